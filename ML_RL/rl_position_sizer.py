@@ -22,7 +22,6 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timezone
-from collections import deque
 from enum import Enum
 import threading
 
@@ -56,6 +55,10 @@ class SizeAction(Enum):
         return multipliers[self]
 
 
+# Size multiplier per SizeAction value, for batch lookups
+ACTION_MULTIPLIERS = np.array([a.multiplier for a in SizeAction])
+
+
 @dataclass
 class RLState:
     """State representation for RL agent."""
@@ -93,6 +96,33 @@ class RLState:
             self.max_position_pct,
             min(self.remaining_daily_risk, 1.0)
         ], dtype=np.float32)
+    
+    @staticmethod
+    def batch_array(**columns: Any) -> np.ndarray:
+        """
+        Batch form of to_array(): one row per state from per-field arrays.
+        
+        Args:
+            **columns: Every RLState field, as an array or a scalar broadcast to all rows
+        """
+        n = max(np.size(v) for v in columns.values())
+        
+        def col(name: str) -> np.ndarray:
+            return np.broadcast_to(np.asarray(columns[name], dtype=float), (n,))
+        
+        return np.column_stack([
+            col('trend_strength'),
+            col('volatility_regime'),
+            col('momentum_score'),
+            col('signal_confidence'),
+            col('entry_quality'),
+            np.minimum(col('risk_reward_ratio') / 5, 1.0),
+            col('current_exposure_pct'),
+            col('win_rate_recent'),
+            col('drawdown_pct'),
+            col('max_position_pct'),
+            np.minimum(col('remaining_daily_risk'), 1.0)
+        ]).astype(np.float32)
 
 
 @dataclass
@@ -116,23 +146,215 @@ class TrainingMetrics:
     q_values_mean: float
 
 
+def experience_dtype(state_size: int = 11) -> np.dtype:
+    """Structured dtype of one replay slot."""
+    return np.dtype([
+        ('state', np.float32, (state_size,)),
+        ('action', np.int8),
+        ('reward', np.float64),
+        ('next_state', np.float32, (state_size,)),
+        ('done', np.bool_),
+    ])
+
+
+@dataclass
+class ReplayBatch:
+    """Sampled transitions as arrays, plus where they came from."""
+    states: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    next_states: np.ndarray
+    dones: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray  # Importance-sampling weights (all ones for uniform replay)
+
+
 class ReplayBuffer:
-    """Experience replay buffer for off-policy learning."""
+    """
+    Experience replay buffer for off-policy learning.
+    
+    Transitions live in one preallocated structured array used as a ring:
+    pushes overwrite the oldest slot and sampling is a single fancy-index
+    gather, so neither depends on how full the buffer is.
+    """
+    
+    def __init__(self, capacity: int = 10000, state_size: int = 11):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=experience_dtype(state_size))
+        self._pos = 0
+        self._size = 0
+    
+    def push(self, experience: RLExperience) -> int:
+        """Add experience to buffer, returning its slot."""
+        idx = self._pos
+        slot = self.data[idx]
+        slot['state'] = experience.state
+        slot['action'] = experience.action
+        slot['reward'] = experience.reward
+        slot['next_state'] = experience.next_state
+        slot['done'] = experience.done
+        self._advance(1)
+        self._on_write(np.array([idx]))
+        return idx
+    
+    def push_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> np.ndarray:
+        """Add many transitions at once, returning their slots."""
+        n = len(actions)
+        if n > self.capacity:
+            # Only the newest `capacity` transitions would survive anyway
+            keep = slice(n - self.capacity, n)
+            states, actions, rewards = states[keep], actions[keep], rewards[keep]
+            next_states, dones = next_states[keep], dones[keep]
+            self._advance(n - self.capacity)
+            n = self.capacity
+        indices = (self._pos + np.arange(n)) % self.capacity
+        self.data['state'][indices] = states
+        self.data['action'][indices] = actions
+        self.data['reward'][indices] = rewards
+        self.data['next_state'][indices] = next_states
+        self.data['done'][indices] = dones
+        self._advance(n)
+        self._on_write(indices)
+        return indices
+    
+    def _advance(self, n: int):
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+    
+    def _on_write(self, indices: np.ndarray):
+        """Hook for subclasses that track per-slot state."""
     
-    def __init__(self, capacity: int = 10000):
-        self.buffer: deque = deque(maxlen=capacity)
+    def _gather(self, indices: np.ndarray, weights: np.ndarray) -> ReplayBatch:
+        rows = self.data[indices]
+        return ReplayBatch(
+            states=rows['state'],
+            actions=rows['action'].astype(np.intp),
+            rewards=rows['reward'],
+            next_states=rows['next_state'],
+            dones=rows['done'],
+            indices=indices,
+            weights=weights
+        )
     
-    def push(self, experience: RLExperience):
-        """Add experience to buffer."""
-        self.buffer.append(experience)
+    def sample_batch(self, batch_size: int) -> ReplayBatch:
+        """Sample a uniform random batch (with replacement) as arrays."""
+        indices = np.random.randint(0, self._size, size=batch_size)
+        return self._gather(indices, np.ones(batch_size))
     
     def sample(self, batch_size: int) -> List[RLExperience]:
         """Sample random batch."""
-        indices = np.random.choice(len(self.buffer), min(batch_size, len(self.buffer)), replace=False)
-        return [self.buffer[i] for i in indices]
+        batch = self.sample_batch(min(batch_size, self._size))
+        return [
+            RLExperience(state=batch.states[i], action=int(batch.actions[i]), reward=float(batch.rewards[i]),
+                         next_state=batch.next_states[i], done=bool(batch.dones[i]))
+            for i in range(len(batch.indices))
+        ]
+    
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray):
+        """No-op for uniform replay."""
     
     def __len__(self) -> int:
-        return len(self.buffer)
+        return self._size
+
+
+class SumTree:
+    """
+    Binary sum tree over per-slot priorities, stored flat in one array.
+    
+    Leaves sit at [leaf_base, leaf_base + capacity); node i holds the sum of
+    nodes 2i and 2i+1. Both updates and prefix-sum lookups process a whole
+    batch per tree level.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaf_base = 1 << max(0, int(np.ceil(np.log2(max(capacity, 1)))))
+        self.depth = int(np.log2(self.leaf_base))
+        self.tree = np.zeros(2 * self.leaf_base)
+    
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+    
+    def leaves(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[self.leaf_base + indices]
+    
+    def update(self, indices: np.ndarray, priorities: np.ndarray):
+        """Set leaf priorities and refresh their ancestors."""
+        nodes = self.leaf_base + np.asarray(indices)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+    
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index whose cumulative priority range contains each value."""
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.intp)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values -= left_sum * go_right
+            nodes = left + go_right
+        return nodes - self.leaf_base
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Proportional prioritized replay (Schaul et al., 2015).
+    
+    Slots are sampled with probability p_i^alpha / sum(p^alpha), where p_i is
+    the last |TD error| seen for the slot; new transitions get the current
+    maximum priority so each is replayed at least once. Sampling bias is
+    corrected with importance weights (N * P(i))^-beta, beta annealed to 1.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 10000,
+        state_size: int = 11,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        beta_increment: float = 1e-4,
+        epsilon: float = 1e-6
+    ):
+        super().__init__(capacity, state_size)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self._max_priority = 1.0
+    
+    def _on_write(self, indices: np.ndarray):
+        self.tree.update(indices, np.full(len(indices), self._max_priority ** self.alpha))
+    
+    def sample_batch(self, batch_size: int) -> ReplayBatch:
+        """Sample proportionally to priority, one draw per equal-mass segment."""
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        indices = np.minimum(self.tree.find(np.minimum(values, total)), self._size - 1)
+        
+        probs = self.tree.leaves(indices) / total
+        weights = (self._size * np.maximum(probs, 1e-12)) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self._gather(indices, weights)
+    
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray):
+        """Re-prioritize sampled slots by their latest |TD error|."""
+        priorities = np.abs(td_errors) + self.epsilon
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
 
 
 class QNetwork:
@@ -208,7 +430,55 @@ class QNetwork:
         # Compute gradients (MSE loss)
         batch_size = state.shape[0]
         dout = 2 * (output - target) / batch_size
+        self._apply_gradients(state, z1, a1, z2, a2, dout, learning_rate, momentum)
+        
+        # Return loss
+        return float(np.mean((output - target) ** 2))
+    
+    def train_on_actions(
+        self,
+        state: np.ndarray,
+        actions: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        learning_rate: float = 0.001,
+        momentum: float = 0.9
+    ) -> Tuple[float, np.ndarray]:
+        """
+        DQN update: regress Q(s, a) of the taken actions onto targets.
         
+        Equivalent to backward() with a target equal to the current Q-values
+        except at the taken actions, without the separate forward pass to
+        build that target.
+        
+        Args:
+            state: Batch of states (batch, state_size)
+            actions: Action taken per row
+            targets: TD target per row
+            weights: Optional per-row importance weights
+            
+        Returns:
+            loss: Weighted MSE over the full Q-value matrix (as backward())
+            td_errors: targets - Q(s, a) per row, before the update
+        """
+        z1 = np.dot(state, self.W1) + self.b1
+        a1 = np.maximum(0, z1)
+        z2 = np.dot(a1, self.W2) + self.b2
+        a2 = np.maximum(0, z2)
+        output = np.dot(a2, self.W3) + self.b3
+        
+        rows = np.arange(state.shape[0])
+        diff = output[rows, actions] - targets
+        weighted = diff if weights is None else diff * weights
+        dout = np.zeros_like(output)
+        dout[rows, actions] = 2 * weighted / state.shape[0]
+        self._apply_gradients(state, z1, a1, z2, a2, dout, learning_rate, momentum)
+        
+        loss = float(np.sum(weighted * diff) / output.size)
+        return loss, -diff
+    
+    def _apply_gradients(self, state, z1, a1, z2, a2, dout, learning_rate: float, momentum: float):
+        """Backpropagate dLoss/dQ and take a momentum step."""
         # Output layer gradients
         dW3 = np.dot(a2.T, dout)
         db3 = np.sum(dout, axis=0)
@@ -226,19 +496,13 @@ class QNetwork:
         db1 = np.sum(dz1, axis=0)
         
         # Update with momentum
-        for name, grad, weight in [
-            ('W1', dW1, self.W1), ('b1', db1, self.b1),
-            ('W2', dW2, self.W2), ('b2', db2, self.b2),
-            ('W3', dW3, self.W3), ('b3', db3, self.b3)
+        for name, grad in [
+            ('W1', dW1), ('b1', db1),
+            ('W2', dW2), ('b2', db2),
+            ('W3', dW3), ('b3', db3)
         ]:
             self._velocities[name] = momentum * self._velocities[name] - learning_rate * grad
-            if name.startswith('W'):
-                setattr(self, name, getattr(self, name) + self._velocities[name])
-            else:
-                setattr(self, name, getattr(self, name) + self._velocities[name])
-        
-        # Return loss
-        return float(np.mean((output - target) ** 2))
+            setattr(self, name, getattr(self, name) + self._velocities[name])
     
     def copy_from(self, other: 'QNetwork'):
         """Copy weights from another network."""
@@ -307,6 +571,13 @@ class PolicyNetwork:
         action = np.clip(action, 0, 2)  # Clip to valid range
         log_prob = -0.5 * ((action - mean) / (std + 1e-8)) ** 2 - np.log(std + 1e-8)
         return float(action), float(log_prob)
+    
+    def sample_actions(self, states: np.ndarray) -> np.ndarray:
+        """Sample one multiplier per row of a state batch."""
+        a1 = np.tanh(np.dot(states, self.W1) + self.b1)
+        mean = 2.0 / (1.0 + np.exp(-(np.dot(a1, self.W_mean) + self.b_mean)))
+        actions = np.random.normal(mean[:, 0], np.exp(self.log_std[0]))
+        return np.clip(actions, 0, 2)
 
 
 class RLPositionSizer:
@@ -333,7 +604,9 @@ class RLPositionSizer:
         epsilon_decay: float = 0.995,
         batch_size: int = 64,
         target_update_freq: int = 100,
-        use_ppo: bool = True
+        use_ppo: bool = True,
+        buffer_capacity: int = 10000,
+        prioritized_replay: bool = False
     ):
         self.learning_rate = learning_rate
         self.gamma = gamma
@@ -353,7 +626,11 @@ class RLPositionSizer:
         self.policy_network = PolicyNetwork() if use_ppo else None
         
         # Replay buffer
-        self.replay_buffer = ReplayBuffer(capacity=10000)
+        self.prioritized_replay = prioritized_replay
+        if prioritized_replay:
+            self.replay_buffer = PrioritizedReplayBuffer(capacity=buffer_capacity)
+        else:
+            self.replay_buffer = ReplayBuffer(capacity=buffer_capacity)
         
         # Training state
         self.steps = 0
@@ -362,7 +639,8 @@ class RLPositionSizer:
         # Lock for thread safety
         self._lock = threading.Lock()
         
-        logger.info(f"RLPositionSizer initialized: lr={learning_rate}, gamma={gamma}, ppo={use_ppo}")
+        logger.info(f"RLPositionSizer initialized: lr={learning_rate}, gamma={gamma}, ppo={use_ppo}, "
+                    f"per={prioritized_replay}")
     
     def select_action(self, state: RLState, explore: bool = True) -> Tuple[SizeAction, float]:
         """
@@ -400,6 +678,27 @@ class RLPositionSizer:
         
         return action, float(final_mult)
     
+    def select_actions(self, states: np.ndarray, explore: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch form of select_action() for a (batch, state_size) state array.
+        
+        Returns:
+            actions: SizeAction values per row
+            multipliers: Final size multiplier per row (0-2)
+        """
+        n = states.shape[0]
+        actions = np.argmax(self.q_network.forward(states), axis=1)
+        if explore:
+            random_rows = np.random.random(n) < self.epsilon
+            actions[random_rows] = np.random.randint(0, 6, size=int(random_rows.sum()))
+        
+        multipliers = ACTION_MULTIPLIERS[actions]
+        if self.use_ppo:
+            adjustment = (self.policy_network.sample_actions(states) - 1.0) * 0.25
+            sized = actions != SizeAction.SKIP.value
+            multipliers = np.where(sized, np.clip(multipliers * (1.0 + adjustment), 0, 2), multipliers)
+        return actions, multipliers
+    
     def calculate_reward(
         self,
         action: SizeAction,
@@ -464,6 +763,17 @@ class RLPositionSizer:
         )
         self.replay_buffer.push(experience)
     
+    def store_experiences(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ):
+        """Store a batch of transitions given as state arrays."""
+        self.replay_buffer.push_batch(states, actions, rewards, next_states, dones)
+    
     def train_step(self) -> Optional[float]:
         """
         Perform one training step.
@@ -475,29 +785,17 @@ class RLPositionSizer:
             return None
         
         # Sample batch
-        batch = self.replay_buffer.sample(self.batch_size)
-        
-        states = np.array([e.state for e in batch])
-        actions = np.array([e.action for e in batch])
-        rewards = np.array([e.reward for e in batch])
-        next_states = np.array([e.next_state for e in batch])
-        dones = np.array([e.done for e in batch])
+        batch = self.replay_buffer.sample_batch(self.batch_size)
         
         # Compute target Q-values
-        next_q = self.target_network.forward(next_states)
-        max_next_q = np.max(next_q, axis=1)
-        targets = rewards + self.gamma * max_next_q * (1 - dones)
-        
-        # Current Q-values
-        current_q = self.q_network.forward(states)
+        next_q = self.target_network.forward(batch.next_states)
+        targets = batch.rewards + self.gamma * np.max(next_q, axis=1) * ~batch.dones
         
-        # Create target array (only update chosen action)
-        target_q = current_q.copy()
-        for i, action in enumerate(actions):
-            target_q[i, action] = targets[i]
-        
-        # Backward pass
-        loss = self.q_network.backward(states, target_q, self.learning_rate)
+        # Update Q(s, a) of the taken actions only
+        loss, td_errors = self.q_network.train_on_actions(
+            batch.states, batch.actions, targets, batch.weights, self.learning_rate
+        )
+        self.replay_buffer.update_priorities(batch.indices, td_errors)
         
         # Update target network
         self.steps += 1
@@ -579,7 +877,8 @@ class RLPositionSizer:
             'config': {
                 'learning_rate': self.learning_rate,
                 'gamma': self.gamma,
-                'use_ppo': self.use_ppo
+                'use_ppo': self.use_ppo,
+                'prioritized_replay': self.prioritized_replay
             }
         }
         
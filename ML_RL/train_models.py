@@ -26,6 +26,7 @@ import glob
 import argparse
 import logging
 import sqlite3
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import numpy as np
@@ -38,6 +39,7 @@ from ML_RL.feature_pipeline import FeaturePipeline, get_feature_pipeline
 from ML_RL.mlops import ModelRegistry, DriftDetector, get_model_registry, get_drift_detector
 from ML_RL.rl_position_sizer import RLPositionSizer, get_rl_position_sizer, RLState, SizeAction
 from ML_RL.llm_analysis import LLMAnalyzer, get_llm_analyzer, MarketContext
+from cthulu.utils.event_log import event_log_files, read_event_logs, scan_event_logs
 
 # Setup logging
 logging.basicConfig(
@@ -74,12 +76,13 @@ class ModelTrainer:
         
         logger.info("ModelTrainer initialized")
     
-    def load_jsonl_events(self, data_dir: str) -> List[Dict[str, Any]]:
+    def load_jsonl_events(self, data_dir: str, event_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Load events from compressed JSONL files.
+        Load events from compressed JSONL files and columnar event logs.
         
         Args:
-            data_dir: Directory containing .jsonl.gz files
+            data_dir: Directory containing .jsonl.gz / .evlog files
+            event_types: Only return these event types (default all)
             
         Returns:
             List of event dictionaries
@@ -87,8 +90,9 @@ class ModelTrainer:
         events = []
         pattern = os.path.join(data_dir, '*.jsonl.gz')
         files = sorted(glob.glob(pattern))
+        logs = event_log_files(data_dir)
         
-        logger.info(f"Loading events from {len(files)} JSONL files in {data_dir}")
+        logger.info(f"Loading events from {len(files)} JSONL files and {len(logs)} event logs in {data_dir}")
         
         for filepath in files:
             try:
@@ -96,15 +100,45 @@ class ModelTrainer:
                     for line in f:
                         try:
                             event = json.loads(line.strip())
-                            events.append(event)
+                            if event_types is None or event.get('event_type') in event_types:
+                                events.append(event)
                         except json.JSONDecodeError:
                             continue
             except Exception as e:
                 logger.debug(f"Could not read {filepath}: {e}")
+        
+        # Columnar logs: only chunks of the requested types are decoded
+        for batch in scan_event_logs(logs, event_type=event_types):
+            timestamps = batch.timestamps().strftime('%Y-%m-%dT%H:%M:%S.%f')
+            for ts, payload in zip(timestamps, batch.to_records()):
+                events.append({'ts': ts + 'Z', 'event_type': batch.event_type, 'payload': payload})
                 
         logger.info(f"Loaded {len(events)} events from JSONL files")
         return events
     
+    def load_event_frame(
+        self,
+        data_dir: str,
+        event_type: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load one event type from the columnar event logs as a DataFrame.
+        
+        Args:
+            data_dir: Directory containing .evlog files
+            event_type: Event type to load
+            start: Earliest event time to include
+            end: Event time to stop before
+            columns: Payload fields to load (default all)
+            
+        Returns:
+            DataFrame with one column per payload field and the event time in '_ts'
+        """
+        return read_event_logs(data_dir, event_type, start, end, columns)
+    
     def load_trades_from_db(self) -> List[Dict[str, Any]]:
         """Load trades from SQLite database."""
         trades = []
@@ -358,8 +392,9 @@ class ModelTrainer:
             trades_data = self.load_trades_from_db()
         
         # Also load from JSONL events for additional data
-        ml_events = self.load_jsonl_events(os.path.join(DATA_DIR, 'raw'))
-        cog_events = self.load_jsonl_events(os.path.join(COGNITION_DATA_DIR, 'raw'))
+        outcome_types = ['execution', 'trade_closed', 'position_closed']
+        ml_events = self.load_jsonl_events(os.path.join(DATA_DIR, 'raw'), event_types=outcome_types)
+        cog_events = self.load_jsonl_events(os.path.join(COGNITION_DATA_DIR, 'raw'), event_types=outcome_types)
         
         # Process trades from database
         outcomes_added = 0
@@ -388,7 +423,7 @@ class ModelTrainer:
         # Process JSONL events for execution data
         for event in ml_events + cog_events:
             try:
-                if event.get('event_type') in ['execution', 'trade_closed', 'position_closed']:
+                if event.get('event_type') in outcome_types:
                     payload = event.get('payload', {})
                     pnl = payload.get('pnl', 0) or payload.get('profit', 0)
                     if pnl != 0:
@@ -578,91 +613,119 @@ class ModelTrainer:
             "avg_loss": avg_loss
         }
     
-    def _train_rl_simulated(self, episodes: int) -> Dict[str, Any]:
-        """Train RL sizer with simulated episodes."""
+    def _train_rl_simulated(self, episodes: int, chunk_size: int = 32, train_every: int = 1) -> Dict[str, Any]:
+        """
+        Train RL sizer with simulated episodes.
+        
+        Episodes are one-step and independent, so they are simulated
+        chunk_size at a time as arrays (the policy is refreshed between
+        chunks), and one gradient step is taken per train_every episodes
+        (1 keeps the original one-step-per-episode schedule).
+        
+        Args:
+            episodes: Number of simulated episodes
+            chunk_size: Episodes simulated per vectorized batch
+            train_every: Episodes per gradient step
+        """
         total_reward = 0
         losses = []
-        
-        for ep in range(episodes):
-            # Generate random state
-            state = RLState(
-                trend_strength=np.random.uniform(0, 1),
-                volatility_regime=np.random.uniform(0, 1),
-                momentum_score=np.random.uniform(-1, 1),
-                signal_confidence=np.random.uniform(0.3, 0.9),
-                entry_quality=np.random.uniform(0.3, 1.0),
-                risk_reward_ratio=np.random.uniform(1.0, 3.0),
-                current_exposure_pct=np.random.uniform(0, 0.1),
-                win_rate_recent=np.random.uniform(0.4, 0.7),
-                drawdown_pct=np.random.uniform(0, 0.1),
+        gradient_steps = 0
+        sizer = self.rl_sizer
+        started = time.perf_counter()
+        
+        for start in range(0, episodes, chunk_size):
+            n = min(chunk_size, episodes - start)
+            uniform = np.random.uniform
+            
+            # Generate random states
+            columns = dict(
+                trend_strength=uniform(0, 1, n),
+                volatility_regime=uniform(0, 1, n),
+                momentum_score=uniform(-1, 1, n),
+                signal_confidence=uniform(0.3, 0.9, n),
+                entry_quality=uniform(0.3, 1.0, n),
+                risk_reward_ratio=uniform(1.0, 3.0, n),
+                current_exposure_pct=uniform(0, 0.1, n),
+                win_rate_recent=uniform(0.4, 0.7, n),
+                drawdown_pct=uniform(0, 0.1, n),
                 max_position_pct=0.1,
-                remaining_daily_risk=np.random.uniform(0.5, 1.0)
+                remaining_daily_risk=uniform(0.5, 1.0, n)
             )
+            states = RLState.batch_array(**columns)
             
-            # Select action
-            action, multiplier = self.rl_sizer.select_action(state, explore=True)
+            # Select actions
+            actions, multipliers = sizer.select_actions(states, explore=True)
             
             # Simulate outcome
             # Higher quality setups have higher expected returns
-            expected_win_prob = (state.signal_confidence + state.entry_quality) / 2
-            won = np.random.random() < expected_win_prob
-            
-            if won:
-                pnl = multiplier * state.risk_reward_ratio * np.random.uniform(0.5, 1.5)
-            else:
-                pnl = -multiplier * np.random.uniform(0.5, 1.0)
-            
-            if action == SizeAction.SKIP:
-                pnl = 0  # No trade
-            
-            # Calculate reward
-            reward = self.rl_sizer.calculate_reward(
-                action=action,
-                multiplier=multiplier,
-                pnl=pnl,
-                risk_taken=multiplier * 2,  # Rough estimate
-                max_risk=5.0,
-                trade_duration_bars=np.random.randint(5, 50)
+            expected_win_prob = (columns['signal_confidence'] + columns['entry_quality']) / 2
+            won = np.random.random(n) < expected_win_prob
+            pnl = np.where(
+                won,
+                multipliers * columns['risk_reward_ratio'] * uniform(0.5, 1.5, n),
+                -multipliers * uniform(0.5, 1.0, n)
             )
+            pnl[actions == SizeAction.SKIP.value] = 0  # No trade
+            durations = np.random.randint(5, 50, n)
             
-            total_reward += reward
-            
-            # Create next state
-            next_state = RLState(
-                trend_strength=np.random.uniform(0, 1),
-                volatility_regime=np.random.uniform(0, 1),
-                momentum_score=np.random.uniform(-1, 1),
-                signal_confidence=np.random.uniform(0.3, 0.9),
-                entry_quality=np.random.uniform(0.3, 1.0),
-                risk_reward_ratio=np.random.uniform(1.0, 3.0),
+            # Calculate reward
+            rewards = np.array([
+                sizer.calculate_reward(
+                    action=SizeAction(int(actions[i])),
+                    multiplier=float(multipliers[i]),
+                    pnl=float(pnl[i]),
+                    risk_taken=float(multipliers[i]) * 2,  # Rough estimate
+                    max_risk=5.0,
+                    trade_duration_bars=int(durations[i])
+                )
+                for i in range(n)
+            ])
+            total_reward += float(rewards.sum())
+            
+            # Create next states
+            next_states = RLState.batch_array(
+                trend_strength=uniform(0, 1, n),
+                volatility_regime=uniform(0, 1, n),
+                momentum_score=uniform(-1, 1, n),
+                signal_confidence=uniform(0.3, 0.9, n),
+                entry_quality=uniform(0.3, 1.0, n),
+                risk_reward_ratio=uniform(1.0, 3.0, n),
                 current_exposure_pct=0,
-                win_rate_recent=state.win_rate_recent * 0.9 + (0.1 if pnl > 0 else 0),
-                drawdown_pct=max(0, state.drawdown_pct - pnl / 100),
+                win_rate_recent=columns['win_rate_recent'] * 0.9 + np.where(pnl > 0, 0.1, 0),
+                drawdown_pct=np.maximum(0, columns['drawdown_pct'] - pnl / 100),
                 max_position_pct=0.1,
-                remaining_daily_risk=state.remaining_daily_risk
+                remaining_daily_risk=columns['remaining_daily_risk']
             )
             
             # Store and train
-            self.rl_sizer.store_experience(state, action, reward, next_state, done=True)
-            loss = self.rl_sizer.train_step()
-            if loss is not None:
-                losses.append(loss)
+            sizer.store_experiences(states, actions, rewards, next_states, np.ones(n, dtype=bool))
+            for _ in range((start + n) // train_every - start // train_every):
+                loss = sizer.train_step()
+                if loss is not None:
+                    losses.append(loss)
+                    gradient_steps += 1
             
-            if (ep + 1) % 100 == 0:
+            if (start + n) // 100 > start // 100:
                 avg_loss = np.mean(losses[-100:]) if losses else 0
-                logger.info(f"Episode {ep+1}/{episodes}: avg_loss={avg_loss:.4f}, epsilon={self.rl_sizer.epsilon:.3f}")
+                logger.info(f"Episode {start + n}/{episodes}: avg_loss={avg_loss:.4f}, epsilon={sizer.epsilon:.3f}")
+        
+        elapsed = max(time.perf_counter() - started, 1e-9)
         
         # Save model
-        self.rl_sizer.save()
+        sizer.save()
         
         avg_loss = np.mean(losses) if losses else 0
-        logger.info(f"RL sizer training complete: total_reward={total_reward:.2f}, avg_loss={avg_loss:.4f}")
+        logger.info(f"RL sizer training complete: total_reward={total_reward:.2f}, avg_loss={avg_loss:.4f}, "
+                    f"{episodes / elapsed:.0f} episodes/s, {gradient_steps / elapsed:.0f} gradient steps/s")
         
         return {
             "episodes": episodes,
             "total_reward": total_reward,
             "avg_loss": avg_loss,
-            "epsilon": self.rl_sizer.epsilon
+            "epsilon": sizer.epsilon,
+            "gradient_steps": gradient_steps,
+            "episodes_per_sec": episodes / elapsed,
+            "gradient_steps_per_sec": gradient_steps / elapsed
         }
     
     def fit_feature_pipeline(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -7,6 +7,7 @@ Features:
 - Historical data management with MT5 integration
 - Adjustable speed engine (fast/slow/realtime simulation)
 - Multi-strategy ensemble testing
+- Portfolio backtests over many symbols with shared capital
 - Advanced benchmarking (Sharpe, Sortino, Calmar, Omega, etc.)
 - Detailed performance reports with visualizations
 - Walk-forward optimization support
@@ -42,11 +43,15 @@ BACKTEST_CACHE_DIR = BASE_DIR / "cache"
 BACKTEST_REPORTS_DIR = BASE_DIR / "reports"
 
 from .engine import BacktestEngine, BacktestConfig, SpeedMode
+from .portfolio import PortfolioBacktestEngine, PortfolioConfig
 from .data_manager import HistoricalDataManager, DataSource
 from .ensemble import EnsembleStrategy, EnsembleConfig, WeightingMethod
 from .benchmarks import BenchmarkSuite, PerformanceMetrics
 from .reporter import ReportGenerator, ReportFormat
 from .optimizer import WalkForwardOptimizer, MonteCarloSimulator
+from .surrogate import TPESampler, MedianPruner
+from .multi_fidelity import SuccessiveHalvingScheduler, BacktestStateCache
+from .exit_replay import TradePaths, ExitPolicyReplay
 from .ml_decision import (
     SoftmaxSelector,
     SelectionMethod,
@@ -59,6 +64,8 @@ __all__ = [
     'BacktestEngine',
     'BacktestConfig',
     'SpeedMode',
+    'PortfolioBacktestEngine',
+    'PortfolioConfig',
     'HistoricalDataManager',
     'DataSource',
     'EnsembleStrategy',
@@ -70,6 +77,12 @@ __all__ = [
     'ReportFormat',
     'WalkForwardOptimizer',
     'MonteCarloSimulator',
+    'TPESampler',
+    'MedianPruner',
+    'SuccessiveHalvingScheduler',
+    'BacktestStateCache',
+    'TradePaths',
+    'ExitPolicyReplay',
     # ML-enhanced
     'SoftmaxSelector',
     'SelectionMethod',
@@ -3,23 +3,145 @@ Automated Configuration Optimizer
 
 Uses Hektor-powered pattern recognition and Bayesian optimization
 to find optimal trading configurations.
+
+Bayesian optimization is a sequential model-based search (TPE surrogate)
+whose trials run asynchronously on a process pool. Pending trials are
+handled with the constant-liar heuristic and poor trials are pruned at
+intermediate checkpoints on partial data.
 """
 
+import os
+import time
 import logging
 import json
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple, Callable
+from typing import Dict, Any, List, Optional, Tuple, Callable, Sequence
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from copy import deepcopy
 import itertools
 
-from backtesting.engine import BacktestEngine, BacktestConfig
+from backtesting.engine import BacktestEngine, BacktestConfig, SpeedMode, prepare_backtest_frame
 from backtesting.hektor_backtest import HektorBacktest
+from backtesting.surrogate import TPESampler, MedianPruner
 
 logger = logging.getLogger(__name__)
 
+# Market data shared with pool workers (set once per worker process)
+_WORKER_DATA: Optional[pd.DataFrame] = None
+
+
+def _init_worker(data: pd.DataFrame) -> None:
+    """Process pool initializer: keep the dataset resident in the worker."""
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def objective_score(metrics: Dict[str, Any], objective: str) -> float:
+    """
+    Convert a metric into a score where higher is better.
+    
+    Drawdown objectives are negated (stored either as positive fractions
+    or negative returns, so the magnitude is used).
+    """
+    value = metrics.get(objective, 0.0)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if not np.isfinite(value):
+        return 0.0
+    if 'drawdown' in objective.lower():
+        return -abs(value)
+    return value
+
+
+def build_backtest_config(config: Dict[str, Any]) -> BacktestConfig:
+    """Build a FAST-mode BacktestConfig from a config's `backtest` section (or top level)."""
+    section = config.get('backtest', config) or {}
+    names = {f.name for f in fields(BacktestConfig)} - {'speed_mode'}
+    kwargs = {k: v for k, v in section.items() if k in names}
+    return BacktestConfig(speed_mode=SpeedMode.FAST, **kwargs)
+
+
+def build_strategies(config: Dict[str, Any]) -> List[Any]:
+    """Instantiate the strategies described by a config (`strategy` or `strategies`)."""
+    from cthulu.core.strategy_factory import load_strategy
+    
+    strategy_configs = config.get('strategies') or ([config['strategy']] if config.get('strategy') else [])
+    if not strategy_configs:
+        raise ValueError("Configuration has no 'strategy' section to backtest")
+    return [load_strategy(deepcopy(c)) for c in strategy_configs]
+
+
+def run_config_backtest(
+    data: Optional[pd.DataFrame],
+    config: Dict[str, Any],
+    objective: str = 'sharpe_ratio',
+    checkpoints: Optional[Sequence[int]] = None,
+    thresholds: Optional[Sequence[Optional[float]]] = None
+) -> Dict[str, Any]:
+    """
+    Backtest one full configuration.
+    
+    Module-level so it can be shipped to a process pool. When checkpoints
+    (bar counts) are given, the objective is scored at each one and the run
+    stops early if the score falls below the matching pruning threshold.
+    
+    Args:
+        data: OHLCV data (None = dataset installed by the pool initializer)
+        config: Configuration with `strategy`/`strategies` and optional `backtest` sections
+        objective: Metric used for intermediate scores
+        checkpoints: Ascending bar counts at which to score the run
+        thresholds: Per-checkpoint minimum score (None entries never prune)
+        
+    Returns:
+        Flat metrics plus `intermediate`, `pruned` and `bars_processed`
+    """
+    data = data if data is not None else _WORKER_DATA
+    if data is None or data.empty:
+        raise ValueError("No market data available for backtest")
+        
+    strategies = build_strategies(config)
+    frame = prepare_backtest_frame(data, strategies, config)
+    engine = BacktestEngine(strategies, build_backtest_config(config))
+    engine.start_time = time.time()
+    engine.total_bars = len(frame)
+    
+    stops = list(checkpoints or [])
+    intermediate: List[float] = []
+    pruned = False
+    last_timestamp, last_close = None, None
+    
+    for idx, (timestamp, bar) in enumerate(frame.iterrows()):
+        engine.current_bar_idx = idx
+        last_timestamp, last_close = timestamp, bar['close']
+        if not engine.step(timestamp, bar):
+            break
+            
+        if len(intermediate) < len(stops) and idx + 1 >= stops[len(intermediate)]:
+            step = len(intermediate)
+            score = objective_score(engine.summary_metrics(), objective)
+            intermediate.append(score)
+            threshold = thresholds[step] if thresholds and step < len(thresholds) else None
+            if threshold is not None and score < threshold:
+                pruned = True
+                break
+                
+    if engine.positions and last_timestamp is not None:
+        engine._close_all_positions(last_timestamp, last_close, "backtest_end")
+        
+    result = engine.summary_metrics()
+    result.update({
+        'bars_processed': engine.current_bar_idx + 1,
+        'intermediate': intermediate,
+        'pruned': pruned,
+    })
+    return result
+
 
 @dataclass
 class OptimizationResult:
@@ -74,11 +196,20 @@ class AutoOptimizer:
         base_config: Dict[str, Any],
         objective: str = 'sharpe_ratio',
         max_iterations: Optional[int] = None,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        successive_halving: bool = False,
+        eta: int = 3,
+        n_final: int = 1,
+        min_bars: int = 200,
+        cache_dir: Optional[str] = None
     ) -> List[OptimizationResult]:
         """
         Grid search optimization.
         
+        With `successive_halving` every combination is first backtested on a
+        short prefix of the data and only the best 1/eta advance to longer
+        prefixes; promoted runs resume from their cached engine state.
+        
         Args:
             data: Market data for backtesting
             param_grid: Parameter grid to search
@@ -86,9 +217,15 @@ class AutoOptimizer:
             objective: Objective metric to optimize
             max_iterations: Maximum iterations (None = all combinations)
             progress_callback: Progress callback function
+            successive_halving: Use multi-fidelity search instead of full runs
+            eta: Reduction factor between halving rungs
+            n_final: Combinations evaluated on the full data
+            min_bars: Bars in the first (cheapest) rung
+            cache_dir: Directory for resumable engine snapshots
             
         Returns:
-            List of optimization results sorted by score
+            List of optimization results sorted by score (deepest rung first
+            when successive halving is used)
         """
         self.logger.info("Starting grid search optimization...")
         
@@ -104,38 +241,51 @@ class AutoOptimizer:
             
         self.logger.info(f"Testing {total_iterations} parameter combinations")
         
-        results = []
-        
+        configs: List[Tuple[int, Dict[str, Any]]] = []
         for i, combination in enumerate(combinations):
-            try:
-                # Build configuration
-                config = base_config.copy()
-                for param_name, param_value in zip(param_names, combination):
-                    self._set_nested_param(config, param_name, param_value)
-                    
-                # Check if similar config was tested before (Hektor optimization)
-                if self.hektor_backtest:
+            # Build configuration
+            config = deepcopy(base_config)
+            for param_name, param_value in zip(param_names, combination):
+                self._set_nested_param(config, param_name, param_value)
+                
+            # Check if similar config was tested before (Hektor optimization)
+            if self.hektor_backtest:
+                try:
                     similar = self.hektor_backtest.find_similar_backtests(
                         config=config,
                         k=1,
                         min_score=0.95  # Very similar
                     )
+                except Exception as e:
+                    self.logger.debug(f"Similarity lookup failed: {e}")
+                    similar = None
                     
-                    if similar:
-                        # Skip if very similar config already tested
-                        self.logger.info(
-                            f"Skipping similar config (iteration {i+1}/{total_iterations})"
-                        )
-                        continue
-                        
+                if similar:
+                    # Skip if very similar config already tested
+                    self.logger.info(
+                        f"Skipping similar config (iteration {i+1}/{total_iterations})"
+                    )
+                    continue
+                    
+            configs.append((i, config))
+            
+        if successive_halving:
+            return self._grid_successive_halving(
+                data, configs, objective, eta, n_final, min_bars, cache_dir, progress_callback
+            )
+            
+        results = []
+        
+        for i, config in configs:
+            try:
                 # Run backtest
                 self.logger.info(f"Testing iteration {i+1}/{total_iterations}")
-                
+            
                 backtest_result = self._run_backtest(data, config)
-                
+            
                 # Extract score
-                score = backtest_result.get(objective, 0.0)
-                
+                score = objective_score(backtest_result, objective)
+            
                 # Create result
                 result = OptimizationResult(
                     config=config,
@@ -143,9 +293,9 @@ class AutoOptimizer:
                     metrics=backtest_result,
                     iteration=i
                 )
-                
+            
                 results.append(result)
-                
+            
                 # Store in Hektor
                 if self.hektor_backtest:
                     self.hektor_backtest.store_backtest_result(
@@ -153,18 +303,22 @@ class AutoOptimizer:
                         result=backtest_result,
                         metadata={'optimization_iteration': i}
                     )
-                    
+                
                 # Progress callback
                 if progress_callback:
                     progress_callback(i + 1, total_iterations, result.to_dict())
-                    
+                
             except Exception as e:
                 self.logger.error(f"Error in iteration {i}: {e}")
                 continue
-                
+            
         # Sort by score
         results.sort(key=lambda x: x.score, reverse=True)
         
+        if not results:
+            self.logger.warning("Optimization produced no results")
+            return results
+            
         self.logger.info(
             f"Optimization complete. Best score: {results[0].score:.4f}"
         )
@@ -174,6 +328,67 @@ class AutoOptimizer:
         
         return results
     
+    def _grid_successive_halving(
+        self,
+        data: pd.DataFrame,
+        configs: List[Tuple[int, Dict[str, Any]]],
+        objective: str,
+        eta: int,
+        n_final: int,
+        min_bars: int,
+        cache_dir: Optional[str],
+        progress_callback: Optional[Callable]
+    ) -> List[OptimizationResult]:
+        """Run grid configurations through a successive-halving bracket."""
+        from backtesting.multi_fidelity import SuccessiveHalvingScheduler, BacktestStateCache
+        
+        scheduler = SuccessiveHalvingScheduler(
+            engine_factory=lambda config: BacktestEngine(build_strategies(config), build_backtest_config(config)),
+            score_fn=lambda metrics: objective_score(metrics, objective),
+            eta=eta,
+            min_bars=min_bars,
+            n_final=n_final,
+            cache=BacktestStateCache(cache_dir)
+        )
+        
+        def on_progress(rung, n_rungs, evaluated, total):
+            if progress_callback:
+                progress_callback(evaluated, total, {'rung': rung, 'n_rungs': n_rungs})
+                
+        iterations = {id(config): i for i, config in configs}
+        fidelity_results = scheduler.run(data, [config for _, config in configs], on_progress)
+        
+        results = []
+        for fr in fidelity_results:
+            metrics = dict(fr.metrics)
+            metrics['rung'] = fr.rung
+            results.append(OptimizationResult(
+                config=fr.config,
+                score=fr.score,
+                metrics=metrics,
+                iteration=iterations.get(id(fr.config), -1)
+            ))
+            
+        # Only full-length runs are comparable with other backtests
+        if self.hektor_backtest:
+            for result in results:
+                if result.metrics.get('bars_processed', 0) >= len(data):
+                    self.hektor_backtest.store_backtest_result(
+                        config=result.config,
+                        result=result.metrics,
+                        metadata={'optimization_iteration': result.iteration}
+                    )
+                    
+        self.logger.info(
+            f"Successive halving complete ({scheduler.cache.hits} cache hits). "
+            f"Best score: {results[0].score:.4f}" if results else "Successive halving produced no results"
+        )
+        
+        if results:
+            self._save_optimization_results(results, 'grid_search')
+            
+        return results
+        
     def optimize_bayesian(
         self,
         data: pd.DataFrame,
@@ -182,124 +397,129 @@ class AutoOptimizer:
         objective: str = 'sharpe_ratio',
         n_iterations: int = 50,
         n_initial_points: int = 10,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        n_workers: Optional[int] = None,
+        pruning: bool = True,
+        checkpoints: Sequence[float] = (0.25, 0.5, 0.75),
+        seed: Optional[int] = None
     ) -> List[OptimizationResult]:
         """
-        Bayesian optimization using historical patterns.
+        Bayesian optimization with a TPE surrogate and asynchronous trials.
+        
+        Up to `n_workers` backtests run concurrently on a process pool. Each
+        time one finishes the surrogate is refit and a new trial is
+        submitted; in-flight trials are treated as observed with a
+        pessimistic score (constant liar). With pruning enabled, each trial
+        scores itself at the given fractions of the data and stops when it
+        falls below the median of earlier trials at the same checkpoint.
         
         Args:
             data: Market data
-            param_bounds: Parameter bounds (min, max)
+            param_bounds: Parameter bounds (min, max); integer bounds sample integers
             base_config: Base configuration
             objective: Objective metric
-            n_iterations: Number of iterations
-            n_initial_points: Number of random initial points
+            n_iterations: Number of trials
+            n_initial_points: Random trials before the surrogate is used
             progress_callback: Progress callback
+            n_workers: Parallel worker processes (None = CPU count, 1 = in-process)
+            pruning: Enable median pruning on partial data
+            checkpoints: Fractions of the data at which trials may be pruned
+            seed: Random seed for the sampler
             
         Returns:
-            List of optimization results
+            List of optimization results (completed trials first, best first)
         """
         self.logger.info("Starting Bayesian optimization...")
         
-        results = []
+        sampler = TPESampler(param_bounds, n_startup_trials=n_initial_points, seed=seed)
+        pruner = MedianPruner(n_startup_trials=max(3, n_initial_points // 2)) if pruning else None
+        stops = sorted({max(1, int(len(data) * f)) for f in checkpoints if 0 < f < 1}) if pruning else []
+        self._warm_start(sampler, base_config, objective)
         
-        # Initial random sampling
-        for i in range(n_initial_points):
-            try:
-                # Sample random parameters
-                config = base_config.copy()
-                for param_name, (min_val, max_val) in param_bounds.items():
-                    value = np.random.uniform(min_val, max_val)
-                    self._set_nested_param(config, param_name, value)
-                    
-                # Run backtest
-                backtest_result = self._run_backtest(data, config)
-                score = backtest_result.get(objective, 0.0)
-                
-                result = OptimizationResult(
-                    config=config,
-                    score=score,
-                    metrics=backtest_result,
-                    iteration=i
-                )
-                
-                results.append(result)
-                
-                if progress_callback:
-                    progress_callback(i + 1, n_iterations, result.to_dict())
-                    
-            except Exception as e:
-                self.logger.error(f"Error in initial sampling {i}: {e}")
-                continue
+        n_workers = max(1, min(n_workers or os.cpu_count() or 1, n_iterations))
+        if n_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_init_worker, initargs=(data,)
+            )
+            payload = None
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+            payload = data
+            
+        results: List[OptimizationResult] = []
+        in_flight: Dict[Any, Tuple[int, Dict[str, Any]]] = {}
+        submitted = 0
+        completed = 0
+        
+        def submit_trial():
+            nonlocal submitted
+            trial = submitted
+            submitted += 1
+            params = sampler.ask(trial)
+            config = deepcopy(base_config)
+            for param_name, value in params.items():
+                self._set_nested_param(config, param_name, value)
+            thresholds = pruner.thresholds(len(stops)) if pruner else None
+            future = executor.submit(run_config_backtest, payload, config, objective, stops, thresholds)
+            in_flight[future] = (trial, config)
+            
+        with executor:
+            while submitted < n_iterations and len(in_flight) < n_workers:
+                submit_trial()
                 
-        # Bayesian optimization iterations
-        for i in range(n_initial_points, n_iterations):
-            try:
-                # Use Hektor to find promising regions
-                if self.hektor_backtest and results:
-                    # Get best configurations so far
-                    best_configs = sorted(results, key=lambda x: x.score, reverse=True)[:5]
-                    
-                    # Find similar high-performing configs from history
-                    promising_regions = []
-                    for best in best_configs:
-                        similar = self.hektor_backtest.find_similar_backtests(
-                            config=best.config,
-                            k=3,
-                            min_score=0.7
-                        )
-                        promising_regions.extend(similar)
+            while in_flight:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial, config = in_flight.pop(future)
+                    completed += 1
+                    try:
+                        backtest_result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error in Bayesian trial {trial}: {e}")
+                        sampler.cancel(trial)
+                    else:
+                        intermediate = backtest_result.get('intermediate', [])
+                        pruned = backtest_result.get('pruned', False)
+                        score = intermediate[-1] if pruned else objective_score(backtest_result, objective)
                         
-                    # Sample from promising regions
-                    if promising_regions:
-                        # Pick a random promising config and perturb it
-                        base = np.random.choice(promising_regions)
-                        config = self._perturb_config(
-                            base['config'],
-                            param_bounds,
-                            perturbation=0.1
+                        sampler.tell(trial, score)
+                        if pruner:
+                            pruner.report(intermediate)
+                            
+                        result = OptimizationResult(
+                            config=config,
+                            score=score,
+                            metrics=backtest_result,
+                            iteration=trial
                         )
-                    else:
-                        # Fallback to random sampling
-                        config = self._sample_random_config(base_config, param_bounds)
-                else:
-                    # No Hektor - use simple Bayesian approach
-                    config = self._sample_random_config(base_config, param_bounds)
-                    
-                # Run backtest
-                backtest_result = self._run_backtest(data, config)
-                score = backtest_result.get(objective, 0.0)
-                
-                result = OptimizationResult(
-                    config=config,
-                    score=score,
-                    metrics=backtest_result,
-                    iteration=i
-                )
-                
-                results.append(result)
-                
-                # Store in Hektor
-                if self.hektor_backtest:
-                    self.hektor_backtest.store_backtest_result(
-                        config=config,
-                        result=backtest_result,
-                        metadata={'optimization_iteration': i, 'method': 'bayesian'}
-                    )
-                    
-                if progress_callback:
-                    progress_callback(i + 1, n_iterations, result.to_dict())
-                    
-            except Exception as e:
-                self.logger.error(f"Error in Bayesian iteration {i}: {e}")
-                continue
-                
-        # Sort results
-        results.sort(key=lambda x: x.score, reverse=True)
+                        results.append(result)
+                        
+                        if pruned:
+                            self.logger.info(f"Trial {trial} pruned after {backtest_result.get('bars_processed')} bars")
+                        elif self.hektor_backtest:
+                            self.hektor_backtest.store_backtest_result(
+                                config=config,
+                                result=backtest_result,
+                                metadata={'optimization_iteration': trial, 'method': 'bayesian'}
+                            )
+                            
+                        if progress_callback:
+                            progress_callback(completed, n_iterations, result.to_dict())
+                            
+                    if submitted < n_iterations:
+                        submit_trial()
+                        
+        # Sort results: fully evaluated trials rank above pruned ones
+        results.sort(key=lambda x: (not x.metrics.get('pruned', False), x.score), reverse=True)
         
-        self.logger.info(
-            f"Bayesian optimization complete. Best score: {results[0].score:.4f}"
-        )
+        if results:
+            n_pruned = sum(1 for r in results if r.metrics.get('pruned'))
+            self.logger.info(
+                f"Bayesian optimization complete. Best score: {results[0].score:.4f} "
+                f"({n_pruned}/{len(results)} trials pruned)"
+            )
+        else:
+            self.logger.warning("Bayesian optimization produced no results")
         
         # Save results
         self._save_optimization_results(results, 'bayesian')
@@ -379,16 +599,30 @@ class AutoOptimizer:
         config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Run a single backtest"""
-        # TODO: Implement actual backtest execution
-        # For now, return dummy results
-        
-        return {
-            'sharpe_ratio': np.random.uniform(0.5, 2.5),
-            'total_return': np.random.uniform(-0.2, 0.5),
-            'max_drawdown': np.random.uniform(-0.3, -0.05),
-            'win_rate': np.random.uniform(0.4, 0.7),
-            'total_trades': np.random.randint(50, 500)
-        }
+        return run_config_backtest(data, config)
+    
+    def _warm_start(
+        self,
+        sampler: TPESampler,
+        base_config: Dict[str, Any],
+        objective: str
+    ):
+        """Seed the surrogate with similar backtests remembered by Hektor"""
+        if not self.hektor_backtest:
+            return
+            
+        priors = self.hektor_backtest.find_similar_backtests(
+            config=base_config,
+            k=sampler.n_startup_trials,
+            min_score=0.7
+        )
+        for prior in priors:
+            prior_config = prior.get('config') or {}
+            params = {name: self._get_nested_param(prior_config, name) for name in sampler.names}
+            sampler.add_observation(params, objective_score(prior, objective))
+            
+        if sampler.n_observed:
+            self.logger.info(f"Warm-started surrogate with {sampler.n_observed} Hektor observations")
     
     def _set_nested_param(
         self,
@@ -407,45 +641,6 @@ class AutoOptimizer:
             
         current[keys[-1]] = value
     
-    def _sample_random_config(
-        self,
-        base_config: Dict[str, Any],
-        param_bounds: Dict[str, Tuple[float, float]]
-    ) -> Dict[str, Any]:
-        """Sample random configuration"""
-        config = base_config.copy()
-        
-        for param_name, (min_val, max_val) in param_bounds.items():
-            value = np.random.uniform(min_val, max_val)
-            self._set_nested_param(config, param_name, value)
-            
-        return config
-    
-    def _perturb_config(
-        self,
-        config: Dict[str, Any],
-        param_bounds: Dict[str, Tuple[float, float]],
-        perturbation: float = 0.1
-    ) -> Dict[str, Any]:
-        """Perturb configuration slightly"""
-        new_config = config.copy()
-        
-        for param_name, (min_val, max_val) in param_bounds.items():
-            # Get current value
-            current = self._get_nested_param(config, param_name)
-            
-            if current is None:
-                current = (min_val + max_val) / 2
-                
-            # Perturb
-            range_size = max_val - min_val
-            noise = np.random.normal(0, perturbation * range_size)
-            new_value = np.clip(current + noise, min_val, max_val)
-            
-            self._set_nested_param(new_config, param_name, new_value)
-            
-        return new_config
-    
     def _get_nested_param(
         self,
         config: Dict[str, Any],
@@ -456,7 +651,7 @@ class AutoOptimizer:
         current = config
         
         for key in keys:
-            if key not in current:
+            if not isinstance(current, dict) or key not in current:
                 return None
             current = current[key]
             
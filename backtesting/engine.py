@@ -252,32 +252,85 @@ class BacktestEngine:
                 actual_delay = (timestamp - prev_timestamp).total_seconds()
                 time.sleep(min(actual_delay, 60))  # Cap at 60 seconds
                 
-            # Update positions (check stops/targets)
-            self._update_positions(timestamp, bar)
-            
-            # Generate signals from strategies
-            for strategy in self.strategies:
-                try:
-                    signal = strategy.on_bar(bar)
-                    if signal:
-                        self._process_signal(signal, timestamp, bar)
-                except Exception as e:
-                    self.logger.error(f"Strategy {strategy.name} error: {e}", exc_info=True)
-                    
-            # Update equity curve
-            unrealized = sum(pos.unrealized_pnl(bar['close']) for pos in self.positions.values())
-            self.equity = self.cash + unrealized
-            self.equity_curve.append((timestamp, self.equity))
-            
-            # Check margin call
-            if self.config.stop_on_margin_call:
-                if self.equity < self.config.initial_capital * self.config.margin_call_level:
-                    self.logger.warning(f"Margin call at bar {idx}: Equity ${self.equity:.2f}")
-                    self._close_all_positions(timestamp, bar['close'], "margin_call")
-                    break
+            if not self.step(timestamp, bar):
+                break
                     
         return {}
         
+    def step(self, timestamp: datetime, bar: pd.Series) -> bool:
+        """
+        Advance the simulation by a single bar.
+        
+        Exposed so callers (optimizers, schedulers) can drive the engine
+        incrementally and inspect intermediate metrics between bars.
+        
+        Args:
+            timestamp: Bar timestamp
+            bar: OHLCV bar (with indicator columns) as pandas Series
+            
+        Returns:
+            False if the run must stop (margin call), True otherwise
+        """
+        # Update positions (check stops/targets)
+        self._update_positions(timestamp, bar)
+        
+        # Generate signals from strategies
+        for strategy in self.strategies:
+            try:
+                signal = strategy.on_bar(bar)
+                if signal:
+                    self._process_signal(signal, timestamp, bar)
+            except Exception as e:
+                self.logger.error(f"Strategy {strategy.name} error: {e}", exc_info=True)
+                
+        # Update equity curve
+        unrealized = sum(pos.unrealized_pnl(bar['close']) for pos in self.positions.values())
+        self.equity = self.cash + unrealized
+        self.equity_curve.append((timestamp, self.equity))
+        
+        # Check margin call
+        if self.config.stop_on_margin_call:
+            if self.equity < self.config.initial_capital * self.config.margin_call_level:
+                self.logger.warning(f"Margin call at bar {self.current_bar_idx}: Equity ${self.equity:.2f}")
+                self._close_all_positions(timestamp, bar['close'], "margin_call")
+                return False
+                
+        return True
+        
+    def summary_metrics(self) -> Dict[str, float]:
+        """
+        Flat, JSON-friendly metric snapshot of the run so far.
+        
+        Drawdown is taken from the bar-level equity curve (fraction of peak),
+        so the snapshot is meaningful mid-run as well as at the end.
+        
+        Returns:
+            Dictionary with sharpe_ratio, total_return, max_drawdown,
+            win_rate, profit_factor and total_trades
+        """
+        metrics = self.metrics.get_metrics()
+        
+        if self.equity_curve:
+            equity = np.array([value for _, value in self.equity_curve], dtype=float)
+        else:
+            equity = np.array([self.equity], dtype=float)
+        peaks = np.maximum.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, (peaks - equity) / peaks, 0.0)
+            
+        profit_factor = metrics.profit_factor
+        if profit_factor is None or not np.isfinite(profit_factor):
+            profit_factor = 0.0 if profit_factor is None else 99.0
+            
+        return {
+            'sharpe_ratio': float(metrics.sharpe_ratio),
+            'total_return': float(equity[-1] / self.config.initial_capital - 1.0),
+            'max_drawdown': float(drawdowns.max()) if len(drawdowns) else 0.0,
+            'win_rate': float(metrics.win_rate),
+            'profit_factor': float(profit_factor),
+            'total_trades': int(metrics.total_trades),
+        }
+        
     def _process_signal(self, signal: Signal, timestamp: datetime, bar: pd.Series) -> None:
         """Process trading signal."""
         # Check if we can open more positions
@@ -461,3 +514,89 @@ Duration: {self.total_bars} bars
 Speed: {self.config.speed_mode.value}
 """
         return summary
+
+
+def prepare_backtest_frame(
+    data: pd.DataFrame,
+    strategies: List[Strategy],
+    config: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Add the indicator columns the given strategies read from each bar.
+    
+    Mirrors the runtime indicator resolution of the trading loop so a
+    strategy sees the same columns in a backtest as it does live.
+    
+    Args:
+        data: OHLCV DataFrame indexed by datetime
+        strategies: Strategies that will consume the frame
+        config: Optional system configuration (strategy/indicators sections)
+        
+    Returns:
+        Copy of data with indicator columns added
+    """
+    from cthulu.core.indicator_loader import IndicatorRequirementResolver
+    
+    df = data.copy()
+    config = config or {}
+    
+    for strategy in strategies:
+        resolver = IndicatorRequirementResolver(strategy, config)
+        for indicator in resolver.ensure_indicators(df, []):
+            try:
+                result = indicator.calculate(df)
+            except Exception as e:
+                logging.getLogger("cthulu.backtesting.engine").debug(
+                    f"Indicator {getattr(indicator, 'name', indicator)} failed: {e}"
+                )
+                continue
+            if isinstance(result, pd.Series):
+                result = result.to_frame()
+            new_cols = [c for c in result.columns if c not in df.columns]
+            if new_cols:
+                df = df.join(result[new_cols], how='left')
+                
+        # SMA crossover windows
+        for attr in ('short_window', 'long_window'):
+            period = getattr(strategy, attr, None)
+            if isinstance(period, int) and f'sma_{period}' not in df.columns:
+                df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
+                
+        # Trend-following moving averages
+        for attr in ('fast_ma', 'slow_ma'):
+            period = getattr(strategy, attr, None)
+            if isinstance(period, int) and f'ema_{period}' not in df.columns:
+                df[f'ema_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
+                
+        # Mean-reversion Bollinger naming (bb_upper_{period}_{std})
+        ma_period = getattr(strategy, 'ma_period', None)
+        bb_std = getattr(strategy, 'bb_std', None)
+        if isinstance(ma_period, int) and bb_std is not None:
+            middle = df['close'].rolling(window=ma_period).mean()
+            std = df['close'].rolling(window=ma_period).std()
+            df[f'bb_middle_{ma_period}'] = middle
+            df[f'bb_upper_{ma_period}_{bb_std}'] = middle + bb_std * std
+            df[f'bb_lower_{ma_period}_{bb_std}'] = middle - bb_std * std
+            
+        # Breakout price levels
+        lookback = getattr(strategy, 'lookback_period', None)
+        if isinstance(lookback, int) and f'high_{lookback}' not in df.columns:
+            df[f'high_{lookback}'] = df['high'].rolling(window=lookback).max()
+            df[f'low_{lookback}'] = df['low'].rolling(window=lookback).min()
+            if 'volume' in df.columns:
+                df[f'volume_avg_{lookback}'] = df['volume'].rolling(window=lookback).mean()
+        if hasattr(strategy, 'rsi_threshold') and 'rsi' not in df.columns:
+            from cthulu.indicators.rsi import RSI
+            df['rsi'] = RSI(period=14).calculate(df)
+
+        adx_period = getattr(strategy, 'adx_period', None)
+        if isinstance(adx_period, int) and 'adx' not in df.columns:
+            from cthulu.indicators.adx import ADX
+            adx = ADX(period=adx_period).calculate(df)
+            df = df.join(adx[[c for c in adx.columns if c not in df.columns]], how='left')
+
+        if 'atr' not in df.columns and {'high', 'low', 'close'} <= set(df.columns):
+            from cthulu.indicators.atr import calculate_atr
+            df['atr'] = calculate_atr(df, period=int(getattr(strategy, 'atr_period', 14) or 14))
+            
+    return df
@@ -79,6 +79,13 @@ class OptimizationConfig:
     # Parallel processing
     max_workers: int = 4
     
+    # Multi-fidelity search (successive halving over bar budgets)
+    successive_halving: bool = False
+    halving_eta: int = 3
+    halving_min_bars: int = 500
+    halving_final: int = 5
+    cache_dir: Optional[str] = None
+    
     # Output
     output_dir: str = "./optimization_results"
 
@@ -246,6 +253,23 @@ class BeastModeOptimizer:
         Returns:
             Backtest results
         """
+        # Run backtest
+        engine = self._build_engine(params)
+        results = engine.run(data)
+        
+        return {
+            "params": params,
+            "metrics": results["metrics"],
+            "final_equity": engine.equity,
+            "trades": len(results["trades"]),
+            "sharpe": results["metrics"].sharpe_ratio if results["metrics"] else 0.0,
+            "profit_factor": results["metrics"].profit_factor if results["metrics"] else 0.0,
+            "win_rate": results["metrics"].win_rate if results["metrics"] else 0.0,
+            "max_drawdown": results["metrics"].max_drawdown_pct if results["metrics"] else 0.0
+        }
+    
+    def _build_engine(self, params: Dict[str, Any]) -> BacktestEngine:
+        """Create a backtest engine for a parameter set."""
         # Create strategies
         strategies = StrategyFactory.create_strategies(params)
         
@@ -260,25 +284,17 @@ class BeastModeOptimizer:
             enable_short_selling=True
         )
         
-        # Run backtest
-        engine = BacktestEngine(strategies, bt_config)
-        results = engine.run(data)
-        
-        return {
-            "params": params,
-            "metrics": results["metrics"],
-            "final_equity": engine.equity,
-            "trades": len(results["trades"]),
-            "sharpe": results["metrics"].sharpe_ratio if results["metrics"] else 0.0,
-            "profit_factor": results["metrics"].profit_factor if results["metrics"] else 0.0,
-            "win_rate": results["metrics"].win_rate if results["metrics"] else 0.0,
-            "max_drawdown": results["metrics"].max_drawdown_pct if results["metrics"] else 0.0
-        }
+        return BacktestEngine(strategies, bt_config)
     
     def optimize_walk_forward(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
         Run walk-forward optimization.
         
+        With `successive_halving` enabled, combinations are screened on a
+        short prefix of the data and only the best 1/eta are extended to
+        longer prefixes (resuming their engines) until `halving_final`
+        combinations have seen the full history.
+        
         Args:
             data: Historical data
             
@@ -297,6 +313,9 @@ class BeastModeOptimizer:
         param_combinations = self._generate_param_combinations()
         logger.info(f"Testing {len(param_combinations)} parameter combinations")
         
+        if self.config.successive_halving:
+            return self._optimize_successive_halving(data, param_combinations)
+        
         best_params = None
         best_score = float("-inf")
         all_results = []
@@ -325,6 +344,53 @@ class BeastModeOptimizer:
             "all_results": all_results
         }
     
+    def _optimize_successive_halving(
+        self,
+        data: pd.DataFrame,
+        param_combinations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Screen parameter combinations with successive halving."""
+        from cthulu.backtesting.multi_fidelity import SuccessiveHalvingScheduler, BacktestStateCache
+        
+        scheduler = SuccessiveHalvingScheduler(
+            engine_factory=self._build_engine,
+            score_fn=lambda metrics: metrics.get("sharpe_ratio", 0.0),
+            # Same raw bars run_single_backtest feeds the engine
+            frame_factory=lambda frame, strategies, params: frame,
+            eta=self.config.halving_eta,
+            min_bars=self.config.halving_min_bars,
+            n_final=self.config.halving_final,
+            cache=BacktestStateCache(self.config.cache_dir)
+        )
+        
+        def on_progress(rung, n_rungs, evaluated, total):
+            if evaluated % 10 == 0:
+                logger.info(f"Progress: {evaluated}/{total} (rung {rung + 1}/{n_rungs})")
+        
+        results = scheduler.run(data, param_combinations, on_progress)
+        
+        all_results = [{
+            "params": r.config,
+            "trades": r.metrics.get("total_trades", 0),
+            "sharpe": r.metrics.get("sharpe_ratio", 0.0),
+            "profit_factor": r.metrics.get("profit_factor", 0.0),
+            "win_rate": r.metrics.get("win_rate", 0.0),
+            "max_drawdown": r.metrics.get("max_drawdown", 0.0),
+            "bars_evaluated": r.bars_evaluated,
+        } for r in results]
+        
+        # Only combinations that saw the full history are eligible
+        finalists = [r for r in results if r.bars_evaluated >= len(data) and "error" not in r.metrics]
+        best = finalists[0] if finalists else None
+        if best:
+            logger.info(f"New best: Sharpe={best.score:.3f}")
+        
+        return {
+            "best_params": best.config if best else None,
+            "best_score": best.score if best else float("-inf"),
+            "all_results": all_results
+        }
+    
     def _generate_param_combinations(self) -> List[Dict[str, Any]]:
         """Generate parameter combinations from grid."""
         from itertools import product
@@ -587,6 +653,8 @@ def main():
     parser.add_argument("--windows", type=int, default=5, help="Walk-forward windows")
     parser.add_argument("--simulations", type=int, default=1000, help="Monte Carlo simulations")
     parser.add_argument("--output", default="./optimization_results", help="Output directory")
+    parser.add_argument("--successive-halving", action="store_true",
+                        help="Screen combinations on short data prefixes before full runs")
     
     args = parser.parse_args()
     
@@ -596,6 +664,7 @@ def main():
         lookback_days=args.days,
         walk_forward_windows=args.windows,
         monte_carlo_simulations=args.simulations,
+        successive_halving=args.successive_halving,
         output_dir=args.output
     )
     
@@ -0,0 +1,911 @@
+"""
+Exit Policy Replay
+
+Batch evaluation of exit policies over historical trade paths. Each trade
+is an entry (price, side, initial SL/TP, volume) followed by the bars (or
+ticks) that came after it. All trades are laid out as (n_trades, horizon)
+matrices and every policy is evaluated column-wise with NumPy, so the
+cost of replaying a new trailing or RRR setting over 10k past trades is a
+handful of array passes instead of a bar-by-bar simulation.
+
+Policies mirror the live exit components:
+- TrailingStopPolicy      <- exit.trailing_stop.TrailingStop
+- TimeExitPolicy          <- exit.time_based.TimeBasedExit
+- MultiRRRPolicy          <- exit.multi_rrr.MultiRRRExitManager
+- ConfluenceExitPolicy    <- exit.confluence_exit_manager.ConfluenceExitManager
+- ProfitScalerPolicy      <- position.profit_scaler.ProfitScaler tiers
+- AdaptiveLossPolicy      <- exit.adaptive_loss_curve.AdaptiveLossCurve
+
+All prices are handled in "signed" space (price * side), so a stop is hit
+when the adverse extreme falls to the stop level and a target is hit when
+the favourable extreme reaches it, for longs and shorts alike. Within one
+bar the stop is assumed to trade before any target (conservative).
+
+Usage:
+    paths = TradePaths.from_bars(entries, bars, horizon=200)
+    replay = ExitPolicyReplay(paths)
+    results = replay.run([
+        TrailingStopPolicy(atr_multiplier=1.5),
+        MultiRRRPolicy(),
+    ])
+    print(replay.compare(results))
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Exit reason codes
+EXIT_END = 0       # Held to the end of the path
+EXIT_STOP = 1      # Stop loss (initial, breakeven or trailed by a tier)
+EXIT_TARGET = 2    # Trade take-profit
+EXIT_POLICY = 3    # Full close requested by the policy
+
+EXIT_REASONS = {EXIT_END: 'end', EXIT_STOP: 'stop', EXIT_TARGET: 'target', EXIT_POLICY: 'policy'}
+
+
+def first_true(mask: np.ndarray, default: int) -> np.ndarray:
+    """Index of the first True per row, `default` where a row has none."""
+    hit = mask.any(axis=1)
+    return np.where(hit, mask.argmax(axis=1), default)
+
+
+def _side_array(side: Any) -> np.ndarray:
+    values = np.asarray(side)
+    if values.dtype.kind in ('U', 'S', 'O'):
+        upper = np.char.upper(values.astype(str))
+        return np.where(np.isin(upper, ('SELL', 'SHORT', '-1')), -1.0, 1.0)
+    return np.where(values.astype(float) < 0, -1.0, 1.0)
+
+
+@dataclass
+class TradePaths:
+    """
+    Entries and their subsequent price paths as aligned matrices.
+
+    Cells past the end of a trade's path are NaN (prices) / NaT (times).
+    Indicator matrices have one extra leading column holding the value at
+    the entry bar, so `prev` values exist for the first path bar.
+    """
+    entry_price: np.ndarray
+    side: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    volume: np.ndarray
+    entry_time: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    times: np.ndarray
+    atr: np.ndarray
+    indicators: Dict[str, np.ndarray] = field(default_factory=dict)
+    contract_size: float = 1.0
+
+    @property
+    def n_trades(self) -> int:
+        return len(self.entry_price)
+
+    @property
+    def horizon(self) -> int:
+        return self.close.shape[1]
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.close)
+
+    @property
+    def last_index(self) -> np.ndarray:
+        """Index of the last valid bar of each path (-1 for empty paths)."""
+        valid = self.valid
+        return np.where(valid.any(axis=1), valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1), -1)
+
+    @property
+    def entry_signed(self) -> np.ndarray:
+        return self.entry_price * self.side
+
+    @property
+    def risk(self) -> np.ndarray:
+        """Initial risk distance |entry - SL| (NaN without a stop loss)."""
+        return np.abs(self.entry_price - self.stop_loss)
+
+    def signed(self, prices: np.ndarray) -> np.ndarray:
+        """Prices multiplied by side (row-wise)."""
+        return prices * self.side[:, None]
+
+    def favourable(self) -> np.ndarray:
+        """Signed favourable extreme per bar (high for longs, low for shorts)."""
+        return np.where(self.side[:, None] > 0, self.high, -self.low)
+
+    def adverse(self) -> np.ndarray:
+        """Signed adverse extreme per bar (low for longs, high for shorts)."""
+        return np.where(self.side[:, None] > 0, self.low, -self.high)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        entry_price: Sequence[float],
+        side: Sequence[Any],
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        stop_loss: Optional[Sequence[float]] = None,
+        take_profit: Optional[Sequence[float]] = None,
+        volume: Optional[Sequence[float]] = None,
+        entry_time: Optional[Sequence[Any]] = None,
+        times: Optional[np.ndarray] = None,
+        atr: Optional[Sequence[float]] = None,
+        contract_size: float = 1.0
+    ) -> 'TradePaths':
+        """
+        Build paths from pre-aligned matrices (e.g. tick paths, where high
+        and low default to the tick price).
+        """
+        close = np.asarray(close, dtype=float)
+        n, h = close.shape
+        nan = np.full(n, np.nan)
+        if times is None:
+            times = np.full((n, h), np.datetime64('NaT'), dtype='datetime64[ns]')
+        return cls(
+            entry_price=np.asarray(entry_price, dtype=float),
+            side=_side_array(side),
+            stop_loss=nan.copy() if stop_loss is None else np.asarray(stop_loss, dtype=float),
+            take_profit=nan.copy() if take_profit is None else np.asarray(take_profit, dtype=float),
+            volume=np.ones(n) if volume is None else np.asarray(volume, dtype=float),
+            entry_time=(np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]') if entry_time is None
+                        else np.asarray(pd.to_datetime(entry_time), dtype='datetime64[ns]')),
+            high=close if high is None else np.asarray(high, dtype=float),
+            low=close if low is None else np.asarray(low, dtype=float),
+            close=close,
+            times=np.asarray(times, dtype='datetime64[ns]'),
+            atr=nan.copy() if atr is None else np.asarray(atr, dtype=float),
+            contract_size=contract_size,
+        )
+
+    @classmethod
+    def from_bars(
+        cls,
+        entries: pd.DataFrame,
+        bars: pd.DataFrame,
+        horizon: int = 500,
+        indicator_columns: Optional[Sequence[str]] = None,
+        contract_size: float = 1.0
+    ) -> 'TradePaths':
+        """
+        Cut the bars following each entry out of one OHLC frame.
+
+        Args:
+            entries: DataFrame with entry_time and side ('BUY'/'SELL' or +1/-1);
+                     optional entry_price (defaults to the entry bar close),
+                     stop_loss, take_profit, volume and atr
+            bars: OHLC DataFrame with a sorted DatetimeIndex (an 'atr'
+                  column is used when entries carry no atr)
+            horizon: Maximum bars replayed after each entry
+            indicator_columns: Bar columns to gather for indicator-driven policies
+            contract_size: Account currency per price unit per lot
+
+        Returns:
+            TradePaths
+        """
+        index = bars.index.values.astype('datetime64[ns]')
+        entry_times = np.asarray(pd.to_datetime(entries['entry_time']), dtype='datetime64[ns]')
+        # Entry bar = last bar at or before the entry time; the path starts after it
+        entry_idx = np.searchsorted(index, entry_times, side='right') - 1
+        n_bars = len(bars)
+
+        offsets = np.arange(horizon + 1)
+        idx = entry_idx[:, None] + offsets[None, :]
+        in_range = (idx >= 0) & (idx < n_bars)
+        safe = np.clip(idx, 0, max(n_bars - 1, 0))
+
+        def gather(values: np.ndarray) -> np.ndarray:
+            out = values.astype(float)[safe]
+            out[~in_range] = np.nan
+            return out
+
+        close_full = gather(bars['close'].values)
+        times = index[safe]
+        times[~in_range] = np.datetime64('NaT')
+
+        if 'entry_price' in entries:
+            entry_price = entries['entry_price'].values.astype(float)
+        else:
+            entry_price = close_full[:, 0]
+
+        if 'atr' in entries:
+            atr = entries['atr'].values.astype(float)
+        elif 'atr' in bars:
+            atr = gather(bars['atr'].values)[:, 0]
+        else:
+            atr = None
+
+        indicators = {}
+        for column in indicator_columns or []:
+            if column in bars:
+                indicators[column] = gather(bars[column].values)
+
+        def optional(name: str) -> Optional[np.ndarray]:
+            return entries[name].values.astype(float) if name in entries else None
+
+        paths = cls.from_arrays(
+            entry_price=entry_price,
+            side=entries['side'].values,
+            close=close_full[:, 1:],
+            high=gather(bars['high'].values)[:, 1:],
+            low=gather(bars['low'].values)[:, 1:],
+            stop_loss=optional('stop_loss'),
+            take_profit=optional('take_profit'),
+            volume=optional('volume'),
+            entry_time=entry_times,
+            times=times[:, 1:],
+            atr=atr,
+            contract_size=contract_size,
+        )
+        paths.indicators = indicators
+        return paths
+
+
+@dataclass
+class ExitPlan:
+    """
+    What a policy wants to do along each path.
+
+    Attributes:
+        exit_idx: Bar of a full close at that bar's close (horizon = never)
+        stop: Signed stop level in force at each bar (-inf = no stop)
+        partials: (bar index, fraction of initial volume, signed exit price)
+    """
+    exit_idx: np.ndarray
+    stop: Optional[np.ndarray] = None
+    partials: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = field(default_factory=list)
+
+    @classmethod
+    def hold(cls, paths: TradePaths) -> 'ExitPlan':
+        return cls(exit_idx=np.full(paths.n_trades, paths.horizon))
+
+
+@dataclass
+class PolicyResult:
+    """Per-trade outcome of one policy"""
+    name: str
+    pnl: np.ndarray
+    r_multiple: np.ndarray
+    exit_idx: np.ndarray
+    exit_reason: np.ndarray
+    partial_fraction: np.ndarray
+
+    def summary(self) -> Dict[str, Any]:
+        """Distribution statistics of per-trade PnL."""
+        pnl = self.pnl[~np.isnan(self.pnl)]
+        if len(pnl) == 0:
+            return {'policy': self.name, 'trades': 0}
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        p5, p25, p50, p75, p95 = np.percentile(pnl, [5, 25, 50, 75, 95])
+        reasons = {EXIT_REASONS[code]: int((self.exit_reason == code).sum()) for code in EXIT_REASONS}
+        return {
+            'policy': self.name,
+            'trades': int(len(pnl)),
+            'total_pnl': float(pnl.sum()),
+            'mean_pnl': float(pnl.mean()),
+            'std_pnl': float(pnl.std()),
+            'p5': float(p5),
+            'p25': float(p25),
+            'median_pnl': float(p50),
+            'p75': float(p75),
+            'p95': float(p95),
+            'win_rate': float(len(wins) / len(pnl)),
+            'profit_factor': float(wins.sum() / -losses.sum()) if len(losses) else float('inf'),
+            'mean_r': float(np.nanmean(self.r_multiple)) if np.isfinite(self.r_multiple).any() else None,
+            'avg_bars_held': float(np.mean(self.exit_idx + 1)),
+            'exit_reasons': reasons,
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Per-trade results as a DataFrame."""
+        return pd.DataFrame({
+            'pnl': self.pnl,
+            'r_multiple': self.r_multiple,
+            'exit_bar': self.exit_idx,
+            'exit_reason': [EXIT_REASONS[c] for c in self.exit_reason],
+            'partial_fraction': self.partial_fraction,
+        })
+
+
+class ExitPolicy:
+    """Base class for vectorized exit policies."""
+
+    name = "policy"
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        """Compute the exit plan for all paths at once."""
+        raise NotImplementedError
+
+
+class FixedStopTargetPolicy(ExitPolicy):
+    """Baseline: only the trade's own stop loss and take profit."""
+
+    name = "fixed_sl_tp"
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        return ExitPlan.hold(paths)
+
+
+class TrailingStopPolicy(ExitPolicy):
+    """
+    Close-based ATR trailing stop, as TrailingStop.should_exit().
+
+    Trailing activates once the close is `activation_profit_pct` percent
+    beyond entry. From then on the stop follows the best close at
+    `atr_multiplier` x ATR (or `fallback_stop_pct` percent of price without
+    ATR, never closer than 0.05%) and only ratchets in the trade direction.
+    """
+
+    def __init__(
+        self,
+        atr_multiplier: float = 2.0,
+        activation_profit_pct: float = 0.5,
+        fallback_stop_pct: float = 0.1,
+        min_distance_pct: float = 0.05,
+        name: Optional[str] = None
+    ):
+        self.atr_multiplier = atr_multiplier
+        self.activation_profit_pct = activation_profit_pct
+        self.fallback_stop_pct = fallback_stop_pct
+        self.min_distance_pct = min_distance_pct
+        self.name = name or f"trailing_{atr_multiplier:g}atr_{activation_profit_pct:g}pct"
+
+    @classmethod
+    def from_exit(cls, exit_strategy: Any, **kwargs) -> 'TrailingStopPolicy':
+        """Mirror the settings of a live TrailingStop instance."""
+        return cls(
+            atr_multiplier=exit_strategy.atr_multiplier,
+            activation_profit_pct=exit_strategy.activation_profit_pct,
+            fallback_stop_pct=exit_strategy.params.get('fallback_stop_pct', 0.1),
+            **kwargs
+        )
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        close = paths.close
+        close_s = paths.signed(close)
+        entry_s = paths.entry_signed[:, None]
+        valid = paths.valid
+
+        move_pct = (close_s - entry_s) / np.abs(entry_s) * 100.0
+        activated = np.logical_or.accumulate(valid & (move_pct >= self.activation_profit_pct), axis=1)
+
+        atr = paths.atr[:, None]
+        distance = np.where(
+            np.isfinite(atr) & (atr > 0),
+            atr * self.atr_multiplier,
+            np.abs(close) * self.fallback_stop_pct / 100.0
+        )
+        distance = np.maximum(distance, np.abs(close) * self.min_distance_pct / 100.0)
+
+        best = np.maximum.accumulate(np.where(activated, close_s, -np.inf), axis=1)
+        stop = np.maximum.accumulate(np.where(activated, best - distance, -np.inf), axis=1)
+        hit = activated & valid & (close_s <= stop)
+        return ExitPlan(exit_idx=first_true(hit, paths.horizon))
+
+
+class TimeExitPolicy(ExitPolicy):
+    """
+    Time rules of TimeBasedExit: max hold time, Friday close and
+    (optionally) end-of-day close. Exits at the close of the first bar
+    that satisfies a rule; paths without timestamps never time out.
+    """
+
+    def __init__(
+        self,
+        max_hold_hours: float = 24.0,
+        weekend_protection: bool = True,
+        friday_close_time: str = "16:00",
+        day_trading_mode: bool = False,
+        eod_close_time: str = "16:45",
+        name: Optional[str] = None
+    ):
+        self.max_hold_hours = max_hold_hours
+        self.weekend_protection = weekend_protection
+        self.friday_minute = self._minutes(friday_close_time)
+        self.day_trading_mode = day_trading_mode
+        self.eod_minute = self._minutes(eod_close_time)
+        self.name = name or f"time_{max_hold_hours:g}h"
+
+    @staticmethod
+    def _minutes(hhmm: str) -> int:
+        hour, minute = map(int, hhmm.split(':'))
+        return hour * 60 + minute
+
+    @classmethod
+    def from_exit(cls, exit_strategy: Any, **kwargs) -> 'TimeExitPolicy':
+        """Mirror the settings of a live TimeBasedExit instance."""
+        return cls(
+            max_hold_hours=exit_strategy.max_hold_hours,
+            weekend_protection=exit_strategy.weekend_protection,
+            friday_close_time=exit_strategy.friday_close_time,
+            day_trading_mode=exit_strategy.day_trading_mode,
+            eod_close_time=exit_strategy.eod_close_time,
+            **kwargs
+        )
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        times = paths.times
+        has_time = ~np.isnat(times)
+        ns = times.astype('int64')
+
+        age_hours = (times - paths.entry_time[:, None]) / np.timedelta64(1, 'h')
+        rule = has_time & (age_hours >= self.max_hold_hours)
+
+        minute_of_day = (ns // 60_000_000_000) % 1440
+        if self.weekend_protection:
+            weekday = (ns // 86_400_000_000_000 + 3) % 7  # 1970-01-01 was a Thursday
+            rule |= has_time & (weekday == 4) & (minute_of_day >= self.friday_minute)
+        if self.day_trading_mode:
+            rule |= has_time & (minute_of_day >= self.eod_minute)
+        return ExitPlan(exit_idx=first_true(rule, paths.horizon))
+
+
+def _tiered_stop(
+    paths: TradePaths,
+    trigger_idx: List[np.ndarray],
+    stop_updates: List[np.ndarray]
+) -> np.ndarray:
+    """Signed stop matrix: each tier's stop applies from the bar after it triggers."""
+    t = np.arange(paths.horizon)[None, :]
+    stop = np.full(paths.close.shape, -np.inf)
+    for k, level in zip(trigger_idx, stop_updates):
+        stop = np.where(t > k[:, None], np.maximum(stop, level[:, None]), stop)
+    return stop
+
+
+class MultiRRRPolicy(ExitPolicy):
+    """
+    Tiered RRR targets of MultiRRRExitManager.
+
+    Each target closes its share of the initial volume at
+    entry +/- risk * rrr. After a target fills the stop moves to breakeven
+    (if the tier says so) and/or trails `trail_pct` of the open profit,
+    measured at the fill price. Trades without a stop loss have no risk
+    unit and only the trade-level exits apply.
+    """
+
+    def __init__(
+        self,
+        config: Any = None,
+        targets: Optional[List[Any]] = None,
+        win_rate: float = 0.5,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            config: RRRConfig (defaults to RRRConfig())
+            targets: Explicit RRRTarget list (overrides config)
+            win_rate: Win rate used to generate targets from config
+            name: Policy name
+        """
+        if targets is None:
+            from cthulu.exit.multi_rrr import MultiRRRExitManager
+            targets = MultiRRRExitManager(config=config).generate_targets(win_rate)
+        self.targets = list(targets)
+        self.name = name or "rrr_" + "_".join(f"{t.rrr:g}" for t in self.targets)
+
+    @classmethod
+    def from_manager(cls, manager: Any, win_rate: float = 0.5, **kwargs) -> 'MultiRRRPolicy':
+        """Mirror the targets a live MultiRRRExitManager would generate."""
+        return cls(targets=manager.generate_targets(win_rate), **kwargs)
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        entry_s = paths.entry_signed
+        risk = paths.risk
+        fav = paths.favourable()
+        has_risk = np.isfinite(risk) & (risk > 0)
+
+        plan = ExitPlan.hold(paths)
+        trigger_idx, stop_updates = [], []
+        for target in self.targets:
+            target_s = entry_s + np.where(has_risk, risk, np.nan) * target.rrr
+            k = first_true(fav >= target_s[:, None], paths.horizon)
+            plan.partials.append((k, np.full(paths.n_trades, target.close_pct), target_s))
+
+            level = np.full(paths.n_trades, -np.inf)
+            if target.sl_to_breakeven:
+                level = np.maximum(level, entry_s)
+            if target.trail_pct > 0:
+                level = np.maximum(level, target_s - (target_s - entry_s) * target.trail_pct)
+            trigger_idx.append(k)
+            stop_updates.append(np.where(has_risk, level, -np.inf))
+
+        plan.stop = _tiered_stop(paths, trigger_idx, stop_updates)
+        return plan
+
+
+class ProfitScalerPolicy(ExitPolicy):
+    """
+    ProfitScaler tiers: progress toward TP (profit / TP distance, or per
+    0.0050 without a TP) triggers partial closes of the remaining volume
+    at the bar close, optional breakeven and a stop trailed at `trail_pct`
+    of the profit at that moment.
+
+    The minimum time-in-trade and minimum profit guards are applied; the
+    momentum deferral and balance-based emergency lock are not replayed.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[List[Any]] = None,
+        min_time_in_trade_bars: int = 3,
+        min_profit_amount: float = 0.0,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            tiers: ScalingTier list (defaults to ScalingConfig().tiers)
+            min_time_in_trade_bars: Bars before any tier may trigger
+            min_profit_amount: Minimum profit estimate (as in ProfitScaler)
+            name: Policy name
+        """
+        if tiers is None:
+            from cthulu.position.profit_scaler import ScalingConfig
+            tiers = ScalingConfig().tiers
+        self.tiers = sorted(tiers, key=lambda t: t.profit_threshold_pct)
+        self.min_time_in_trade_bars = min_time_in_trade_bars
+        self.min_profit_amount = min_profit_amount
+        self.name = name or "scaler_" + "_".join(f"{t.profit_threshold_pct:g}" for t in self.tiers)
+
+    @classmethod
+    def from_scaler(cls, scaler: Any, balance: float, **kwargs) -> 'ProfitScalerPolicy':
+        """Mirror the tiers and guards a live ProfitScaler uses at `balance`."""
+        return cls(
+            tiers=scaler.get_active_tiers(balance),
+            min_time_in_trade_bars=scaler.config.min_time_in_trade_bars,
+            min_profit_amount=scaler.config.min_profit_amount,
+            **kwargs
+        )
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        entry_s = paths.entry_signed[:, None]
+        profit = paths.signed(paths.close) - entry_s
+        tp_distance = np.abs(paths.take_profit - paths.entry_price)
+        scale = np.where(np.isfinite(tp_distance) & (tp_distance > 0), tp_distance, 0.0050)[:, None]
+        progress = profit / scale
+
+        t = np.arange(paths.horizon)[None, :]
+        eligible = paths.valid & (t + 1 >= self.min_time_in_trade_bars)
+        if self.min_profit_amount > 0:
+            # Same rough currency estimate ProfitScaler uses
+            eligible &= np.abs(profit) * paths.volume[:, None] * 100 >= self.min_profit_amount
+
+        plan = ExitPlan.hold(paths)
+        trigger_idx, stop_updates = [], []
+        remaining = 1.0
+        rows = np.arange(paths.n_trades)
+        for tier in self.tiers:
+            k = first_true(eligible & (progress >= tier.profit_threshold_pct), paths.horizon)
+            at = np.minimum(k, paths.horizon - 1)
+            price_s = paths.signed(paths.close)[rows, at]
+            plan.partials.append((k, np.full(paths.n_trades, remaining * tier.close_pct), price_s))
+            remaining *= 1.0 - tier.close_pct
+
+            level = np.full(paths.n_trades, -np.inf)
+            if tier.move_sl_to_entry:
+                level = np.maximum(level, paths.entry_signed)
+            if tier.trail_pct > 0:
+                level = np.maximum(level, paths.entry_signed + profit[rows, at] * tier.trail_pct)
+            trigger_idx.append(k)
+            stop_updates.append(level)
+
+        plan.stop = _tiered_stop(paths, trigger_idx, stop_updates)
+        return plan
+
+
+class AdaptiveLossPolicy(ExitPolicy):
+    """
+    AdaptiveLossCurve per-trade loss limit: close when the open loss at a
+    bar close reaches curve.get_max_loss(balance).
+    """
+
+    def __init__(self, curve: Any = None, balance: Any = 1000.0, name: Optional[str] = None):
+        """
+        Initialize policy.
+
+        Args:
+            curve: AdaptiveLossCurve (defaults to AdaptiveLossCurve())
+            balance: Account balance, scalar or one value per trade
+            name: Policy name
+        """
+        if curve is None:
+            from cthulu.exit.adaptive_loss_curve import AdaptiveLossCurve
+            curve = AdaptiveLossCurve()
+        self.curve = curve
+        self.balance = balance
+        self.name = name or "adaptive_loss"
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        balances = np.broadcast_to(np.asarray(self.balance, dtype=float), (paths.n_trades,))
+        # Few distinct balances in practice; evaluate the curve once per value
+        unique, inverse = np.unique(balances, return_inverse=True)
+        max_loss = np.array([self.curve.get_max_loss(b, per_trade=True) for b in unique])[inverse]
+
+        loss = -(paths.signed(paths.close) - paths.entry_signed[:, None]) * paths.volume[:, None] * paths.contract_size
+        hit = paths.valid & (loss >= max_loss[:, None])
+        return ExitPlan(exit_idx=first_true(hit, paths.horizon))
+
+
+class ConfluenceExitPolicy(ExitPolicy):
+    """
+    Indicator confluence scoring of ConfluenceExitManager.
+
+    Uses indicator matrices gathered into the paths ('rsi', 'macd',
+    'macd_signal', 'bb_upper', 'bb_lower', 'volume', 'volume_avg',
+    'ema_fast', 'ema_slow', 'atr'); missing indicators contribute nothing.
+    CLOSE_NOW/EMERGENCY closes the trade; the first SCALE_OUT closes 50%
+    (score > 0.65) or 30% of the remaining volume.
+    """
+
+    WEIGHTS = {
+        'rsi_divergence': 0.20,
+        'macd_crossover': 0.15,
+        'bollinger_breach': 0.15,
+        'volume_spike': 0.10,
+        'trend_flip': 0.25,
+        'price_action': 0.15,
+    }
+
+    def __init__(
+        self,
+        scale_out_threshold: float = 0.55,
+        close_now_threshold: float = 0.75,
+        emergency_threshold: float = 0.90,
+        rsi_overbought: float = 70,
+        rsi_oversold: float = 30,
+        name: Optional[str] = None
+    ):
+        self.scale_out_threshold = scale_out_threshold
+        self.close_now_threshold = close_now_threshold
+        self.emergency_threshold = emergency_threshold
+        self.rsi_overbought = rsi_overbought
+        self.rsi_oversold = rsi_oversold
+        self.name = name or f"confluence_{scale_out_threshold:g}_{close_now_threshold:g}"
+
+    @classmethod
+    def from_manager(cls, manager: Any, **kwargs) -> 'ConfluenceExitPolicy':
+        """Mirror the thresholds of a live ConfluenceExitManager."""
+        return cls(
+            scale_out_threshold=manager.scale_out_threshold,
+            close_now_threshold=manager.close_now_threshold,
+            emergency_threshold=manager.EMERGENCY_THRESHOLD,
+            rsi_overbought=manager.rsi_overbought,
+            rsi_oversold=manager.rsi_oversold,
+            **kwargs
+        )
+
+    def scores(self, paths: TradePaths) -> np.ndarray:
+        """Confluence score per trade and bar."""
+        ind = paths.indicators
+        long = paths.side[:, None] > 0
+        shape = paths.close.shape
+        contributions = []
+
+        def cur(name):
+            return ind[name][:, 1:] if name in ind else None
+
+        def prev(name):
+            return ind[name][:, :-1] if name in ind else None
+
+        def add(key, fired, strength, confidence):
+            strength = np.nan_to_num(strength, nan=0.0)
+            contributions.append((fired, self.WEIGHTS[key] * strength * confidence))
+
+        close = paths.close
+        pnl = paths.signed(close) - paths.entry_signed[:, None]
+
+        rsi, rsi_prev = cur('rsi'), prev('rsi')
+        if rsi is not None:
+            long_fire = (rsi_prev > self.rsi_overbought) & (rsi < rsi_prev)
+            short_fire = (rsi_prev < self.rsi_oversold) & (rsi > rsi_prev)
+            fired = np.where(long, long_fire, short_fire)
+            strength = np.minimum(np.abs(rsi_prev - rsi) / 10, 1.0)
+            confidence = np.where(long, np.where(rsi_prev > 75, 0.8, 0.6), np.where(rsi_prev < 25, 0.8, 0.6))
+            add('rsi_divergence', fired, strength, confidence)
+
+        macd, macd_prev, sig = cur('macd'), prev('macd'), cur('macd_signal')
+        if macd is not None and sig is not None:
+            fired = np.where(long, (macd < sig) & (macd_prev > sig), (macd > sig) & (macd_prev < sig))
+            add('macd_crossover', fired, np.minimum(np.abs(macd - sig) * 10, 1.0), 0.75)
+
+        upper, lower = cur('bb_upper'), cur('bb_lower')
+        if upper is not None and lower is not None:
+            width = upper - lower
+            fired = np.where(long, close >= upper * 0.995, close <= lower * 1.005)
+            strength = np.where(long, (close - upper) / width + 0.5, (lower - close) / width + 0.5)
+            add('bollinger_breach', fired, np.minimum(strength, 1.0), 0.7)
+
+        volume, volume_avg = cur('volume'), cur('volume_avg')
+        if volume is not None and volume_avg is not None:
+            ratio = np.where(volume_avg > 0, volume / np.where(volume_avg > 0, volume_avg, 1.0), 0.0)
+            add('volume_spike', (ratio > 2.0) & (pnl > 0), np.minimum(ratio / 4, 1.0), 0.6)
+
+        fast, slow, fast_prev, slow_prev = cur('ema_fast'), cur('ema_slow'), prev('ema_fast'), prev('ema_slow')
+        if fast is not None and slow is not None:
+            fired = np.where(long, (fast_prev > slow_prev) & (fast < slow), (fast_prev < slow_prev) & (fast > slow))
+            add('trend_flip', fired, np.full(shape, 0.9), 0.85)
+
+        if 'atr' in ind:
+            max_fav = np.fmax.accumulate(np.where(paths.valid, pnl, np.nan), axis=1)
+            giveback = 1 - pnl / np.where(max_fav > 0, max_fav, 1.0)
+            add('price_action', (max_fav > 0) & (giveback > 0.5), np.minimum(giveback, 1.0), 0.7)
+
+        total_weight = sum(self.WEIGHTS.values())
+        score = np.zeros(shape)
+        agreeing = np.zeros(shape, dtype=int)
+        for fired, value in contributions:
+            fired = np.nan_to_num(fired, nan=0).astype(bool)
+            score += np.where(fired, value, 0.0)
+            agreeing += fired
+        score /= total_weight
+        score = np.where(agreeing >= 3, np.minimum(score * 1.2, 1.0), score)
+        score = np.where(agreeing >= 4, np.minimum(score * 1.1, 1.0), score)
+        return score
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        score = self.scores(paths)
+        pnl = paths.signed(paths.close) - paths.entry_signed[:, None]
+        was_profitable = np.fmax.accumulate(np.where(paths.valid, pnl, np.nan), axis=1) > 0
+
+        close_now = (
+            (score >= self.emergency_threshold)
+            | (score >= self.close_now_threshold)
+            | (was_profitable & (pnl < 0) & (score >= self.scale_out_threshold * 0.8))
+        ) & paths.valid
+        scale_out = (score >= self.scale_out_threshold) & paths.valid
+
+        plan = ExitPlan(exit_idx=first_true(close_now, paths.horizon))
+        k = first_true(scale_out, paths.horizon)
+        rows = np.arange(paths.n_trades)
+        at = np.minimum(k, paths.horizon - 1)
+        fraction = np.where(score[rows, at] > 0.65, 0.50, 0.30)
+        plan.partials.append((k, fraction, paths.signed(paths.close)[rows, at]))
+        return plan
+
+
+class CompositePolicy(ExitPolicy):
+    """
+    Several policies acting on the same trades, as the live exit stack
+    does: the earliest full close wins, stops take the tightest level and
+    partial closes of all members apply in time order.
+    """
+
+    def __init__(self, policies: List[ExitPolicy], name: Optional[str] = None):
+        self.policies = list(policies)
+        self.name = name or "+".join(p.name for p in self.policies)
+
+    def plan(self, paths: TradePaths) -> ExitPlan:
+        combined = ExitPlan.hold(paths)
+        for policy in self.policies:
+            plan = policy.plan(paths)
+            combined.exit_idx = np.minimum(combined.exit_idx, plan.exit_idx)
+            if plan.stop is not None:
+                combined.stop = plan.stop if combined.stop is None else np.maximum(combined.stop, plan.stop)
+            combined.partials.extend(plan.partials)
+        return combined
+
+
+class ExitPolicyReplay:
+    """
+    Evaluate exit policies over a fixed set of trade paths.
+
+    Usage:
+        replay = ExitPolicyReplay(paths, use_trade_levels=True)
+        results = replay.run([TrailingStopPolicy(), TimeExitPolicy(max_hold_hours=8)])
+        table = replay.compare(results)
+    """
+
+    def __init__(self, paths: TradePaths, use_trade_levels: bool = True):
+        """
+        Initialize replay.
+
+        Args:
+            paths: Trade paths
+            use_trade_levels: Apply each trade's own SL/TP on top of every policy
+        """
+        self.paths = paths
+        self.use_trade_levels = use_trade_levels
+        self.logger = logging.getLogger("cthulu.backtesting.exit_replay")
+
+        # Policy-independent matrices, computed once per replay
+        self._adverse = paths.adverse()
+        self._favourable = paths.favourable()
+        self._close_s = paths.signed(paths.close)
+        self._last = paths.last_index
+
+    def run(self, policies: List[ExitPolicy]) -> Dict[str, PolicyResult]:
+        """Evaluate each policy; results keyed by policy name."""
+        results = {}
+        for policy in policies:
+            results[policy.name] = self.evaluate(policy)
+        return results
+
+    def evaluate(self, policy: ExitPolicy) -> PolicyResult:
+        """Evaluate one policy over all paths."""
+        return self.settle(policy.name, policy.plan(self.paths))
+
+    def settle(self, name: str, plan: ExitPlan) -> PolicyResult:
+        """Turn an exit plan into per-trade fills and PnL."""
+        paths = self.paths
+        n, horizon = paths.n_trades, paths.horizon
+        rows = np.arange(n)
+        entry_s = paths.entry_signed
+
+        stop = plan.stop if plan.stop is not None else np.full((n, horizon), -np.inf)
+        target_s = np.full(n, np.inf)
+        if self.use_trade_levels:
+            sl_s = paths.signed(paths.stop_loss[:, None])[:, 0]
+            stop = np.maximum(stop, np.where(np.isfinite(sl_s), sl_s, -np.inf)[:, None])
+            tp_s = paths.signed(paths.take_profit[:, None])[:, 0]
+            target_s = np.where(np.isfinite(tp_s), tp_s, np.inf)
+
+        stop_idx = first_true(self._adverse <= stop, horizon)
+        target_idx = first_true(self._favourable >= target_s[:, None], horizon)
+        end_idx = np.where(self._last >= 0, self._last, 0)
+
+        # Earliest full exit; ties resolve stop > target > policy > end
+        candidates = np.stack([stop_idx, target_idx, plan.exit_idx, np.where(self._last >= 0, end_idx, horizon)])
+        reason_order = np.array([EXIT_STOP, EXIT_TARGET, EXIT_POLICY, EXIT_END])
+        choice = candidates.argmin(axis=0)
+        exit_idx = candidates[choice, rows]
+        reason = reason_order[choice]
+
+        at = np.minimum(exit_idx, horizon - 1)
+        exit_price_s = np.select(
+            [reason == EXIT_STOP, reason == EXIT_TARGET],
+            [stop[rows, at], target_s],
+            default=self._close_s[rows, at]
+        )
+
+        # Partial closes strictly before the full exit, in time order
+        realised = np.zeros(n)
+        closed = np.zeros(n)
+        if plan.partials:
+            k = np.stack([p[0] for p in plan.partials], axis=1)
+            frac = np.stack([p[1] for p in plan.partials], axis=1)
+            price = np.stack([p[2] for p in plan.partials], axis=1)
+            order = np.argsort(k, axis=1, kind='stable')
+            for j in range(k.shape[1]):
+                col = order[:, j]
+                kj, fj, pj = k[rows, col], frac[rows, col], price[rows, col]
+                take = (kj < exit_idx) & np.isfinite(pj)
+                fj = np.where(take, np.minimum(fj, 1.0 - closed), 0.0)
+                realised += fj * np.where(take, pj - entry_s, 0.0)
+                closed += fj
+
+        per_unit = realised + (1.0 - closed) * (exit_price_s - entry_s)
+        pnl = per_unit * paths.volume * paths.contract_size
+        risk = paths.risk
+        r_multiple = np.where(np.isfinite(risk) & (risk > 0), per_unit / np.where(risk > 0, risk, 1.0), np.nan)
+
+        empty = self._last < 0
+        pnl[empty] = np.nan
+        return PolicyResult(
+            name=name,
+            pnl=pnl,
+            r_multiple=r_multiple,
+            exit_idx=exit_idx,
+            exit_reason=reason,
+            partial_fraction=closed,
+        )
+
+    @staticmethod
+    def compare(results: Dict[str, PolicyResult]) -> pd.DataFrame:
+        """Summary table of policy results, best total PnL first."""
+        rows = [r.summary() for r in results.values()]
+        frame = pd.DataFrame(rows).set_index('policy')
+        if 'total_pnl' in frame:
+            frame = frame.sort_values('total_pnl', ascending=False)
+        return frame
@@ -0,0 +1,455 @@
+"""
+Backtest Job Queue
+
+Bounded executor for UI-submitted backtest and optimization jobs.
+
+Jobs wait in a priority queue and are dispatched to a process pool no more
+than `max_workers` at a time, so CPU-bound backtests never compete with the
+web server's request handling for the GIL. Workers report progress through
+a JobContext, which throttles updates at the source and is also the
+cooperative cancellation point: once a job is cancelled, its next progress
+report raises JobCancelled inside the worker.
+
+Finished results are cached by content hash (data, strategy config, engine
+config), so an identical re-submission completes without running at all.
+"""
+
+import json
+import time
+import heapq
+import queue
+import hashlib
+import logging
+import threading
+import itertools
+import multiprocessing
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+
+import pandas as pd
+
+
+QUEUED = 'QUEUED'
+RUNNING = 'RUNNING'
+COMPLETED = 'COMPLETED'
+FAILED = 'FAILED'
+CANCELLED = 'CANCELLED'
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+def job_cache_key(
+    data: Optional[pd.DataFrame],
+    strategy_config: Any,
+    engine_config: Any
+) -> str:
+    """
+    Content hash identifying a job's inputs.
+
+    Args:
+        data: Market data slice the job runs on
+        strategy_config: Strategy (or parameter search) configuration
+        engine_config: Backtest engine configuration
+
+    Returns:
+        Hex digest usable as a cache key
+    """
+    digest = hashlib.sha1()
+    if data is not None:
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        digest.update(','.join(map(str, data.columns)).encode('utf-8'))
+    digest.update(json.dumps(strategy_config, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(json.dumps(engine_config, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Job results keyed by content hash.
+
+    Keeps the most recent results in memory (LRU) and, with `cache_dir`,
+    writes every result to `<key>.json` so the cache survives restarts.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 128):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Optional directory for persisted results
+            max_entries: Results kept in memory
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("cthulu.backtesting.job_queue")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached result for key, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.json"
+            if path.exists():
+                try:
+                    with open(path, 'r') as f:
+                        result = json.load(f)
+                    self._remember(key, result)
+                    return result
+                except Exception as e:
+                    self.logger.warning(f"Ignoring unreadable cached result {path.name}: {e}")
+        return None
+
+    def put(self, key: str, result: Any) -> None:
+        """Store a result."""
+        self._remember(key, result)
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.json"
+            tmp = path.with_suffix('.tmp')
+            try:
+                with open(tmp, 'w') as f:
+                    json.dump(result, f, default=str)
+                tmp.replace(path)
+            except Exception as e:
+                self.logger.warning(f"Could not persist result {key}: {e}")
+
+    def _remember(self, key: str, result: Any) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+class JobContext:
+    """
+    Worker-side handle for progress reporting and cancellation.
+
+    Picklable, so it is shipped to the pool together with the job.
+    """
+
+    def __init__(self, job_id: str, progress_queue: Any, cancelled: Any, min_interval: float = 0.5):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self._queue = progress_queue
+        self._cancelled = cancelled
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.job_id in self._cancelled
+
+    def raise_if_cancelled(self) -> None:
+        """Cancellation point: raise JobCancelled if the job was cancelled."""
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+    def report(self, progress: float, message: str = '', **extra: Any) -> None:
+        """
+        Report progress (0.0-1.0); doubles as a cancellation point.
+
+        Updates closer together than `min_interval` are dropped, except
+        the final one and updates carrying extra payload.
+        """
+        self.raise_if_cancelled()
+        now = time.monotonic()
+        if progress < 1.0 and not extra and now - self._last_report < self.min_interval:
+            return
+        self._last_report = now
+        self._queue.put((self.job_id, float(progress), message, extra))
+
+
+def _run_job(fn: Callable, context: JobContext, args: tuple) -> Any:
+    """Pool entry point."""
+    context.raise_if_cancelled()
+    return fn(context, *args)
+
+
+class BacktestJobQueue:
+    """
+    Priority job queue in front of a bounded worker pool.
+
+    Usage:
+        jobs = BacktestJobQueue(max_workers=2, on_complete=handle_result)
+        jobs.submit(job_id, run_backtest, data, config, priority=5, cache_key=key)
+        jobs.cancel(job_id)
+
+    `fn` must be a module-level callable taking (context, *args). Higher
+    priority jobs run first; ties run in submission order.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        result_cache: Optional[ResultCache] = None,
+        progress_interval: float = 0.5,
+        use_processes: bool = True,
+        on_start: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[str, float, str, Dict[str, Any]], None]] = None,
+        on_complete: Optional[Callable[[str, Any, bool], None]] = None,
+        on_error: Optional[Callable[[str, str], None]] = None,
+        on_cancel: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            max_workers: Maximum concurrently running jobs
+            result_cache: Cache for finished results (None = no caching)
+            progress_interval: Minimum seconds between progress updates per job
+            use_processes: Run jobs in worker processes (False = threads)
+            on_start: Callback(job_id) when a job starts running
+            on_progress: Callback(job_id, progress, message, extra)
+            on_complete: Callback(job_id, result, from_cache)
+            on_error: Callback(job_id, error_message)
+            on_cancel: Callback(job_id)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.result_cache = result_cache
+        self.progress_interval = progress_interval
+        self.use_processes = use_processes
+        self.on_start = on_start
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.logger = logging.getLogger("cthulu.backtesting.job_queue")
+
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._pending: Dict[str, tuple] = {}
+        self._running: Dict[str, Future] = {}
+        self._cache_keys: Dict[str, Optional[str]] = {}
+        self._status: Dict[str, str] = {}
+        self._closed = False
+
+        self._executor = None
+        self._manager = None
+        self._progress_queue = None
+        self._cancelled = None
+        self._threads: List[threading.Thread] = []
+
+    def submit(
+        self,
+        job_id: str,
+        fn: Callable,
+        *args: Any,
+        priority: int = 0,
+        cache_key: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a job.
+
+        Args:
+            job_id: Unique job identifier
+            fn: Module-level callable (context, *args) -> JSON-serializable result
+            *args: Arguments passed to fn (must be picklable)
+            priority: Higher runs sooner
+            cache_key: Content hash of the job inputs (see job_cache_key)
+
+        Returns:
+            True if the result was served from the cache (on_complete has
+            already been called), False if the job was queued
+        """
+        if cache_key and self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self._status[job_id] = COMPLETED
+                self.logger.info(f"Job {job_id} served from result cache")
+                if self.on_complete:
+                    self.on_complete(job_id, cached, True)
+                return True
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job queue is shut down")
+            self._start()
+            entry = (-priority, next(self._counter), job_id, fn, args)
+            heapq.heappush(self._heap, entry)
+            self._pending[job_id] = entry
+            self._cache_keys[job_id] = cache_key
+            self._status[job_id] = QUEUED
+            self._cond.notify_all()
+        return False
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Queued jobs are removed immediately; running jobs stop at their
+        next progress report.
+
+        Returns:
+            True if the job was queued or running
+        """
+        with self._cond:
+            if job_id in self._pending:
+                # Lazy deletion: the dispatcher skips entries no longer pending
+                del self._pending[job_id]
+                self._status[job_id] = CANCELLED
+                queued = True
+            elif job_id in self._running:
+                self._cancelled[job_id] = True
+                queued = False
+            else:
+                return False
+            self._cond.notify_all()
+
+        if queued and self.on_cancel:
+            self.on_cancel(job_id)
+        return True
+
+    def status(self, job_id: str) -> Optional[str]:
+        """Queue-side status of a job."""
+        return self._status.get(job_id)
+
+    def queued_jobs(self) -> List[str]:
+        """Queued job IDs in dispatch order."""
+        with self._cond:
+            return [entry[2] for entry in sorted(self._heap) if entry[2] in self._pending]
+
+    def running_jobs(self) -> List[str]:
+        with self._cond:
+            return list(self._running)
+
+    def shutdown(self, wait: bool = True, cancel_running: bool = False) -> None:
+        """Stop dispatching; optionally cancel running jobs."""
+        with self._cond:
+            self._closed = True
+            for job_id in list(self._pending):
+                self._status[job_id] = CANCELLED
+            self._pending.clear()
+            if cancel_running and self._cancelled is not None:
+                for job_id in self._running:
+                    self._cancelled[job_id] = True
+            self._cond.notify_all()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        for thread in self._threads:
+            thread.join(timeout=5.0 if wait else 0.0)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    # Private methods
+
+    def _start(self) -> None:
+        """Create the pool and helper threads on first use (caller holds the lock)."""
+        if self._executor is not None:
+            return
+
+        if self.use_processes:
+            self._manager = multiprocessing.Manager()
+            self._progress_queue = self._manager.Queue()
+            self._cancelled = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._progress_queue = queue.Queue()
+            self._cancelled = {}
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="backtest-job")
+
+        for target, name in ((self._dispatch_loop, "backtest-dispatch"), (self._progress_loop, "backtest-progress")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _dispatch_loop(self) -> None:
+        """Move jobs from the priority queue to the pool as slots free up."""
+        while True:
+            with self._cond:
+                while not self._closed and (not self._pending or len(self._running) >= self.max_workers):
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+                _, _, job_id, fn, args = heapq.heappop(self._heap)
+                if self._pending.pop(job_id, None) is None:
+                    continue  # cancelled while queued
+
+                context = JobContext(job_id, self._progress_queue, self._cancelled, self.progress_interval)
+                future = self._executor.submit(_run_job, fn, context, args)
+                self._running[job_id] = future
+                self._status[job_id] = RUNNING
+
+            if self.on_start:
+                self._safe_callback(self.on_start, job_id)
+            future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+
+    def _progress_loop(self) -> None:
+        """Forward worker progress, coalescing bursts to the latest update per job."""
+        while not self._closed or self._running:
+            try:
+                first = self._progress_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError, BrokenPipeError):
+                return  # manager shut down
+
+            updates = [first]
+            try:
+                while True:
+                    updates.append(self._progress_queue.get_nowait())
+            except (queue.Empty, EOFError, OSError, BrokenPipeError):
+                pass
+
+            latest: Dict[str, tuple] = {}
+            for job_id, progress, message, extra in updates:
+                if extra and self.on_progress:
+                    # Payload-carrying updates are never coalesced
+                    self._safe_callback(self.on_progress, job_id, progress, message, extra)
+                else:
+                    latest[job_id] = (progress, message)
+
+            for job_id, (progress, message) in latest.items():
+                if job_id in self._running and self.on_progress:
+                    self._safe_callback(self.on_progress, job_id, progress, message, {})
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        """Record a job's outcome and free its slot."""
+        with self._cond:
+            self._running.pop(job_id, None)
+            was_cancelled = self._cancelled.pop(job_id, None) is not None
+            cache_key = self._cache_keys.pop(job_id, None)
+            self._cond.notify_all()
+
+        try:
+            result = future.result()
+        except JobCancelled:
+            self._status[job_id] = CANCELLED
+            if self.on_cancel:
+                self._safe_callback(self.on_cancel, job_id)
+            return
+        except Exception as e:
+            self._status[job_id] = FAILED
+            self.logger.error(f"Job {job_id} failed: {e}")
+            if self.on_error:
+                self._safe_callback(self.on_error, job_id, str(e))
+            return
+
+        if was_cancelled:
+            # Finished before reaching a cancellation point; keep the result
+            self.logger.info(f"Job {job_id} completed before cancellation took effect")
+
+        self._status[job_id] = COMPLETED
+        if cache_key and self.result_cache is not None:
+            self.result_cache.put(cache_key, result)
+        if self.on_complete:
+            self._safe_callback(self.on_complete, job_id, result, False)
+
+    def _safe_callback(self, callback: Callable, *args: Any) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.error(f"Job queue callback error: {e}", exc_info=True)
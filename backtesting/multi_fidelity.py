@@ -0,0 +1,312 @@
+"""
+Multi-Fidelity Search
+
+Successive halving for parameter searches that would otherwise give every
+candidate the full dataset. All candidates are evaluated on a short slice
+of history, the best 1/eta are promoted to a longer slice, and so on until
+only a few run on the full history.
+
+Promoted candidates resume from where their previous rung stopped: the
+engine (positions, cash, equity curve and strategy state) is kept in a
+BacktestStateCache and advanced over the additional bars only. With a
+cache directory the snapshots are also pickled to disk, so a nightly
+re-run over the same data picks up finished work instead of repeating it.
+"""
+
+import math
+import json
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from backtesting.engine import BacktestEngine, prepare_backtest_frame
+
+
+def halving_schedule(
+    n_candidates: int,
+    max_budget: int,
+    eta: int = 3,
+    min_budget: int = 1,
+    n_final: int = 1
+) -> List[Tuple[int, int]]:
+    """
+    Compute the rungs of a successive-halving bracket.
+
+    Args:
+        n_candidates: Number of candidates entering the first rung
+        max_budget: Budget of the final rung (e.g. total bars or windows)
+        eta: Reduction factor between rungs
+        min_budget: Smallest budget worth evaluating
+        n_final: Candidates that should reach the full budget
+
+    Returns:
+        List of (n_candidates, budget) per rung, last rung at max_budget
+    """
+    if n_candidates <= 0 or max_budget <= 0:
+        return []
+    eta = max(2, int(eta))
+    n_final = max(1, min(n_final, n_candidates))
+
+    n_rungs = 1
+    while (
+        math.ceil(n_candidates / eta ** n_rungs) >= n_final
+        and max_budget / eta ** n_rungs >= min_budget
+        and n_candidates / eta ** n_rungs >= 1
+    ):
+        n_rungs += 1
+
+    rungs = []
+    for k in range(n_rungs):
+        survivors = max(n_final, math.ceil(n_candidates / eta ** k))
+        budget = max(min_budget, int(round(max_budget / eta ** (n_rungs - 1 - k))))
+        rungs.append((min(survivors, n_candidates), min(budget, max_budget)))
+    return rungs
+
+
+def config_key(config: Dict[str, Any], data_fingerprint: str = "") -> str:
+    """Stable content hash of a configuration (and the data it runs on)."""
+    payload = json.dumps(config, sort_keys=True, default=str) + data_fingerprint
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Content hash of an OHLCV frame (index and price columns)."""
+    cols = [c for c in ('open', 'high', 'low', 'close', 'volume') if c in data.columns]
+    hashed = pd.util.hash_pandas_object(data[cols], index=True).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+@dataclass
+class BacktestSnapshot:
+    """Resumable state of a partially evaluated backtest"""
+    engine: BacktestEngine
+    bars_done: int
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    finished: bool = False
+
+
+class BacktestStateCache:
+    """
+    Cache of partially evaluated backtests keyed by config hash.
+
+    Snapshots live in memory; with `cache_dir` they are also pickled so
+    later runs over the same data can resume them.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Optional directory for persistent snapshots
+        """
+        self._memory: Dict[str, BacktestSnapshot] = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger("cthulu.backtesting.multi_fidelity")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[BacktestSnapshot]:
+        """Return snapshot for key (memory first, then disk)."""
+        snapshot = self._memory.get(key)
+        if snapshot is None and self.cache_dir:
+            path = self.cache_dir / f"{key}.pkl"
+            if path.exists():
+                try:
+                    with open(path, 'rb') as f:
+                        snapshot = pickle.load(f)
+                    self._memory[key] = snapshot
+                except Exception as e:
+                    self.logger.warning(f"Discarding unreadable snapshot {path.name}: {e}")
+                    snapshot = None
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return snapshot
+
+    def put(self, key: str, snapshot: BacktestSnapshot) -> None:
+        """Store snapshot (and persist it when a cache directory is set)."""
+        self._memory[key] = snapshot
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.pkl"
+            tmp = path.with_suffix('.tmp')
+            try:
+                with open(tmp, 'wb') as f:
+                    pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp.replace(path)
+            except Exception as e:
+                self.logger.warning(f"Could not persist snapshot {key}: {e}")
+
+    def drop(self, key: str) -> None:
+        """Release the in-memory engine of an eliminated candidate."""
+        self._memory.pop(key, None)
+
+
+@dataclass
+class FidelityResult:
+    """Outcome of one candidate in a successive-halving run"""
+    config: Dict[str, Any]
+    score: float
+    metrics: Dict[str, Any]
+    bars_evaluated: int
+    rung: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'config': self.config,
+            'score': self.score,
+            'metrics': self.metrics,
+            'bars_evaluated': self.bars_evaluated,
+            'rung': self.rung,
+        }
+
+
+class SuccessiveHalvingScheduler:
+    """
+    Successive halving over bar budgets with resumable backtests.
+
+    Usage:
+        scheduler = SuccessiveHalvingScheduler(engine_factory, eta=3)
+        results = scheduler.run(data, configs)
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[Dict[str, Any]], BacktestEngine],
+        score_fn: Callable[[Dict[str, Any]], float],
+        frame_factory: Optional[Callable[..., pd.DataFrame]] = None,
+        eta: int = 3,
+        min_bars: int = 200,
+        n_final: int = 1,
+        cache: Optional[BacktestStateCache] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            engine_factory: Builds a fresh BacktestEngine for a config
+            score_fn: Maps summary metrics to a score (higher is better)
+            frame_factory: (data, strategies, config) -> frame with indicators
+            eta: Keep the top 1/eta candidates at every rung
+            min_bars: Smallest slice length evaluated
+            n_final: Candidates that run on the full history
+            cache: State cache (defaults to an in-memory cache)
+        """
+        self.engine_factory = engine_factory
+        self.score_fn = score_fn
+        self.frame_factory = frame_factory or prepare_backtest_frame
+        self.eta = eta
+        self.min_bars = min_bars
+        self.n_final = n_final
+        self.cache = cache or BacktestStateCache()
+        # Indicator frames of live candidates (rebuilt at most once per run)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self.logger = logging.getLogger("cthulu.backtesting.multi_fidelity")
+
+    def run(
+        self,
+        data: pd.DataFrame,
+        configs: List[Dict[str, Any]],
+        progress_callback: Optional[Callable] = None
+    ) -> List[FidelityResult]:
+        """
+        Run successive halving.
+
+        Args:
+            data: Full OHLCV history
+            configs: Candidate configurations
+            progress_callback: Callback(rung, n_rungs, evaluated, total)
+
+        Returns:
+            Results for every candidate, deepest rung first, best first
+        """
+        total_bars = len(data)
+        rungs = halving_schedule(len(configs), total_bars, self.eta, min(self.min_bars, total_bars), self.n_final)
+        fingerprint = data_fingerprint(data)
+        keys = [config_key(c, fingerprint) for c in configs]
+        results: Dict[int, FidelityResult] = {}
+        survivors = list(range(len(configs)))
+        evaluations = sum(n for n, _ in rungs)
+        evaluated = 0
+
+        self.logger.info(
+            "Successive halving: "
+            + ", ".join(f"{n}x{budget} bars" for n, budget in rungs)
+        )
+
+        for rung, (n_keep, budget) in enumerate(rungs):
+            survivors = survivors[:n_keep]
+            for i in survivors:
+                try:
+                    metrics, bars_done = self._advance(keys[i], configs[i], data, budget)
+                except Exception as e:
+                    self.logger.error(f"Candidate {i} failed at rung {rung}: {e}")
+                    metrics, bars_done = {'error': str(e)}, 0
+                score = self.score_fn(metrics) if 'error' not in metrics else float('-inf')
+                results[i] = FidelityResult(
+                    config=configs[i], score=score, metrics=metrics,
+                    bars_evaluated=bars_done, rung=rung
+                )
+                evaluated += 1
+                if progress_callback:
+                    progress_callback(rung, len(rungs), evaluated, evaluations)
+
+            survivors.sort(key=lambda i: results[i].score, reverse=True)
+            next_keep = rungs[rung + 1][0] if rung + 1 < len(rungs) else 0
+            for i in survivors[next_keep:]:
+                self.cache.drop(keys[i])
+                self._frames.pop(keys[i], None)
+
+        return sorted(results.values(), key=lambda r: (r.rung, r.score), reverse=True)
+
+    def _advance(
+        self,
+        key: str,
+        config: Dict[str, Any],
+        data: pd.DataFrame,
+        budget: int
+    ) -> Tuple[Dict[str, Any], int]:
+        """Advance a candidate's backtest to `budget` bars, resuming if cached."""
+        snapshot = self.cache.get(key)
+        if snapshot is not None and (snapshot.bars_done >= budget or snapshot.finished):
+            return snapshot.metrics, snapshot.bars_done
+
+        if snapshot is None:
+            engine = self.engine_factory(config)
+            engine.total_bars = len(data)
+            snapshot = BacktestSnapshot(engine=engine, bars_done=0)
+        engine = snapshot.engine
+
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self.frame_factory(data, engine.strategies, config)
+            self._frames[key] = frame
+
+        stopped = False
+        bars_done = snapshot.bars_done
+        for timestamp, bar in frame.iloc[snapshot.bars_done:budget].iterrows():
+            engine.current_bar_idx = bars_done
+            bars_done += 1
+            if not engine.step(timestamp, bar):
+                stopped = True
+                break
+        snapshot.bars_done = bars_done
+
+        finished = stopped or snapshot.bars_done >= len(frame)
+        if finished and engine.positions and snapshot.bars_done > 0:
+            last = frame.iloc[snapshot.bars_done - 1]
+            engine._close_all_positions(frame.index[snapshot.bars_done - 1], last['close'], "backtest_end")
+
+        snapshot.metrics = engine.summary_metrics()
+        snapshot.metrics['bars_processed'] = snapshot.bars_done
+        snapshot.finished = finished
+        self.cache.put(key, snapshot)
+        return snapshot.metrics, snapshot.bars_done
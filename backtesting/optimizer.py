@@ -54,16 +54,27 @@ class WalkForwardOptimizer:
         data: pd.DataFrame,
         strategy_class: type,
         param_grid: Dict[str, List[Any]],
-        backtest_fn: Callable
+        backtest_fn: Callable,
+        successive_halving: bool = False,
+        eta: int = 3,
+        n_final: int = 1
     ) -> OptimizationResult:
         """
         Perform walk-forward optimization.
         
+        With `successive_halving` the number of windows is the fidelity: all
+        combinations are scored on the first window(s), and only the best
+        1/eta are evaluated on further windows. Window scores are cached per
+        combination, so a promoted combination only runs its new windows.
+        
         Args:
             data: Historical OHLCV data
             strategy_class: Strategy class to optimize
             param_grid: Dictionary of parameter names and values to test
             backtest_fn: Function to run backtest (data, strategy, params) -> metrics
+            successive_halving: Prune combinations between window rungs
+            eta: Reduction factor between rungs
+            n_final: Combinations evaluated on every window
             
         Returns:
             OptimizationResult with best parameters and performance
@@ -82,31 +93,38 @@ class WalkForwardOptimizer:
         best_params = None
         best_score = float('-inf')
         
-        # Test each parameter combination
-        for params in param_combinations:
-            window_scores = []
+        if successive_halving:
+            from backtesting.multi_fidelity import halving_schedule
+            rungs = halving_schedule(len(param_combinations), len(windows), eta, 1, n_final)
+        else:
+            rungs = [(len(param_combinations), len(windows))]
             
-            # Test on each window
-            for in_sample_data, out_sample_data in windows:
-                # Run backtest on in-sample data
-                in_metrics = backtest_fn(in_sample_data, strategy_class, params)
-                in_score = getattr(in_metrics, self.metric_to_optimize, 0.0)
-                
-                # Validate on out-of-sample data
-                out_metrics = backtest_fn(out_sample_data, strategy_class, params)
-                out_score = getattr(out_metrics, self.metric_to_optimize, 0.0)
-                
-                window_scores.append({
-                    'in_sample': in_score,
-                    'out_sample': out_score
-                })
+        window_scores: List[List[Dict[str, float]]] = [[] for _ in param_combinations]
+        survivors = list(range(len(param_combinations)))
+        
+        for rung, (n_keep, n_windows) in enumerate(rungs):
+            survivors = survivors[:n_keep]
+            for i in survivors:
+                # Only windows not scored at a previous rung are run
+                for in_sample_data, out_sample_data in windows[len(window_scores[i]):n_windows]:
+                    window_scores[i].append(self._score_window(
+                        in_sample_data, out_sample_data, strategy_class, param_combinations[i], backtest_fn
+                    ))
+            survivors.sort(key=lambda i: np.mean([w['out_sample'] for w in window_scores[i]]), reverse=True)
+            
+        # Aggregate each parameter combination
+        for i, params in enumerate(param_combinations):
+            scores = window_scores[i]
+            if not scores:
+                continue
                 
             # Calculate average performance
-            avg_in_sample = np.mean([w['in_sample'] for w in window_scores])
-            avg_out_sample = np.mean([w['out_sample'] for w in window_scores])
+            avg_in_sample = np.mean([w['in_sample'] for w in scores])
+            avg_out_sample = np.mean([w['out_sample'] for w in scores])
             
-            # Use out-of-sample score for comparison (prevents overfitting)
-            if avg_out_sample > best_score:
+            # Use out-of-sample score for comparison (prevents overfitting);
+            # under successive halving only fully evaluated combinations compete
+            if len(scores) == len(windows) and avg_out_sample > best_score:
                 best_score = avg_out_sample
                 best_params = params
                 
@@ -114,7 +132,8 @@ class WalkForwardOptimizer:
                 'params': params,
                 'avg_in_sample': avg_in_sample,
                 'avg_out_sample': avg_out_sample,
-                'window_scores': window_scores
+                'window_scores': scores,
+                'windows_evaluated': len(scores)
             })
             
         elapsed = (datetime.now() - start_time).total_seconds()
@@ -133,6 +152,28 @@ class WalkForwardOptimizer:
             optimization_time=elapsed
         )
         
+    def _score_window(
+        self,
+        in_sample_data: pd.DataFrame,
+        out_sample_data: pd.DataFrame,
+        strategy_class: type,
+        params: Dict[str, Any],
+        backtest_fn: Callable
+    ) -> Dict[str, float]:
+        """Score one parameter combination on one walk-forward window."""
+        # Run backtest on in-sample data
+        in_metrics = backtest_fn(in_sample_data, strategy_class, params)
+        in_score = getattr(in_metrics, self.metric_to_optimize, 0.0)
+        
+        # Validate on out-of-sample data
+        out_metrics = backtest_fn(out_sample_data, strategy_class, params)
+        out_score = getattr(out_metrics, self.metric_to_optimize, 0.0)
+        
+        return {
+            'in_sample': in_score,
+            'out_sample': out_score
+        }
+        
     def _generate_param_combinations(self, param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
         """Generate all parameter combinations from grid."""
         from itertools import product
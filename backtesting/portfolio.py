@@ -0,0 +1,443 @@
+"""
+Portfolio Backtest Engine
+
+Multi-symbol backtesting on a common clock with shared capital and risk
+limits.
+
+The run has two phases:
+
+1. Signal shards - each symbol's bars go through indicator preparation and
+   its own copies of the strategies, one shard per symbol on a process
+   pool. Strategies only see their own bars (exactly as in
+   BacktestEngine.step), so signals do not depend on portfolio state and
+   the shards are independent. Strategies with a batch implementation
+   (Strategy.generate_signals) are evaluated column-wise; the others are
+   replayed bar by bar.
+2. Merge - the bar timestamps of all symbols are merged into one clock and
+   replayed in order. At every clock step open positions of the symbols
+   that printed a bar are checked against stops/targets, then the signals
+   of that step are applied in a fixed (symbol, strategy) order against
+   the shared cash, `max_positions`, per-symbol and correlation limits.
+
+The merge order depends only on the input, never on which worker finished
+first, so a run is reproducible for any worker count.
+
+Usage:
+    engine = PortfolioBacktestEngine(
+        strategies=[SmaCrossover({'short_window': 20, 'long_window': 50})],
+        config=BacktestConfig(max_positions=5),
+        portfolio_config=PortfolioConfig(n_workers=8, correlation_limit=0.8),
+    )
+    results = engine.run({'EURUSD': eurusd_df, 'GBPUSD': gbpusd_df, 'XAUUSD': gold_df})
+    print(results['per_symbol'])
+"""
+
+import os
+import time
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Mapping
+
+import numpy as np
+import pandas as pd
+
+from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import frame_to_signals
+from .engine import BacktestEngine, BacktestConfig, prepare_backtest_frame
+
+
+logger = logging.getLogger("cthulu.backtesting.portfolio")
+
+
+@dataclass
+class PortfolioConfig:
+    """Portfolio-level settings on top of BacktestConfig"""
+    n_workers: Optional[int] = None          # Signal shard processes (None = CPU count, 1 = in-process)
+    max_positions_per_symbol: int = 1
+    correlation_limit: Optional[float] = None  # Reject entries this correlated with an open position
+    correlation_window: int = 100            # Bars of returns used for the correlation check
+    prepare_indicators: bool = True          # Add the strategies' indicator columns per symbol
+    batch_signals: bool = True               # Use Strategy.generate_signals() where implemented
+    indicator_config: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_workers': self.n_workers,
+            'max_positions_per_symbol': self.max_positions_per_symbol,
+            'correlation_limit': self.correlation_limit,
+            'correlation_window': self.correlation_window,
+            'prepare_indicators': self.prepare_indicators,
+            'batch_signals': self.batch_signals,
+        }
+
+
+@dataclass
+class SymbolSignals:
+    """Output of one signal shard: the symbol's bars and the signals raised on them."""
+    symbol: str
+    times: np.ndarray          # datetime64[ns]
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    signals: List[Tuple[int, int, Signal]]  # (bar index, strategy index, signal)
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def generate_symbol_signals(
+    symbol: str,
+    data: pd.DataFrame,
+    strategies: List[Strategy],
+    indicators: Optional[List[Any]] = None,
+    prepare_indicators: bool = True,
+    indicator_config: Optional[Dict[str, Any]] = None,
+    batch_signals: bool = True
+) -> SymbolSignals:
+    """
+    Run fresh copies of `strategies` over one symbol's bars.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        symbol: Symbol the bars belong to (stamped on every signal)
+        data: OHLCV DataFrame indexed by datetime
+        strategies: Strategy templates (deep-copied, never mutated)
+        indicators: Optional extra indicators to calculate first
+        prepare_indicators: Add the columns the strategies read (prepare_backtest_frame)
+        indicator_config: System configuration passed to prepare_backtest_frame
+        batch_signals: Use Strategy.generate_signals() where implemented; other
+            strategies are replayed bar by bar through on_bar()
+
+    Returns:
+        SymbolSignals for the merge phase
+    """
+    start = time.perf_counter()
+    strategies = deepcopy(strategies)
+    df = data.sort_index()
+    for indicator in indicators or []:
+        try:
+            df = indicator.calculate(df)
+        except Exception as e:
+            logger.error(f"{symbol}: indicator calculation failed: {e}")
+    if prepare_indicators:
+        df = prepare_backtest_frame(df, strategies, indicator_config)
+
+    signals: List[Tuple[int, int, Signal]] = []
+    errors = 0
+    replayed = []
+    for s_idx, strategy in enumerate(strategies):
+        frame = None
+        if batch_signals:
+            try:
+                frame = strategy.generate_signals(df)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"{symbol}: batch signals of {strategy.name} failed: {e}")
+        if frame is None:
+            replayed.append((s_idx, strategy))
+            continue
+        for idx, signal in frame_to_signals(strategy, frame, symbol):
+            signals.append((idx, s_idx, signal))
+
+    for idx, (_, bar) in enumerate(df.iterrows() if replayed else ()):
+        for s_idx, strategy in replayed:
+            try:
+                signal = strategy.on_bar(bar)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"{symbol}: strategy {strategy.name} error: {e}")
+                continue
+            if signal and signal.side in (SignalType.LONG, SignalType.SHORT):
+                signal.symbol = symbol
+                signals.append((idx, s_idx, signal))
+
+    return SymbolSignals(
+        symbol=symbol,
+        times=pd.DatetimeIndex(df.index).values.astype('datetime64[ns]'),
+        high=df['high'].to_numpy(dtype=float),
+        low=df['low'].to_numpy(dtype=float),
+        close=df['close'].to_numpy(dtype=float),
+        signals=signals,
+        errors=errors,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _shard(args: tuple) -> SymbolSignals:
+    return generate_symbol_signals(*args)
+
+
+class PortfolioBacktestEngine(BacktestEngine):
+    """
+    Backtest engine for a basket of symbols sharing one account.
+
+    Position sizing, slippage, commission, trade records and metrics are
+    those of BacktestEngine. Cash is shared, `max_positions` applies to the
+    whole portfolio and the equity curve has one point per clock step.
+    """
+
+    def __init__(
+        self,
+        strategies: List[Strategy],
+        config: Optional[BacktestConfig] = None,
+        portfolio_config: Optional[PortfolioConfig] = None
+    ):
+        """
+        Initialize portfolio engine.
+
+        Args:
+            strategies: Strategy templates, copied per symbol
+            config: Backtesting configuration (capital, costs, max_positions)
+            portfolio_config: Portfolio settings
+        """
+        super().__init__(strategies, config)
+        self.portfolio_config = portfolio_config or PortfolioConfig()
+        self.logger = logging.getLogger("cthulu.backtesting.portfolio")
+        self.symbols: List[str] = []
+        self.rejections: Counter = Counter()
+        self._marks: Dict[str, float] = {}
+        self._aligned_returns: Optional[np.ndarray] = None
+        self._symbol_index: Dict[str, int] = {}
+        self._clock_idx = 0
+
+    def generate_signals(
+        self,
+        data: Mapping[str, pd.DataFrame],
+        indicators: Optional[List[Any]] = None
+    ) -> List[SymbolSignals]:
+        """
+        Run the signal shards, in parallel when more than one worker is configured.
+
+        Returns:
+            One SymbolSignals per symbol, in the order of `data`
+        """
+        pcfg = self.portfolio_config
+        jobs = [
+            (symbol, df, self.strategies, indicators, pcfg.prepare_indicators, pcfg.indicator_config,
+             pcfg.batch_signals)
+            for symbol, df in data.items()
+        ]
+        n_workers = max(1, min(pcfg.n_workers or os.cpu_count() or 1, len(jobs)))
+        if n_workers == 1:
+            return [_shard(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            # map() yields in submission order, whatever order the shards finish in
+            return list(executor.map(_shard, jobs))
+
+    def run(
+        self,
+        data: Mapping[str, pd.DataFrame],
+        indicators: Optional[List[Any]] = None,
+        progress_callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a portfolio backtest.
+
+        Args:
+            data: Symbol -> OHLCV DataFrame (indexed by datetime); order sets tie-breaking
+            indicators: Optional extra indicators calculated per symbol
+            progress_callback: Optional callback function(progress_pct, current_step, total_steps)
+
+        Returns:
+            Dictionary with the BacktestEngine result keys plus per-symbol
+            statistics, rejection counts and phase timings
+        """
+        if not data:
+            raise ValueError("Portfolio backtest needs at least one symbol")
+        self.symbols = list(data)
+        self.start_time = time.time()
+        self.logger.info(
+            f"Starting portfolio backtest: {len(self.symbols)} symbols, "
+            f"{len(self.strategies)} strategies, initial capital ${self.config.initial_capital:,.2f}"
+        )
+
+        t0 = time.perf_counter()
+        shards = self.generate_signals(data, indicators)
+        signal_seconds = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        self._merge(shards, progress_callback)
+        merge_seconds = time.perf_counter() - t0
+
+        final_metrics = self.metrics.get_metrics()
+        elapsed = time.time() - self.start_time
+        self.logger.info(
+            f"Portfolio backtest completed in {elapsed:.2f}s (signals {signal_seconds:.2f}s, "
+            f"merge {merge_seconds:.2f}s): equity ${self.equity:,.2f}, {len(self.trades)} trades"
+        )
+
+        return {
+            'config': self.config.to_dict(),
+            'portfolio_config': self.portfolio_config.to_dict(),
+            'symbols': self.symbols,
+            'equity_curve': self.equity_curve,
+            'trades': self.trades,
+            'metrics': final_metrics,
+            'per_symbol': self._per_symbol_stats(shards),
+            'rejections': dict(self.rejections),
+            'duration_seconds': elapsed,
+            'signal_seconds': signal_seconds,
+            'merge_seconds': merge_seconds,
+            'bars_processed': self.total_bars,
+            'bars_per_second': self.total_bars / elapsed if elapsed > 0 else 0,
+        }
+
+    def _merge(self, shards: List[SymbolSignals], progress_callback: Optional[callable]) -> None:
+        """Replay all shards on the merged clock against the shared account."""
+        clock = np.unique(np.concatenate([s.times for s in shards]))
+        timestamps = pd.DatetimeIndex(clock)
+        n_steps = len(clock)
+        self.total_bars = sum(len(s.times) for s in shards)
+        self._symbol_index = {s.symbol: i for i, s in enumerate(shards)}
+
+        # bar_index[symbol, step] -> bar of that symbol printed at the step, -1 if none
+        bar_index = np.full((len(shards), n_steps), -1, dtype=np.int64)
+        for i, shard in enumerate(shards):
+            bar_index[i, np.searchsorted(clock, shard.times)] = np.arange(len(shard.times))
+
+        # Signals per step in (symbol, strategy) order
+        signals_at: Dict[int, List[Tuple[int, Signal]]] = defaultdict(list)
+        for i, shard in enumerate(shards):
+            steps = np.searchsorted(clock, shard.times)
+            for bar_idx, s_idx, signal in sorted(shard.signals, key=lambda item: (item[0], item[1])):
+                signals_at[int(steps[bar_idx])].append((i, signal))
+
+        if self.portfolio_config.correlation_limit is not None and len(shards) > 1:
+            closes = np.full((len(shards), n_steps), np.nan)
+            for i, shard in enumerate(shards):
+                closes[i, np.searchsorted(clock, shard.times)] = shard.close
+            closes = pd.DataFrame(closes.T).ffill().to_numpy().T
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._aligned_returns = np.diff(np.log(closes), axis=1, prepend=np.nan)
+
+        for step in range(n_steps):
+            self._clock_idx = step
+            self.current_bar_idx = step
+            timestamp = timestamps[step]
+            if progress_callback and step % 1000 == 0:
+                progress_callback(step / n_steps * 100, step, n_steps)
+
+            # Stops and targets of the symbols that printed a bar
+            for sym in sorted({self._symbol_index[p.symbol] for p in self.positions.values()}):
+                j = bar_index[sym, step]
+                if j >= 0:
+                    shard = shards[sym]
+                    self._marks[shard.symbol] = shard.close[j]
+                    self._update_symbol_positions(
+                        shard.symbol, timestamp, {'high': shard.high[j], 'low': shard.low[j]}
+                    )
+
+            for sym, signal in signals_at.get(step, ()):
+                shard = shards[sym]
+                close = shard.close[bar_index[sym, step]]
+                self._marks[shard.symbol] = close
+                self._process_signal(signal, timestamp, {'close': close})
+
+            unrealized = sum(pos.unrealized_pnl(self._marks[pos.symbol]) for pos in self.positions.values())
+            self.equity = self.cash + unrealized
+            self.equity_curve.append((timestamp, self.equity))
+
+            if self.config.stop_on_margin_call and \
+                    self.equity < self.config.initial_capital * self.config.margin_call_level:
+                self.logger.warning(f"Margin call at step {step}: Equity ${self.equity:.2f}")
+                self._close_all_at_marks(timestamp, "margin_call")
+                break
+
+        if self.positions:
+            self.logger.info(f"Closing {len(self.positions)} open positions at backtest end")
+            last = {
+                shard.symbol: (pd.Timestamp(shard.times[-1]), shard.close[-1])
+                for shard in shards if len(shard.times)
+            }
+            for ticket, pos in list(self.positions.items()):
+                exit_time, price = last[pos.symbol]
+                self._close_position(ticket, exit_time, price, "backtest_end")
+
+    def _update_symbol_positions(self, symbol: str, timestamp: Any, bar: Dict[str, float]) -> None:
+        """Check the stops/targets of one symbol's positions against its bar."""
+        to_close = []
+        for ticket, pos in self.positions.items():
+            if pos.symbol != symbol:
+                continue
+            if pos.stop_loss:
+                if pos.side == SignalType.LONG and bar['low'] <= pos.stop_loss:
+                    to_close.append((ticket, pos.stop_loss, "stop_loss"))
+                    continue
+                if pos.side == SignalType.SHORT and bar['high'] >= pos.stop_loss:
+                    to_close.append((ticket, pos.stop_loss, "stop_loss"))
+                    continue
+            if pos.take_profit:
+                if pos.side == SignalType.LONG and bar['high'] >= pos.take_profit:
+                    to_close.append((ticket, pos.take_profit, "take_profit"))
+                elif pos.side == SignalType.SHORT and bar['low'] <= pos.take_profit:
+                    to_close.append((ticket, pos.take_profit, "take_profit"))
+        for ticket, exit_price, reason in to_close:
+            self._close_position(ticket, timestamp, exit_price, reason)
+
+    def _close_all_at_marks(self, timestamp: Any, reason: str) -> None:
+        for ticket, pos in list(self.positions.items()):
+            self._close_position(ticket, timestamp, self._marks[pos.symbol], reason)
+
+    def _process_signal(self, signal: Signal, timestamp: Any, bar: Any) -> None:
+        """Apply portfolio limits, then open the position as BacktestEngine does."""
+        if len(self.positions) >= self.config.max_positions:
+            self.rejections['max_positions'] += 1
+            return
+        same_symbol = sum(1 for pos in self.positions.values() if pos.symbol == signal.symbol)
+        if same_symbol >= self.portfolio_config.max_positions_per_symbol:
+            self.rejections['max_positions_per_symbol'] += 1
+            return
+        if self._too_correlated(signal):
+            self.rejections['correlation'] += 1
+            return
+        opened = len(self.positions)
+        super()._process_signal(signal, timestamp, bar)
+        if len(self.positions) == opened:
+            self.rejections['sizing_or_cash'] += 1
+
+    def _too_correlated(self, signal: Signal) -> bool:
+        """True if the entry would stack exposure onto a highly correlated open position."""
+        limit = self.portfolio_config.correlation_limit
+        if limit is None or self._aligned_returns is None or not self.positions:
+            return False
+        window = self.portfolio_config.correlation_window
+        start = self._clock_idx - window + 1
+        if start < 1:
+            return False
+        candidate = self._aligned_returns[self._symbol_index[signal.symbol], start:self._clock_idx + 1]
+        sign = 1.0 if signal.side == SignalType.LONG else -1.0
+        for pos in self.positions.values():
+            if pos.symbol == signal.symbol:
+                continue
+            other = self._aligned_returns[self._symbol_index[pos.symbol], start:self._clock_idx + 1]
+            ok = np.isfinite(candidate) & np.isfinite(other)
+            if ok.sum() < 3 or candidate[ok].std() == 0 or other[ok].std() == 0:
+                continue
+            corr = float(np.corrcoef(candidate[ok], other[ok])[0, 1])
+            pos_sign = 1.0 if pos.side == SignalType.LONG else -1.0
+            if corr * sign * pos_sign >= limit:
+                return True
+        return False
+
+    def _per_symbol_stats(self, shards: List[SymbolSignals]) -> Dict[str, Dict[str, Any]]:
+        stats: Dict[str, Dict[str, Any]] = {
+            shard.symbol: {
+                'bars': int(len(shard.times)),
+                'signals': len(shard.signals),
+                'strategy_errors': shard.errors,
+                'signal_seconds': round(shard.seconds, 3),
+                'trades': 0,
+                'wins': 0,
+                'pnl': 0.0,
+            }
+            for shard in shards
+        }
+        for trade in self.trades:
+            entry = stats[trade.symbol]
+            entry['trades'] += 1
+            entry['wins'] += int(trade.pnl > 0)
+            entry['pnl'] += trade.pnl
+        return stats
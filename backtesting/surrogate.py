@@ -0,0 +1,302 @@
+"""
+Surrogate Models for Sequential Optimization
+
+NumPy-only Tree-structured Parzen Estimator (TPE) sampler and a median
+pruner used by the AutoOptimizer. Observations are kept in parameter
+space and normalized to the unit cube for density estimation.
+
+The sampler supports asynchronous evaluation through the constant-liar
+heuristic: trials that have been asked for but not yet told are treated
+as observed with a pessimistic score, so parallel workers are pushed
+towards different regions instead of all sampling the same optimum.
+"""
+
+import math
+import logging
+from typing import Dict, Any, List, Optional, Tuple, Hashable
+
+import numpy as np
+
+
+_SQRT2 = math.sqrt(2.0)
+_LOG_SQRT_2PI = 0.5 * math.log(2.0 * math.pi)
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (element-wise, NumPy only)."""
+    flat = np.asarray(x, dtype=float).ravel()
+    values = np.array([0.5 * (1.0 + math.erf(v / _SQRT2)) for v in flat])
+    return values.reshape(np.shape(x))
+
+
+class ParzenEstimator:
+    """
+    Multivariate Parzen window density over the unit cube.
+
+    Each observation contributes a diagonal Gaussian kernel truncated to
+    [0, 1]; a broad prior kernel centred in the cube keeps the density
+    non-zero everywhere. Bandwidth follows a Scott-style rule scaled to the
+    cube rather than to the sample spread, so the estimator does not
+    collapse when the good set clusters.
+    """
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        prior_weight: float = 1.0,
+        min_bandwidth: float = 0.02
+    ):
+        """
+        Build estimator from observations.
+
+        Args:
+            points: Array (n_points, n_dims) in the unit cube
+            prior_weight: Weight of the prior kernel relative to one observation
+            min_bandwidth: Lower clip for per-dimension bandwidth
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        n, d = points.shape
+
+        bandwidth = np.full(d, max(min_bandwidth, 0.2 * n ** (-1.0 / (d + 4))))
+
+        self.mus = np.vstack([points, np.full((1, d), 0.5)])
+        self.sigmas = np.vstack([np.tile(bandwidth, (n, 1)), np.ones((1, d))])
+        weights = np.append(np.ones(n), prior_weight)
+        self.weights = weights / weights.sum()
+
+        # Truncation mass of each kernel on [0, 1]
+        mass = _norm_cdf((1.0 - self.mus) / self.sigmas) - _norm_cdf(-self.mus / self.sigmas)
+        self._log_mass = np.log(np.maximum(mass, 1e-12))
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw samples from the truncated mixture."""
+        idx = rng.choice(len(self.weights), size=size, p=self.weights)
+        mus, sigmas = self.mus[idx], self.sigmas[idx]
+        samples = rng.normal(mus, sigmas)
+        # Rejection sampling for the truncation; clip whatever is left
+        for _ in range(10):
+            outside = (samples < 0.0) | (samples > 1.0)
+            if not outside.any():
+                break
+            samples[outside] = rng.normal(mus[outside], sigmas[outside])
+        return np.clip(samples, 0.0, 1.0)
+
+    def log_pdf(self, x: np.ndarray) -> np.ndarray:
+        """Log density of each row of x."""
+        x = np.atleast_2d(x)
+        # (n_x, n_kernels, n_dims)
+        z = (x[:, None, :] - self.mus[None, :, :]) / self.sigmas[None, :, :]
+        log_k = -0.5 * z ** 2 - _LOG_SQRT_2PI - np.log(self.sigmas)[None] - self._log_mass[None]
+        log_components = log_k.sum(axis=2) + np.log(self.weights)[None, :]
+        peak = log_components.max(axis=1, keepdims=True)
+        return (peak + np.log(np.exp(log_components - peak).sum(axis=1, keepdims=True))).ravel()
+
+
+class TPESampler:
+    """
+    Tree-structured Parzen Estimator for box-bounded parameters.
+
+    Usage:
+        sampler = TPESampler({'risk.pct': (0.005, 0.03), 'params.fast': (5, 30)})
+        params = sampler.ask(trial_id=0)
+        sampler.tell(0, score)
+
+    Scores are maximized. Parameters whose bounds are both integers are
+    sampled as integers.
+    """
+
+    def __init__(
+        self,
+        param_bounds: Dict[str, Tuple[float, float]],
+        n_startup_trials: int = 10,
+        n_ei_candidates: int = 24,
+        gamma: float = 0.25,
+        liar: str = 'min',
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize sampler.
+
+        Args:
+            param_bounds: Parameter bounds (min, max)
+            n_startup_trials: Random trials before the model is used
+            n_ei_candidates: Candidates drawn from l(x) per suggestion
+            gamma: Fraction of observations treated as "good"
+            liar: Score assumed for pending trials ('min', 'mean' or 'max')
+            seed: Random seed
+        """
+        if not param_bounds:
+            raise ValueError("param_bounds must not be empty")
+        if liar not in ('min', 'mean', 'max'):
+            raise ValueError(f"Unknown liar strategy: {liar}")
+
+        self.names = list(param_bounds.keys())
+        self.lows = np.array([float(param_bounds[n][0]) for n in self.names])
+        self.highs = np.array([float(param_bounds[n][1]) for n in self.names])
+        self.is_int = np.array([
+            isinstance(param_bounds[n][0], (int, np.integer)) and isinstance(param_bounds[n][1], (int, np.integer))
+            for n in self.names
+        ])
+        self.n_startup_trials = n_startup_trials
+        self.n_ei_candidates = n_ei_candidates
+        self.gamma = gamma
+        self.liar = liar
+        self.rng = np.random.default_rng(seed)
+        self.logger = logging.getLogger("cthulu.backtesting.surrogate")
+
+        self._observed_x: List[np.ndarray] = []
+        self._observed_y: List[float] = []
+        self._pending: Dict[Hashable, np.ndarray] = {}
+
+    @property
+    def n_observed(self) -> int:
+        return len(self._observed_y)
+
+    def ask(self, trial_id: Hashable) -> Dict[str, Any]:
+        """
+        Suggest parameters for a new trial and mark it pending.
+
+        Args:
+            trial_id: Identifier used later in tell()
+
+        Returns:
+            Parameter dictionary
+        """
+        if self.n_observed < self.n_startup_trials:
+            u = self.rng.uniform(0.0, 1.0, size=len(self.names))
+        else:
+            u = self._suggest_tpe()
+        u = self._snap(u)
+        self._pending[trial_id] = u
+        return self._to_params(u)
+
+    def tell(self, trial_id: Hashable, score: float) -> None:
+        """Record the score of a pending trial."""
+        u = self._pending.pop(trial_id, None)
+        if u is None:
+            return
+        self.add_observation(self._to_params(u), score)
+
+    def cancel(self, trial_id: Hashable) -> None:
+        """Forget a pending trial that failed without a score."""
+        self._pending.pop(trial_id, None)
+
+    def add_observation(self, params: Dict[str, Any], score: float) -> None:
+        """
+        Add an externally obtained observation (e.g. a warm-start prior).
+
+        Args:
+            params: Parameter dictionary (skipped if a parameter is missing)
+            score: Objective score (higher is better)
+        """
+        if score is None or not np.isfinite(score):
+            return
+        values = []
+        for name in self.names:
+            value = params.get(name)
+            if value is None:
+                return
+            values.append(float(value))
+        u = (np.array(values) - self.lows) / np.where(self.highs > self.lows, self.highs - self.lows, 1.0)
+        self._observed_x.append(np.clip(u, 0.0, 1.0))
+        self._observed_y.append(float(score))
+
+    def best(self) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Best observed parameters and score."""
+        if not self._observed_y:
+            return None
+        i = int(np.argmax(self._observed_y))
+        return self._to_params(self._observed_x[i]), self._observed_y[i]
+
+    # Private methods
+
+    def _suggest_tpe(self) -> np.ndarray:
+        """Pick the candidate maximizing l(x) / g(x)."""
+        x = list(self._observed_x)
+        y = list(self._observed_y)
+
+        # Constant liar for in-flight trials
+        if self._pending:
+            if self.liar == 'min':
+                lie = min(y)
+            elif self.liar == 'max':
+                lie = max(y)
+            else:
+                lie = float(np.mean(y))
+            for u in self._pending.values():
+                x.append(u)
+                y.append(lie)
+
+        x = np.array(x)
+        y = np.array(y)
+        order = np.argsort(-y, kind='stable')
+        n_good = max(1, int(math.ceil(self.gamma * len(y))))
+        good = x[order[:n_good]]
+        bad = x[order[n_good:]] if len(y) > n_good else x[order[-1:]]
+
+        l_est = ParzenEstimator(good)
+        g_est = ParzenEstimator(bad)
+        candidates = l_est.sample(self.rng, self.n_ei_candidates)
+        scores = l_est.log_pdf(candidates) - g_est.log_pdf(candidates)
+        return candidates[int(np.argmax(scores))]
+
+    def _snap(self, u: np.ndarray) -> np.ndarray:
+        """Round integer dimensions so pending points match what is evaluated."""
+        if not self.is_int.any():
+            return u
+        span = self.highs - self.lows
+        values = self.lows + u * span
+        values[self.is_int] = np.round(values[self.is_int])
+        return np.clip((values - self.lows) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+
+    def _to_params(self, u: np.ndarray) -> Dict[str, Any]:
+        values = self.lows + u * (self.highs - self.lows)
+        params = {}
+        for i, name in enumerate(self.names):
+            if self.is_int[i]:
+                params[name] = int(round(values[i]))
+            else:
+                params[name] = float(values[i])
+        return params
+
+
+class MedianPruner:
+    """
+    Median stopping rule over intermediate objective values.
+
+    A trial is pruned at a checkpoint when its intermediate score is below
+    the median of the scores other trials reported at the same checkpoint.
+    Thresholds are computed in the parent process and shipped to workers,
+    so a running trial prunes itself without round-trips.
+    """
+
+    def __init__(self, n_startup_trials: int = 5, n_warmup_steps: int = 0, percentile: float = 50.0):
+        """
+        Initialize pruner.
+
+        Args:
+            n_startup_trials: Trials that must report a checkpoint before it can prune
+            n_warmup_steps: Leading checkpoints that never prune
+            percentile: Percentile used as threshold (50 = median)
+        """
+        self.n_startup_trials = n_startup_trials
+        self.n_warmup_steps = n_warmup_steps
+        self.percentile = percentile
+        self._values: Dict[int, List[float]] = {}
+
+    def report(self, intermediate: List[float]) -> None:
+        """Record the intermediate values of a finished (or pruned) trial."""
+        for step, value in enumerate(intermediate):
+            if value is not None and np.isfinite(value):
+                self._values.setdefault(step, []).append(float(value))
+
+    def thresholds(self, n_steps: int) -> List[Optional[float]]:
+        """Current per-checkpoint thresholds (None = do not prune)."""
+        result: List[Optional[float]] = []
+        for step in range(n_steps):
+            values = self._values.get(step, [])
+            if step < self.n_warmup_steps or len(values) < self.n_startup_trials:
+                result.append(None)
+            else:
+                result.append(float(np.percentile(values, self.percentile)))
+        return result
@@ -3,6 +3,10 @@ Backtesting UI Server
 
 Flask/FastAPI server for backtesting UI communication.
 Provides REST API endpoints and WebSocket support for real-time updates.
+
+Backtest and optimization jobs run on a bounded worker-process pool behind a
+priority queue (see backtesting.job_queue); they can be cancelled, stream
+throttled progress over Socket.IO and are cached by content hash.
 """
 
 import logging
@@ -27,6 +31,7 @@ try:
     from backtesting.engine import BacktestEngine, BacktestConfig, SpeedMode
     from backtesting.optimizer import ParameterOptimizer
     from backtesting.reporter import BacktestReporter
+    from backtesting.job_queue import BacktestJobQueue, ResultCache, job_cache_key
     from strategy.base import Strategy
     from config.loader import load_config
     CTHULU_AVAILABLE = True
@@ -41,6 +46,7 @@ except ImportError as e:
     class ParameterOptimizer: pass
     class BacktestReporter: pass
     class Strategy: pass
+    BacktestJobQueue = ResultCache = job_cache_key = None
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +55,7 @@ logger = logging.getLogger(__name__)
 class BacktestJob:
     """Backtest job tracking"""
     job_id: str
-    status: str  # QUEUED, RUNNING, COMPLETED, FAILED
+    status: str  # QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED
     config: Dict[str, Any]
     progress: float
     result: Optional[Dict[str, Any]] = None
@@ -57,6 +63,9 @@ class BacktestJob:
     created_at: datetime = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    kind: str = 'backtest'  # backtest, optimization
+    priority: int = 0
+    cached: bool = False
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -67,12 +76,185 @@ class BacktestJob:
             'progress': self.progress,
             'result': self.result,
             'error': self.error,
+            'kind': self.kind,
+            'priority': self.priority,
+            'cached': self.cached,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None
         }
 
 
+def create_strategies(strategy_configs: List[Dict[str, Any]]) -> List[Strategy]:
+    """Create strategy instances from configurations"""
+    from strategy import (
+        SmaCrossover, EmaCrossover, MomentumBreakout, 
+        ScalpingStrategy, MeanReversionStrategy, 
+        TrendFollowingStrategy, RsiReversalStrategy
+    )
+    
+    STRATEGY_MAP = {
+        'sma_crossover': SmaCrossover,
+        'ema_crossover': EmaCrossover,
+        'momentum_breakout': MomentumBreakout,
+        'scalping': ScalpingStrategy,
+        'mean_reversion': MeanReversionStrategy,
+        'trend_following': TrendFollowingStrategy,
+        'rsi_reversal': RsiReversalStrategy
+    }
+    
+    strategies = []
+    
+    for config in strategy_configs:
+        strategy_type = config.get('type')
+        if strategy_type in STRATEGY_MAP:
+            strategy_cls = STRATEGY_MAP[strategy_type]
+            strategies.append(strategy_cls(config))
+        else:
+            logger.warning(f"Unknown strategy type: {strategy_type}")
+    
+    return strategies
+
+
+def backtest_config_params(config_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Engine settings of a job request (also part of its cache key)"""
+    return {
+        'initial_capital': config_data.get('initial_capital', 10000.0),
+        'commission': config_data.get('commission', 0.0001),
+        'slippage_pct': config_data.get('slippage_pct', 0.0002),
+        'speed_mode': config_data.get('speed_mode', 'fast'),
+    }
+
+
+def create_backtest_config(config_data: Dict[str, Any]) -> BacktestConfig:
+    """Create backtest configuration"""
+    params = backtest_config_params(config_data)
+    params['speed_mode'] = SpeedMode(params['speed_mode'])
+    return BacktestConfig(**params)
+
+
+def _data_source_path(data_source: Optional[Dict[str, Any]]) -> Optional[Path]:
+    """CSV file load_market_data() would read, or None for generated data"""
+    if data_source and 'csv_path' in data_source:
+        path = Path(data_source['csv_path'])
+        if path.exists():
+            return path
+    default_data = Path(__file__).parent.parent / "test_pattern_data.csv"
+    return default_data if default_data.exists() else None
+
+
+def data_source_fingerprint(data_source: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Cheap identity of a job's market data (path, size, mtime) for its cache key.
+    
+    Computed without reading the data, so request handlers stay fast. None
+    when the job would run on generated random data (never cacheable).
+    """
+    path = _data_source_path(data_source)
+    if path is None:
+        return None
+    stat = path.stat()
+    return {'path': str(path.resolve()), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_market_data(data_source: Optional[Dict[str, Any]]):
+    """Load market data from source (runs in the job worker)"""
+    import pandas as pd
+    
+    # 1. Try CSV path if provided
+    if data_source and 'csv_path' in data_source:
+        path = Path(data_source['csv_path'])
+        if path.exists():
+            return pd.read_csv(path, parse_dates=['Date'], index_col='Date')
+    
+    # 2. Try default project data path
+    default_data = Path(__file__).parent.parent / "test_pattern_data.csv"
+    if default_data.exists():
+        df = pd.read_csv(default_data)
+        # Normalize column names for SMA/EMA indicators
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+            df.set_index('Date', inplace=True)
+        return df
+    
+    # 3. Create dummy data as last resort
+    import numpy as np
+    dates = pd.date_range(start='2023-01-01', periods=1000, freq='H')
+    prices = 1.1000 + np.cumsum(np.random.normal(0, 0.001, 1000))
+    df = pd.DataFrame({
+        'open': prices,
+        'high': prices + 0.0005,
+        'low': prices - 0.0005,
+        'close': prices,
+        'volume': np.random.randint(100, 1000, 1000)
+    }, index=dates)
+    
+    # Add required indicators if missing
+    df['ema_9'] = df['close'].ewm(span=9).mean()
+    df['ema_12'] = df['close'].ewm(span=12).mean()
+    df['ema_21'] = df['close'].ewm(span=21).mean()
+    df['ema_26'] = df['close'].ewm(span=26).mean()
+    df['atr'] = 0.0010 # Constant ATR for dummy
+    
+    return df
+
+
+def run_backtest_job(context, data_source, config_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Backtest job body (runs in a pool worker).
+    
+    Progress reports double as cancellation points, so a cancelled job
+    stops within ~100 bars.
+    """
+    context.report(0.05, 'Loading market data...')
+    data = load_market_data(data_source)
+    
+    context.report(0.2, 'Initializing strategies...')
+    strategies = create_strategies(config_data.get('strategies', []))
+    
+    engine = BacktestEngine(strategies, create_backtest_config(config_data))
+    
+    def progress_callback(progress_pct: float, current_bar: int, total_bars: int):
+        context.report(
+            0.2 + (progress_pct / 100.0 * 0.7),
+            f'Running backtest... {progress_pct:.1f}%'
+        )
+    
+    context.report(0.2, 'Running backtest...')
+    result = engine.run(data, progress_callback=progress_callback)
+    
+    context.report(0.9, 'Generating report...')
+    reporter = BacktestReporter()
+    report = reporter.generate_report(result)
+    
+    # Round-trip through JSON so the result is cacheable and picklable
+    return json.loads(json.dumps(report, default=str))
+
+
+def run_optimization_job(context, data_source, config_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Optimization job body (runs in a pool worker)."""
+    context.report(0.0, 'Loading market data...')
+    data = load_market_data(data_source)
+    optimizer = ParameterOptimizer()
+    
+    def progress_callback(iteration: int, total: int, best_result: Dict[str, Any]):
+        context.report(
+            iteration / total,
+            f'Optimization: {iteration}/{total} iterations',
+            iteration=iteration,
+            total=total,
+            best_result=best_result
+        )
+    
+    results = optimizer.optimize(
+        data=data,
+        param_ranges=config_data.get('param_ranges', {}),
+        objective=config_data.get('objective', 'sharpe_ratio'),
+        progress_callback=progress_callback
+    )
+    return json.loads(json.dumps(results, default=str))
+
+
 class BacktestServer:
     """
     Flask server for backtesting UI.
@@ -85,13 +267,14 @@ class BacktestServer:
     - Optimization
     """
     
-    def __init__(self, host: str = '127.0.0.1', port: int = 5000):
+    def __init__(self, host: str = '127.0.0.1', port: int = 5000, max_workers: int = 2):
         """
         Initialize backtest server.
         
         Args:
             host: Server host
             port: Server port
+            max_workers: Maximum concurrently running jobs (worker processes)
         """
         self.app = Flask(__name__)
         CORS(self.app)  # Enable CORS for Angular frontend
@@ -111,6 +294,18 @@ class BacktestServer:
         self.results_dir = Path("./backtesting/results")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
+        # Bounded worker pool with priority queue and content-hash result cache
+        self.job_queue = None if BacktestJobQueue is None else BacktestJobQueue(
+            max_workers=max_workers,
+            result_cache=ResultCache(str(self.results_dir / "cache")),
+            progress_interval=0.5,
+            on_start=self._on_job_start,
+            on_progress=self._on_job_progress,
+            on_complete=self._on_job_complete,
+            on_error=self._on_job_error,
+            on_cancel=self._on_job_cancel
+        )
+        
         # Setup routes
         self._setup_routes()
         self._setup_socketio()
@@ -128,6 +323,8 @@ class BacktestServer:
         @self.app.route('/api/backtest/run', methods=['POST'])
         def run_backtest():
             """Start a backtest"""
+            if self.job_queue is None:
+                return self._queue_unavailable()
             try:
                 data = request.json
                 
@@ -138,18 +335,20 @@ class BacktestServer:
                     status='QUEUED',
                     config=data,
                     progress=0.0,
-                    created_at=datetime.now()
+                    created_at=datetime.now(),
+                    kind='backtest',
+                    priority=int(data.get('priority', 0))
                 )
                 
                 self.jobs[job_id] = job
                 
-                # Start backtest asynchronously
-                self.socketio.start_background_task(self._run_backtest_async, job_id)
+                # Queue backtest (completes immediately on a cache hit)
+                self._submit_job(job, run_backtest_job, data.get('strategies', []))
                 
                 return jsonify({
                     'job_id': job_id,
-                    'status': 'QUEUED',
-                    'message': 'Backtest queued successfully'
+                    'status': job.status,
+                    'message': 'Backtest served from cache' if job.cached else 'Backtest queued successfully'
                 })
                 
             except Exception as e:
@@ -186,6 +385,22 @@ class BacktestServer:
             jobs.sort(key=lambda x: x['created_at'], reverse=True)
             return jsonify(jobs)
         
+        @self.app.route('/api/backtest/cancel/<job_id>', methods=['POST'])
+        def cancel_job(job_id):
+            """Cancel a queued or running job"""
+            job = self.jobs.get(job_id)
+            
+            if not job:
+                return jsonify({'error': 'Job not found'}), 404
+            
+            if self.job_queue is None:
+                return self._queue_unavailable()
+                
+            if not self.job_queue.cancel(job_id):
+                return jsonify({'error': f'Job is {job.status}'}), 400
+                
+            return jsonify({'job_id': job_id, 'message': 'Cancellation requested'})
+        
         @self.app.route('/api/configs', methods=['GET'])
         def list_configs():
             """List saved configurations"""
@@ -250,6 +465,8 @@ class BacktestServer:
         @self.app.route('/api/optimize', methods=['POST'])
         def run_optimization():
             """Run parameter optimization"""
+            if self.job_queue is None:
+                return self._queue_unavailable()
             try:
                 data = request.json
                 
@@ -260,18 +477,23 @@ class BacktestServer:
                     status='QUEUED',
                     config=data,
                     progress=0.0,
-                    created_at=datetime.now()
+                    created_at=datetime.now(),
+                    kind='optimization',
+                    priority=int(data.get('priority', 0))
                 )
                 
                 self.jobs[job_id] = job
                 
-                # Start optimization asynchronously
-                self.socketio.start_background_task(self._run_optimization_async, job_id)
+                # Queue optimization (completes immediately on a cache hit)
+                self._submit_job(job, run_optimization_job, {
+                    'param_ranges': data.get('param_ranges', {}),
+                    'objective': data.get('objective', 'sharpe_ratio'),
+                })
                 
                 return jsonify({
                     'job_id': job_id,
-                    'status': 'QUEUED',
-                    'message': 'Optimization queued successfully'
+                    'status': job.status,
+                    'message': 'Optimization served from cache' if job.cached else 'Optimization queued successfully'
                 })
                 
             except Exception as e:
@@ -326,133 +548,90 @@ class BacktestServer:
             job_id = data.get('job_id')
             self.logger.info(f"Client subscribed to job {job_id}")
             emit('subscribed', {'job_id': job_id})
+        
+        @self.socketio.on('cancel')
+        def handle_cancel(data):
+            """Cancel a job"""
+            job_id = data.get('job_id')
+            accepted = self.job_queue is not None and self.job_queue.cancel(job_id)
+            emit('cancel_requested', {'job_id': job_id, 'accepted': accepted})
+    
+    @staticmethod
+    def _queue_unavailable():
+        """Response for job routes when the job queue could not be created"""
+        return jsonify({'error': 'Backtest job queue is not available'}), 503
     
-    def _run_backtest_async(self, job_id: str):
-        """Run backtest asynchronously"""
+    def _submit_job(self, job: BacktestJob, fn, job_config: Any):
+        """Hash the job inputs and hand the job to the queue (data loads in the worker)"""
+        config_data = job.config
+        data_source = config_data.get('data_source')
+        
+        fingerprint = data_source_fingerprint(data_source)
+        cache_key = None if fingerprint is None else job_cache_key(
+            None, job_config, {'engine': backtest_config_params(config_data), 'data': fingerprint}
+        )
+        
+        self.job_queue.submit(
+            job.job_id, fn, data_source, config_data,
+            priority=job.priority,
+            cache_key=cache_key
+        )
+    
+    def _on_job_start(self, job_id: str):
+        """Job left the queue and started on a worker"""
+        job = self.jobs[job_id]
+        job.status = 'RUNNING'
+        job.started_at = datetime.now()
+        self._emit_progress(job_id, 0.0, 'Starting...')
+    
+    def _on_job_progress(self, job_id: str, progress: float, message: str, extra: Dict[str, Any]):
+        """Throttled progress update from a worker"""
+        job = self.jobs.get(job_id)
+        if job:
+            job.progress = progress
+        
+        if extra:
+            # Emit intermediate optimization results
+            self.socketio.emit('optimization_update', {'job_id': job_id, **extra})
+        self._emit_progress(job_id, progress, message)
+    
+    def _on_job_complete(self, job_id: str, result: Any, from_cache: bool):
+        """Job finished (or was served from the result cache)"""
         job = self.jobs[job_id]
         
-        try:
-            job.status = 'RUNNING'
-            job.started_at = datetime.now()
-            
-            self._emit_progress(job_id, 0.0, 'Initializing backtest...')
-            
-            # Parse configuration
-            config_data = job.config
-            
-            # Load data
-            self._emit_progress(job_id, 0.1, 'Loading market data...')
-            data = self._load_market_data(config_data.get('data_source'))
-            
-            # Create strategies
-            self._emit_progress(job_id, 0.2, 'Initializing strategies...')
-            strategies = self._create_strategies(config_data.get('strategies', []))
-            
-            # Create backtest config
-            backtest_config = self._create_backtest_config(config_data)
-            
-            # Create engine
-            engine = BacktestEngine(strategies, backtest_config)
-            
-            # Run backtest with progress callback
-            def progress_callback(progress: float):
-                self._emit_progress(
-                    job_id,
-                    0.2 + (progress * 0.7),
-                    f'Running backtest... {progress:.1%}'
-                )
-            
-            self._emit_progress(job_id, 0.2, 'Running backtest...')
-            
-            result = engine.run(data, progress_callback=progress_callback)
-            
-            # Generate report
-            self._emit_progress(job_id, 0.9, 'Generating report...')
-            
-            reporter = BacktestReporter()
-            report = reporter.generate_report(result)
-            
+        if job.kind == 'backtest':
             # Save results
             result_file = self.results_dir / f"{job_id}.json"
             with open(result_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-            
-            # Update job
-            job.status = 'COMPLETED'
-            job.result = report
-            job.progress = 1.0
-            job.completed_at = datetime.now()
-            
-            self._emit_progress(job_id, 1.0, 'Backtest completed!')
-            self._emit_complete(job_id, report)
-            
-        except Exception as e:
-            self.logger.error(f"Backtest error: {e}", exc_info=True)
-            job.status = 'FAILED'
-            job.error = str(e)
-            job.completed_at = datetime.now()
-            
-            self._emit_error(job_id, str(e))
+                json.dump(result, f, indent=2, default=str)
+        
+        job.status = 'COMPLETED'
+        job.result = result
+        job.progress = 1.0
+        job.cached = from_cache
+        job.started_at = job.started_at or datetime.now()
+        job.completed_at = datetime.now()
+        
+        self._emit_progress(job_id, 1.0, 'Backtest completed!' if job.kind == 'backtest' else 'Optimization completed!')
+        self._emit_complete(job_id, result)
     
-    def _run_optimization_async(self, job_id: str):
-        """Run optimization asynchronously"""
+    def _on_job_error(self, job_id: str, error: str):
+        """Job raised in its worker"""
+        self.logger.error(f"{self.jobs[job_id].kind.capitalize()} error: {error}")
         job = self.jobs[job_id]
+        job.status = 'FAILED'
+        job.error = error
+        job.completed_at = datetime.now()
         
-        try:
-            job.status = 'RUNNING'
-            job.started_at = datetime.now()
-            
-            self._emit_progress(job_id, 0.0, 'Starting optimization...')
-            
-            # Parse configuration
-            config_data = job.config
-            
-            # Load data
-            data = self._load_market_data(config_data.get('data_source'))
-            
-            # Create optimizer
-            optimizer = ParameterOptimizer()
-            
-            # Run optimization with progress callback
-            def progress_callback(iteration: int, total: int, best_result: Dict[str, Any]):
-                progress = iteration / total
-                self._emit_progress(
-                    job_id,
-                    progress,
-                    f'Optimization: {iteration}/{total} iterations'
-                )
-                
-                # Emit intermediate results
-                self.socketio.emit('optimization_update', {
-                    'job_id': job_id,
-                    'iteration': iteration,
-                    'total': total,
-                    'best_result': best_result
-                })
-            
-            # Run optimization
-            results = optimizer.optimize(
-                data=data,
-                param_ranges=config_data.get('param_ranges', {}),
-                objective=config_data.get('objective', 'sharpe_ratio'),
-                progress_callback=progress_callback
-            )
-            
-            # Update job
-            job.status = 'COMPLETED'
-            job.result = results
-            job.progress = 1.0
-            job.completed_at = datetime.now()
-            
-            self._emit_complete(job_id, results)
-            
-        except Exception as e:
-            self.logger.error(f"Optimization error: {e}", exc_info=True)
-            job.status = 'FAILED'
-            job.error = str(e)
-            job.completed_at = datetime.now()
-            
-            self._emit_error(job_id, str(e))
+        self._emit_error(job_id, error)
+    
+    def _on_job_cancel(self, job_id: str):
+        """Job was cancelled while queued or running"""
+        job = self.jobs[job_id]
+        job.status = 'CANCELLED'
+        job.completed_at = datetime.now()
+        
+        self.socketio.emit('cancelled', {'job_id': job_id})
     
     def _emit_progress(self, job_id: str, progress: float, message: str):
         """Emit progress update via WebSocket"""
@@ -478,94 +657,30 @@ class BacktestServer:
     
     def _load_market_data(self, data_source: Optional[Dict[str, Any]]):
         """Load market data from source"""
-        import pandas as pd
-        
-        # 1. Try CSV path if provided
-        if data_source and 'csv_path' in data_source:
-            path = Path(data_source['csv_path'])
-            if path.exists():
-                return pd.read_csv(path, parse_dates=['Date'], index_col='Date')
-        
-        # 2. Try default project data path
-        default_data = Path(__file__).parent.parent / "test_pattern_data.csv"
-        if default_data.exists():
-            df = pd.read_csv(default_data)
-            # Normalize column names for SMA/EMA indicators
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'])
-                df.set_index('Date', inplace=True)
-            return df
-        
-        # 3. Create dummy data as last resort
-        import numpy as np
-        dates = pd.date_range(start='2023-01-01', periods=1000, freq='H')
-        prices = 1.1000 + np.cumsum(np.random.normal(0, 0.001, 1000))
-        df = pd.DataFrame({
-            'open': prices,
-            'high': prices + 0.0005,
-            'low': prices - 0.0005,
-            'close': prices,
-            'volume': np.random.randint(100, 1000, 1000)
-        }, index=dates)
-        
-        # Add required indicators if missing
-        df['ema_9'] = df['close'].ewm(span=9).mean()
-        df['ema_12'] = df['close'].ewm(span=12).mean()
-        df['ema_21'] = df['close'].ewm(span=21).mean()
-        df['ema_26'] = df['close'].ewm(span=26).mean()
-        df['atr'] = 0.0010 # Constant ATR for dummy
-        
-        return df
+        return load_market_data(data_source)
     
     def _create_strategies(self, strategy_configs: List[Dict[str, Any]]) -> List[Strategy]:
         """Create strategy instances from configurations"""
-        from strategy import (
-            SmaCrossover, EmaCrossover, MomentumBreakout, 
-            ScalpingStrategy, MeanReversionStrategy, 
-            TrendFollowingStrategy, RsiReversalStrategy
-        )
-        
-        STRATEGY_MAP = {
-            'sma_crossover': SmaCrossover,
-            'ema_crossover': EmaCrossover,
-            'momentum_breakout': MomentumBreakout,
-            'scalping': ScalpingStrategy,
-            'mean_reversion': MeanReversionStrategy,
-            'trend_following': TrendFollowingStrategy,
-            'rsi_reversal': RsiReversalStrategy
-        }
-        
-        strategies = []
-        
-        for config in strategy_configs:
-            strategy_type = config.get('type')
-            if strategy_type in STRATEGY_MAP:
-                strategy_cls = STRATEGY_MAP[strategy_type]
-                strategies.append(strategy_cls(config))
-            else:
-                self.logger.warning(f"Unknown strategy type: {strategy_type}")
-        
-        return strategies
+        return create_strategies(strategy_configs)
     
     def _create_backtest_config(self, config_data: Dict[str, Any]) -> BacktestConfig:
         """Create backtest configuration"""
-        return BacktestConfig(
-            initial_capital=config_data.get('initial_capital', 10000.0),
-            commission=config_data.get('commission', 0.0001),
-            slippage_pct=config_data.get('slippage_pct', 0.0002),
-            speed_mode=SpeedMode(config_data.get('speed_mode', 'fast'))
-        )
+        return create_backtest_config(config_data)
     
     def run(self):
         """Start the server"""
         self.logger.info(f"Starting backtest server on {self.host}:{self.port}")
-        self.socketio.run(
-            self.app, 
-            host=self.host, 
-            port=self.port, 
-            debug=True,
-            allow_unsafe_werkzeug=True  # Allow development mode
-        )
+        try:
+            self.socketio.run(
+                self.app, 
+                host=self.host, 
+                port=self.port, 
+                debug=True,
+                allow_unsafe_werkzeug=True  # Allow development mode
+            )
+        finally:
+            if self.job_queue is not None:
+                self.job_queue.shutdown(wait=False, cancel_running=True)
 
 
 def main():
@@ -35,6 +35,13 @@ from .regime_classifier import (
     classify_regime,
 )
 
+# Shared per-bar regime
+from .regime_service import (
+    RegimeService,
+    RegimeSnapshot,
+    get_regime_service,
+)
+
 # Price Predictor
 from .price_predictor import (
     PricePredictor,
@@ -45,6 +52,12 @@ from .price_predictor import (
     predict_direction,
 )
 
+# Per-bar memoized, batched model inference
+from .inference import (
+    InferenceCache,
+    get_inference_cache,
+)
+
 # Sentiment Analyzer
 from .sentiment_analyzer import (
     SentimentAnalyzer,
@@ -137,6 +150,9 @@ __all__ = [
     'RegimeTransition',
     'get_regime_classifier',
     'classify_regime',
+    'RegimeService',
+    'RegimeSnapshot',
+    'get_regime_service',
     
     # Predictor
     'PricePredictor',
@@ -145,6 +161,8 @@ __all__ = [
     'TrainingResult',
     'get_price_predictor',
     'predict_direction',
+    'InferenceCache',
+    'get_inference_cache',
     
     # Sentiment
     'SentimentAnalyzer',
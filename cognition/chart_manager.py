@@ -41,6 +41,7 @@ Part of Cthulu v5.2.33 APEX - Visual Reasoning System
 
 from __future__ import annotations
 import asyncio
+import copy
 import threading
 import queue
 import os
@@ -398,6 +399,29 @@ class ChartManager:
             self._write_thread.join(timeout=5.0)
         self.logger.info("ChartManager shutdown complete")
     
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        Capture chart states (zones, trend lines, channels) for warm restarts.
+        
+        Writes still queued for the async writer are not included; they are
+        re-derived from the next bars after a restart.
+        """
+        with self._state_lock:
+            return {
+                'chart_states': copy.deepcopy(self._chart_states),
+                'stats': dict(self._stats)
+            }
+    
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """Restore chart states captured by get_warm_state()."""
+        with self._state_lock:
+            self._chart_states.update(state.get('chart_states', {}))
+            for key, value in state.get('stats', {}).items():
+                if key in self._stats:
+                    self._stats[key] = value
+            zones = sum(len(cs.zones) for cs in self._chart_states.values())
+        self.logger.info(f"Chart state restored: {len(self._chart_states)} charts, {zones} zones")
+    
     def _auto_export(self, symbol: str, timeframe: str):
         """Auto-export chart state to JSON for MT5 EA consumption (MTF by default)."""
         try:
@@ -7,23 +7,32 @@ Central AI/ML integration layer that coordinates:
 - Sentiment Analysis
 - Enhanced Exit Signals
 
+The per-bar modules are independent, so they run concurrently on a small
+worker pool under a per-call deadline (deadline_ms). Results that arrive in
+time are used; modules that miss the budget fall back to neutral outputs,
+are listed in CognitionState.missed_modules, and drop out of the combined
+confidence. Set deadline_ms=None to run them sequentially.
+
 Part of Cthulu v5.2.33
 """
 from __future__ import annotations
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from datetime import datetime
 import logging
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 from .regime_classifier import (
     MarketRegimeClassifier, RegimeState, MarketRegime,
     get_regime_classifier, classify_regime
 )
+from .inference import get_inference_cache
 from .price_predictor import (
     PricePredictor, PricePrediction, PredictionDirection,
     get_price_predictor, predict_direction
@@ -41,6 +50,9 @@ from .session_orb import SessionORBDetector, SessionType, OpeningRange
 
 logger = logging.getLogger("cthulu.cognition")
 
+# Weight of each module's confidence in CognitionState.combined_confidence
+CONFIDENCE_WEIGHTS = {'regime': 0.35, 'prediction': 0.40, 'sentiment': 0.25}
+
 
 @dataclass
 class CognitionState:
@@ -49,16 +61,29 @@ class CognitionState:
     prediction: PricePrediction
     sentiment: SentimentScore
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    missed_modules: List[str] = field(default_factory=list)  # Missed the deadline or failed
+    
+    @property
+    def degraded(self) -> bool:
+        """True when some module outputs are neutral stand-ins."""
+        return bool(self.missed_modules)
+    
+    @property
+    def coverage(self) -> float:
+        """Share of the confidence weight backed by real module outputs."""
+        return sum(w for name, w in CONFIDENCE_WEIGHTS.items() if name not in self.missed_modules)
     
     @property
     def combined_confidence(self) -> float:
-        """Overall confidence from all modules."""
-        weights = {'regime': 0.35, 'prediction': 0.40, 'sentiment': 0.25}
-        return (
-            self.regime.confidence * weights['regime'] +
-            self.prediction.confidence * weights['prediction'] +
-            self.sentiment.confidence * weights['sentiment']
-        )
+        """Overall confidence from the modules that reported (degraded mode renormalizes)."""
+        coverage = self.coverage
+        if coverage <= 0:
+            return 0.0
+        return sum(
+            getattr(self, name).confidence * w
+            for name, w in CONFIDENCE_WEIGHTS.items()
+            if name not in self.missed_modules
+        ) / coverage
     
     @property
     def directional_consensus(self) -> str:
@@ -124,6 +149,11 @@ class SignalEnhancement:
     size_multiplier: float  # Multiply position size
     reasons: List[str]
     warnings: List[str]
+    missed_modules: List[str] = field(default_factory=list)
+    
+    @property
+    def degraded(self) -> bool:
+        return bool(self.missed_modules)
     
     @property
     def is_favorable(self) -> bool:
@@ -145,6 +175,10 @@ class CognitionEngine:
     - Exit signal generation
     - Risk adjustment recommendations
     - Market condition awareness
+    
+    Independent modules are fanned out to a worker pool and bounded by
+    deadline_ms; a module still running from an earlier call is not
+    re-entered and counts as missed.
     """
     
     def __init__(
@@ -157,7 +191,9 @@ class CognitionEngine:
         enable_session_orb: bool = True,
         model_dir: Optional[str] = None,
         hektor_adapter: Optional[Any] = None,
-        hektor_retriever: Optional[Any] = None
+        hektor_retriever: Optional[Any] = None,
+        deadline_ms: Optional[float] = 250.0,
+        max_workers: int = 4
     ):
         self.enable_regime = enable_regime
         self.enable_prediction = enable_prediction
@@ -188,21 +224,161 @@ class CognitionEngine:
         self._last_state: Optional[CognitionState] = None
         self._state_history: List[CognitionState] = []
         
+        # Concurrent fan-out (pool created on first use)
+        self.deadline_ms = deadline_ms if deadline_ms and deadline_ms > 0 else None
+        self.max_workers = max(1, int(max_workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+        self._module_stats: Dict[str, Dict[str, float]] = {}
+        self._stats = {'fan_outs': 0, 'degraded': 0}
+        
         # Initialize enabled modules
         self._initialize_modules()
         
         logger.info(f"CognitionEngine initialized: regime={enable_regime}, "
                    f"prediction={enable_prediction}, sentiment={enable_sentiment}, "
                    f"exit_oracle={enable_exit_oracle}, order_blocks={enable_order_blocks}, "
-                   f"session_orb={enable_session_orb}, hektor={self.enable_hektor}")
+                   f"session_orb={enable_session_orb}, hektor={self.enable_hektor}, "
+                   f"deadline_ms={self.deadline_ms}")
+    
+    # ------------------------------------------------------------------
+    # Concurrent fan-out
+    # ------------------------------------------------------------------
     
-    def _get_semantic_context(self, signal: Any, market_data: pd.DataFrame) -> Dict[str, Any]:
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="cognition")
+            return self._pool
+    
+    def _module_stat(self, name: str) -> Dict[str, float]:
+        stat = self._module_stats.get(name)
+        if stat is None:
+            stat = self._module_stats[name] = {
+                'runs': 0, 'missed': 0, 'busy': 0, 'failed': 0,
+                'last_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0
+            }
+        return stat
+    
+    def _timed(self, name: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stat = self._module_stat(name)
+                stat['runs'] += 1
+                stat['last_ms'] = elapsed_ms
+                stat['max_ms'] = max(stat['max_ms'], elapsed_ms)
+                stat['total_ms'] += elapsed_ms
+    
+    def _fan_out(self, tasks: Dict[str, Callable[[], Any]]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run independent module calls concurrently under the deadline.
+        
+        Args:
+            tasks: module name -> zero-argument callable
+            
+        Returns:
+            (results of the modules that finished in time,
+             names of the modules that missed the deadline, were still busy or failed)
+        """
+        results: Dict[str, Any] = {}
+        missed: List[str] = []
+        if not tasks:
+            return results, missed
+        
+        # Sequential mode: no pool, no deadline
+        if self.deadline_ms is None:
+            for name, fn in tasks.items():
+                try:
+                    results[name] = self._timed(name, fn)
+                except Exception as e:
+                    logger.warning(f"Cognition module {name} failed: {e}")
+                    missed.append(name)
+                    with self._lock:
+                        self._module_stat(name)['failed'] += 1
+            return results, missed
+        
+        # 1. Submit, skipping modules whose previous run has not finished
+        #    (modules keep per-instance state and are not re-entered)
+        deadline = time.monotonic() + self.deadline_ms / 1000.0
+        pool = self._get_pool()
+        futures: Dict[Future, str] = {}
+        with self._lock:
+            self._stats['fan_outs'] += 1
+            for name, fn in tasks.items():
+                running = self._inflight.get(name)
+                if running is not None and not running.done():
+                    self._module_stat(name)['busy'] += 1
+                    missed.append(name)
+                    continue
+                future = pool.submit(self._timed, name, fn)
+                self._inflight[name] = future
+                futures[future] = name
+        
+        # 2. Collect whatever finishes within the budget
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Cognition module {name} failed: {e}")
+                missed.append(name)
+                with self._lock:
+                    self._module_stat(name)['failed'] += 1
+        
+        # 3. Late modules keep running (their outputs are memoized for the
+        #    next call where possible) but are not waited for
+        late = [futures[future] for future in not_done]
+        if late:
+            with self._lock:
+                for name in late:
+                    self._module_stat(name)['missed'] += 1
+            logger.warning(f"Cognition modules missed the {self.deadline_ms:.0f}ms deadline: {', '.join(late)}")
+        missed.extend(late)
+        
+        if missed:
+            with self._lock:
+                self._stats['degraded'] += 1
+        return results, missed
+    
+    def shutdown(self, wait_for_modules: bool = False):
+        """Stop the worker pool (recreated on next use)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._inflight.clear()
+        if pool is not None:
+            pool.shutdown(wait=wait_for_modules)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Fan-out counters and per-module latency/miss statistics."""
+        with self._lock:
+            modules = {}
+            for name, stat in self._module_stats.items():
+                stat = dict(stat)
+                stat['avg_ms'] = stat['total_ms'] / stat['runs'] if stat['runs'] else 0.0
+                modules[name] = stat
+            return {
+                **self._stats,
+                'deadline_ms': self.deadline_ms,
+                'last_missed': list(self._last_state.missed_modules) if self._last_state else [],
+                'modules': modules
+            }
+    
+    def _get_semantic_context(self, signal: Any, market_data: pd.DataFrame,
+                              regime: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieve semantic context from Hektor for signal enhancement.
         
         Args:
             signal: Trading signal to enhance
             market_data: Current market data
+            regime: Current regime name (defaults to the last analyzed regime)
             
         Returns:
             Dictionary with semantic context and similar historical patterns
@@ -211,12 +387,15 @@ class CognitionEngine:
             return {}
         
         try:
+            if regime is None:
+                regime = self._last_state.regime.regime.name if self._last_state else 'UNKNOWN'
+            
             # Get current market context
             current_context = {
                 'symbol': getattr(signal, 'symbol', 'UNKNOWN'),
                 'side': getattr(signal, 'side', 'UNKNOWN'),
                 'confidence': getattr(signal, 'confidence', 0.0),
-                'regime': self._last_state.regime.regime.name if self._last_state else 'UNKNOWN',
+                'regime': regime,
                 'price': market_data['close'].iloc[-1] if len(market_data) > 0 else 0.0
             }
             
@@ -315,57 +494,72 @@ class CognitionEngine:
                 confirm_bars=1
             )
     
-    def analyze(self, symbol: str, market_data: pd.DataFrame) -> CognitionState:
-        """
-        Perform full cognition analysis.
+    @staticmethod
+    def _neutral_regime() -> RegimeState:
+        return RegimeState(
+            regime=MarketRegime.UNKNOWN,
+            confidence=0.0,
+            probabilities={},
+            features={}
+        )
+    
+    @staticmethod
+    def _neutral_prediction() -> PricePrediction:
+        return PricePrediction(
+            direction=PredictionDirection.NEUTRAL,
+            confidence=0.33,
+            probabilities={},
+            expected_move_pct=0.0,
+            horizon_bars=5,
+            features_used=0
+        )
+    
+    @staticmethod
+    def _neutral_sentiment() -> SentimentScore:
+        return SentimentScore(
+            score=0.0,
+            direction=SentimentDirection.NEUTRAL,
+            confidence=0.5,
+            components={},
+            events=[]
+        )
+    
+    def _classify(self, symbol: str, market_data: pd.DataFrame) -> RegimeState:
+        """Regime for the frame's bar (once per bar via the inference cache)."""
+        if self._regime_classifier and len(market_data) >= 50:
+            return get_inference_cache().classify(self._regime_classifier, market_data, symbol)
+        return self._neutral_regime()
+    
+    def _analysis_tasks(self, symbol: str, market_data: pd.DataFrame,
+                        prediction: Optional[PricePrediction] = None) -> Dict[str, Callable[[], Any]]:
+        """Module calls needed for a CognitionState; disabled modules are left out."""
+        inference = get_inference_cache()
+        tasks: Dict[str, Callable[[], Any]] = {}
         
-        Args:
-            symbol: Trading symbol
-            market_data: OHLCV DataFrame
-            
-        Returns:
-            CognitionState with all module outputs
-        """
-        # Regime classification
         if self._regime_classifier and len(market_data) >= 50:
-            regime = self._regime_classifier.classify(market_data)
-        else:
-            regime = RegimeState(
-                regime=MarketRegime.UNKNOWN,
-                confidence=0.0,
-                probabilities={},
-                features={}
-            )
+            tasks['regime'] = lambda: self._classify(symbol, market_data)
         
-        # Price prediction
-        if self._price_predictor and len(market_data) >= self._price_predictor.lookback_bars:
-            prediction = self._price_predictor.predict(market_data)
-        else:
-            prediction = PricePrediction(
-                direction=PredictionDirection.NEUTRAL,
-                confidence=0.33,
-                probabilities={},
-                expected_move_pct=0.0,
-                horizon_bars=5,
-                features_used=0
-            )
+        # analyze_many passes its batched prediction
+        if prediction is None and self._price_predictor and len(market_data) >= self._price_predictor.lookback_bars:
+            tasks['prediction'] = lambda: inference.predict(self._price_predictor, market_data, symbol)
         
-        # Sentiment
         if self._sentiment_analyzer:
-            sentiment = self._sentiment_analyzer.get_sentiment(symbol)
-        else:
-            sentiment = SentimentScore(
-                score=0.0,
-                direction=SentimentDirection.NEUTRAL,
-                confidence=0.5,
-                components={},
-                events=[]
-            )
+            tasks['sentiment'] = lambda: self._sentiment_analyzer.get_sentiment(symbol)
+        
+        return tasks
+    
+    def _record_state(self, results: Dict[str, Any], missed: List[str],
+                      prediction: Optional[PricePrediction] = None) -> CognitionState:
+        """Build the CognitionState from fan-out results and make it current."""
+        regime = results.get('regime') or self._neutral_regime()
+        prediction = results.get('prediction') or prediction or self._neutral_prediction()
+        sentiment = results.get('sentiment') or self._neutral_sentiment()
         
         state = CognitionState(
             regime=regime,
             prediction=prediction,
-            sentiment=sentiment
+            sentiment=sentiment,
+            missed_modules=[name for name in missed if name in CONFIDENCE_WEIGHTS]
         )
         
         self._last_state = state
@@ -377,10 +571,54 @@ class CognitionEngine:
         
         logger.debug(f"Cognition analysis: regime={regime.regime.value}, "
                     f"prediction={prediction.direction.value}, "
-                    f"sentiment={sentiment.direction.value}")
+                    f"sentiment={sentiment.direction.value}"
+                    + (f", degraded (missed: {', '.join(state.missed_modules)})" if state.degraded else ""))
         
         return state
     
+    def analyze(self, symbol: str, market_data: pd.DataFrame,
+                prediction: Optional[PricePrediction] = None) -> CognitionState:
+        """
+        Perform full cognition analysis.
+        
+        Regime, prediction and sentiment run concurrently under the
+        deadline; late modules are replaced by neutral outputs and listed in
+        the state's missed_modules. Model outputs are memoized per bar, so
+        repeated calls for the same bar (should_trade, enhance_signal, exit
+        evaluation) reuse them.
+        
+        Args:
+            symbol: Trading symbol
+            market_data: OHLCV DataFrame
+            prediction: Precomputed prediction (from analyze_many's batch)
+            
+        Returns:
+            CognitionState with all module outputs
+        """
+        results, missed = self._fan_out(self._analysis_tasks(symbol, market_data, prediction))
+        return self._record_state(results, missed, prediction)
+    
+    def analyze_many(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, CognitionState]:
+        """
+        Analyze several symbols, batching their price predictions into one
+        forward pass.
+        
+        Args:
+            frames: symbol -> OHLCV DataFrame
+            
+        Returns:
+            symbol -> CognitionState (the last one also becomes get_state())
+        """
+        predictions: Dict[str, PricePrediction] = {}
+        if self._price_predictor:
+            eligible = {s: df for s, df in frames.items() if len(df) >= self._price_predictor.lookback_bars}
+            if eligible:
+                predictions = get_inference_cache().predict_many(self._price_predictor, eligible)
+        return {
+            symbol: self.analyze(symbol, df, prediction=predictions.get(symbol))
+            for symbol, df in frames.items()
+        }
+    
     def enhance_signal(
         self,
         signal_direction: str,  # 'long' or 'short'
@@ -402,17 +640,24 @@ class CognitionEngine:
         Returns:
             SignalEnhancement with multipliers and reasons
         """
-        # Get or refresh state
-        state = self.analyze(symbol, market_data)
-        
-        # Get semantic context from Hektor if available
-        semantic_context = self._get_semantic_context(signal, market_data) if signal else {}
+        # Analysis modules and semantic retrieval share one deadline
+        tasks = self._analysis_tasks(symbol, market_data)
+        if signal and self.enable_hektor and self.hektor_retriever:
+            tasks['semantic'] = lambda: self._get_semantic_context(
+                signal, market_data, regime=self._classify(symbol, market_data).regime.name
+            )
+        results, missed = self._fan_out(tasks)
+        state = self._record_state(results, missed)
+        semantic_context = results.get('semantic', {})
         
         confidence_mult = 1.0
         size_mult = 1.0
         reasons = []
         warnings = []
         
+        if missed:
+            warnings.append(f"Cognition degraded: {', '.join(missed)} unavailable")
+        
         # Semantic enhancement from historical patterns
         if semantic_context.get('has_semantic_data', False):
             similar_count = semantic_context.get('similar_count', 0)
@@ -422,19 +667,6 @@ class CognitionEngine:
             elif similar_count >= 1:
                 confidence_mult *= 1.05  # +5% boost for some patterns
                 reasons.append(f"Historical patterns (+5% conf, {similar_count} similar)")
-                
-        # Continue with existing logic...
-        if self._last_state is None or (datetime.utcnow() - self._last_state.timestamp).seconds > 60:
-            self.analyze(symbol, market_data)
-        
-        state = self._last_state
-        if state is None:
-            return SignalEnhancement(1.0, 1.0, [], [])
-        
-        confidence_mult = 1.0
-        size_mult = 1.0
-        reasons = []
-        warnings = []
         
         # Regime alignment - BOOST MORE, PENALIZE LESS
         # Philosophy: Rule-based signals are already good, cognition should enhance
@@ -519,7 +751,8 @@ class CognitionEngine:
             confidence_multiplier=confidence_mult,
             size_multiplier=size_mult,
             reasons=reasons,
-            warnings=warnings
+            warnings=warnings,
+            missed_modules=missed
         )
         
         # Store signal context in Hektor for future learning (asynchronous)
@@ -652,6 +885,8 @@ class CognitionEngine:
         Get all structure-based signals (Order Blocks + Session ORB).
         
         Combines ICT order block signals with session-based ORB signals.
+        Both detectors run concurrently under the deadline; a detector that
+        misses it contributes no signal this call.
         
         Args:
             market_data: OHLCV DataFrame
@@ -662,17 +897,19 @@ class CognitionEngine:
         Returns:
             List of signal dicts from both detectors
         """
-        signals = []
-        
-        ob_signal = self.get_order_block_signal(market_data, current_price, atr, timestamp)
-        if ob_signal:
-            ob_signal['source'] = 'order_block'
-            signals.append(ob_signal)
+        tasks = {}
+        if self._order_block_detector:
+            tasks['order_block'] = lambda: self.get_order_block_signal(market_data, current_price, atr, timestamp)
+        if self._session_orb_detector:
+            tasks['session_orb'] = lambda: self.get_session_orb_signal(market_data, current_price, atr, timestamp)
+        results, _ = self._fan_out(tasks)
         
-        orb_signal = self.get_session_orb_signal(market_data, current_price, atr, timestamp)
-        if orb_signal:
-            orb_signal['source'] = 'session_orb'
-            signals.append(orb_signal)
+        signals = []
+        for source in ('order_block', 'session_orb'):
+            signal = results.get(source)
+            if signal:
+                signal['source'] = source
+                signals.append(signal)
         
         return signals
     
@@ -735,9 +972,15 @@ class CognitionEngine:
                 # Don't return False
         
         # Only block for CRITICAL upcoming events with high-impact
+        # (a check that misses the deadline is skipped - cognition is advisory)
         if self._sentiment_analyzer:
+            results, _ = self._fan_out({
+                'event_filter': lambda: self._sentiment_analyzer.should_avoid_trading(symbol)
+            })
             try:
-                avoid, reason = self._sentiment_analyzer.should_avoid_trading(symbol)
+                if 'event_filter' not in results:
+                    return True, "Trading conditions acceptable (event check skipped)"
+                avoid, reason = results['event_filter']
                 if avoid:
                     # Check if this is truly critical
                     if 'critical' in reason.lower() or 'nfp' in reason.lower() or 'fomc' in reason.lower():
@@ -793,7 +1036,8 @@ class CognitionEngine:
                 'order_blocks': self.enable_order_blocks,
                 'session_orb': self.enable_session_orb
             },
-            'state_history_length': len(self._state_history)
+            'state_history_length': len(self._state_history),
+            'fan_out': self.get_stats()
         }
         
         if self._last_state:
@@ -806,7 +1050,8 @@ class CognitionEngine:
                 'sentiment_score': self._last_state.sentiment.score,
                 'consensus': self._last_state.directional_consensus,
                 'combined_confidence': self._last_state.combined_confidence,
-                'trade_allowed': self._last_state.trade_allowed
+                'trade_allowed': self._last_state.trade_allowed,
+                'missed_modules': list(self._last_state.missed_modules)
             }
         
         if self._regime_classifier:
@@ -891,7 +1136,9 @@ def create_cognition_engine(
         enable_session_orb=cognition_config.get('enable_session_orb', True),
         model_dir=cognition_config.get('model_dir'),
         hektor_adapter=hektor_adapter,
-        hektor_retriever=hektor_retriever
+        hektor_retriever=hektor_retriever,
+        deadline_ms=cognition_config.get('deadline_ms', 250.0),
+        max_workers=cognition_config.get('max_workers', 4)
     )
 
 
@@ -450,7 +450,8 @@ class ExitOracle:
         # Regime check
         if self._regime_classifier:
             try:
-                state = self._regime_classifier.classify(market_data)
+                from .inference import get_inference_cache
+                state = get_inference_cache().classify(self._regime_classifier, market_data, position.symbol)
                 # Adverse regime for position
                 if position.direction == 'long' and state.regime.value == 'bear':
                     factor += 0.3
@@ -465,7 +466,8 @@ class ExitOracle:
         # Prediction check
         if self._price_predictor:
             try:
-                prediction = self._price_predictor.predict(market_data)
+                from .inference import get_inference_cache
+                prediction = get_inference_cache().predict(self._price_predictor, market_data, position.symbol)
                 # Prediction against position
                 if position.direction == 'long' and prediction.direction.value == 'short':
                     factor += prediction.confidence * 0.2
@@ -0,0 +1,249 @@
+"""
+Inference Cache - One Forward Pass per Model per Bar
+
+should_trade(), signal enhancement and exit evaluation each ran the price
+predictor and the regime classifier from scratch on the same frame, several
+times per cycle and again per open position. This cache memoizes model
+outputs per (model, symbol, timeframe, newest bar, model version), so every
+consumer after the first reuses the result, and batches the misses of
+several symbols into one PricePredictor.predict_batch() call (a single
+float32 matrix multiply).
+
+The newest bar is identified by its timestamp, the frame length and its
+close, so a still-forming bar that ticks is recomputed rather than served
+stale. A model's version (PricePredictor.model_version) changes whenever
+its weights do, which retires its cached outputs.
+
+Models run outside the cache lock, so different models (the engine's
+concurrent fan-out) compute in parallel; concurrent requests for the same
+key wait for the one computation already in flight instead of repeating it.
+
+Usage:
+    cache = get_inference_cache()
+    prediction = cache.predict(predictor, df, symbol='EURUSD')
+    predictions = cache.predict_many(predictor, {'EURUSD': df1, 'GBPUSD': df2})
+    regime = cache.classify(classifier, df, symbol='EURUSD')
+
+Part of Cthulu Cognition Engine v5.2.33
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from .price_predictor import PricePredictor, PricePrediction
+from .regime_classifier import MarketRegimeClassifier, RegimeState
+
+logger = logging.getLogger("cthulu.cognition.inference")
+
+
+def bar_key(data: pd.DataFrame, symbol: Optional[str] = None,
+            timeframe: Optional[Any] = None) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Identity of a frame's newest bar: (symbol, timeframe, bar time, bars, close).
+
+    Symbol and timeframe fall back to df.attrs. Returns None for frames that
+    cannot be keyed (empty, no close column).
+    """
+    if data is None or len(data) == 0 or 'close' not in data.columns:
+        return None
+    symbol = symbol or data.attrs.get('symbol')
+    timeframe = timeframe if timeframe is not None else data.attrs.get('timeframe')
+    return (symbol, timeframe, data.index[-1], len(data), float(data['close'].iat[-1]))
+
+
+def model_version(model: Any) -> Hashable:
+    """Version of a model's weights (0 for models that are never retrained)."""
+    return getattr(model, 'model_version', 0)
+
+
+class InferenceCache:
+    """
+    LRU memo of model outputs keyed by bar and model version.
+
+    Thread-safe. Entries are small result objects; max_entries bounds the
+    cache across symbols, timeframes and models.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._inflight: Dict[Tuple[Hashable, ...], Future] = {}
+        self._lock = threading.RLock()
+        self._stats: Dict[str, int] = {}
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._stats = {'hits': 0, 'misses': 0, 'batches': 0, 'batched_rows': 0, 'uncached': 0,
+                       'shared': 0}
+
+    def _get(self, key: Tuple[Hashable, ...]) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return value
+
+    def _put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def memoize(self, model_name: str, model: Any, data: pd.DataFrame,
+                compute: Callable[[pd.DataFrame], Any], symbol: Optional[str] = None,
+                timeframe: Optional[Any] = None) -> Any:
+        """
+        compute(data) once per (model, bar, version); later calls reuse it.
+
+        Frames without a usable bar key are computed without caching.
+        """
+        key = bar_key(data, symbol, timeframe)
+        if key is None:
+            with self._lock:
+                self._stats['uncached'] += 1
+            return compute(data)
+        key = (model_name, id(model), model_version(model)) + key
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = pending = Future()
+                self._stats['misses'] += 1
+                owner = True
+            else:
+                self._stats['shared'] += 1
+                owner = False
+
+        if not owner:
+            return pending.result()
+        try:
+            value = compute(data)
+        except BaseException as e:
+            self._settle({key: pending}, error=e)
+            raise
+        self._settle({key: pending}, {key: value})
+        return value
+
+    def _settle(self, pending: Dict[Tuple[Hashable, ...], Future],
+                values: Optional[Dict[Tuple[Hashable, ...], Any]] = None,
+                error: Optional[BaseException] = None) -> None:
+        """Store computed values and release callers waiting on them."""
+        with self._lock:
+            for key in pending:
+                self._inflight.pop(key, None)
+                if error is None:
+                    self._put(key, values[key])
+        for key, future in pending.items():
+            if error is None:
+                future.set_result(values[key])
+            else:
+                future.set_exception(error)
+
+    def predict(self, predictor: PricePredictor, data: pd.DataFrame,
+                symbol: Optional[str] = None, timeframe: Optional[Any] = None) -> PricePrediction:
+        """PricePredictor.predict(data), once per bar."""
+        return self.memoize('predictor', predictor, data, predictor.predict, symbol, timeframe)
+
+    def predict_many(self, predictor: PricePredictor, frames: Dict[str, pd.DataFrame],
+                     timeframe: Optional[Any] = None) -> Dict[str, PricePrediction]:
+        """
+        Predictions for several symbols; all cache misses share one batched forward pass.
+
+        Args:
+            predictor: PricePredictor
+            frames: symbol -> OHLCV frame
+            timeframe: Timeframe of the frames (optional, part of the key)
+
+        Returns:
+            symbol -> PricePrediction
+        """
+        results: Dict[str, PricePrediction] = {}
+        batch: List[Tuple[str, Optional[Tuple[Hashable, ...]]]] = []
+        owned: Dict[Tuple[Hashable, ...], Future] = {}
+        waiting: Dict[str, Future] = {}
+        prefix = ('predictor', id(predictor), model_version(predictor))
+        with self._lock:
+            for symbol, data in frames.items():
+                key = bar_key(data, symbol, timeframe)
+                if key is None:
+                    batch.append((symbol, None))
+                    self._stats['uncached'] += 1
+                    continue
+                key = prefix + key
+                value = self._get(key)
+                if value is not None:
+                    results[symbol] = value
+                elif key in self._inflight:
+                    waiting[symbol] = self._inflight[key]
+                    self._stats['shared'] += 1
+                else:
+                    owned[key] = self._inflight[key] = Future()
+                    batch.append((symbol, key))
+                    self._stats['misses'] += 1
+            if batch:
+                self._stats['batches'] += 1
+                self._stats['batched_rows'] += len(batch)
+
+        if batch:
+            try:
+                predictions = predictor.predict_batch([frames[symbol] for symbol, _ in batch])
+            except BaseException as e:
+                self._settle(owned, error=e)
+                raise
+            computed = {}
+            for (symbol, key), prediction in zip(batch, predictions):
+                results[symbol] = prediction
+                if key is not None:
+                    computed[key] = prediction
+            self._settle(owned, computed)
+        for symbol, future in waiting.items():
+            results[symbol] = future.result()
+        return {symbol: results[symbol] for symbol in frames}
+
+    def classify(self, classifier: MarketRegimeClassifier, data: pd.DataFrame,
+                 symbol: Optional[str] = None, timeframe: Optional[Any] = None) -> RegimeState:
+        """
+        Cognition regime for the frame's bar.
+
+        Frames published to the regime service use its per-bar snapshot;
+        others are classified once per bar here.
+        """
+        from .regime_service import get_regime_service
+
+        state = get_regime_service().regime_state(data, classifier, symbol)
+        if state is not None:
+            return state
+        return self.memoize('regime', classifier, data, classifier.classify, symbol, timeframe)
+
+    def clear(self) -> None:
+        """Drop all cached outputs and counters."""
+        with self._lock:
+            self._entries.clear()
+            self._reset_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            return stats
+
+
+# Module-level singleton for easy access
+_cache: Optional[InferenceCache] = None
+
+
+def get_inference_cache(**kwargs) -> InferenceCache:
+    """Get or create the inference cache singleton."""
+    global _cache
+    if _cache is None:
+        _cache = InferenceCache(**kwargs)
+    return _cache
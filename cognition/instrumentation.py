@@ -1,6 +1,7 @@
 """
 ML instrumentation and lightweight collector.
-Writes JSONL entries to `training/data/raw/` and provides simple rotate-by-size logic.
+Writes JSONL entries (or a columnar event log, see cthulu.utils.event_log)
+to `training/data/raw/` and provides simple rotate-by-size logic.
 """
 from __future__ import annotations
 import os
@@ -12,21 +13,34 @@ from threading import Lock, Thread
 from queue import Queue, Empty
 from typing import Dict, Any, Optional
 
+from cthulu.utils.event_log import EventLogWriter, EXTENSION as EVENT_LOG_EXTENSION
+
 BASE = os.path.join(os.path.dirname(__file__), 'data', 'raw')
 os.makedirs(BASE, exist_ok=True)
 
 class MLDataCollector:
     """Non-blocking JSONL event collector using a background writer thread.
 
+    With log_format='columnar' events go to a chunked columnar event log
+    (one typed column per payload key, indexed by event type and time) that
+    training reads back with cthulu.utils.event_log.scan_event_logs. Rows are
+    written in chunks, at least every `chunk_seconds`, so an unclean exit can
+    lose up to that much; the file stays readable without its footer.
+
     Usage:
         collector = MLDataCollector()
         collector.record_event('order', {...})  # returns quickly
         collector.close()  # flushes queued events and stops writer thread
     """
-    def __init__(self, prefix: str = 'events', rotate_size_bytes: int = 10_000_000, queue_max: int = 10000):
+    def __init__(self, prefix: str = 'events', rotate_size_bytes: int = 10_000_000, queue_max: int = 10000,
+                 log_format: str = 'jsonl', chunk_seconds: float = 30.0):
+        if log_format not in ('jsonl', 'columnar'):
+            raise ValueError(f"Unknown ML log format: {log_format}")
         self.prefix = prefix
         self.rotate_size_bytes = rotate_size_bytes
-        self._queue: Queue[str] = Queue(maxsize=queue_max)
+        self.log_format = log_format
+        self.chunk_seconds = chunk_seconds
+        self._queue: Queue = Queue(maxsize=queue_max)
         self._stop_marker = object()
         self._thread = Thread(target=self._writer_loop, name=f"ml-writer-{self.prefix}", daemon=True)
         self._open_path: Optional[str] = None
@@ -36,13 +50,18 @@ class MLDataCollector:
 
     def _path(self):
         ts = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+        if self.log_format == 'columnar':
+            return os.path.join(BASE, f"{self.prefix}.{ts}{EVENT_LOG_EXTENSION}")
         return os.path.join(BASE, f"{self.prefix}.{ts}.jsonl.gz")
 
     def _ensure_rotated(self):
         # Only called from writer thread under _lock
         if self._open_handle:
             try:
-                size = os.path.getsize(self._open_path)
+                if self.log_format == 'columnar':
+                    size = self._open_handle.bytes_written
+                else:
+                    size = os.path.getsize(self._open_path)
             except Exception:
                 size = 0
             if size >= self.rotate_size_bytes:
@@ -54,8 +73,11 @@ class MLDataCollector:
                 self._open_path = None
         if not self._open_handle:
             self._open_path = self._path()
-            # open in text append mode on gzip
-            self._open_handle = gzip.open(self._open_path, 'at', encoding='utf-8')
+            if self.log_format == 'columnar':
+                self._open_handle = EventLogWriter(self._open_path, max_buffer_seconds=self.chunk_seconds)
+            else:
+                # open in text append mode on gzip
+                self._open_handle = gzip.open(self._open_path, 'at', encoding='utf-8')
 
     def _writer_loop(self):
         buffer = []
@@ -99,7 +121,12 @@ class MLDataCollector:
         with self._lock:
             try:
                 self._ensure_rotated()
-                if self._open_handle:
+                if self._open_handle and self.log_format == 'columnar':
+                    for ts, event_type, payload in buffer:
+                        self._open_handle.append(event_type, payload, ts=ts)
+                    # Writes only the event types whose chunk is full or due
+                    self._open_handle.flush()
+                elif self._open_handle:
                     for line in buffer:
                         try:
                             self._open_handle.write(line + "\n")
@@ -123,18 +150,24 @@ class MLDataCollector:
                     pass
 
     def record_event(self, event_type: str, payload: Dict[str, Any]):
+        now = datetime.utcnow()
         entry = {
-            'ts': datetime.utcnow().isoformat() + 'Z',
+            'ts': now.isoformat() + 'Z',
             'event_type': event_type,
             'payload': payload
         }
-        line = json.dumps(entry, default=str)
+        if self.log_format == 'columnar':
+            # Snapshot the payload; its keys become columns in the writer thread
+            item = (now, event_type, dict(payload) if isinstance(payload, dict) else {'value': payload})
+        else:
+            item = json.dumps(entry, default=str)
         try:
             # Non-blocking put with small timeout to avoid stalling application
-            self._queue.put(line, timeout=0.1)
+            self._queue.put(item, timeout=0.1)
         except Exception:
             # Queue full or other issue; fallback to best-effort synchronous write
             try:
+                line = json.dumps(entry, default=str)
                 fallback = os.path.join(BASE, f"{self.prefix}.fallback.{int(time.time())}.jsonl")
                 with open(fallback, 'a', encoding='utf-8') as f:
                     f.write(line + "\n")
@@ -130,6 +130,10 @@ class PricePredictor:
         self._loss_history: List[float] = []
         self._accuracy_history: List[float] = []
         
+        # Bumped whenever weights change; keys memoized inference results
+        self.model_version = 0
+        self._inference_cache: Optional[Tuple[int, Tuple[np.ndarray, ...]]] = None
+        
         # Load model if path provided
         if model_path and os.path.exists(model_path):
             self.load(model_path)
@@ -293,41 +297,81 @@ class PricePredictor:
         Returns:
             PricePrediction with direction, confidence, and probabilities
         """
-        try:
-            features = self.extract_features(df)
-            features_norm = self._normalize_features(features)
-            
-            # Forward pass
-            _, _, probs = self._forward(features_norm.reshape(1, -1))
-            probs = probs[0]
-            
-            # Determine direction (argmax)
-            direction_idx = np.argmax(probs)
-            direction = self.DIRECTIONS[direction_idx]
-            confidence = float(probs[direction_idx])
-            
-            # Calculate expected move
-            expected_move = self._estimate_expected_move(df, direction, confidence)
-            
-            return PricePrediction(
-                direction=direction,
-                confidence=confidence,
-                probabilities={d.value: float(probs[i]) for i, d in enumerate(self.DIRECTIONS)},
-                expected_move_pct=expected_move,
-                horizon_bars=self.prediction_horizon,
-                features_used=self.feature_count
-            )
+        return self.predict_batch([df])[0]
+    
+    def predict_batch(self, frames: List[pd.DataFrame]) -> List[PricePrediction]:
+        """
+        Predict price direction for several frames (e.g. one per symbol).
+        
+        Feature vectors are stacked into one matrix and run through a single
+        float32 forward pass. Frames whose features cannot be extracted get
+        the neutral fallback prediction.
+        
+        Args:
+            frames: OHLCV DataFrames
             
-        except Exception as e:
-            logger.error(f"Prediction error: {e}")
-            return PricePrediction(
-                direction=PredictionDirection.NEUTRAL,
-                confidence=0.33,
-                probabilities={d.value: 0.33 for d in self.DIRECTIONS},
-                expected_move_pct=0.0,
-                horizon_bars=self.prediction_horizon,
-                features_used=0
-            )
+        Returns:
+            One PricePrediction per frame, in order
+        """
+        predictions: List[Optional[PricePrediction]] = [None] * len(frames)
+        rows, valid = [], []
+        for i, df in enumerate(frames):
+            try:
+                rows.append(self.extract_features(df))
+                valid.append(i)
+            except Exception as e:
+                logger.error(f"Prediction error: {e}")
+                predictions[i] = self._neutral_prediction()
+        
+        if rows:
+            try:
+                probs = self._infer(self._normalize_features(np.vstack(rows)))
+                for row, i in enumerate(valid):
+                    predictions[i] = self._to_prediction(frames[i], probs[row])
+            except Exception as e:
+                logger.error(f"Prediction error: {e}")
+                for i in valid:
+                    predictions[i] = self._neutral_prediction()
+        return predictions
+    
+    def _infer(self, x: np.ndarray) -> np.ndarray:
+        """Inference-only forward pass in float32 (weights cast once per model version)."""
+        if self._inference_cache is None or self._inference_cache[0] != self.model_version:
+            self._inference_cache = (self.model_version, tuple(
+                np.ascontiguousarray(w, dtype=np.float32) for w in (self.W1, self.b1, self.W2, self.b2)
+            ))
+        w1, b1, w2, b2 = self._inference_cache[1]
+        hidden = np.maximum(x.astype(np.float32) @ w1 + b1, 0)
+        return self._softmax(hidden @ w2 + b2).astype(np.float64)
+    
+    def _to_prediction(self, df: pd.DataFrame, probs: np.ndarray) -> PricePrediction:
+        """Build the PricePrediction for one row of class probabilities."""
+        # Determine direction (argmax)
+        direction_idx = int(np.argmax(probs))
+        direction = self.DIRECTIONS[direction_idx]
+        confidence = float(probs[direction_idx])
+        
+        # Calculate expected move
+        expected_move = self._estimate_expected_move(df, direction, confidence)
+        
+        return PricePrediction(
+            direction=direction,
+            confidence=confidence,
+            probabilities={d.value: float(probs[i]) for i, d in enumerate(self.DIRECTIONS)},
+            expected_move_pct=expected_move,
+            horizon_bars=self.prediction_horizon,
+            features_used=self.feature_count
+        )
+    
+    def _neutral_prediction(self) -> PricePrediction:
+        return PricePrediction(
+            direction=PredictionDirection.NEUTRAL,
+            confidence=0.33,
+            probabilities={d.value: 0.33 for d in self.DIRECTIONS},
+            expected_move_pct=0.0,
+            horizon_bars=self.prediction_horizon,
+            features_used=0
+        )
     
     def _estimate_expected_move(self, df: pd.DataFrame, direction: PredictionDirection, confidence: float) -> float:
         """Estimate expected price move based on recent volatility."""
@@ -529,6 +573,7 @@ class PricePredictor:
         self.b2 += self._velocity_b2
         self.W1 += self._velocity_w1
         self.b1 += self._velocity_b1
+        self.model_version += 1
     
     def save(self, path: str):
         """Save model to file."""
@@ -567,6 +612,7 @@ class PricePredictor:
         self.lookback_bars = state['lookback_bars']
         self.prediction_horizon = state['prediction_horizon']
         self.confidence_threshold = state['confidence_threshold']
+        self.model_version += 1
         
         logger.info(f"Model loaded from {path}")
     
@@ -0,0 +1,334 @@
+"""
+Regime Service - One Regime Computation per Bar
+
+The strategy selector, the cognition engine/exit oracle and the adaptive
+drawdown manager each used to derive the market regime from the same bar
+frame on every call. The trading loop now publishes its indicator frame
+here once per cycle; the service computes the regime once per (bar, close)
+for each (symbol, timeframe) and every consumer reuses that snapshot, so a
+still-forming bar is re-classified as its close moves.
+
+The 20-bar return and volatility are kept in a short rolling window per key
+that only folds in the bars which arrived since the previous bar, instead of
+rescanning the whole frame with pct_change().rolling(). The bar that was
+newest on the last update is re-read, since it may still have been forming.
+
+Usage:
+    service = get_regime_service()
+    snapshot = service.update('EURUSD', 'M15', df)     # once per loop cycle
+    snapshot.selector_regime                          # StrategySelector regime
+    state = service.regime_state(df, classifier)      # cognition RegimeState, classified once per bar
+    service.subscribe(drawdown_manager.on_regime_update)
+
+Part of Cthulu Cognition Engine v5.2.33
+"""
+from __future__ import annotations
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .regime_classifier import MarketRegimeClassifier, RegimeState
+
+logger = logging.getLogger("cthulu.cognition.regime_service")
+
+# Bars detect_market_regime() needs before it classifies
+MIN_REGIME_BARS = 50
+
+
+@dataclass
+class RegimeSnapshot:
+    """Regime of one (symbol, timeframe) as of one bar."""
+    symbol: str
+    timeframe: Any
+    bar_time: Any
+    bars: int
+    last_close: float
+    features: Dict[str, float]
+    selector_regime: str
+    regime_state: Optional[RegimeState] = None
+    computed_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def trend_direction(self) -> int:
+        """1 for an up trend, -1 for a down trend, 0 otherwise."""
+        if self.selector_regime.startswith('trending_up'):
+            return 1
+        if self.selector_regime.startswith('trending_down'):
+            return -1
+        return 0
+
+    @property
+    def range_bound(self) -> bool:
+        return self.selector_regime in ('ranging_tight', 'ranging_wide', 'consolidating')
+
+    def drawdown_inputs(self) -> Dict[str, Any]:
+        """Market data dict in the shape AdaptiveDrawdownManager.update() reads."""
+        atr = self.features.get('atr', 0.0)
+        atr_avg = self.features.get('atr_avg', atr)
+        return {
+            'atr': 0.0 if np.isnan(atr) else atr,
+            'atr_avg': 0.0 if np.isnan(atr_avg) else atr_avg,
+            'trend_direction': self.trend_direction,
+            'range_bound': self.range_bound,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'bar_time': str(self.bar_time),
+            'bars': self.bars,
+            'selector_regime': self.selector_regime,
+            'cognition_regime': self.regime_state.regime.value if self.regime_state else None,
+            'features': dict(self.features),
+            'computed_at': self.computed_at.isoformat(),
+        }
+
+
+class _RollingWindow:
+    """Last `size` bars of close and atr for one key, extended incrementally."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.times: Deque[Any] = deque(maxlen=size)
+        self.closes: Deque[float] = deque(maxlen=size)
+        self.atrs: Deque[float] = deque(maxlen=size)
+        self.rows_read = 0
+
+    def sync(self, data: pd.DataFrame) -> None:
+        """Fold in the bars of data newer than the last synced bar."""
+        start = None
+        if self.times:
+            try:
+                pos = data.index.get_loc(self.times[-1])
+            except KeyError:
+                pos = None
+            if isinstance(pos, (int, np.integer)):
+                # Re-read the previously newest bar; it has closed since
+                self.times.pop()
+                self.closes.pop()
+                self.atrs.pop()
+                start = int(pos)
+        if start is None:
+            self.times.clear()
+            self.closes.clear()
+            self.atrs.clear()
+            start = 0
+        start = max(start, len(data) - self.size)
+
+        tail = data.iloc[start:]
+        closes = tail['close'].to_numpy(dtype=float)
+        atrs = tail['atr'].to_numpy(dtype=float) if 'atr' in tail.columns else np.full(len(tail), np.nan)
+        self.times.extend(tail.index)
+        self.closes.extend(closes)
+        self.atrs.extend(atrs)
+        self.rows_read += len(tail)
+
+    def features(self, period: int) -> Dict[str, float]:
+        """period-bar return, std of 1-bar returns and mean atr (NaN when short)."""
+        closes = np.fromiter(self.closes, dtype=float, count=len(self.closes))
+        atrs = np.fromiter(self.atrs, dtype=float, count=len(self.atrs))
+        returns = volatility = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if len(closes) > period:
+                window = closes[-(period + 1):]
+                returns = window[-1] / window[0] - 1
+                volatility = np.std(window[1:] / window[:-1] - 1, ddof=1)
+        tail = atrs[-period:]
+        tail = tail[~np.isnan(tail)]
+        return {
+            'returns': float(returns),
+            'volatility': float(volatility),
+            'atr': float(atrs[-1]) if len(atrs) else np.nan,
+            'atr_avg': float(tail.mean()) if len(tail) else np.nan,
+        }
+
+
+class RegimeService:
+    """
+    Per-(symbol, timeframe) regime cache shared by all regime consumers.
+
+    update() recomputes only when the frame's newest bar or its close
+    changes; lookup() finds the snapshot a consumer's frame was published
+    under (same newest bar and close, symbol from df.attrs when present) so
+    consumers that are not told the symbol can still reuse it.
+    """
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self._snapshots: Dict[Tuple[str, Hashable], RegimeSnapshot] = {}
+        self._windows: Dict[Tuple[str, Hashable], _RollingWindow] = {}
+        self._subscribers: List[Callable[[RegimeSnapshot], None]] = []
+        self._lock = threading.RLock()
+        self._stats: Dict[str, int] = {}
+        self._reset_stats()
+
+    def subscribe(self, callback: Callable[[RegimeSnapshot], None]) -> None:
+        """Call callback(snapshot) whenever a regime is (re)computed."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[RegimeSnapshot], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def update(self, symbol: str, timeframe: Any, data: pd.DataFrame) -> Optional[RegimeSnapshot]:
+        """
+        Publish the latest frame for (symbol, timeframe).
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe the frame's bars are on
+            data: OHLCV frame with indicators, newest bar last
+
+        Returns:
+            Snapshot for the frame's newest bar, or None for an empty frame
+        """
+        if data is None or len(data) == 0 or 'close' not in data.columns:
+            return None
+        key = (symbol, timeframe)
+        bar_time = data.index[-1]
+        last_close = float(data['close'].iat[-1])
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.bar_time == bar_time and snapshot.bars == len(data) \
+                    and snapshot.last_close == last_close:
+                # Same bar and close: nothing the regime depends on has moved
+                self._stats['cached_updates'] += 1
+                return snapshot
+
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = _RollingWindow(self.period + 1)
+            window.sync(data)
+            snapshot = self._compute(symbol, timeframe, data, window)
+            self._snapshots[key] = snapshot
+            self._stats['computations'] += 1
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.debug(f"Regime subscriber {callback!r} failed: {e}")
+        return snapshot
+
+    def _compute(self, symbol: str, timeframe: Any, data: pd.DataFrame,
+                 window: _RollingWindow) -> RegimeSnapshot:
+        from cthulu.strategy.strategy_selector import (
+            MarketRegime as SelectorRegime, regime_inputs, classify_market_regime
+        )
+
+        rolling = window.features(self.period)
+        if len(data) < MIN_REGIME_BARS:
+            features = dict(rolling)
+            selector_regime = SelectorRegime.RANGING_TIGHT
+        else:
+            inputs = regime_inputs(data, returns=rolling['returns'], volatility=rolling['volatility'])
+            features = {k: float(v) for k, v in inputs.items()}
+            features['atr'] = rolling['atr']
+            features['atr_avg'] = rolling['atr_avg']
+            selector_regime = classify_market_regime(inputs)
+
+        logger.debug(f"Regime {symbol} {timeframe} @ {data.index[-1]}: {selector_regime}")
+        return RegimeSnapshot(
+            symbol=symbol,
+            timeframe=timeframe,
+            bar_time=data.index[-1],
+            bars=len(data),
+            last_close=float(data['close'].iat[-1]),
+            features=features,
+            selector_regime=selector_regime,
+        )
+
+    def get(self, symbol: str, timeframe: Any) -> Optional[RegimeSnapshot]:
+        """Latest snapshot for (symbol, timeframe)."""
+        with self._lock:
+            return self._snapshots.get((symbol, timeframe))
+
+    def lookup(self, data: pd.DataFrame, symbol: Optional[str] = None) -> Optional[RegimeSnapshot]:
+        """
+        Snapshot published for this frame, if any.
+
+        Args:
+            data: Frame the consumer was handed
+            symbol: Symbol if the consumer knows it (else df.attrs['symbol'])
+
+        Returns:
+            The single matching snapshot, or None (consumer computes itself)
+        """
+        if data is None or len(data) == 0 or 'close' not in data.columns:
+            return None
+        symbol = symbol or data.attrs.get('symbol')
+        bar_time = data.index[-1]
+        bars = len(data)
+        last_close = data['close'].iat[-1]
+
+        with self._lock:
+            self._stats['lookups'] += 1
+            matches = [
+                s for (sym, _), s in self._snapshots.items()
+                if s.bar_time == bar_time and s.bars == bars and s.last_close == last_close
+                and (symbol is None or sym == symbol)
+            ]
+            if len(matches) != 1:
+                return None
+            self._stats['lookup_hits'] += 1
+            return matches[0]
+
+    def regime_state(self, data: pd.DataFrame, classifier: MarketRegimeClassifier,
+                     symbol: Optional[str] = None) -> Optional[RegimeState]:
+        """
+        Cognition regime for the frame's bar, classified at most once per bar.
+
+        Returns:
+            RegimeState, or None if the frame was not published (caller
+            classifies it directly)
+        """
+        with self._lock:
+            snapshot = self.lookup(data, symbol)
+            if snapshot is None:
+                return None
+            if snapshot.regime_state is None:
+                snapshot.regime_state = classifier.classify(data)
+                self._stats['classifications'] += 1
+            return snapshot.regime_state
+
+    def _reset_stats(self) -> None:
+        self._stats = {'computations': 0, 'cached_updates': 0, 'lookups': 0,
+                       'lookup_hits': 0, 'classifications': 0}
+
+    def clear(self) -> None:
+        """Drop all cached snapshots, rolling windows and counters."""
+        with self._lock:
+            self._snapshots.clear()
+            self._windows.clear()
+            self._reset_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['keys'] = len(self._snapshots)
+            stats['rows_read'] = sum(w.rows_read for w in self._windows.values())
+            return stats
+
+
+# Module-level singleton for easy access
+_service: Optional[RegimeService] = None
+
+
+def get_regime_service(**kwargs) -> RegimeService:
+    """Get or create the regime service singleton."""
+    global _service
+    if _service is None:
+        _service = RegimeService(**kwargs)
+    return _service
@@ -4,19 +4,33 @@ Sentiment Analyzer - The Ears of Cognition
 News and market sentiment integration for trading decisions.
 Aggregates multiple sources: news, economic calendar, fear/greed indices.
 
+Headlines are scored in one pass over their tokens against a precompiled
+lexicon (single words and phrases, negation window tracked during the scan),
+and scores are cached by headline content, so re-polled providers and bulk
+training loads score each distinct headline once. News and calendar events
+are held in stores indexed by symbol/currency and ordered by time.
+
+Usage:
+    analyzer = get_sentiment_analyzer()
+    analyzer.add_news("Gold rallies to record highs", "reuters", ["XAUUSD"])
+    sentiment = analyzer.get_sentiment("XAUUSD")
+    scores = analyzer.keyword_analyzer.analyze_many(historical_headlines)
+
 Part of Cthulu Cognition Engine v5.2.33
 """
 from __future__ import annotations
 import numpy as np
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterable, List, Optional, Any, Callable, Tuple
 from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
 import json
 import os
 import logging
 import re
-from collections import deque
+import threading
+from collections import OrderedDict, deque
 
 logger = logging.getLogger("cthulu.cognition.sentiment")
 
@@ -103,10 +117,24 @@ class EconomicEvent:
         return (self.actual - self.forecast) / abs(self.forecast)
 
 
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
 class KeywordSentimentAnalyzer:
-    """Simple keyword-based sentiment analyzer for headlines."""
+    """
+    Keyword-based sentiment analyzer for headlines.
+    
+    The keyword tables are compiled into a first-token lexicon: each token
+    of a headline costs one dict lookup, phrases are confirmed against the
+    following tokens, and negation is tracked as the position of the last
+    negation word (a keyword is flipped when one occurs in the 3 preceding
+    words). Call compile() after editing the keyword tables directly, or use
+    add_keyword().
+    """
+    
+    NEGATION_WINDOW = 3
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 65536):
         # Bullish keywords with weights
         self.bullish_keywords = {
             'surge': 0.8, 'soar': 0.9, 'rally': 0.7, 'bullish': 0.9, 
@@ -129,36 +157,64 @@ class KeywordSentimentAnalyzer:
         
         # Negation words that flip sentiment
         self.negation_words = {'not', 'no', 'never', "n't", 'without', 'despite'}
-    
-    def analyze(self, text: str) -> float:
-        """
-        Analyze text sentiment.
         
-        Returns: Score from -1 (bearish) to +1 (bullish)
-        """
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
+        # LRU score cache keyed by headline text
+        self.cache_size = cache_size
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self._stats = {'scored': 0, 'cache_hits': 0}
+        
+        self._lexicon: Dict[str, List[Tuple[Tuple[str, ...], float, float]]] = {}
+        self._negations: frozenset = frozenset()
+        self.compile()
+    
+    def compile(self):
+        """Rebuild the lexicon from the keyword tables and drop cached scores."""
+        phrases: Dict[Tuple[str, ...], List[float]] = {}
+        for table, side in ((self.bullish_keywords, 0), (self.bearish_keywords, 1)):
+            for phrase, weight in table.items():
+                tokens = tuple(_WORD_RE.findall(phrase.lower()))
+                if tokens:
+                    phrases.setdefault(tokens, [0.0, 0.0])[side] += weight
+        
+        lexicon: Dict[str, List[Tuple[Tuple[str, ...], float, float]]] = {}
+        for tokens, (bull, bear) in phrases.items():
+            lexicon.setdefault(tokens[0], []).append((tokens[1:], bull, bear))
+        
+        self._lexicon = lexicon
+        self._negations = frozenset(w.lower() for w in self.negation_words)
+        self._scores = OrderedDict()
+    
+    def add_keyword(self, phrase: str, weight: float, bullish: bool = True):
+        """Add a bullish/bearish keyword or phrase and recompile."""
+        table = self.bullish_keywords if bullish else self.bearish_keywords
+        table[phrase.lower()] = weight
+        self.compile()
+    
+    def _score(self, text: str) -> float:
+        words = _WORD_RE.findall(text.lower())
+        lexicon = self._lexicon
+        negations = self._negations
+        window = self.NEGATION_WINDOW
         
         bullish_score = 0.0
         bearish_score = 0.0
+        last_negation = -window - 1
         
         for i, word in enumerate(words):
-            # Check for negation in previous 3 words
-            negated = any(words[max(0, i-3):i].count(neg) > 0 for neg in self.negation_words)
-            
-            if word in self.bullish_keywords:
-                weight = self.bullish_keywords[word]
-                if negated:
-                    bearish_score += weight
-                else:
-                    bullish_score += weight
-            
-            if word in self.bearish_keywords:
-                weight = self.bearish_keywords[word]
-                if negated:
-                    bullish_score += weight
-                else:
-                    bearish_score += weight
+            entries = lexicon.get(word)
+            if entries is not None:
+                negated = i - last_negation <= window
+                for tail, bull, bear in entries:
+                    if tail and tuple(words[i + 1:i + 1 + len(tail)]) != tail:
+                        continue
+                    if negated:
+                        bullish_score += bear
+                        bearish_score += bull
+                    else:
+                        bullish_score += bull
+                        bearish_score += bear
+            if word in negations:
+                last_negation = i
         
         # Normalize to -1 to +1
         total = bullish_score + bearish_score
@@ -166,6 +222,151 @@ class KeywordSentimentAnalyzer:
             return 0.0
         
         return (bullish_score - bearish_score) / max(total, 1.0)
+    
+    def analyze(self, text: str) -> float:
+        """
+        Analyze text sentiment.
+        
+        Returns: Score from -1 (bearish) to +1 (bullish)
+        """
+        score = self._scores.get(text)
+        if score is not None:
+            try:
+                self._scores.move_to_end(text)  # LRU: hits stay cached
+            except KeyError:
+                pass
+            self._stats['cache_hits'] += 1
+            return score
+        
+        score = self._score(text)
+        self._stats['scored'] += 1
+        scores = self._scores
+        if len(scores) >= self.cache_size:
+            try:
+                scores.popitem(last=False)
+            except KeyError:
+                pass
+        scores[text] = score
+        return score
+    
+    def analyze_many(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Score many headlines (e.g. historical news for training).
+        
+        Returns:
+            float64 array of scores aligned with texts
+        """
+        analyze = self.analyze
+        return np.fromiter((analyze(t) for t in texts), dtype=np.float64)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, 'cached': len(self._scores), 'lexicon_tokens': len(self._lexicon)}
+
+
+class NewsStore:
+    """
+    News items indexed by symbol, each list ordered by timestamp.
+    
+    Items older than the retention window are pruned as new ones arrive.
+    Thread-safe.
+    """
+    
+    def __init__(self, retention: timedelta = timedelta(hours=4)):
+        self.retention = retention
+        self._times: Dict[str, List[datetime]] = {}
+        self._items: Dict[str, List[NewsItem]] = {}
+        self._lock = threading.RLock()
+    
+    def add(self, item: NewsItem):
+        with self._lock:
+            for symbol in item.symbols:
+                times = self._times.setdefault(symbol, [])
+                items = self._items.setdefault(symbol, [])
+                pos = bisect_right(times, item.timestamp)
+                times.insert(pos, item.timestamp)
+                items.insert(pos, item)
+            self.prune(datetime.utcnow() - self.retention)
+    
+    def since(self, symbol: str, start: datetime) -> List[NewsItem]:
+        """Items for symbol with timestamp > start, oldest first."""
+        with self._lock:
+            times = self._times.get(symbol)
+            if not times:
+                return []
+            return self._items[symbol][bisect_right(times, start):]
+    
+    def prune(self, before: datetime):
+        """Drop items with timestamp <= before."""
+        with self._lock:
+            for symbol, times in self._times.items():
+                cut = bisect_right(times, before)
+                if cut:
+                    del times[:cut]
+                    del self._items[symbol][:cut]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len({id(item) for items in self._items.values() for item in items})
+
+
+class CalendarStore:
+    """
+    Economic events indexed by currency, each list ordered by scheduled time.
+    
+    Thread-safe.
+    """
+    
+    def __init__(self, retention: timedelta = timedelta(hours=24)):
+        self.retention = retention
+        self._times: Dict[str, List[datetime]] = {}
+        self._events: Dict[str, List[EconomicEvent]] = {}
+        self._lock = threading.RLock()
+    
+    def add(self, event: EconomicEvent, prune: bool = True):
+        with self._lock:
+            times = self._times.setdefault(event.currency, [])
+            pos = bisect_right(times, event.scheduled_time)
+            times.insert(pos, event.scheduled_time)
+            self._events.setdefault(event.currency, []).insert(pos, event)
+            if prune:
+                self.prune(datetime.utcnow() - self.retention)
+    
+    def replace(self, events: Iterable[EconomicEvent]):
+        """Replace the whole calendar (a provider snapshot)."""
+        with self._lock:
+            self._times = {}
+            self._events = {}
+            for event in events:
+                self.add(event, prune=False)
+    
+    def for_currencies(self, currencies: Iterable[str], start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> List[EconomicEvent]:
+        """Events for the currencies scheduled in [start, end], ordered by time."""
+        with self._lock:
+            selected = []
+            for currency in dict.fromkeys(currencies):
+                times = self._times.get(currency)
+                if not times:
+                    continue
+                lo = bisect_left(times, start) if start is not None else 0
+                hi = bisect_right(times, end) if end is not None else len(times)
+                selected.extend(self._events[currency][lo:hi])
+            if len(selected) > 1:
+                selected.sort(key=lambda e: e.scheduled_time)
+            return selected
+    
+    def prune(self, before: datetime):
+        """Drop events scheduled at or before `before`."""
+        with self._lock:
+            for currency, times in self._times.items():
+                cut = bisect_right(times, before)
+                if cut:
+                    del times[:cut]
+                    del self._events[currency][:cut]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(events) for events in self._events.values())
 
 
 class SentimentAnalyzer:
@@ -195,9 +396,9 @@ class SentimentAnalyzer:
         # Sub-analyzers
         self.keyword_analyzer = KeywordSentimentAnalyzer()
         
-        # Caches
-        self._news_cache: List[NewsItem] = []
-        self._calendar_cache: List[EconomicEvent] = []
+        # Stores and caches
+        self._news = NewsStore(retention=timedelta(hours=4))
+        self._calendar = CalendarStore(retention=timedelta(hours=24))
         self._sentiment_cache: Dict[str, SentimentScore] = {}
         self._cache_time: Dict[str, datetime] = {}
         
@@ -308,8 +509,8 @@ class SentimentAnalyzer:
             except Exception as e:
                 logger.warning(f"News provider error: {e}")
         
-        # Fallback: use cached news
-        relevant_news = [n for n in self._news_cache if symbol in n.symbols and n.is_recent]
+        # Fallback: use stored news from the last 4 hours
+        relevant_news = self._news.since(symbol.upper(), datetime.utcnow() - timedelta(hours=4))
         if relevant_news:
             return float(np.mean([n.sentiment_score for n in relevant_news]))
         
@@ -333,7 +534,7 @@ class SentimentAnalyzer:
         if self._calendar_provider:
             try:
                 events_data = self._calendar_provider()
-                self._calendar_cache = [
+                self._calendar.replace(
                     EconomicEvent(
                         name=e['name'],
                         currency=e['currency'],
@@ -344,12 +545,12 @@ class SentimentAnalyzer:
                         previous=e.get('previous')
                     )
                     for e in events_data
-                ]
+                )
             except Exception as e:
                 logger.warning(f"Calendar provider error: {e}")
         
         # Analyze events
-        relevant_events = [e for e in self._calendar_cache if e.currency in currencies]
+        relevant_events = self._calendar.for_currencies(currencies)
         
         if not relevant_events:
             return 0.0
@@ -401,8 +602,8 @@ class SentimentAnalyzer:
         currencies = symbol_currency_map.get(symbol.upper().replace('#', ''), ['USD'])
         
         events = []
-        for e in self._calendar_cache:
-            if e.currency in currencies and (e.is_upcoming or e.surprise_factor is not None):
+        for e in self._calendar.for_currencies(currencies):
+            if e.is_upcoming or e.surprise_factor is not None:
                 events.append({
                     'name': e.name,
                     'currency': e.currency,
@@ -426,10 +627,8 @@ class SentimentAnalyzer:
             symbols=[s.upper() for s in symbols]
         )
         
-        self._news_cache.append(item)
-        
-        # Trim old news
-        self._news_cache = [n for n in self._news_cache if n.is_recent]
+        # Store (prunes news older than 4 hours)
+        self._news.add(item)
         
         logger.debug(f"News added: {headline[:50]}... score={score:.3f}")
     
@@ -454,11 +653,8 @@ class SentimentAnalyzer:
             previous=previous
         )
         
-        self._calendar_cache.append(event)
-        
-        # Remove old events (> 24h past)
-        cutoff = datetime.utcnow() - timedelta(hours=24)
-        self._calendar_cache = [e for e in self._calendar_cache if e.scheduled_time > cutoff]
+        # Store (removes events more than 24h past)
+        self._calendar.add(event)
         
         logger.debug(f"Event added: {name} ({currency}, {impact})")
     
@@ -502,10 +698,11 @@ class SentimentAnalyzer:
     def to_dict(self) -> Dict:
         """Export current state as dictionary."""
         return {
-            'news_count': len(self._news_cache),
-            'events_count': len(self._calendar_cache),
+            'news_count': len(self._news),
+            'events_count': len(self._calendar),
             'cached_symbols': list(self._sentiment_cache.keys()),
-            'history_length': len(self._sentiment_history)
+            'history_length': len(self._sentiment_history),
+            'keyword_scores': self.keyword_analyzer.get_stats()
         }
 
 
@@ -16,6 +16,7 @@ Part of Cthulu v5.2.33 APEX - Entry Quality System
 """
 
 from __future__ import annotations
+import copy
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
@@ -523,6 +524,35 @@ class MarketStructureDetector:
                       s.metadata.get('symbol') == symbol]
         return signals[-limit:]
     
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        Capture fractals, per-symbol structure and signal history.
+        
+        Fractals are only detected on the newest closed bar, so this state
+        cannot be re-derived cheaply after a restart.
+        """
+        return copy.deepcopy({
+            'fractal_length': self.fractal_length,
+            'bull_fractals': self._bull_fractals,
+            'bear_fractals': self._bear_fractals,
+            'market_state': self._market_state,
+            'signal_history': self._signal_history,
+        })
+    
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """Restore state captured by get_warm_state()."""
+        if state.get('fractal_length') != self.fractal_length:
+            self.logger.info("Fractal length changed since snapshot; starting structure state fresh")
+            return
+        self._bull_fractals = list(state.get('bull_fractals', []))
+        self._bear_fractals = list(state.get('bear_fractals', []))
+        self._market_state = dict(state.get('market_state', {}))
+        self._signal_history = list(state.get('signal_history', []))
+        self.logger.info(
+            f"Structure state restored: {len(self._bull_fractals)} high / "
+            f"{len(self._bear_fractals)} low fractals, {len(self._market_state)} symbols"
+        )
+    
     def clear_state(self, symbol: str = None):
         """Clear state for a symbol or all symbols."""
         if symbol:
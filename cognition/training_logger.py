@@ -13,11 +13,16 @@ import gzip
 import logging
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Sequence
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from cthulu.utils.event_log import (
+    EventLogWriter, EXTENSION as EVENT_LOG_EXTENSION, TIME_COLUMN, TimeLike,
+    read_event_logs, scan_event_logs, to_ns
+)
+
 logger = logging.getLogger("cthulu.cognition.training")
 
 
@@ -72,23 +77,33 @@ class TrainingDataLogger:
     """
     Logs trading decisions and outcomes for ML model training.
     
-    Stores data in JSONL format (one JSON per line) with optional gzip compression.
-    Designed for efficient batch training data collection.
+    Stores data as a columnar event log (one typed, compressed column per
+    decision field, indexed by decision time) so training can load a time
+    window and a subset of fields without parsing every record. The legacy
+    JSONL format (optionally gzip-compressed) is still available and read.
     """
     
+    # Event type of decision rows in the columnar log
+    EVENT_TYPE = 'decision'
+    
     def __init__(
         self,
         data_dir: Optional[str] = None,
         compress: bool = True,
-        batch_size: int = 100
+        batch_size: int = 100,
+        log_format: str = 'columnar'
     ):
         self.data_dir = Path(data_dir or os.path.join(
             os.path.dirname(__file__), 'data', 'training'
         ))
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        if log_format not in ('jsonl', 'columnar'):
+            raise ValueError(f"Unknown training log format: {log_format}")
         self.compress = compress
         self.batch_size = batch_size
+        self.log_format = log_format
+        self._writer: Optional[EventLogWriter] = None
         
         # Pending decisions (not yet written)
         self._pending: List[Dict[str, Any]] = []
@@ -97,9 +112,7 @@ class TrainingDataLogger:
         self._active_decisions: Dict[int, TradeDecision] = {}
         
         # Session file
-        session_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
-        ext = ".jsonl.gz" if compress else ".jsonl"
-        self._session_file = self.data_dir / f"decisions_{session_id}{ext}"
+        self._session_file = self._new_session_file()
         
         logger.info(f"TrainingDataLogger initialized: {self._session_file}")
     
@@ -235,13 +248,33 @@ class TrainingDataLogger:
         except Exception as e:
             logger.error(f"Error logging outcome: {e}")
     
+    def _new_session_file(self) -> Path:
+        session_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        if self.log_format == 'columnar':
+            ext = EVENT_LOG_EXTENSION
+        else:
+            ext = ".jsonl.gz" if self.compress else ".jsonl"
+        path = self.data_dir / f"decisions_{session_id}{ext}"
+        n = 1
+        while self.log_format == 'columnar' and path.exists():
+            # A closed event log cannot be appended to
+            path = self.data_dir / f"decisions_{session_id}_{n}{ext}"
+            n += 1
+        return path
+    
     def _flush(self) -> None:
         """Write pending decisions to file."""
         if not self._pending:
             return
         
         try:
-            if self.compress:
+            if self.log_format == 'columnar':
+                if self._writer is None:
+                    self._writer = EventLogWriter(str(self._session_file))
+                for decision in self._pending:
+                    self._writer.append(self.EVENT_TYPE, decision, ts=decision['timestamp'])
+                self._writer.flush(force=True)
+            elif self.compress:
                 with gzip.open(self._session_file, 'at', encoding='utf-8') as f:
                     for decision in self._pending:
                         f.write(json.dumps(decision) + '\n')
@@ -270,30 +303,57 @@ class TrainingDataLogger:
             self._pending = incomplete
             self._flush()
         
+        if self._writer is not None:
+            # Footer index; later decisions go to a new session file
+            self._writer.close()
+            self._writer = None
+            self._session_file = self._new_session_file()
+        
         logger.info(f"TrainingDataLogger closed: {len(self._active_decisions)} incomplete trades")
     
     @staticmethod
-    def load_training_data(data_dir: str, min_date: Optional[str] = None) -> pd.DataFrame:
+    def _session_files(data_dir: str, pattern: str, min_date: Optional[str]) -> List[Path]:
+        files = []
+        for file in sorted(Path(data_dir).glob(pattern)):
+            # Check date filter
+            if min_date:
+                file_date = file.stem.split('_')[1][:8]
+                if file_date < min_date:
+                    continue
+            files.append(file)
+        return files
+    
+    @staticmethod
+    def load_training_data(
+        data_dir: str,
+        min_date: Optional[str] = None,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
         """
         Load training data from files.
         
         Args:
             data_dir: Directory containing training data files
-            min_date: Minimum date to include (YYYYMMDD format)
+            min_date: Minimum session date to include (YYYYMMDD format)
+            start: Earliest decision timestamp to include
+            end: Decision timestamp to stop before
+            columns: Decision fields to load (default all)
             
         Returns:
             DataFrame with all training data
         """
-        data_path = Path(data_dir)
-        records = []
+        frames = []
         
-        for file in data_path.glob("decisions_*.jsonl*"):
-            # Check date filter
-            if min_date:
-                file_date = file.stem.split('_')[1][:8]
-                if file_date < min_date:
-                    continue
-            
+        logs = TrainingDataLogger._session_files(data_dir, f"decisions_*{EVENT_LOG_EXTENSION}", min_date)
+        if logs:
+            frame = read_event_logs(logs, TrainingDataLogger.EVENT_TYPE, start, end, columns)
+            if not frame.empty:
+                frames.append(frame.drop(columns=[TIME_COLUMN]))
+        
+        records = []
+        for file in TrainingDataLogger._session_files(data_dir, "decisions_*.jsonl*", min_date):
             try:
                 if file.suffix == '.gz':
                     with gzip.open(file, 'rt', encoding='utf-8') as f:
@@ -306,10 +366,44 @@ class TrainingDataLogger:
             except Exception as e:
                 logger.warning(f"Error loading {file}: {e}")
         
-        if not records:
+        if records:
+            legacy = pd.DataFrame(records)
+            if start is not None or end is not None:
+                times = pd.to_datetime(legacy['timestamp'], utc=True).astype('int64')
+                keep = pd.Series(True, index=legacy.index)
+                if start is not None:
+                    keep &= times >= to_ns(start)
+                if end is not None:
+                    keep &= times < to_ns(end)
+                legacy = legacy[keep]
+            if columns is not None:
+                legacy = legacy.reindex(columns=list(columns))
+            frames.append(legacy)
+        
+        if not frames:
             return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True, sort=False)
+    
+    @staticmethod
+    def iter_training_data(
+        data_dir: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream decisions from the columnar session logs one batch at a time.
+        
+        Memory stays bounded by the chunk size however long the window is.
         
-        return pd.DataFrame(records)
+        Yields:
+            DataFrame per record batch, with the decision time in '_ts'
+        """
+        logs = TrainingDataLogger._session_files(data_dir, f"decisions_*{EVENT_LOG_EXTENSION}", None)
+        for batch in scan_event_logs(logs, TrainingDataLogger.EVENT_TYPE, start, end, columns):
+            yield batch.to_frame()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get logging statistics."""
@@ -318,6 +412,7 @@ class TrainingDataLogger:
             'pending_decisions': len(self._pending),
             'active_trades': len(self._active_decisions),
             'compress': self.compress,
+            'log_format': self.log_format,
             'batch_size': self.batch_size
         }
 
@@ -5,8 +5,20 @@ Handles MetaTrader 5 terminal connection, session management, and health monitor
 Implements retry logic, rate limiting, and reconnection policies.
 """
 
+import os as _os
+import sys as _sys
+
 try:
-    import MetaTrader5 as mt5  # type: ignore
+    if _os.getenv('CTHULU_MT5_SIM'):
+        # Offline runs: a simulated terminal replaying historical bars stands in for MT5
+        try:
+            from .simulated_terminal import terminal_from_env
+        except ImportError:
+            from cthulu.connector.simulated_terminal import terminal_from_env
+        mt5 = terminal_from_env()
+        _sys.modules['MetaTrader5'] = mt5
+    else:
+        import MetaTrader5 as mt5  # type: ignore
 except Exception:
     # Minimal stub of MetaTrader5 for testing and import-time resilience
     class _Mt5Stub:
@@ -30,6 +42,7 @@ except Exception:
 import os
 import time
 import logging
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from datetime import datetime
@@ -38,9 +51,18 @@ from pathlib import Path
 try:
     # Prefer a relative import when running inside the package (pytest collection)
     from ..market.tick_manager import TickManager
+    from ..utils.latency import LatencyHistogram
 except Exception:
     # Fallback to absolute import for scripts run outside the package context
     from cthulu.market.tick_manager import TickManager
+    from cthulu.utils.latency import LatencyHistogram
+
+
+# Symbol properties that do not change during a terminal session
+STATIC_SPEC_KEYS = (
+    'name', 'digits', 'point', 'volume_min', 'volume_max', 'volume_step',
+    'contract_size', 'currency_base', 'currency_profit', 'currency_margin',
+)
 
 
 @dataclass
@@ -58,6 +80,12 @@ class ConnectionConfig:
     start_on_missing: bool = False
     # Seconds to wait after starting terminal for it to become responsive
     start_wait: int = 5
+    # Seconds a successful terminal call vouches for the connection before
+    # another terminal_info() liveness probe is made
+    liveness_interval: float = 5.0
+    # Minimum seconds between terminal requests (0 = no throttling; the
+    # terminal serializes requests itself)
+    min_request_interval: float = 0.0
 
 
 class MT5Connector:
@@ -69,6 +97,9 @@ class MT5Connector:
     - Health checks and session monitoring
     - Rate limiting and timeout handling
     - Exception consolidation
+    - Session caches: resolved symbol names and static symbol specs
+      (cleared on connect/disconnect)
+    - Amortized liveness checks and per-request latency histograms
     """
     
     def __init__(self, config: ConnectionConfig):
@@ -83,7 +114,16 @@ class MT5Connector:
         self.logger = logging.getLogger("cthulu.connector")
         self._lock = Lock()
         self._last_request_time = 0.0
-        self._min_request_interval = 0.1  # 100ms between requests
+        self._min_request_interval = float(config.min_request_interval or 0.0)
+        # Monotonic time of the last successful terminal call
+        self._last_alive = 0.0
+        # Session caches, invalid after a reconnect; session_id lets shared
+        # caches (utils.cache.symbol_spec) key on the current session
+        self.session_id = 0
+        self._symbol_map: Dict[str, str] = {}
+        self._symbol_specs: Dict[str, Dict[str, Any]] = {}
+        # Per-operation terminal request latency
+        self.latency_histograms: Dict[str, LatencyHistogram] = {}
         # Tick manager for lightweight tick caching and subscriptions
         try:
             self._tick_manager = TickManager(self)
@@ -244,6 +284,8 @@ class MT5Connector:
                     if credential_mode and account_info.login != self.config.login:
                         raise ConnectionError(f"Connected to wrong account: {account_info.login}")                    
                     self.connected = True
+                    self._reset_session_cache()
+                    self._mark_alive()
                     # Mask account login in logs to avoid leaking full account numbers
                     acct_display = str(self.config.login)
                     acct_masked = acct_display if len(acct_display) <= 4 else f"****{acct_display[-4:]}"
@@ -293,7 +335,55 @@ class MT5Connector:
             if self.connected:
                 mt5.shutdown()
                 self.connected = False
+                self._reset_session_cache()
                 self.logger.info("Disconnected from MT5")
+
+    def _reset_session_cache(self):
+        """Forget resolved symbols, specs and liveness (new terminal session)."""
+        self._symbol_map.clear()
+        self._symbol_specs.clear()
+        self._last_alive = 0.0
+        self.session_id += 1
+
+    def _mark_alive(self):
+        """Record that the terminal just answered a request."""
+        self._last_alive = time.monotonic()
+
+    @contextmanager
+    def _timed(self, op: str):
+        """Record the latency of a terminal request under `op`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            hist = self.latency_histograms.get(op)
+            if hist is None:
+                hist = self.latency_histograms.setdefault(op, LatencyHistogram())
+            hist.observe((time.perf_counter() - start) * 1000.0)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency summary (count, mean, p50/p90/p99, max in ms) per request type."""
+        return {op: hist.to_dict() for op, hist in self.latency_histograms.items()}
+
+    def _ensure_connected(self, reconnect: bool = False) -> bool:
+        """
+        Cheap liveness gate for data calls.
+
+        A successful terminal call within `liveness_interval` seconds counts
+        as proof of life; only after that does it fall back to a
+        terminal_info() probe.
+
+        Args:
+            reconnect: Attempt connect() if the probe fails
+
+        Returns:
+            True if the connection can be used
+        """
+        if self.connected and time.monotonic() - self._last_alive < self.config.liveness_interval:
+            return True
+        if self.is_connected():
+            return True
+        return reconnect and self.connect()
                 
     def is_connected(self) -> bool:
         """
@@ -307,8 +397,12 @@ class MT5Connector:
             
         try:
             # Test connection with terminal info request
-            info = mt5.terminal_info()
-            return info is not None and info.connected
+            with self._timed('terminal_info'):
+                info = mt5.terminal_info()
+            alive = info is not None and info.connected
+            if alive:
+                self._mark_alive()
+            return alive
         except Exception as e:
             self.logger.error(f"Connection check failed: {e}")
             self.connected = False
@@ -327,14 +421,16 @@ class MT5Connector:
         return self.connect()
         
     def _rate_limit(self):
-        """Apply rate limiting between requests."""
-        current_time = time.time()
+        """Apply rate limiting between terminal requests (not cache hits)."""
+        if self._min_request_interval <= 0:
+            return
+        current_time = time.monotonic()
         elapsed = current_time - self._last_request_time
         
         if elapsed < self._min_request_interval:
             time.sleep(self._min_request_interval - elapsed)
             
-        self._last_request_time = time.time()
+        self._last_request_time = time.monotonic()
         
     def _normalize_symbol(self, s: str) -> str:
         """Return normalized symbol string for comparison (alphanumeric upper-case)."""
@@ -353,7 +449,11 @@ class MT5Connector:
             if not sel:
                 return None
             self._rate_limit()
-            return mt5.symbol_info_tick(sel)
+            with self._timed('symbol_info_tick'):
+                tick = mt5.symbol_info_tick(sel)
+            if tick is not None:
+                self._mark_alive()
+            return tick
         except Exception:
             return None
 
@@ -419,7 +519,20 @@ class MT5Connector:
         """Ensure symbol is selected in MT5 using broker defaults.
 
         Returns the actual selected symbol name on success, or None on failure.
-        
+        Resolved names are remembered for the session, so repeat calls make
+        no terminal request.
+        """
+        symbol_map = getattr(self, '_symbol_map', None)
+        if symbol_map is not None and symbol in symbol_map:
+            return symbol_map[symbol]
+        resolved = self._select_symbol(symbol)
+        if resolved and symbol_map is not None:
+            symbol_map[symbol] = resolved
+        return resolved
+
+    def _select_symbol(self, symbol: str) -> Optional[str]:
+        """Select `symbol` in the terminal, falling back to normalized matching.
+
         Simplified approach: Uses exact symbol name from broker.
         Users should specify the exact symbol name as shown in MT5.
         """
@@ -481,29 +594,11 @@ class MT5Connector:
         Returns:
             List of rate dictionaries or None on error
         """
-        if not self.is_connected():
-            # Try to connect first
-            if not self.connect():
-                self.logger.error("Not connected to MT5")
-                return None
+        rates = self.get_rates_array(symbol, timeframe, count, start_pos)
+        if rates is None:
+            return None
             
-        self._rate_limit()
-        
         try:
-            # Ensure symbol is selected (flexible)
-            selected = self.ensure_symbol_selected(symbol)
-            if not selected:
-                self.logger.error(f"Failed to select symbol {symbol}")
-                return None
-                
-            # Fetch rates
-            rates = mt5.copy_rates_from_pos(selected, timeframe, start_pos, count)
-            
-            if rates is None or len(rates) == 0:
-                error = mt5.last_error()
-                self.logger.error(f"Failed to fetch rates: {error}")
-                return None
-                
             # Convert numpy array to list of dicts
             return [
                 {
@@ -522,6 +617,53 @@ class MT5Connector:
         except Exception as e:
             self.logger.error(f"Error fetching rates: {e}", exc_info=True)
             return None
+    
+    def get_rates_array(
+        self,
+        symbol: str,
+        timeframe: int,
+        count: int,
+        start_pos: int = 0
+    ) -> Optional[Any]:
+        """
+        Fetch historical rates as the terminal's structured array.
+        
+        Same request as get_rates() without the per-bar dict conversion;
+        'time' stays in epoch seconds. Used by the bar store.
+        
+        Returns:
+            numpy structured array (oldest first) or None on error
+        """
+        if not self._ensure_connected(reconnect=True):
+            self.logger.error("Not connected to MT5")
+            return None
+            
+        self._rate_limit()
+        
+        try:
+            # Ensure symbol is selected (cached after the first call)
+            selected = self.ensure_symbol_selected(symbol)
+            if not selected:
+                self.logger.error(f"Failed to select symbol {symbol}")
+                return None
+                
+            # Fetch rates
+            with self._timed('copy_rates_from_pos'):
+                rates = mt5.copy_rates_from_pos(selected, timeframe, start_pos, count)
+            
+            if rates is None or len(rates) == 0:
+                error = mt5.last_error()
+                self.logger.error(f"Failed to fetch rates: {error}")
+                # Re-probe the terminal and re-select the symbol next time
+                self._last_alive = 0.0
+                self._symbol_map.pop(symbol, None)
+                return None
+            self._mark_alive()
+            return rates
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching rates: {e}", exc_info=True)
+            return None
             
     def get_account_info(self) -> Optional[Dict[str, Any]]:
         """
@@ -530,15 +672,17 @@ class MT5Connector:
         Returns:
             Dictionary with account details or None
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             return None
             
         self._rate_limit()
         
         try:
-            account = mt5.account_info()
+            with self._timed('account_info'):
+                account = mt5.account_info()
             if account is None:
                 return None
+            self._mark_alive()
                 
             return {
                 'login': account.login,
@@ -567,17 +711,19 @@ class MT5Connector:
         Returns:
             Dictionary with symbol details or None
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             return None
             
         self._rate_limit()
         
         try:
-            info = mt5.symbol_info(symbol)
+            with self._timed('symbol_info'):
+                info = mt5.symbol_info(self._symbol_map.get(symbol, symbol))
             if info is None:
                 return None
+            self._mark_alive()
                 
-            return {
+            result = {
                 'name': info.name,
                 'bid': info.bid,
                 'ask': info.ask,
@@ -595,14 +741,34 @@ class MT5Connector:
                 'currency_profit': getattr(info, 'currency_profit', None),
                 'currency_margin': getattr(info, 'currency_margin', None),
             }
+            self._symbol_specs[symbol] = {k: result[k] for k in STATIC_SPEC_KEYS}
+            return result
         except Exception as e:
             self.logger.error(f"Error fetching symbol info: {e}")
             return None
 
+    def get_symbol_spec(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Static symbol specification (point, digits, volume limits, contract
+        size, currencies), fetched once per terminal session.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Dictionary with STATIC_SPEC_KEYS or None
+        """
+        spec = self._symbol_specs.get(symbol)
+        if spec is not None:
+            return spec
+        if self.get_symbol_info(symbol) is None:
+            return None
+        return self._symbol_specs.get(symbol)
+
     def get_point_value(self, symbol: str) -> Optional[float]:
         """Return point value in account currency for one point movement for symbol."""
         try:
-            info = self.get_symbol_info(symbol)
+            info = self.get_symbol_spec(symbol)
             if not info:
                 return None
             point = info.get('point')
@@ -619,7 +785,7 @@ class MT5Connector:
     def get_point(self, symbol: str) -> float:
         """Return point size for symbol (minimum price increment)."""
         try:
-            info = self.get_symbol_info(symbol)
+            info = self.get_symbol_spec(symbol)
             if not info:
                 return 0.00001  # default for forex
             point = info.get('point')
@@ -632,7 +798,7 @@ class MT5Connector:
     def get_min_lot(self, symbol: str) -> float:
         """Return minimum tradable lot size for symbol."""
         try:
-            info = self.get_symbol_info(symbol)
+            info = self.get_symbol_spec(symbol)
             if not info:
                 return 0.01
             return float(info.get('volume_min', 0.01))
@@ -666,15 +832,16 @@ class MT5Connector:
         """
         try:
             # Ensure connected
-            if not self.is_connected():
+            if not self._ensure_connected():
                 return None
             self._rate_limit()
 
-            try:
-                positions = mt5.positions_get(ticket=ticket)
-            except Exception:
-                # Some MT5 builds do not accept ticket kw; fall back to all positions
-                positions = mt5.positions_get()
+            with self._timed('positions_get'):
+                try:
+                    positions = mt5.positions_get(ticket=ticket)
+                except Exception:
+                    # Some MT5 builds do not accept ticket kw; fall back to all positions
+                    positions = mt5.positions_get()
 
             if not positions:
                 return None
@@ -710,7 +877,8 @@ class MT5Connector:
             List of position dictionaries
         """
         try:
-            positions = mt5.positions_get()
+            with self._timed('positions_get'):
+                positions = mt5.positions_get()
             if not positions:
                 return []
             
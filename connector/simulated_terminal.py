@@ -0,0 +1,897 @@
+"""
+Simulated MT5 Terminal
+
+Drop-in stand-in for the MetaTrader5 package, backed by historical bar
+files, for running and load-testing the full bot where no terminal is
+available (Linux CI, benchmarks, soak tests).
+
+Implements the API surface the system uses: initialize/shutdown/
+last_error, terminal_info, account_info, symbols_get, symbol_select,
+symbol_info, symbol_info_tick, copy_rates_from_pos, positions_get,
+order_send (market deals, closes and SL/TP modification),
+order_calc_margin and history_deals_get, plus the order/retcode/
+timeframe constants.
+
+Market time runs on a SimClock that is either accelerated (speed x wall
+time) or stepped manually. Intrabar prices follow a deterministic
+open -> low/high -> high/low -> close path, so ticks, fills and SL/TP
+triggers never see beyond the current instant. Fills pay the bar spread
+plus random adverse slippage; requests can be delayed by injected
+latency.
+
+Enable for a whole run by pointing CTHULU_MT5_SIM at a JSON config
+(see SimulatedTerminal.from_config); the connector then uses the
+simulated terminal instead of importing MetaTrader5.
+
+Usage:
+    terminal = SimulatedTerminal.from_files({'EURUSD': 'data/EURUSD_M1.csv'}, speed=600)
+    install(terminal)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger("cthulu.connector.simulated_terminal")
+
+
+# MT5 constants (values match the MetaTrader5 package)
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_SLTP = 6
+ORDER_TIME_GTC = 0
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_REASON_CLIENT = 0
+DEAL_REASON_SL = 4
+DEAL_REASON_TP = 5
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_INVALID_STOPS = 10016
+TRADE_RETCODE_MARKET_CLOSED = 10018
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+
+# Timeframe constant -> seconds (plain minute counts are accepted as well)
+TIMEFRAME_SECONDS = {
+    TIMEFRAME_M1: 60, TIMEFRAME_M5: 300, TIMEFRAME_M15: 900, TIMEFRAME_M30: 1800,
+    TIMEFRAME_H1: 3600, TIMEFRAME_H4: 14400, TIMEFRAME_D1: 86400,
+}
+
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<i8'), ('spread', '<i4'), ('real_volume', '<i8'),
+])
+
+TerminalInfo = namedtuple('TerminalInfo', 'connected trade_allowed name build')
+AccountInfo = namedtuple(
+    'AccountInfo',
+    'login server balance equity margin margin_free margin_level profit currency leverage trade_allowed'
+)
+SymbolInfo = namedtuple(
+    'SymbolInfo',
+    'name bid ask spread digits point trade_mode trade_stops_level trade_freeze_level '
+    'volume_min volume_max volume_step trade_contract_size currency_base currency_profit '
+    'currency_margin visible select'
+)
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc')
+TradePosition = namedtuple(
+    'TradePosition',
+    'ticket identifier symbol type volume price_open price_current sl tp profit magic time comment'
+)
+TradeDeal = namedtuple(
+    'TradeDeal',
+    'ticket order position_id symbol type entry volume price profit commission magic time reason comment'
+)
+OrderSendResult = namedtuple(
+    'OrderSendResult', 'retcode deal order volume price bid ask comment request_id profit request'
+)
+
+
+def timeframe_seconds(timeframe: Any) -> int:
+    """Seconds per bar for an MT5 timeframe constant, minute count or 'TIMEFRAME_*' name."""
+    if isinstance(timeframe, str):
+        timeframe = globals().get(timeframe.upper(), None) or int(timeframe)
+    timeframe = int(timeframe)
+    if timeframe in TIMEFRAME_SECONDS:
+        return TIMEFRAME_SECONDS[timeframe]
+    return timeframe * 60
+
+
+def load_bars(path: str) -> pd.DataFrame:
+    """
+    Read an OHLC file (csv or parquet) into a frame indexed by UTC bar time.
+
+    Accepts a 'time'/'datetime'/'date' column (datetimes or epoch seconds)
+    or a datetime index; column names are case-insensitive.
+    """
+    if str(path).endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    df.columns = [str(c).lower() for c in df.columns]
+    for name in ('time', 'datetime', 'date', 'timestamp'):
+        if name in df.columns:
+            col = df.pop(name)
+            if np.issubdtype(col.dtype, np.number):
+                df.index = pd.to_datetime(col, unit='s')
+            else:
+                df.index = pd.to_datetime(col)
+            break
+    df.index = pd.DatetimeIndex(df.index).tz_localize(None)
+    if 'tick_volume' not in df.columns:
+        df['tick_volume'] = df['volume'] if 'volume' in df.columns else 1
+    return df.sort_index()
+
+
+@dataclass
+class SymbolSpec:
+    """Contract specification of a simulated symbol"""
+    name: str
+    point: float = 0.00001
+    digits: int = 5
+    contract_size: float = 100000.0
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+    volume_step: float = 0.01
+    stops_level: int = 0
+    spread_points: int = 10        # Used when the bar file has no spread column
+    currency_base: str = "EUR"
+    currency_profit: str = "USD"
+
+
+@dataclass
+class SimulationConfig:
+    """Account and execution realism settings"""
+    balance: float = 10000.0
+    leverage: int = 100
+    currency: str = "USD"
+    login: int = 0
+    server: str = "Cthulu-Sim"
+    commission_per_lot: float = 0.0     # Charged per side
+    max_slippage_points: int = 0        # Adverse slippage drawn uniformly from [0, max]
+    request_latency_ms: float = 0.0     # Injected into every terminal call
+    order_latency_ms: float = 0.0       # Additional delay before an order fills
+    seed: Optional[int] = None
+
+
+class SimClock:
+    """
+    Market clock for the simulation.
+
+    With a speed the clock runs `speed` market seconds per wall second;
+    with speed=None it only moves through advance().
+    """
+
+    def __init__(self, start: datetime, speed: Optional[float] = 60.0):
+        self._start = pd.Timestamp(start).tz_localize(None) if pd.Timestamp(start).tzinfo else pd.Timestamp(start)
+        self.speed = speed
+        self._wall_start = time.monotonic()
+        self._offset = 0.0
+        self._lock = threading.Lock()
+
+    def now(self) -> pd.Timestamp:
+        with self._lock:
+            elapsed = self._offset
+            if self.speed:
+                elapsed += (time.monotonic() - self._wall_start) * self.speed
+        return self._start + pd.Timedelta(seconds=elapsed)
+
+    def advance(self, seconds: float) -> pd.Timestamp:
+        """Move market time forward (both modes)."""
+        with self._lock:
+            self._offset += seconds
+        return self.now()
+
+    def sleep(self, market_seconds: float) -> None:
+        """Let `market_seconds` of market time pass."""
+        if self.speed:
+            time.sleep(market_seconds / self.speed)
+        else:
+            self.advance(market_seconds)
+
+
+class _SymbolData:
+    """Bar arrays of one symbol plus the intrabar price path."""
+
+    def __init__(self, spec: SymbolSpec, bars: pd.DataFrame):
+        self.spec = spec
+        self.times = (bars.index.values.astype('datetime64[s]').astype(np.int64))
+        self.open = bars['open'].values.astype(float)
+        self.high = bars['high'].values.astype(float)
+        self.low = bars['low'].values.astype(float)
+        self.close = bars['close'].values.astype(float)
+        self.tick_volume = bars['tick_volume'].values.astype(np.int64)
+        if 'spread' in bars.columns:
+            self.spread = bars['spread'].values.astype(np.int64)
+        else:
+            self.spread = np.full(len(bars), spec.spread_points, dtype=np.int64)
+        steps = np.diff(self.times)
+        self.bar_seconds = int(np.median(steps)) if len(steps) else 60
+        self._resampled: Dict[int, Tuple[np.ndarray, ...]] = {}
+
+    def index_at(self, ts: int) -> int:
+        """Index of the bar containing epoch second `ts` (-1 before the data)."""
+        return int(np.searchsorted(self.times, ts, side='right')) - 1
+
+    def path(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Intrabar path of bar i as (fractions of the bar, prices)."""
+        o, h, l, c = self.open[i], self.high[i], self.low[i], self.close[i]
+        if c >= o:
+            prices = np.array([o, l, h, c])
+        else:
+            prices = np.array([o, h, l, c])
+        return np.array([0.0, 1 / 3, 2 / 3, 1.0]), prices
+
+    def price_at(self, i: int, frac: float) -> float:
+        fracs, prices = self.path(i)
+        return float(np.interp(frac, fracs, prices))
+
+    def range_until(self, i: int, frac: float) -> Tuple[float, float]:
+        """(low, high) traded in bar i up to `frac` of its duration."""
+        fracs, prices = self.path(i)
+        seen = prices[fracs <= frac]
+        current = np.interp(frac, fracs, prices)
+        return float(min(seen.min(), current)), float(max(seen.max(), current))
+
+    def resampled(self, seconds: int) -> Tuple[np.ndarray, ...]:
+        """Completed-bar arrays aggregated to `seconds` (cached)."""
+        if seconds <= self.bar_seconds:
+            return self.times, self.open, self.high, self.low, self.close, self.tick_volume, self.spread
+        cached = self._resampled.get(seconds)
+        if cached is None:
+            bucket = self.times // seconds * seconds
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+            ends = np.r_[starts[1:], len(bucket)] - 1
+            cached = (
+                bucket[starts],
+                self.open[starts],
+                np.maximum.reduceat(self.high, starts),
+                np.minimum.reduceat(self.low, starts),
+                self.close[ends],
+                np.add.reduceat(self.tick_volume, starts),
+                self.spread[ends],
+            )
+            self._resampled[seconds] = cached
+        return cached
+
+
+@dataclass
+class _Position:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    magic: int
+    time: int
+    comment: str = ""
+    profit: float = 0.0
+    price_current: float = 0.0
+
+
+class SimulatedTerminal:
+    """
+    Simulated MetaTrader 5 terminal.
+
+    Usage:
+        terminal = SimulatedTerminal({'EURUSD': bars}, speed=None)
+        terminal.initialize()
+        terminal.clock.advance(3600)
+        rates = terminal.copy_rates_from_pos('EURUSD', TIMEFRAME_M15, 0, 100)
+    """
+
+    def __init__(
+        self,
+        bars: Dict[str, pd.DataFrame],
+        specs: Optional[Dict[str, SymbolSpec]] = None,
+        config: Optional[SimulationConfig] = None,
+        start: Optional[datetime] = None,
+        speed: Optional[float] = 60.0,
+        warmup_bars: int = 500
+    ):
+        """
+        Initialize terminal.
+
+        Args:
+            bars: Symbol -> OHLC frame (see load_bars)
+            specs: Symbol -> SymbolSpec (defaults inferred per symbol)
+            config: Account/execution settings
+            start: Market start time (defaults to `warmup_bars` into the data)
+            speed: Market seconds per wall second (None = manual clock)
+            warmup_bars: History available before the default start
+        """
+        if not bars:
+            raise ValueError("SimulatedTerminal needs bars for at least one symbol")
+        self.config = config or SimulationConfig()
+        self._symbols: Dict[str, _SymbolData] = {}
+        for name, frame in bars.items():
+            spec = (specs or {}).get(name) or self._infer_spec(name, frame)
+            self._symbols[name] = _SymbolData(spec, frame)
+
+        if start is None:
+            first = next(iter(self._symbols.values()))
+            i = min(warmup_bars, len(first.times) - 1)
+            start = pd.Timestamp(int(first.times[i]), unit='s')
+        self.clock = SimClock(start, speed=speed)
+
+        self._lock = threading.RLock()
+        self._rng = random.Random(self.config.seed)
+        self._initialized = False
+        self._last_error: Tuple[int, str] = (1, 'Success')
+        self._login = self.config.login
+        self.balance = float(self.config.balance)
+        self._positions: Dict[int, _Position] = {}
+        self._deals: List[TradeDeal] = []
+        self._next_ticket = 1000
+        self._last_processed = int(self.clock.now().timestamp())
+        self.calls: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------ setup
+
+    @staticmethod
+    def _infer_spec(name: str, frame: pd.DataFrame) -> SymbolSpec:
+        """Guess point/digits from the price data."""
+        sample = frame['close'].astype(float).iloc[:500]
+        digits = 0
+        for d in range(0, 6):
+            if np.allclose(sample, sample.round(d), atol=1e-9):
+                digits = d
+                break
+        else:
+            digits = 5
+        contract = 100000.0 if sample.mean() < 50 else 100.0
+        return SymbolSpec(name=name, point=10 ** -digits, digits=digits, contract_size=contract,
+                          currency_base=name[:3], currency_profit=name[3:6] or "USD")
+
+    @classmethod
+    def from_files(
+        cls,
+        files: Dict[str, str],
+        specs: Optional[Dict[str, SymbolSpec]] = None,
+        **kwargs
+    ) -> 'SimulatedTerminal':
+        """Build from symbol -> bar file paths (csv or parquet)."""
+        return cls({symbol: load_bars(path) for symbol, path in files.items()}, specs=specs, **kwargs)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'SimulatedTerminal':
+        """
+        Build from a JSON-style config:
+
+            {"symbols": {"EURUSD": {"bars": "data/EURUSD_M1.csv", "point": 0.00001}},
+             "speed": 600, "start": "2024-03-01T00:00:00", "warmup_bars": 500,
+             "account": {"balance": 10000, "max_slippage_points": 3, "order_latency_ms": 40}}
+        """
+        files, specs = {}, {}
+        for name, sym_cfg in config.get('symbols', {}).items():
+            sym_cfg = dict(sym_cfg)
+            files[name] = sym_cfg.pop('bars')
+            if sym_cfg:
+                specs[name] = SymbolSpec(name=name, **sym_cfg)
+        account = SimulationConfig(**config.get('account', {}))
+        start = config.get('start')
+        return cls.from_files(
+            files, specs=specs or None, config=account,
+            start=pd.Timestamp(start) if start else None,
+            speed=config.get('speed', 60.0),
+            warmup_bars=config.get('warmup_bars', 500),
+        )
+
+    # ------------------------------------------------------------- internals
+
+    def _call(self, name: str) -> None:
+        """Per-request bookkeeping: latency injection and SL/TP processing."""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.config.request_latency_ms:
+            self._delay(self.config.request_latency_ms)
+        self._process_stops()
+
+    def _delay(self, ms: float) -> None:
+        if self.clock.speed:
+            time.sleep(ms / 1000.0)
+        else:
+            self.clock.advance(ms / 1000.0)
+
+    def _now_ts(self) -> int:
+        return int(self.clock.now().timestamp())
+
+    def _quote(self, symbol: str, ts: Optional[int] = None) -> Optional[Tuple[float, float, int]]:
+        """(bid, ask, spread points) at epoch second ts, None outside the data."""
+        data = self._symbols.get(symbol)
+        if data is None:
+            return None
+        ts = self._now_ts() if ts is None else ts
+        i = data.index_at(ts)
+        if i < 0 or ts >= data.times[-1] + data.bar_seconds:
+            return None
+        frac = min(1.0, (ts - data.times[i]) / data.bar_seconds)
+        bid = round(data.price_at(i, frac), data.spec.digits)
+        spread = int(data.spread[i])
+        return bid, round(bid + spread * data.spec.point, data.spec.digits), spread
+
+    def _profit(self, pos: _Position, bid: float, ask: float, volume: Optional[float] = None) -> float:
+        spec = self._symbols[pos.symbol].spec
+        volume = pos.volume if volume is None else volume
+        if pos.type == POSITION_TYPE_BUY:
+            move = bid - pos.price_open
+        else:
+            move = pos.price_open - ask
+        return move * volume * spec.contract_size
+
+    def _process_stops(self) -> None:
+        """Trigger SL/TP on the price path traded since the last call."""
+        with self._lock:
+            now = self._now_ts()
+            since = self._last_processed
+            self._last_processed = now
+            if not self._positions:
+                return
+            for pos in list(self._positions.values()):
+                if not pos.sl and not pos.tp:
+                    continue
+                hit = self._first_stop_hit(pos, since, now)
+                if hit is not None:
+                    price, ts, reason = hit
+                    self._close(pos, pos.volume, price, ts, reason,
+                                comment='[sl]' if reason == DEAL_REASON_SL else '[tp]')
+
+    def _first_stop_hit(self, pos: _Position, since: int, now: int) -> Optional[Tuple[float, int, int]]:
+        """First SL/TP touch of `pos` between two market times."""
+        data = self._symbols[pos.symbol]
+        first = max(data.index_at(max(since, pos.time)), 0)
+        last = data.index_at(now)
+        if last < 0:
+            return None
+        spread = data.spread[first:last + 1] * data.spec.point
+        for offset, i in enumerate(range(first, last + 1)):
+            frac = 1.0 if i < last else min(1.0, (now - data.times[i]) / data.bar_seconds)
+            low, high = data.range_until(i, frac)
+            if pos.type == POSITION_TYPE_BUY:
+                # Long positions close on the bid
+                if pos.sl and low <= pos.sl:
+                    return min(pos.sl, data.open[i]), int(data.times[i]), DEAL_REASON_SL
+                if pos.tp and high >= pos.tp:
+                    return max(pos.tp, data.open[i]), int(data.times[i]), DEAL_REASON_TP
+            else:
+                # Short positions close on the ask
+                ask_low, ask_high = low + spread[offset], high + spread[offset]
+                if pos.sl and ask_high >= pos.sl:
+                    return max(pos.sl, data.open[i] + spread[offset]), int(data.times[i]), DEAL_REASON_SL
+                if pos.tp and ask_low <= pos.tp:
+                    return min(pos.tp, data.open[i] + spread[offset]), int(data.times[i]), DEAL_REASON_TP
+        return None
+
+    def _new_ticket(self) -> int:
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _record_deal(self, pos: _Position, deal_type: int, entry: int, volume: float, price: float,
+                     profit: float, ts: int, reason: int, comment: str) -> TradeDeal:
+        commission = -self.config.commission_per_lot * volume
+        deal = TradeDeal(
+            ticket=self._new_ticket(), order=self._new_ticket(), position_id=pos.ticket,
+            symbol=pos.symbol, type=deal_type, entry=entry, volume=volume, price=price,
+            profit=profit, commission=commission, magic=pos.magic, time=ts, reason=reason,
+            comment=comment
+        )
+        self._deals.append(deal)
+        self.balance += profit + commission
+        return deal
+
+    def _close(self, pos: _Position, volume: float, price: float, ts: int, reason: int,
+               comment: str = "") -> TradeDeal:
+        spec = self._symbols[pos.symbol].spec
+        if pos.type == POSITION_TYPE_BUY:
+            profit = (price - pos.price_open) * volume * spec.contract_size
+            deal_type = DEAL_TYPE_SELL
+        else:
+            profit = (pos.price_open - price) * volume * spec.contract_size
+            deal_type = DEAL_TYPE_BUY
+        deal = self._record_deal(pos, deal_type, DEAL_ENTRY_OUT, volume, price, round(profit, 2),
+                                 ts, reason, comment)
+        pos.volume = round(pos.volume - volume, 8)
+        if pos.volume <= 1e-9:
+            del self._positions[pos.ticket]
+        return deal
+
+    def _margin(self, symbol: str, volume: float, price: float) -> float:
+        spec = self._symbols[symbol].spec
+        return volume * spec.contract_size * price / max(self.config.leverage, 1)
+
+    def _floating(self) -> Tuple[float, float]:
+        """(floating profit, used margin) of open positions."""
+        profit = margin = 0.0
+        for pos in self._positions.values():
+            quote = self._quote(pos.symbol)
+            if quote is None:
+                continue
+            bid, ask, _ = quote
+            profit += self._profit(pos, bid, ask)
+            margin += self._margin(pos.symbol, pos.volume, pos.price_open)
+        return profit, margin
+
+    @staticmethod
+    def _result(retcode: int, request: Dict[str, Any], comment: str, **kwargs) -> OrderSendResult:
+        values = dict(deal=0, order=0, volume=0.0, price=0.0, bid=0.0, ask=0.0, request_id=0, profit=0.0)
+        values.update(kwargs)
+        return OrderSendResult(retcode=retcode, comment=comment, request=request, **values)
+
+    # ------------------------------------------------------------ public API
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self._call('initialize')
+        login = kwargs.get('login')
+        if login:
+            self._login = login
+        self._initialized = True
+        self._last_error = (1, 'Success')
+        return True
+
+    def login(self, login: int, password: str = "", server: str = "", timeout: int = 60000) -> bool:
+        self._login = login
+        return True
+
+    def shutdown(self) -> bool:
+        self._initialized = False
+        return True
+
+    def last_error(self) -> Tuple[int, str]:
+        return self._last_error
+
+    def version(self) -> Tuple[int, int, str]:
+        return (500, 0, 'simulated')
+
+    def terminal_info(self) -> Optional[TerminalInfo]:
+        self._call('terminal_info')
+        if not self._initialized:
+            return None
+        return TerminalInfo(connected=True, trade_allowed=True, name='Cthulu Simulated Terminal', build=0)
+
+    def account_info(self) -> Optional[AccountInfo]:
+        self._call('account_info')
+        if not self._initialized:
+            return None
+        with self._lock:
+            profit, margin = self._floating()
+            equity = self.balance + profit
+            return AccountInfo(
+                login=self._login, server=self.config.server, balance=round(self.balance, 2),
+                equity=round(equity, 2), margin=round(margin, 2),
+                margin_free=round(equity - margin, 2),
+                margin_level=round(equity / margin * 100, 2) if margin else 0.0,
+                profit=round(profit, 2), currency=self.config.currency,
+                leverage=self.config.leverage, trade_allowed=True
+            )
+
+    def symbols_get(self, group: Optional[str] = None) -> Tuple[SymbolInfo, ...]:
+        self._call('symbols_get')
+        return tuple(info for info in (self.symbol_info(name) for name in self._symbols) if info)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        self._call('symbol_select')
+        return symbol in self._symbols
+
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        self._call('symbol_info')
+        data = self._symbols.get(symbol)
+        if data is None:
+            return None
+        spec = data.spec
+        quote = self._quote(symbol)
+        bid, ask, spread = quote if quote else (0.0, 0.0, spec.spread_points)
+        return SymbolInfo(
+            name=symbol, bid=bid, ask=ask, spread=spread, digits=spec.digits, point=spec.point,
+            trade_mode=4, trade_stops_level=spec.stops_level, trade_freeze_level=0,
+            volume_min=spec.volume_min, volume_max=spec.volume_max, volume_step=spec.volume_step,
+            trade_contract_size=spec.contract_size, currency_base=spec.currency_base,
+            currency_profit=spec.currency_profit, currency_margin=spec.currency_base,
+            visible=True, select=True
+        )
+
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        self._call('symbol_info_tick')
+        quote = self._quote(symbol)
+        if quote is None:
+            return None
+        bid, ask, _ = quote
+        now = self.clock.now()
+        return Tick(time=int(now.timestamp()), bid=bid, ask=ask, last=bid, volume=0,
+                    time_msc=int(now.timestamp() * 1000))
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: Any, start_pos: int, count: int) -> Optional[np.ndarray]:
+        """
+        Bars ending at the current market time, oldest first. As in MT5,
+        position 0 is the bar still forming (partial OHLC up to now).
+        """
+        self._call('copy_rates_from_pos')
+        data = self._symbols.get(symbol)
+        if data is None:
+            self._last_error = (-2, f'Unknown symbol {symbol}')
+            return None
+        seconds = timeframe_seconds(timeframe)
+        now = self._now_ts()
+        times, opens, highs, lows, closes, volumes, spreads = data.resampled(seconds)
+
+        period_start = now // seconds * seconds if seconds > data.bar_seconds else int(data.times[max(data.index_at(now), 0)])
+        n_done = int(np.searchsorted(times, period_start, side='left'))
+        rates = np.empty(n_done + 1, dtype=RATE_DTYPE)
+        rates['time'][:n_done] = times[:n_done]
+        rates['open'][:n_done] = opens[:n_done]
+        rates['high'][:n_done] = highs[:n_done]
+        rates['low'][:n_done] = lows[:n_done]
+        rates['close'][:n_done] = closes[:n_done]
+        rates['tick_volume'][:n_done] = volumes[:n_done]
+        rates['spread'][:n_done] = spreads[:n_done]
+        rates['real_volume'] = 0
+
+        # Forming bar: base bars of the current period traded so far
+        first = int(np.searchsorted(data.times, period_start, side='left'))
+        last = data.index_at(now)
+        if last < first or last < 0 or now >= data.times[-1] + data.bar_seconds:
+            rates = rates[:n_done]
+        else:
+            frac = min(1.0, (now - data.times[last]) / data.bar_seconds)
+            low, high = data.range_until(last, frac)
+            if last > first:
+                high = max(high, data.high[first:last].max())
+                low = min(low, data.low[first:last].min())
+            rates[n_done] = (period_start, data.open[first], high, low, data.price_at(last, frac),
+                             int(data.tick_volume[first:last + 1].sum()), int(data.spread[last]), 0)
+
+        end = len(rates) - start_pos
+        if end <= 0:
+            return None
+        return rates[max(0, end - count):end]
+
+    def positions_get(self, symbol: Optional[str] = None, ticket: Optional[int] = None,
+                      group: Optional[str] = None) -> Tuple[TradePosition, ...]:
+        self._call('positions_get')
+        with self._lock:
+            result = []
+            for pos in self._positions.values():
+                if symbol is not None and pos.symbol != symbol:
+                    continue
+                if ticket is not None and pos.ticket != ticket:
+                    continue
+                quote = self._quote(pos.symbol)
+                if quote is not None:
+                    bid, ask, _ = quote
+                    pos.price_current = bid if pos.type == POSITION_TYPE_BUY else ask
+                    pos.profit = round(self._profit(pos, bid, ask), 2)
+                result.append(TradePosition(
+                    ticket=pos.ticket, identifier=pos.ticket, symbol=pos.symbol, type=pos.type,
+                    volume=pos.volume, price_open=pos.price_open, price_current=pos.price_current,
+                    sl=pos.sl, tp=pos.tp, profit=pos.profit, magic=pos.magic, time=pos.time,
+                    comment=pos.comment
+                ))
+            return tuple(result)
+
+    def history_deals_get(self, *args, **kwargs) -> Tuple[TradeDeal, ...]:
+        """Deals filtered by position, ticket, or date range (from_date/to_date or positional)."""
+        self._call('history_deals_get')
+        position = kwargs.get('position')
+        ticket = kwargs.get('ticket')
+        if position is not None:
+            return tuple(d for d in self._deals if d.position_id == position)
+        if ticket is not None:
+            return tuple(d for d in self._deals if d.ticket == ticket)
+        start = kwargs.get('from_date', args[0] if len(args) > 0 else None)
+        end = kwargs.get('to_date', args[1] if len(args) > 1 else None)
+
+        def epoch(value):
+            if value is None:
+                return None
+            if isinstance(value, (int, float)):
+                return int(value)
+            ts = pd.Timestamp(value)
+            return int((ts.tz_convert(None) if ts.tzinfo else ts).timestamp())
+
+        lo, hi = epoch(start), epoch(end)
+        return tuple(d for d in self._deals
+                     if (lo is None or d.time >= lo) and (hi is None or d.time <= hi))
+
+    def order_calc_margin(self, action: int, symbol: str, volume: float, price: float) -> Optional[float]:
+        self._call('order_calc_margin')
+        if symbol not in self._symbols:
+            return None
+        return round(self._margin(symbol, volume, price), 2)
+
+    def order_send(self, request: Dict[str, Any]) -> Optional[OrderSendResult]:
+        """Execute a market deal, position close or SL/TP modification."""
+        self._call('order_send')
+        if not isinstance(request, dict):
+            self._last_error = (-2, 'Invalid request')
+            return None
+        if self.config.order_latency_ms:
+            self._delay(self.config.order_latency_ms)
+            self._process_stops()
+
+        action = request.get('action')
+        with self._lock:
+            if action == TRADE_ACTION_SLTP:
+                return self._modify(request)
+            if action == TRADE_ACTION_DEAL:
+                return self._deal(request)
+        return self._result(TRADE_RETCODE_INVALID, request, 'Unsupported action')
+
+    def _modify(self, request: Dict[str, Any]) -> OrderSendResult:
+        pos = self._positions.get(int(request.get('position', 0) or 0))
+        if pos is None:
+            return self._result(TRADE_RETCODE_POSITION_CLOSED, request, 'Position not found')
+        sl = float(request.get('sl') or 0.0)
+        tp = float(request.get('tp') or 0.0)
+        quote = self._quote(pos.symbol)
+        if quote is None:
+            return self._result(TRADE_RETCODE_MARKET_CLOSED, request, 'Market closed')
+        bid, ask, _ = quote
+        if not self._stops_valid(pos.symbol, pos.type, bid, ask, sl, tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, request, 'Invalid stops')
+        pos.sl, pos.tp = sl, tp
+        return self._result(TRADE_RETCODE_DONE, request, 'Request executed', order=pos.ticket,
+                            volume=pos.volume, bid=bid, ask=ask)
+
+    def _stops_valid(self, symbol: str, side: int, bid: float, ask: float, sl: float, tp: float) -> bool:
+        spec = self._symbols[symbol].spec
+        min_dist = spec.stops_level * spec.point
+        if side == POSITION_TYPE_BUY:
+            return (not sl or sl <= bid - min_dist) and (not tp or tp >= bid + min_dist)
+        return (not sl or sl >= ask + min_dist) and (not tp or tp <= ask - min_dist)
+
+    def _deal(self, request: Dict[str, Any]) -> OrderSendResult:
+        symbol = request.get('symbol')
+        data = self._symbols.get(symbol)
+        if data is None:
+            return self._result(TRADE_RETCODE_INVALID, request, f'Unknown symbol {symbol}')
+        spec = data.spec
+        quote = self._quote(symbol)
+        if quote is None:
+            return self._result(TRADE_RETCODE_MARKET_CLOSED, request, 'Market closed')
+        bid, ask, _ = quote
+
+        volume = float(request.get('volume', 0.0))
+        steps = (volume - spec.volume_min) / spec.volume_step
+        if volume < spec.volume_min - 1e-9 or volume > spec.volume_max + 1e-9 or abs(steps - round(steps)) > 1e-6:
+            return self._result(TRADE_RETCODE_INVALID_VOLUME, request, 'Invalid volume')
+
+        order_type = int(request.get('type', ORDER_TYPE_BUY))
+        slippage = self._rng.randint(0, self.config.max_slippage_points) if self.config.max_slippage_points else 0
+        deviation = request.get('deviation')
+        if deviation is not None and slippage > int(deviation):
+            return self._result(TRADE_RETCODE_REQUOTE, request, 'Requote', bid=bid, ask=ask)
+        if order_type == ORDER_TYPE_BUY:
+            price = round(ask + slippage * spec.point, spec.digits)
+        else:
+            price = round(bid - slippage * spec.point, spec.digits)
+        now = self._now_ts()
+
+        ticket = request.get('position')
+        if ticket:
+            pos = self._positions.get(int(ticket))
+            if pos is None:
+                return self._result(TRADE_RETCODE_POSITION_CLOSED, request, 'Position not found')
+            volume = min(volume, pos.volume)
+            deal = self._close(pos, volume, price, now, DEAL_REASON_CLIENT, comment=request.get('comment', ''))
+            return self._result(TRADE_RETCODE_DONE, request, 'Request executed', deal=deal.ticket,
+                                order=deal.order, volume=volume, price=price, bid=bid, ask=ask,
+                                profit=deal.profit)
+
+        side = POSITION_TYPE_BUY if order_type == ORDER_TYPE_BUY else POSITION_TYPE_SELL
+        sl = float(request.get('sl') or 0.0)
+        tp = float(request.get('tp') or 0.0)
+        if not self._stops_valid(symbol, side, bid, ask, sl, tp):
+            return self._result(TRADE_RETCODE_INVALID_STOPS, request, 'Invalid stops')
+        profit, used = self._floating()
+        if self._margin(symbol, volume, price) > self.balance + profit - used:
+            return self._result(TRADE_RETCODE_NO_MONEY, request, 'No money')
+
+        pos = _Position(
+            ticket=self._new_ticket(), symbol=symbol, type=side, volume=volume, price_open=price,
+            sl=sl, tp=tp, magic=int(request.get('magic', 0)), time=now,
+            comment=str(request.get('comment', '')), price_current=price
+        )
+        self._positions[pos.ticket] = pos
+        deal = self._record_deal(pos, DEAL_TYPE_BUY if side == POSITION_TYPE_BUY else DEAL_TYPE_SELL,
+                                 DEAL_ENTRY_IN, volume, price, 0.0, now, DEAL_REASON_CLIENT, pos.comment)
+        return self._result(TRADE_RETCODE_DONE, request, 'Request executed', deal=deal.ticket,
+                            order=pos.ticket, volume=volume, price=price, bid=bid, ask=ask)
+
+
+# Expose the MT5 constants on the terminal so it can stand in for the module
+for _name, _value in list(globals().items()):
+    if _name.isupper() and isinstance(_value, int) and not _name.startswith('_'):
+        setattr(SimulatedTerminal, _name, _value)
+
+
+def _rebind(previous: Any, replacement: Any) -> None:
+    """Point every module-level `mt5` bound to `previous` at `replacement`."""
+    for module in list(sys.modules.values()):
+        try:
+            if module is not None and previous is not None and getattr(module, 'mt5', None) is previous:
+                module.mt5 = replacement
+        except Exception:
+            continue
+
+
+def install(terminal: SimulatedTerminal) -> SimulatedTerminal:
+    """
+    Route every MetaTrader5 user in the process to `terminal`.
+
+    Registers it as the MetaTrader5 module (for local `import MetaTrader5`)
+    and rebinds the module-level `mt5` name of already imported modules
+    that took it from the connector.
+    """
+    connector_module = sys.modules.get('cthulu.connector.mt5_connector')
+    previous = getattr(connector_module, 'mt5', None) if connector_module else None
+    sys.modules['MetaTrader5'] = terminal
+    _rebind(previous, terminal)
+    if connector_module is not None:
+        connector_module.mt5 = terminal
+    return terminal
+
+
+@contextmanager
+def installed(terminal: SimulatedTerminal):
+    """Install `terminal` for the duration of a with-block, then restore the previous MT5 module."""
+    connector_module = sys.modules.get('cthulu.connector.mt5_connector')
+    previous = getattr(connector_module, 'mt5', None) if connector_module else None
+    had_module = 'MetaTrader5' in sys.modules
+    previous_module = sys.modules.get('MetaTrader5')
+    install(terminal)
+    try:
+        yield terminal
+    finally:
+        _rebind(terminal, previous)
+        if connector_module is not None and previous is not None:
+            connector_module.mt5 = previous
+        if had_module:
+            sys.modules['MetaTrader5'] = previous_module
+        else:
+            sys.modules.pop('MetaTrader5', None)
+
+
+def terminal_from_env(var: str = 'CTHULU_MT5_SIM') -> Optional[SimulatedTerminal]:
+    """Build a terminal from the JSON config file named by an environment variable."""
+    path = os.getenv(var)
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    terminal = SimulatedTerminal.from_config(config)
+    logger.info(f"Using simulated MT5 terminal from {path} (speed={terminal.clock.speed})")
+    return terminal
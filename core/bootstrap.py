@@ -19,6 +19,7 @@ from dataclasses import dataclass
 
 from cthulu.connector.mt5_connector import MT5Connector, ConnectionConfig
 from cthulu.data.layer import DataLayer
+from cthulu.data.bar_store import BarStore
 from cthulu.risk.evaluator import RiskEvaluator, RiskLimits
 from cthulu.execution.engine import ExecutionEngine
 from cthulu.position.tracker import PositionTracker
@@ -53,6 +54,7 @@ class SystemComponents:
     indicators: list = None
     exit_strategies: list = None
     trade_adoption_policy: Optional[Any] = None
+    bar_store: Optional[BarStore] = None  # Shared multi-timeframe bars for per-position consumers
     
     # Optional components
     ml_collector: Any = None
@@ -76,6 +78,9 @@ class SystemComponents:
     
     # ML Enhancement Manager (auto-initialized with trading loop)
     ml_enhancement_manager: Any = None
+    
+    # Warm-restart snapshotter (resumed hot state + periodic snapshots)
+    warm_state: Any = None
 
 
 class CthuluBootstrap:
@@ -160,6 +165,29 @@ class CthuluBootstrap:
         data_layer = DataLayer(cache_enabled=cache_enabled)
         return data_layer
     
+    def initialize_bar_store(self, connector: MT5Connector, config: Dict[str, Any]) -> Optional[BarStore]:
+        """Initialize the shared multi-timeframe bar store.
+        
+        Args:
+            connector: MT5Connector instance
+            config: System configuration ('bar_store' section)
+            
+        Returns:
+            BarStore instance or None if disabled
+        """
+        store_config = config.get('bar_store', {})
+        if not store_config.get('enabled', True):
+            self.logger.info("Bar store disabled; components fetch bars directly")
+            return None
+        bar_store = BarStore(
+            connector,
+            base_timeframe=store_config.get('base_timeframe', 'M1'),
+            base_bars=store_config.get('base_bars', 1500),
+            max_age_seconds=store_config.get('max_age_seconds', 5.0)
+        )
+        self.logger.info(f"Bar store initialized (base={store_config.get('base_timeframe', 'M1')})")
+        return bar_store
+    
     def initialize_risk_manager(self, config: Dict[str, Any]) -> RiskEvaluator:
         """Initialize risk evaluator.
         
@@ -292,13 +320,15 @@ class CthuluBootstrap:
     
     def initialize_trade_adoption_manager(self, connector: MT5Connector, position_tracker: PositionTracker,
                                           position_lifecycle: PositionLifecycle,
-                                          config: Dict[str, Any]) -> TradeAdoptionManager:
+                                          config: Dict[str, Any],
+                                          bar_store: Optional[BarStore] = None) -> TradeAdoptionManager:
         """Initialize trade adoption manager for external trade adoption.
         
         Args:
             position_tracker: Position tracker instance
             position_lifecycle: Position lifecycle instance
             config: System configuration
+            bar_store: Optional shared BarStore
             
         Returns:
             Initialized TradeAdoptionManager instance
@@ -324,7 +354,8 @@ class CthuluBootstrap:
             connector,
             position_tracker,
             position_lifecycle,
-            trade_adoption_policy
+            trade_adoption_policy,
+            bar_store=bar_store
         )
         
         if trade_adoption_policy.enabled:
@@ -357,6 +388,12 @@ class CthuluBootstrap:
                 db_path, e
             )
             raise
+        # Optional background archiving of old signals/provenance rows
+        retention = dict(config.get('database', {}).get('retention') or {})
+        if retention.pop('enabled', False):
+            interval = float(retention.pop('interval_hours', 6)) * 3600
+            database.start_retention_job(interval_seconds=interval, **retention)
+            self.logger.info(f"Database retention job started (every {interval / 3600:.1f}h)")
         return database
     
     def initialize_metrics(self, database: Database) -> MetricsCollector:
@@ -394,7 +431,7 @@ class CthuluBootstrap:
             if ml_enabled:
                 from cthulu.ML_RL.instrumentation import MLDataCollector
                 ml_prefix = ml_config.get('prefix', 'events')
-                ml_collector = MLDataCollector(prefix=ml_prefix)
+                ml_collector = MLDataCollector(prefix=ml_prefix, log_format=ml_config.get('log_format', 'jsonl'))
                 self.logger.info('MLDataCollector initialized')
             else:
                 self.logger.info('ML instrumentation disabled via config/CLI')
@@ -594,13 +631,15 @@ class CthuluBootstrap:
             self.logger.exception("Failed to initialize AdaptiveDrawdownManager")
             return None
     
-    def initialize_profit_scaler(self, config: Dict[str, Any], connector, execution_engine) -> Optional[Any]:
+    def initialize_profit_scaler(self, config: Dict[str, Any], connector, execution_engine,
+                                 bar_store: Optional[BarStore] = None) -> Optional[Any]:
         """Initialize profit scaler for partial profit taking.
         
         Args:
             config: System configuration
             connector: MT5Connector instance
             execution_engine: ExecutionEngine instance
+            bar_store: Optional shared BarStore
             
         Returns:
             ProfitScaler instance or None if disabled
@@ -612,7 +651,7 @@ class CthuluBootstrap:
                 return None
             
             from cthulu.position.profit_scaler import create_profit_scaler
-            scaler = create_profit_scaler(connector, execution_engine, scaler_config)
+            scaler = create_profit_scaler(connector, execution_engine, scaler_config, bar_store=bar_store)
             self.logger.info(
                 f"ProfitScaler initialized: "
                 f"micro_threshold=${scaler_config.get('micro_account_threshold', 100)}, "
@@ -713,6 +752,68 @@ class CthuluBootstrap:
             self.logger.exception("Failed to initialize exit strategies")
             return []
     
+    def initialize_warm_state(self, config: Dict[str, Any], components: SystemComponents) -> Optional[Any]:
+        """Load the warm-restart snapshot and register hot-state owners.
+        
+        The snapshot is only resumed when it was written for the same
+        symbol/timeframe and is younger than `warm_restart.max_age_seconds`.
+        Sections are restored into the risk manager, strategy selector,
+        chart manager and structure detector here; the trading loop claims
+        the bar buffer and indicator state when it starts.
+        
+        Args:
+            config: System configuration
+            components: Initialized system components
+            
+        Returns:
+            WarmStateSnapshotter instance or None if disabled
+        """
+        try:
+            warm_cfg = config.get('warm_restart', {}) if isinstance(config, dict) else {}
+            if not warm_cfg.get('enabled', True):
+                self.logger.info("Warm restart disabled via config")
+                return None
+            
+            from cthulu.core.warm_state import WarmStateStore, WarmStateSnapshotter
+            
+            trading_cfg = config.get('trading', {})
+            symbol = trading_cfg.get('symbol', 'EURUSD')
+            timeframe = trading_cfg.get('timeframe', 'TIMEFRAME_H1')
+            store = WarmStateStore(
+                warm_cfg.get('path', os.path.join('data', 'warm_state.pkl')),
+                max_age_seconds=float(warm_cfg.get('max_age_seconds', 900))
+            )
+            snapshotter = WarmStateSnapshotter(
+                store, symbol, timeframe,
+                interval_seconds=float(warm_cfg.get('interval_seconds', 60))
+            )
+            
+            snapshotter.register('risk', components.risk_manager)
+            if hasattr(components.strategy, 'get_warm_state'):
+                snapshotter.register('strategy_selector', components.strategy)
+            try:
+                from cthulu.cognition.chart_manager import get_chart_manager
+                from cthulu.cognition.structure_detector import get_structure_detector
+                snapshotter.register('chart_manager', get_chart_manager())
+                snapshotter.register('structure_detector', get_structure_detector())
+            except Exception as e:
+                self.logger.debug(f"Cognition state not snapshotted: {e}")
+            
+            state = store.load_fresh(symbol, timeframe)
+            if state is not None:
+                reason = 'crash recovery' if os.getenv('CTHULU_WARM_RESTART') else 'restart'
+                restored = snapshotter.resume(state)
+                self.logger.info(
+                    f"Warm start ({reason}): resumed snapshot from {state.age_seconds:.0f}s ago, "
+                    f"sections={restored}, bars={0 if state.bars is None else len(state.bars)}"
+                )
+            else:
+                self.logger.info("No fresh warm-state snapshot; cold start")
+            return snapshotter
+        except Exception:
+            self.logger.exception("Failed to initialize warm-restart state; continuing with cold start")
+            return None
+    
     def bootstrap(self, config_path: str, args: Any) -> SystemComponents:
         """Bootstrap the entire Cthulu system.
         
@@ -736,6 +837,7 @@ class CthuluBootstrap:
         # Initialize core components
         connector = self.initialize_connector(config)
         data_layer = self.initialize_data_layer(config)
+        bar_store = self.initialize_bar_store(connector, config)
         # Compute risk limits configuration (create RiskEvaluator later when position tracker is available)
         risk_limits = self.initialize_risk_manager(config)
         
@@ -767,7 +869,8 @@ class CthuluBootstrap:
         self.logger.info('RiskEvaluator initialized with runtime dependencies')
         
         position_lifecycle = self.initialize_position_lifecycle(connector, execution_engine, position_tracker, database)
-        trade_adoption_manager = self.initialize_trade_adoption_manager(connector, position_tracker, position_lifecycle, config)
+        trade_adoption_manager = self.initialize_trade_adoption_manager(connector, position_tracker, position_lifecycle, config,
+                                                                        bar_store=bar_store)
         
         # Initialize strategy
         strategy = self.initialize_strategy(config)
@@ -783,12 +886,17 @@ class CthuluBootstrap:
         # Initialize optional components
         advisory_manager = self.initialize_advisory_manager(config, execution_engine, ml_collector)
         exporter = self.initialize_prometheus_exporter(config)
+        if exporter is not None:
+            try:
+                exporter.set_connector_latency(connector)
+            except Exception:
+                self.logger.debug('Failed to register connector latency histograms')
         monitor = self.initialize_trade_monitor(position_tracker, position_lifecycle, trade_adoption_manager, config, ml_collector)
         
         # Initialize cutting-edge risk management components
         dynamic_sltp_manager = self.initialize_dynamic_sltp_manager(config)
         adaptive_drawdown_manager = self.initialize_adaptive_drawdown_manager(config)
-        profit_scaler = self.initialize_profit_scaler(config, connector, execution_engine)
+        profit_scaler = self.initialize_profit_scaler(config, connector, execution_engine, bar_store=bar_store)
         
         # Initialize Hektor (Vector Studio) semantic memory integration
         hektor_adapter, hektor_retriever = self.initialize_hektor(config)
@@ -824,6 +932,7 @@ class CthuluBootstrap:
             config=config,
             connector=connector,
             data_layer=data_layer,
+            bar_store=bar_store,
             risk_manager=risk_manager,
             execution_engine=execution_engine,
             position_tracker=position_tracker,
@@ -852,6 +961,9 @@ class CthuluBootstrap:
         except Exception:
             components.trade_adoption_policy = None
         
+        # Resume hot state from the last snapshot (if fresh)
+        components.warm_state = self.initialize_warm_state(config, components)
+        
         # Start RPC server if configured (allows runtime manual trades via HTTP)
         try:
             rpc_cfg = config.get('rpc', {}) if isinstance(config, dict) else {}
@@ -927,12 +1039,22 @@ class CthuluBootstrap:
                         except Exception:
                             pass
                         
+                        dashboard_url = dashboard_token = None
+                        try:
+                            dashboard_url = config.get('dashboard', {}).get('push_url') or os.getenv('CTHULU_DASHBOARD_PUSH_URL')
+                            dashboard_token = config.get('dashboard', {}).get('push_token') or os.getenv('CTHULU_DASHBOARD_PUSH_TOKEN')
+                        except Exception:
+                            pass
+                        
                         event_bus = initialize_event_bus(
                             metrics_collector=metrics,
                             comprehensive_collector=components.comprehensive_collector,
                             training_logger=training_logger,
                             database=database,
-                            ml_collector=ml_collector
+                            ml_collector=ml_collector,
+                            dashboard_url=dashboard_url,
+                            policies=(config.get('event_bus') or {}).get('policies'),
+                            dashboard_token=dashboard_token
                         )
                         self.logger.info(f"Trade Event Bus initialized: {event_bus.get_stats()['subscribers']}")
                     except Exception as e:
@@ -0,0 +1,546 @@
+"""
+Trading Loop Latency Benchmark
+
+Reproducible end-to-end benchmark of TradingLoop iterations against the
+simulated MT5 terminal: fixed seeded bar fixtures, a configurable
+strategy/indicator/cognition stack and one new bar per iteration.
+
+Reports per-stage latency (p50/p99/mean/max), the bar-to-order latency
+(new bar visible -> order_send reaching the terminal) and, in a separate
+tracemalloc pass so it does not distort timings, per-stage allocation
+counts (net allocated blocks and peak traced KB). Results are written as JSON baselines that can be diffed
+between commits with compare().
+
+Stage times are inclusive: _generate_signal contains enhance_signal and
+_process_entry_signal contains the order round trip. Log records up to
+WARNING are suppressed while the benchmark runs.
+
+Usage:
+    result = LoopBenchmark(BenchmarkConfig.preset('dynamic')).run()
+    print(result.format_table())
+    result.save('benchmarks/loop_dynamic.json')
+    regressions = compare(BenchmarkResult.load('benchmarks/loop_dynamic.json'), result)
+"""
+
+import gc
+import os
+import sys
+import copy
+import json
+import time
+import logging
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cthulu.strategy.base import Strategy, Signal, SignalType
+
+
+logger = logging.getLogger("cthulu.core.loop_benchmark")
+
+
+# Instrumented TradingLoop methods, in execution order
+LOOP_STAGES = (
+    '_ingest_market_data',
+    '_calculate_indicators',
+    '_generate_signal',
+    '_process_entry_signal',
+    '_monitor_positions',
+)
+COGNITION_STAGE = 'enhance_signal'
+ITERATION = 'iteration'
+BAR_TO_ORDER = 'bar_to_order'
+
+DEFAULT_INDICATORS = [
+    {'type': 'rsi', 'params': {'period': 14}},
+    {'type': 'macd', 'params': {'fast_period': 12, 'slow_period': 26, 'signal_period': 9}},
+    {'type': 'bollinger', 'params': {'period': 20, 'std_dev': 2.0}},
+    {'type': 'adx', 'params': {'period': 14}},
+]
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    'sma': {
+        'strategy': {'type': 'sma_crossover', 'params': {'fast_period': 10, 'slow_period': 30}},
+    },
+    'dynamic': {
+        'strategy': {
+            'type': 'dynamic',
+            'strategies': [
+                {'type': 'ema_crossover', 'params': {'fast_period': 9, 'slow_period': 21}},
+                {'type': 'momentum_breakout', 'params': {}},
+                {'type': 'mean_reversion', 'params': {}},
+                {'type': 'trend_following', 'params': {}},
+                {'type': 'rsi_reversal', 'params': {}},
+            ],
+        },
+    },
+    # Fires on a fixed cadence so the entry/order path is timed on every few bars
+    'order_path': {
+        'strategy': {'type': 'periodic', 'params': {'every': 3}},
+        'entry_confluence': {'min_score_to_enter': 0, 'max_wait_bars': 1},
+    },
+    'full': {
+        'strategy': {
+            'type': 'dynamic',
+            'strategies': [
+                {'type': 'ema_crossover', 'params': {'fast_period': 9, 'slow_period': 21}},
+                {'type': 'momentum_breakout', 'params': {}},
+                {'type': 'mean_reversion', 'params': {}},
+                {'type': 'trend_following', 'params': {}},
+                {'type': 'rsi_reversal', 'params': {}},
+            ],
+        },
+        'cognition': True,
+    },
+}
+
+
+class PeriodicSignalStrategy(Strategy):
+    """
+    Benchmark strategy that signals every `every` bars in the direction of
+    the last `lookback` bars, with ATR-based stops. Keeps the entry and
+    order stages busy independently of how often real strategies fire.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__("periodic", config)
+        self.every = int(config.get('every', 3))
+        self.lookback = int(config.get('lookback', 5))
+        self.symbol = config.get('symbol', 'XAUUSD')
+        self._closes: List[float] = []
+
+    def on_bar(self, bar: pd.Series) -> Optional[Signal]:
+        self._closes.append(float(bar['close']))
+        if len(self._closes) <= self.lookback or len(self._closes) % self.every:
+            return None
+        price = self._closes[-1]
+        atr = float(bar.get('atr', price * 0.002) or price * 0.002)
+        long = price >= self._closes[-1 - self.lookback]
+        side = SignalType.LONG if long else SignalType.SHORT
+        sign = 1 if long else -1
+        return Signal(
+            id=self.generate_signal_id(), timestamp=datetime.now(), symbol=self.symbol,
+            timeframe='bench', side=side, action='BUY' if long else 'SELL', price=price,
+            stop_loss=price - sign * 1.5 * atr, take_profit=price + sign * 1.5 * atr,
+            confidence=0.8, reason='benchmark cadence'
+        )
+
+
+@dataclass
+class BenchmarkConfig:
+    """Benchmark scenario: data fixture, component stack and run length"""
+    name: str = 'sma'
+    symbol: str = 'XAUUSD'
+    timeframe_minutes: int = 15
+    fixture_bars: int = 3000
+    seed: int = 7
+    bars_path: Optional[str] = None      # Use a bar file instead of the synthetic fixture
+    lookback_bars: int = 300
+    warmup_iterations: int = 20
+    iterations: int = 200
+    alloc_iterations: int = 50           # Iterations of the tracemalloc pass (0 disables)
+    strategy: Dict[str, Any] = field(default_factory=lambda: copy.deepcopy(PRESETS['sma']['strategy']))
+    indicators: List[Dict[str, Any]] = field(default_factory=lambda: copy.deepcopy(DEFAULT_INDICATORS))
+    cognition: bool = False
+    cognition_config: Dict[str, Any] = field(default_factory=dict)
+    risk: Dict[str, Any] = field(default_factory=dict)
+    # Below the live default (50) so marginal entries queue and the fixture yields orders to time
+    entry_confluence: Dict[str, Any] = field(default_factory=lambda: {'min_score_to_enter': 20})
+    simulation: Dict[str, Any] = field(default_factory=dict)   # SimulationConfig overrides
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> 'BenchmarkConfig':
+        """Config for a named stack in PRESETS, with field overrides."""
+        if name not in PRESETS:
+            raise ValueError(f"Unknown benchmark preset '{name}' (available: {', '.join(PRESETS)})")
+        values = copy.deepcopy(PRESETS[name])
+        values.update(overrides)
+        values.setdefault('name', name)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def fixture_bars(n: int, timeframe_minutes: int = 15, seed: int = 7, start: str = '2024-01-01',
+                 base_price: float = 2000.0, digits: int = 2, spread_points: tuple = (15, 40)) -> pd.DataFrame:
+    """
+    Deterministic synthetic OHLC fixture (gold-like by default).
+
+    Alternates trending and ranging regimes with clustered volatility so
+    trend, breakout and mean-reversion strategies all produce signals.
+    Weekends are skipped like a broker feed.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=int(n * 1.5) + 10, freq=f'{timeframe_minutes}min')
+    index = index[index.dayofweek < 5][:n]
+
+    regime_len = rng.integers(80, 300, size=n // 80 + 2)
+    drift = np.repeat(rng.choice([-1.0, 0.0, 0.0, 1.0], size=len(regime_len)), regime_len)[:n] * 0.00012
+    vol = np.empty(n)
+    vol[0] = 0.0006
+    shocks = rng.normal(0, 1, size=n)
+    for i in range(1, n):
+        vol[i] = 0.00002 + 0.9 * vol[i - 1] + 0.07 * 0.0006 * abs(shocks[i - 1])
+    close = base_price * np.exp(np.cumsum(drift + vol * shocks))
+    open_ = np.r_[base_price, close[:-1]]
+    wick = np.abs(rng.normal(0, 1, size=(2, n))) * vol
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    return pd.DataFrame({
+        'open': open_.round(digits), 'high': high.round(digits), 'low': low.round(digits),
+        'close': close.round(digits), 'tick_volume': rng.integers(50, 500, size=n),
+        'spread': rng.integers(spread_points[0], spread_points[1], size=n),
+    }, index=index)
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {'count': 0}
+    values = np.asarray(samples)
+    return {
+        'count': int(values.size),
+        'mean_ms': round(float(values.mean()), 4),
+        'p50_ms': round(float(np.percentile(values, 50)), 4),
+        'p99_ms': round(float(np.percentile(values, 99)), 4),
+        'max_ms': round(float(values.max()), 4),
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    env = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+    try:
+        env['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            timeout=5, cwd=str(Path(__file__).resolve().parent)
+        ).stdout.strip() or None
+    except Exception:
+        env['commit'] = None
+    return env
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-stage latency/allocation results of one benchmark run"""
+    name: str
+    config: Dict[str, Any]
+    stages: Dict[str, Dict[str, Any]]
+    signals: int = 0
+    orders: int = 0
+    environment: Dict[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def save(self, path: str) -> Path:
+        """Write the result as a JSON baseline."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True), encoding='utf-8')
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'BenchmarkResult':
+        return cls(**json.loads(Path(path).read_text(encoding='utf-8')))
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<24}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'blocks':>10}{'peak KB':>10}"]
+        for stage, stats in self.stages.items():
+            if not stats.get('count'):
+                continue
+            lines.append(
+                f"{stage:<24}{stats['count']:>7}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                f"{stats['max_ms']:>10.3f}{stats.get('net_blocks_mean', float('nan')):>10.0f}"
+                f"{stats.get('alloc_peak_kb', float('nan')):>10.1f}"
+            )
+        lines.append(f"signals={self.signals} orders={self.orders} commit={self.environment.get('commit')}")
+        return "\n".join(lines)
+
+
+def compare(baseline: BenchmarkResult, current: BenchmarkResult, tolerance_pct: float = 20.0,
+            min_delta_ms: float = 0.05, metrics: tuple = ('p50_ms', 'p99_ms')) -> List[Dict[str, Any]]:
+    """
+    Stages whose latency regressed against a baseline.
+
+    A metric regresses when it is more than `tolerance_pct` slower and
+    the absolute difference exceeds `min_delta_ms` (timer noise floor).
+
+    Returns:
+        One dict per regressed stage/metric (empty when none)
+    """
+    regressions = []
+    for stage, base in baseline.stages.items():
+        cur = current.stages.get(stage)
+        if not cur or not cur.get('count') or not base.get('count'):
+            continue
+        for metric in metrics:
+            before, after = base.get(metric), cur.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance_pct / 100.0) and after - before > min_delta_ms:
+                regressions.append({
+                    'stage': stage, 'metric': metric, 'baseline': before, 'current': after,
+                    'change_pct': round((after / before - 1) * 100, 1) if before else None,
+                })
+    return regressions
+
+
+class LoopBenchmark:
+    """
+    Runs TradingLoop iterations over a fixed fixture and times every stage.
+
+    Usage:
+        bench = LoopBenchmark(BenchmarkConfig.preset('sma', iterations=300))
+        result = bench.run()
+    """
+
+    def __init__(self, config: Optional[BenchmarkConfig] = None):
+        self.config = config or BenchmarkConfig()
+        self._samples: Dict[str, List[float]] = {}
+        self._allocs: Dict[str, List[int]] = {}
+        self._peaks: Dict[str, List[float]] = {}
+        self._recording = False
+        self._tracking = False
+        self._alloc_stack: List[list] = []
+        self._iteration_start = 0.0
+        self._order_seen = False
+        self.signals = 0
+        self.orders = 0
+
+    # ------------------------------------------------------------ stack
+
+    def _build_terminal(self):
+        from cthulu.connector import simulated_terminal as sim
+
+        cfg = self.config
+        bars = sim.load_bars(cfg.bars_path) if cfg.bars_path else fixture_bars(
+            cfg.fixture_bars, cfg.timeframe_minutes, cfg.seed)
+        needed = cfg.lookback_bars + cfg.warmup_iterations + cfg.iterations + cfg.alloc_iterations + 2
+        if len(bars) < needed:
+            raise ValueError(f"Benchmark needs {needed} bars, fixture has {len(bars)}")
+        simulation = sim.SimulationConfig(**{'seed': cfg.seed, **cfg.simulation})
+        # Start just after the lookback window closes, in manual clock mode
+        start = bars.index[cfg.lookback_bars] + pd.Timedelta(seconds=1)
+        return sim.SimulatedTerminal({cfg.symbol: bars}, config=simulation, start=start, speed=None)
+
+    def _build_loop(self, terminal, workdir: str):
+        """Assemble the loop from the same initializers the bootstrap uses."""
+        from cthulu.core.bootstrap import CthuluBootstrap
+        from cthulu.core.indicator_loader import load_indicators
+        from cthulu.core.trading_loop import TradingLoop, TradingLoopContext
+        from cthulu.position.lifecycle import PositionLifecycle
+        from cthulu.risk.evaluator import RiskEvaluator
+
+        cfg = self.config
+        quiet = logging.getLogger("cthulu.benchmark.loop")
+        config = {
+            'mt5': {'login': 0, 'password': '', 'server': '', 'max_retries': 1, 'retry_delay': 0},
+            'trading': {'symbol': cfg.symbol, 'timeframe': cfg.timeframe_minutes, 'poll_interval': 0,
+                        'lookback_bars': cfg.lookback_bars},
+            'risk': dict(cfg.risk),
+            'strategy': copy.deepcopy(cfg.strategy),
+            'database': {'path': str(Path(workdir) / 'bench.db')},
+            'cognition': dict(cfg.cognition_config),
+            'entry_confluence': dict(cfg.entry_confluence),
+            # Wall-clock cooldown would block every entry after the first at bench speed
+            'min_trade_interval': 0,
+        }
+        boot = CthuluBootstrap(logger=quiet)
+        connector = boot.initialize_connector(config)
+        if not connector.connect():
+            raise RuntimeError("Benchmark could not connect to the simulated terminal")
+        data_layer = boot.initialize_data_layer(config)
+        execution_engine = boot.initialize_execution_engine(connector, config)
+        database = boot.initialize_database(config)
+        position_tracker = boot.initialize_position_tracker(connector)
+        position_manager = boot.initialize_position_manager(connector, execution_engine, context_symbol=cfg.symbol)
+        risk_manager = RiskEvaluator(connector, position_tracker, limits=boot.initialize_risk_manager(config))
+        position_lifecycle = PositionLifecycle(connector, execution_engine, position_tracker, database)
+        adoption = boot.initialize_trade_adoption_manager(connector, position_tracker, position_lifecycle, config)
+        if cfg.strategy.get('type') == 'periodic':
+            strategy = PeriodicSignalStrategy({'symbol': cfg.symbol, **cfg.strategy.get('params', {})})
+        else:
+            strategy = boot.initialize_strategy(config)
+        if strategy is None:
+            raise RuntimeError(f"Benchmark strategy could not be built from {cfg.strategy}")
+
+        # Without an exporter the loop would start its fallback metrics HTTP server
+        from cthulu.observability.prometheus import PrometheusExporter
+        exporter = PrometheusExporter()
+        exporter._file_path = str(Path(workdir) / 'metrics.prom')
+
+        cognition = None
+        if cfg.cognition:
+            from cthulu.cognition.engine import create_cognition_engine
+            cognition = create_cognition_engine(config)
+
+        ctx = TradingLoopContext(
+            connector=connector, data_layer=data_layer, execution_engine=execution_engine,
+            risk_manager=risk_manager, position_tracker=position_tracker,
+            position_lifecycle=position_lifecycle, trade_adoption_manager=adoption,
+            exit_coordinator=position_lifecycle, database=database,
+            metrics=boot.initialize_metrics(database), logger=quiet,
+            symbol=cfg.symbol, timeframe=cfg.timeframe_minutes, poll_interval=0,
+            lookback_bars=cfg.lookback_bars, dry_run=False,
+            indicators=load_indicators(copy.deepcopy(cfg.indicators)) if cfg.indicators else [],
+            exit_strategies=[], trade_adoption_policy=adoption.policy, config=config,
+            strategy=strategy, position_manager=position_manager, cognition_engine=cognition,
+            exporter=exporter,
+        )
+        return TradingLoop(ctx)
+
+    # ------------------------------------------------------ instrumentation
+
+    def _timed(self, stage: str, func):
+        def wrapper(*args, **kwargs):
+            if self._tracking:
+                return self._measure_allocs(stage, func, args, kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if self._recording:
+                    self._samples.setdefault(stage, []).append((time.perf_counter() - start) * 1000.0)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _measure_allocs(self, stage: str, func, args, kwargs):
+        """Allocation count and peak traced memory of one stage call (nesting-aware)."""
+        if self._alloc_stack:
+            parent = self._alloc_stack[-1]
+            parent[1] = max(parent[1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = [tracemalloc.get_traced_memory()[0], 0]
+        blocks = sys.getallocatedblocks()
+        self._alloc_stack.append(frame)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._alloc_stack.pop()
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            self._allocs.setdefault(stage, []).append(max(sys.getallocatedblocks() - blocks, 0))
+            self._peaks.setdefault(stage, []).append((peak - frame[0]) / 1024.0)
+            if self._alloc_stack:
+                parent = self._alloc_stack[-1]
+                parent[1] = max(parent[1], peak)
+
+    def _instrument(self, loop, terminal) -> None:
+        for stage in LOOP_STAGES:
+            setattr(loop, stage, self._timed(stage, getattr(loop, stage)))
+        cognition = getattr(loop.ctx, 'cognition_engine', None)
+        if cognition is not None:
+            cognition.enhance_signal = self._timed(COGNITION_STAGE, cognition.enhance_signal)
+
+        generate = loop._generate_signal
+
+        def counting_generate(*args, **kwargs):
+            signal = generate(*args, **kwargs)
+            if signal is not None and self._recording:
+                self.signals += 1
+            return signal
+        loop._generate_signal = counting_generate
+
+        order_send = terminal.order_send
+
+        def timed_order_send(request):
+            if self._recording and not self._order_seen and isinstance(request, dict) \
+                    and request.get('action') == terminal.TRADE_ACTION_DEAL and not request.get('position'):
+                self._order_seen = True
+                self.orders += 1
+                self._samples.setdefault(BAR_TO_ORDER, []).append(
+                    (time.perf_counter() - self._iteration_start) * 1000.0)
+            return order_send(request)
+        terminal.order_send = timed_order_send
+
+    # ------------------------------------------------------------------ run
+
+    def _step(self, loop, terminal, bar_seconds: int) -> None:
+        terminal.clock.advance(bar_seconds)
+        self._order_seen = False
+        self._iteration_start = time.perf_counter()
+        loop.loop_count += 1
+        try:
+            loop._execute_loop_iteration()
+        except Exception as e:
+            logger.debug(f"Benchmark iteration failed: {e}")
+        if self._recording:
+            self._samples.setdefault(ITERATION, []).append((time.perf_counter() - self._iteration_start) * 1000.0)
+
+    def _run_passes(self, terminal, workdir: str, bar_seconds: int) -> None:
+        """Warmup, timed pass and tracemalloc pass over consecutive bars."""
+        cfg = self.config
+        loop = self._build_loop(terminal, workdir)
+        self._instrument(loop, terminal)
+
+        for _ in range(cfg.warmup_iterations):
+            self._step(loop, terminal, bar_seconds)
+
+        gc.collect()
+        self._recording = True
+        for _ in range(cfg.iterations):
+            self._step(loop, terminal, bar_seconds)
+        self._recording = False
+
+        if cfg.alloc_iterations:
+            tracemalloc.start()
+            self._tracking = True
+            try:
+                for _ in range(cfg.alloc_iterations):
+                    self._step(loop, terminal, bar_seconds)
+            finally:
+                self._tracking = False
+                tracemalloc.stop()
+        try:
+            loop.ctx.database.close()
+        except Exception:
+            pass
+
+    def run(self) -> BenchmarkResult:
+        """Run warmup, timed and allocation passes and summarize them."""
+        from cthulu.connector.simulated_terminal import installed
+
+        cfg = self.config
+        terminal = self._build_terminal()
+        bar_seconds = cfg.timeframe_minutes * 60
+        # Logging is part of the loop's cost but console output would swamp the report
+        logging.disable(logging.WARNING)
+        # Fresh entry filter per run: its pending entries must not leak between runs
+        from cthulu.cognition import entry_confluence
+        previous_filter = entry_confluence._confluence_filter
+        entry_confluence._confluence_filter = entry_confluence.EntryConfluenceFilter(config=dict(cfg.entry_confluence))
+        try:
+            with tempfile.TemporaryDirectory() as workdir, installed(terminal):
+                # Components that write to relative paths (drawings, logs) write into the scratch dir
+                cwd = os.getcwd()
+                os.chdir(workdir)
+                try:
+                    self._run_passes(terminal, workdir, bar_seconds)
+                finally:
+                    os.chdir(cwd)
+        finally:
+            logging.disable(logging.NOTSET)
+            entry_confluence._confluence_filter = previous_filter
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        for stage in (ITERATION,) + LOOP_STAGES + (COGNITION_STAGE, BAR_TO_ORDER):
+            stats = _summarize(self._samples.get(stage, []))
+            if stage in self._allocs:
+                stats['net_blocks_mean'] = round(float(np.mean(self._allocs[stage])), 1)
+                stats['alloc_peak_kb'] = round(float(np.percentile(self._peaks[stage], 50)), 1)
+            stages[stage] = stats
+        return BenchmarkResult(name=cfg.name, config=cfg.to_dict(), stages=stages,
+                               signals=self.signals, orders=self.orders, environment=_environment())
@@ -21,12 +21,17 @@ import time
 import logging
 import os
 import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 import pandas as pd
 
 from cthulu.strategy.base import Strategy, SignalType
+from cthulu.utils.latency import LatencyHistogram
+from cthulu.observability.loop_profiler import SlowIterationProfiler
+from cthulu.observability.logger import get_log_directory
+from cthulu.cognition.regime_service import get_regime_service
 from cthulu.execution.engine import ExecutionEngine, OrderRequest, OrderType, OrderStatus
 from cthulu.risk.evaluator import RiskEvaluator
 from cthulu.position.tracker import PositionTracker
@@ -37,6 +42,21 @@ from cthulu.observability.metrics import MetricsCollector
 from cthulu.connector.mt5_connector import MT5Connector
 from cthulu.data.layer import DataLayer
 
+# Timed stages of one loop iteration, in execution order
+LOOP_STAGES = (
+    'ingest_market_data',
+    'calculate_indicators',
+    'update_regime',
+    'pending_entries',
+    'generate_signal',
+    'process_entry',
+    'adopt_external',
+    'monitor_positions',
+    'connection_health',
+    'performance_metrics',
+    'warm_state_snapshot',
+)
+
 
 @dataclass
 class PositionSizeDecision:
@@ -138,6 +158,9 @@ class TradingLoopContext:
     # ML Enhancement Manager (automatic ML integration)
     ml_enhancement_manager: Optional[Any] = None
     
+    # Warm-restart snapshotter (resumed bar buffer/indicator state, periodic snapshots)
+    warm_state: Optional[Any] = None
+    
     # CLI args
     args: Optional[Any] = None
 
@@ -438,6 +461,51 @@ class TradingLoop:
         self._min_trade_interval_seconds = self.ctx.config.get('min_trade_interval', 60)  # 1 minute default
         self._last_signal_direction: Optional[str] = None
         self._consecutive_same_direction = 0
+        
+        # Raw bar buffer for tail fetches; only kept when warm restart is on
+        self._bar_buffer: Optional[pd.DataFrame] = None
+        self._tail_fetch_bars = int(self.ctx.config.get('warm_restart', {}).get('tail_fetch_bars', 10))
+        self._warm_state = getattr(self.ctx, 'warm_state', None)
+        if self._warm_state is not None:
+            for indicator in self.ctx.indicators or []:
+                name = getattr(indicator, 'name', None)
+                if name and hasattr(indicator, 'get_warm_state'):
+                    self._warm_state.register(f"indicator:{name}", indicator)
+            self._bar_buffer = self._warm_state.take_bars()
+        
+        # Per-stage and whole-iteration latency (ms), exported as Prometheus histograms
+        self.stage_histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in LOOP_STAGES}
+        self.iteration_histogram = LatencyHistogram()
+        self._stage_times: Dict[str, float] = {}
+        self._last_iteration_start: Optional[float] = None
+        self._loop_rate_hz = 0.0
+        self.slow_iterations = 0
+        
+        # Stack samples of iterations over the latency budget (opt-in)
+        profiling_cfg = (self.ctx.config.get('observability') or {}).get('loop_profiling') or {}
+        self._latency_budget_ms = float(profiling_cfg.get('latency_budget_ms', 2000))
+        self._profiler: Optional[SlowIterationProfiler] = None
+        if profiling_cfg.get('enabled', False):
+            # Relative dump paths live next to the main log file
+            output_dir = os.path.join(get_log_directory(self.ctx.logger),
+                                      profiling_cfg.get('output_dir', 'slow_iterations'))
+            self._profiler = SlowIterationProfiler(
+                budget_ms=self._latency_budget_ms,
+                output_dir=output_dir,
+                sample_interval_ms=float(profiling_cfg.get('sample_interval_ms', 5)),
+                arm_fraction=float(profiling_cfg.get('arm_fraction', 0.5)),
+                max_files=int(profiling_cfg.get('max_files', 50)),
+                min_capture_interval_s=float(profiling_cfg.get('min_capture_interval_s', 30))
+            )
+        exporter = getattr(self.ctx, 'exporter', None)
+        if exporter is not None and hasattr(exporter, 'set_loop_timing'):
+            exporter.set_loop_timing(self)
+        
+        # Regime computed once per bar and shared by selector, cognition and risk
+        self.regime_service = get_regime_service()
+        drawdown_manager = getattr(self.ctx, 'adaptive_drawdown_manager', None)
+        if drawdown_manager is not None and hasattr(drawdown_manager, 'on_regime_update'):
+            self.regime_service.subscribe(drawdown_manager.on_regime_update)
     
     def request_shutdown(self):
         """Request graceful shutdown of the trading loop."""
@@ -673,17 +741,17 @@ class TradingLoop:
         try:
             while not self._shutdown_requested:
                 self.loop_count += 1
-                loop_start = datetime.now()
-                self.ctx.logger.debug(f"Loop #{self.loop_count} started at {loop_start}")
+                loop_start = time.perf_counter()
+                self.ctx.logger.debug(f"Loop #{self.loop_count} started at {datetime.now()}")
                 
                 # Execute one iteration of the trading loop
                 try:
-                    self._execute_loop_iteration()
+                    self._run_timed_iteration()
                 except Exception as e:
                     self.ctx.logger.error(f"Error in loop iteration: {e}", exc_info=True)
                 
                 # Wait for next cycle
-                loop_duration = (datetime.now() - loop_start).total_seconds()
+                loop_duration = time.perf_counter() - loop_start
                 self.ctx.logger.debug(f"Loop completed in {loop_duration:.2f}s")
                 
                 sleep_time = max(0, self.ctx.poll_interval - loop_duration)
@@ -712,6 +780,11 @@ class TradingLoop:
             self.ctx.logger.error(f"Fatal error in main loop: {e}", exc_info=True)
             return 1
         
+        # Graceful shutdown - final snapshot so a planned restart is warm too
+        self._snapshot_warm_state(force=True)
+        if self._profiler is not None:
+            self._profiler.stop()
+        
         # Graceful shutdown - save ML models
         if self.ctx.ml_enhancement_manager:
             try:
@@ -721,6 +794,63 @@ class TradingLoop:
         
         return 0
     
+    @contextmanager
+    def _stage(self, name: str):
+        """Time one stage of the current iteration."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self._stage_times[name] = elapsed_ms
+            self.stage_histograms[name].observe(elapsed_ms)
+    
+    def _run_timed_iteration(self):
+        """Run one iteration, recording its latency and profiling it if slow."""
+        start = time.perf_counter()
+        if self._last_iteration_start is not None and start > self._last_iteration_start:
+            self._loop_rate_hz = 1.0 / (start - self._last_iteration_start)
+        self._last_iteration_start = start
+        self._stage_times = {}
+        if self._profiler is not None:
+            self._profiler.begin()
+        try:
+            self._execute_loop_iteration()
+        finally:
+            self._finish_iteration((time.perf_counter() - start) * 1000.0)
+    
+    def _finish_iteration(self, elapsed_ms: float):
+        """Publish iteration latency and report iterations over the latency budget."""
+        self.iteration_histogram.observe(elapsed_ms)
+        stages = self._stage_times
+        
+        capture = None
+        if self._profiler is not None:
+            capture = self._profiler.end(elapsed_ms, stages, {'loop_count': self.loop_count, 'symbol': getattr(self.ctx, 'symbol', None)})
+        
+        if elapsed_ms > self._latency_budget_ms:
+            self.slow_iterations += 1
+            slowest = sorted(stages.items(), key=lambda kv: kv[1], reverse=True)[:4]
+            breakdown = ", ".join(f"{stage}={ms:.0f}ms" for stage, ms in slowest)
+            self.ctx.logger.warning(
+                f"Loop #{self.loop_count} took {elapsed_ms:.0f}ms (budget {self._latency_budget_ms:.0f}ms): {breakdown}"
+                + (f" - profile: {capture}" if capture else "")
+            )
+            exporter = getattr(self.ctx, 'exporter', None)
+            if exporter is not None and hasattr(exporter, 'set_slow_iterations'):
+                exporter.set_slow_iterations(self.slow_iterations)
+        
+        health = getattr(self.ctx, 'system_health_collector', None)
+        if health is not None:
+            try:
+                health.update_performance(
+                    loop_rate_hz=self._loop_rate_hz,
+                    avg_loop_ms=self.iteration_histogram.mean_ms,
+                    max_loop_ms=self.iteration_histogram.max_ms
+                )
+            except Exception as e:
+                self.ctx.logger.debug(f"System health performance update failed: {e}")
+    
     def _execute_loop_iteration(self):
         """Execute one iteration of the trading loop."""
         # Ensure position_manager has current symbol context for fallback
@@ -730,40 +860,73 @@ class TradingLoop:
         
         # 1. Market data ingestion
         self.ctx.logger.info(f"Loop #{self.loop_count}: Fetching market data...")
-        df = self._ingest_market_data()
+        with self._stage('ingest_market_data'):
+            df = self._ingest_market_data()
         if df is None:
             self.ctx.logger.warning("No market data received, skipping iteration")
             return
         
         # 2. Calculate indicators
         self.ctx.logger.info(f"Loop #{self.loop_count}: Calculating indicators...")
-        df = self._calculate_indicators(df)
+        with self._stage('calculate_indicators'):
+            df = self._calculate_indicators(df)
         if df is None:
             self.ctx.logger.warning("Indicator calculation failed")
             return
         
+        # 2b. Publish the bar's regime for selector, cognition and risk consumers
+        with self._stage('update_regime'):
+            self._update_regime(df)
+        
         # 3. Check pending entries (queued for better price)
-        self._check_pending_entries(df)
+        with self._stage('pending_entries'):
+            self._check_pending_entries(df)
         
         # 4. Generate strategy signals
         self.ctx.logger.info(f"Loop #{self.loop_count}: Generating signals...")
-        signal = self._generate_signal(df)
+        with self._stage('generate_signal'):
+            signal = self._generate_signal(df)
         
         # 5. Process entry signals
         if signal:
-            self._process_entry_signal(signal)
+            with self._stage('process_entry'):
+                self._process_entry_signal(signal)
         
         # 6. Scan and adopt external trades
-        self._adopt_external_trades()
+        with self._stage('adopt_external'):
+            self._adopt_external_trades()
         
         # 7. Monitor positions and check exits
-        self._monitor_positions(df)
+        with self._stage('monitor_positions'):
+            self._monitor_positions(df)
         
         # 8. Health monitoring
-        self._check_connection_health()
+        with self._stage('connection_health'):
+            self._check_connection_health()
         
         # 9. Performance monitoring
-        self._report_performance_metrics()
+        with self._stage('performance_metrics'):
+            self._report_performance_metrics()
+        
+        # 10. Warm-restart snapshot (rate limited by the snapshotter)
+        with self._stage('warm_state_snapshot'):
+            self._snapshot_warm_state()
+    
+    def _update_regime(self, df: pd.DataFrame):
+        """Publish the indicator frame to the shared regime service."""
+        try:
+            self.regime_service.update(getattr(self.ctx, 'symbol', None), getattr(self.ctx, 'timeframe', None), df)
+        except Exception as e:
+            self.ctx.logger.debug(f"Regime update failed: {e}")
+    
+    def _snapshot_warm_state(self, force: bool = False):
+        """Write a warm-restart snapshot of hot state if one is due."""
+        if self._warm_state is None:
+            return
+        try:
+            self._warm_state.maybe_snapshot(bars=self._bar_buffer, force=force)
+        except Exception as e:
+            self.ctx.logger.debug(f"Warm-state snapshot failed: {e}")
     
     def _check_pending_entries(self, df: pd.DataFrame):
         """
@@ -845,6 +1008,12 @@ class TradingLoop:
             DataFrame with market data, or None on error
         """
         try:
+            # Warm buffer: fetch only the newest bars and splice them on
+            if self._bar_buffer is not None:
+                df = self._extend_bar_buffer()
+                if df is not None:
+                    return df
+            
             rates = self.ctx.connector.get_rates(
                 symbol=self.ctx.symbol,
                 timeframe=self.ctx.timeframe,
@@ -858,13 +1027,51 @@ class TradingLoop:
             
             df = self.ctx.data_layer.normalize_rates(rates, symbol=self.ctx.symbol)
             self.ctx.logger.debug(f"Retrieved {len(df)} bars for {self.ctx.symbol}")
-            return df
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                return df
+            if self._warm_state is None:
+                return df
+            self._bar_buffer = df
+            return df.copy()
         
         except Exception as e:
             self.ctx.logger.error(f"Market data error: {e}", exc_info=True)
             time.sleep(self.ctx.poll_interval)
             return None
     
+    def _extend_bar_buffer(self) -> Optional[pd.DataFrame]:
+        """
+        Update the bar buffer from a short tail fetch.
+        
+        Returns:
+            Copy of the updated buffer, or None if the tail does not overlap
+            the buffer (caller falls back to a full history fetch)
+        """
+        buffer = self._bar_buffer
+        if len(buffer) < self.ctx.lookback_bars or self._tail_fetch_bars >= self.ctx.lookback_bars:
+            self._bar_buffer = None
+            return None
+        
+        rates = self.ctx.connector.get_rates(
+            symbol=self.ctx.symbol,
+            timeframe=self.ctx.timeframe,
+            count=self._tail_fetch_bars
+        )
+        if rates is None or len(rates) == 0:
+            return None
+        tail = self.ctx.data_layer.normalize_rates(rates, symbol=self.ctx.symbol)
+        if tail.empty or tail.index[0] > buffer.index[-1]:
+            # Gap since the last buffered bar; rebuild from full history
+            self._bar_buffer = None
+            return None
+        
+        merged = pd.concat([buffer[buffer.index < tail.index[0]], tail[buffer.columns.intersection(tail.columns)]])
+        merged.attrs = dict(tail.attrs)
+        self._bar_buffer = merged.iloc[-self.ctx.lookback_bars:]
+        self.ctx.data_layer.cache_data(self.ctx.symbol, self._bar_buffer)
+        self.ctx.logger.debug(f"Extended bar buffer with {len(tail)} bars for {self.ctx.symbol}")
+        return self._bar_buffer.copy()
+    
     def _calculate_indicators(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
         """
         Calculate all required indicators.
@@ -2500,6 +2707,7 @@ class TradingLoop:
                             t.start()
                         except Exception:
                             self.ctx.logger.exception('Failed to start fallback HTTP metrics server')
+                        exporter.set_loop_timing(self)
                         self.ctx.exporter = exporter
                         self.ctx.logger.info('Prometheus exporter (fallback) initialized in trading loop')
                     except Exception:
@@ -0,0 +1,263 @@
+"""
+Warm-Restart State Snapshots
+
+Periodically captures the hot in-memory state of a running system (bar
+buffer, indicator state, chart zones, structure detector fractals,
+strategy selector performance windows and risk counters) into a single
+compact file. After a crash the bootstrap loads the snapshot, validates
+that it is fresh and belongs to the same symbol/timeframe, and hands each
+section back to its owner instead of rebuilding it from scratch.
+
+Components take part by exposing two methods:
+
+    get_warm_state() -> Dict[str, Any]     # picklable
+    restore_warm_state(state: Dict[str, Any])
+
+Snapshots are written atomically (temp file + fsync + rename), so a crash
+while writing leaves the previous snapshot intact.
+"""
+
+import os
+import time
+import pickle
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class WarmState:
+    """Hot state captured at one point in time"""
+    symbol: str
+    timeframe: str
+    created_at: float = field(default_factory=time.time)
+    version: int = SNAPSHOT_VERSION
+    bars: Optional[pd.DataFrame] = None
+    sections: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+    @property
+    def last_bar_time(self) -> Optional[pd.Timestamp]:
+        if self.bars is None or len(self.bars) == 0:
+            return None
+        return self.bars.index[-1]
+
+
+class WarmStateStore:
+    """
+    Atomic file store for WarmState snapshots.
+
+    Usage:
+        store = WarmStateStore('data/warm_state.pkl', max_age_seconds=900)
+        store.save(state)
+        state = store.load_fresh('EURUSD', 'TIMEFRAME_M15')
+    """
+
+    def __init__(self, path: str, max_age_seconds: float = 900.0):
+        """
+        Initialize store.
+
+        Args:
+            path: Snapshot file path
+            max_age_seconds: Snapshots older than this are not resumed
+        """
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.logger = logging.getLogger("cthulu.core.warm_state")
+
+    def save(self, state: WarmState) -> bool:
+        """Write snapshot atomically. Returns False on failure."""
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to write warm-state snapshot: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+
+    def load(self) -> Optional[WarmState]:
+        """Read snapshot without validation (None if missing or unreadable)."""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable warm-state snapshot: {e}")
+            return None
+        if not isinstance(state, WarmState):
+            self.logger.warning("Discarding warm-state snapshot of unexpected type")
+            return None
+        return state
+
+    def validate(self, state: WarmState, symbol: str, timeframe: str) -> Tuple[bool, str]:
+        """
+        Check that a snapshot can be resumed.
+
+        Args:
+            state: Loaded snapshot
+            symbol: Symbol the system is starting with
+            timeframe: Timeframe the system is starting with
+
+        Returns:
+            Tuple of (usable, reason)
+        """
+        if state.version != SNAPSHOT_VERSION:
+            return False, f"version {state.version} != {SNAPSHOT_VERSION}"
+        if state.symbol != symbol:
+            return False, f"symbol {state.symbol} != {symbol}"
+        if state.timeframe != str(timeframe):
+            return False, f"timeframe {state.timeframe} != {timeframe}"
+        if state.age_seconds > self.max_age_seconds:
+            return False, f"stale ({state.age_seconds:.0f}s > {self.max_age_seconds:.0f}s)"
+        return True, "fresh"
+
+    def load_fresh(self, symbol: str, timeframe: str) -> Optional[WarmState]:
+        """Load snapshot and return it only if it passes validation."""
+        state = self.load()
+        if state is None:
+            return None
+        usable, reason = self.validate(state, symbol, timeframe)
+        if not usable:
+            self.logger.info(f"Ignoring warm-state snapshot: {reason}")
+            return None
+        return state
+
+
+class WarmStateSnapshotter:
+    """
+    Collects state from registered components and writes periodic snapshots.
+
+    A resumed snapshot is kept until every section has been claimed, so
+    components created after bootstrap (e.g. the trading loop's indicators)
+    are restored as soon as they register.
+
+    Usage:
+        snapshotter = WarmStateSnapshotter(store, 'EURUSD', 'TIMEFRAME_M15')
+        snapshotter.register('risk', risk_manager)
+        snapshotter.resume(store.load_fresh('EURUSD', 'TIMEFRAME_M15'))
+        ...
+        snapshotter.maybe_snapshot(bars=df)
+    """
+
+    def __init__(
+        self,
+        store: WarmStateStore,
+        symbol: str,
+        timeframe: Any,
+        interval_seconds: float = 60.0
+    ):
+        """
+        Initialize snapshotter.
+
+        Args:
+            store: Destination store
+            symbol: Symbol recorded in snapshots
+            timeframe: Timeframe recorded in snapshots (as configured)
+            interval_seconds: Minimum time between periodic snapshots
+        """
+        self.store = store
+        self.symbol = symbol
+        self.timeframe = str(timeframe)
+        self.interval_seconds = interval_seconds
+        self.logger = logging.getLogger("cthulu.core.warm_state")
+        self._providers: Dict[str, Any] = {}
+        self._pending: Dict[str, Any] = {}
+        self._resumed: Optional[WarmState] = None
+        self._last_snapshot: Optional[float] = None
+        self.restored: List[str] = []
+
+    def register(self, name: str, provider: Any) -> bool:
+        """
+        Register a component; restores it immediately if a resumed
+        snapshot holds state for it.
+
+        Returns:
+            True if state was restored into the provider
+        """
+        if provider is None:
+            return False
+        self._providers[name] = provider
+        if name in self._pending:
+            return self._restore(name, provider, self._pending.pop(name))
+        return False
+
+    def resume(self, state: Optional[WarmState]) -> List[str]:
+        """
+        Restore a validated snapshot into registered components.
+
+        Args:
+            state: Snapshot from WarmStateStore.load_fresh()
+
+        Returns:
+            Names of sections restored so far
+        """
+        if state is None:
+            return []
+        self._resumed = state
+        self._pending = dict(state.sections)
+        for name, provider in list(self._providers.items()):
+            if name in self._pending:
+                self._restore(name, provider, self._pending.pop(name))
+        self.logger.info(
+            f"Resumed warm state from {state.age_seconds:.0f}s ago "
+            f"(restored={self.restored}, awaiting={sorted(self._pending)})"
+        )
+        return list(self.restored)
+
+    def take_bars(self) -> Optional[pd.DataFrame]:
+        """Hand over the resumed bar buffer (once)."""
+        if self._resumed is None or self._resumed.bars is None:
+            return None
+        bars, self._resumed.bars = self._resumed.bars, None
+        return bars
+
+    def capture(self, bars: Optional[pd.DataFrame] = None) -> WarmState:
+        """Collect state from all registered components."""
+        sections = {}
+        for name, provider in self._providers.items():
+            try:
+                sections[name] = provider.get_warm_state()
+            except Exception as e:
+                self.logger.debug(f"Skipping warm-state section {name}: {e}")
+        return WarmState(symbol=self.symbol, timeframe=self.timeframe, bars=bars, sections=sections)
+
+    def maybe_snapshot(self, bars: Optional[pd.DataFrame] = None, force: bool = False) -> bool:
+        """
+        Write a snapshot if the interval has elapsed (or force is set).
+
+        Returns:
+            True if a snapshot was written
+        """
+        now = time.monotonic()
+        if not force and self._last_snapshot is not None and now - self._last_snapshot < self.interval_seconds:
+            return False
+        self._last_snapshot = now
+        return self.store.save(self.capture(bars))
+
+    def _restore(self, name: str, provider: Any, state: Any) -> bool:
+        try:
+            provider.restore_warm_state(state)
+            self.restored.append(name)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to restore warm-state section {name}: {e}")
+            return False
@@ -346,6 +346,7 @@ def main():
             hektor_adapter=getattr(components, 'hektor_adapter', None),
             hektor_retriever=getattr(components, 'hektor_retriever', None),
             ml_enhancement_manager=getattr(components, 'ml_enhancement_manager', None),
+            warm_state=getattr(components, 'warm_state', None),
         )
         
         # Initialize Cognition Engine (AI/ML layer)
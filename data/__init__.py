@@ -1,8 +1,9 @@
 """Data layer module - initialize package"""
 
 from .layer import DataLayer
+from .bar_store import BarStore
 
-__all__ = ["DataLayer"]
+__all__ = ["DataLayer", "BarStore"]
 
 
 
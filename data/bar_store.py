@@ -0,0 +1,366 @@
+"""
+Bar Store
+
+Per-symbol in-memory bar cache shared by every component that needs OHLC
+history. Each symbol keeps one base series (M1 by default) that is kept
+current with a short tail fetch; higher timeframes are seeded from the
+terminal once and from then on maintained by aggregating base bars, so a
+request for any (symbol, timeframe, count) is served from memory. Terminal
+calls per cycle depend on the number of symbols, not on how many positions
+or components ask.
+
+Usage:
+    store = BarStore(connector)
+    rates = store.get_rates('EURUSD', TIMEFRAME_M1, 10)   # same shape as connector.get_rates
+    h1 = store.get_frame('EURUSD', 'H1', 100)
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# MT5 timeframe constants
+TIMEFRAME_M1 = 1
+TIMEFRAME_H1 = 16385
+TIMEFRAME_D1 = 16408
+TIMEFRAME_W1 = 32769
+TIMEFRAME_MN1 = 49153
+
+TIMEFRAMES = {
+    'M1': 1, 'M2': 2, 'M3': 3, 'M4': 4, 'M5': 5, 'M6': 6, 'M10': 10, 'M12': 12, 'M15': 15,
+    'M20': 20, 'M30': 30, 'H1': 16385, 'H2': 16386, 'H3': 16387, 'H4': 16388, 'H6': 16390,
+    'H8': 16392, 'H12': 16396, 'D1': 16408, 'W1': 32769, 'MN1': 49153,
+}
+
+# Constant -> seconds per bar; None where buckets are not fixed-width (month)
+TIMEFRAME_SECONDS: Dict[int, Optional[int]] = {
+    **{value: value * 60 for name, value in TIMEFRAMES.items() if name.startswith('M') and name != 'MN1'},
+    **{value: int(name[1:]) * 3600 for name, value in TIMEFRAMES.items() if name.startswith('H')},
+    TIMEFRAME_D1: 86400, TIMEFRAME_W1: 604800, TIMEFRAME_MN1: None,
+}
+
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<i8'), ('spread', '<i4'), ('real_volume', '<i8'),
+])
+
+logger = logging.getLogger("cthulu.data.bar_store")
+
+_UNIT_SECONDS = {'T': 60, 'MIN': 60, 'M': 60, 'H': 3600, 'D': 86400, 'W': 604800}
+
+
+def resolve_timeframe(timeframe: Union[int, str]) -> Tuple[int, Optional[int]]:
+    """
+    Normalize a timeframe to (MT5 constant, seconds per bar).
+
+    Accepts MT5 constants, names ('H1', 'TIMEFRAME_H1') and pandas-style
+    offsets ('1H', '15T', '15min').
+
+    Raises:
+        ValueError: If the timeframe is not recognised
+    """
+    if isinstance(timeframe, str):
+        name = timeframe.strip().upper()
+        if name.startswith('TIMEFRAME_'):
+            name = name[len('TIMEFRAME_'):]
+        if name in TIMEFRAMES:
+            constant = TIMEFRAMES[name]
+            return constant, TIMEFRAME_SECONDS[constant]
+        match = re.fullmatch(r'(\d+)\s*(MIN|T|M|H|D|W)', name)
+        if match:
+            seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+            for constant, tf_seconds in TIMEFRAME_SECONDS.items():
+                if tf_seconds == seconds:
+                    return constant, seconds
+        raise ValueError(f"Unknown timeframe: {timeframe!r}")
+    constant = int(timeframe)
+    if constant not in TIMEFRAME_SECONDS:
+        raise ValueError(f"Unknown timeframe: {timeframe!r}")
+    return constant, TIMEFRAME_SECONDS[constant]
+
+
+def as_rates(rates: Any) -> np.ndarray:
+    """Coerce terminal rates (structured array or list of rate dicts) to RATE_DTYPE."""
+    if isinstance(rates, np.ndarray) and rates.dtype == RATE_DTYPE:
+        return rates
+    out = np.zeros(len(rates), dtype=RATE_DTYPE)
+    if len(rates) == 0:
+        return out
+    if isinstance(rates, np.ndarray):
+        for name in RATE_DTYPE.names:
+            if name in rates.dtype.names:
+                out[name] = rates[name]
+        return out
+    for name in RATE_DTYPE.names:
+        values = [r.get(name, 0) for r in rates]
+        if name == 'time':
+            values = [int(v.timestamp()) if isinstance(v, datetime) else int(v) for v in values]
+        out[name] = values
+    return out
+
+
+def rates_to_dicts(rates: np.ndarray) -> List[Dict[str, Any]]:
+    """Rate dicts in the format returned by MT5Connector.get_rates()."""
+    return [
+        {
+            'time': datetime.fromtimestamp(t),
+            'open': o, 'high': h, 'low': l, 'close': c,
+            'tick_volume': v, 'spread': s, 'real_volume': rv,
+        }
+        for t, o, h, l, c, v, s, rv in zip(*(rates[name].tolist() for name in RATE_DTYPE.names))
+    ]
+
+
+def aggregate_rates(rates: np.ndarray, seconds: int) -> np.ndarray:
+    """
+    Aggregate base bars into `seconds`-wide buckets aligned to the epoch
+    (server midnight for D1, as in MT5).
+
+    Open/close come from the first/last bar of a bucket, high/low are the
+    extremes, volumes are summed and spread is taken from the last bar.
+    """
+    if len(rates) == 0:
+        return np.zeros(0, dtype=RATE_DTYPE)
+    bucket = rates['time'] // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    out = np.empty(len(starts), dtype=RATE_DTYPE)
+    out['time'] = bucket[starts]
+    out['open'] = rates['open'][starts]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['close'] = rates['close'][ends]
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['spread'] = rates['spread'][ends]
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    return out
+
+
+@dataclass
+class _Series:
+    """Cached bars of one (symbol, timeframe), oldest first."""
+    rates: np.ndarray
+    fetched_at: float
+    capacity: int
+    base_version: int = -1
+
+
+class BarStore:
+    """
+    Multi-timeframe bar cache on top of a connector.
+
+    Thread-safe; one terminal request is in flight at a time.
+    """
+
+    def __init__(self, connector, base_timeframe: Union[int, str] = TIMEFRAME_M1,
+                 base_bars: int = 1500, tail_bars: int = 3, max_age_seconds: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            connector: MT5Connector (or anything with get_rates / get_rates_array)
+            base_timeframe: Timeframe fetched from the terminal and aggregated up
+            base_bars: Base bars kept per symbol; must span the longest derived
+                bucket (1500 M1 bars covers a D1 bar)
+            tail_bars: Bars fetched on a refresh (the forming bar plus overlap)
+            max_age_seconds: How long a series is served before it is refreshed
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.connector = connector
+        self.base_timeframe, self.base_seconds = resolve_timeframe(base_timeframe)
+        self.base_bars = base_bars
+        self.tail_bars = max(2, tail_bars)
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._base: Dict[str, _Series] = {}
+        self._base_versions: Dict[str, int] = {}
+        self._derived: Dict[Tuple[str, int], _Series] = {}
+        self._direct: Dict[Tuple[str, int], _Series] = {}
+        self._stats = {
+            'requests': 0,
+            'terminal_calls': 0,
+            'base_refreshes': 0,
+            'base_reloads': 0,
+            'seeds': 0,
+            'direct_fetches': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_rates(self, symbol: str, timeframe: Union[int, str], count: int,
+                  start_pos: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Drop-in for MT5Connector.get_rates() served from the store."""
+        rates = self.get_rates_array(symbol, timeframe, count, start_pos)
+        return None if rates is None else rates_to_dicts(rates)
+
+    def get_rates_array(self, symbol: str, timeframe: Union[int, str], count: int,
+                        start_pos: int = 0) -> Optional[np.ndarray]:
+        """
+        Newest `count` bars ending `start_pos` bars before the forming bar.
+
+        Returns:
+            RATE_DTYPE array (oldest first), or None if the terminal has no data
+        """
+        constant, seconds = resolve_timeframe(timeframe)
+        need = count + start_pos
+        with self._lock:
+            self._stats['requests'] += 1
+            derivable = (
+                seconds is not None and seconds >= self.base_seconds
+                and seconds % self.base_seconds == 0 and 86400 % seconds == 0
+            )
+            if not derivable:
+                rates = self._direct_rates(symbol, constant, need)
+            else:
+                base = self._refresh_base(symbol)
+                if base is None:
+                    return None
+                if seconds == self.base_seconds:
+                    rates = base.rates if len(base.rates) >= need else self._direct_rates(symbol, constant, need)
+                else:
+                    rates = self._derived_rates(symbol, constant, seconds, base, need)
+        if rates is None:
+            return None
+        end = len(rates) - start_pos
+        if end <= 0:
+            return None
+        return rates[max(0, end - count):end]
+
+    def get_frame(self, symbol: str, timeframe: Union[int, str], count: int) -> pd.DataFrame:
+        """Bars as a DataFrame indexed by bar time (DataLayer.normalize_rates layout)."""
+        rates = self.get_rates_array(symbol, timeframe, count)
+        if rates is None:
+            return pd.DataFrame()
+        df = pd.DataFrame({name: rates[name] for name in ('open', 'high', 'low', 'close')},
+                          index=pd.to_datetime(rates['time'], unit='s'))
+        df.index.name = 'time'
+        df['volume'] = rates['tick_volume']
+        df['real_volume'] = rates['real_volume']
+        df['spread'] = rates['spread']
+        df.attrs['symbol'] = symbol
+        return df
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop cached series for a symbol, or everything."""
+        with self._lock:
+            if symbol is None:
+                self._base.clear()
+                self._derived.clear()
+                self._direct.clear()
+                return
+            self._base.pop(symbol, None)
+            for cache in (self._derived, self._direct):
+                for key in [k for k in cache if k[0] == symbol]:
+                    del cache[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request/terminal-call counters and cached series sizes"""
+        with self._lock:
+            return {
+                **self._stats,
+                'symbols': sorted(self._base),
+                'cached_series': len(self._base) + len(self._derived) + len(self._direct),
+                'cached_bars': sum(len(s.rates) for cache in (self._base, self._derived, self._direct)
+                                   for s in cache.values()),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (called with the lock held)
+    # ------------------------------------------------------------------
+
+    def _fetch(self, symbol: str, timeframe: int, count: int) -> Optional[np.ndarray]:
+        self._stats['terminal_calls'] += 1
+        try:
+            if hasattr(self.connector, 'get_rates_array'):
+                rates = self.connector.get_rates_array(symbol, timeframe, count)
+            else:
+                rates = self.connector.get_rates(symbol=symbol, timeframe=timeframe, count=count)
+        except Exception as e:
+            logger.warning(f"Rate fetch failed for {symbol} tf={timeframe}: {e}")
+            return None
+        if rates is None or len(rates) == 0:
+            return None
+        return as_rates(rates)
+
+    def _refresh_base(self, symbol: str) -> Optional[_Series]:
+        """Base series for `symbol`, topped up with a tail fetch when stale."""
+        series = self._base.get(symbol)
+        now = self._clock()
+        if series is not None and now - series.fetched_at < self.max_age_seconds:
+            return series
+
+        rates = None
+        if series is not None:
+            tail = self._fetch(symbol, self.base_timeframe, self.tail_bars)
+            if tail is None:
+                return None
+            if tail['time'][0] <= series.rates['time'][-1]:
+                # 1. Splice: keep bars before the tail, the tail replaces the rest
+                keep = series.rates[series.rates['time'] < tail['time'][0]]
+                rates = np.concatenate([keep, tail])[-self.base_bars:]
+                self._stats['base_refreshes'] += 1
+        if rates is None:
+            # 2. First use or a gap since the last refresh: reload the full window
+            rates = self._fetch(symbol, self.base_timeframe, self.base_bars)
+            if rates is None:
+                return None
+            self._stats['base_reloads'] += 1
+
+        version = self._base_versions.get(symbol, 0) + 1
+        self._base_versions[symbol] = version
+        series = _Series(rates=rates, fetched_at=now, capacity=self.base_bars, base_version=version)
+        self._base[symbol] = series
+        return series
+
+    def _derived_rates(self, symbol: str, timeframe: int, seconds: int,
+                       base: _Series, need: int) -> Optional[np.ndarray]:
+        """Higher-timeframe bars: seeded once, then rebuilt from the base from the last bucket on."""
+        key = (symbol, timeframe)
+        series = self._derived.get(key)
+        if series is not None and series.base_version == base.base_version and need <= series.capacity:
+            return series.rates
+
+        base_rates = base.rates
+        if series is not None and need <= series.capacity:
+            cut = series.rates['time'][-1]
+            if base_rates['time'][0] <= cut:
+                # The base covers the whole last (possibly forming) bucket
+                fresh = aggregate_rates(base_rates[base_rates['time'] >= cut], seconds)
+                if len(fresh):
+                    merged = np.concatenate([series.rates[series.rates['time'] < cut], fresh])
+                    series.rates = merged[-series.capacity:]
+                series.base_version = base.base_version
+                return series.rates
+
+        # Seed (or re-seed after a gap / larger request) from the terminal
+        rates = self._fetch(symbol, timeframe, need)
+        if rates is None:
+            return None
+        self._stats['seeds'] += 1
+        self._derived[key] = _Series(rates=rates, fetched_at=self._clock(), capacity=need,
+                                     base_version=base.base_version)
+        return rates
+
+    def _direct_rates(self, symbol: str, timeframe: int, need: int) -> Optional[np.ndarray]:
+        """Timeframes that cannot be derived from the base (or oversized requests): TTL cache."""
+        key = (symbol, timeframe)
+        series = self._direct.get(key)
+        now = self._clock()
+        if series is not None and need <= series.capacity and now - series.fetched_at < self.max_age_seconds:
+            return series.rates
+        capacity = max(need, series.capacity if series is not None else 0)
+        rates = self._fetch(symbol, timeframe, capacity)
+        if rates is None:
+            return None
+        self._stats['direct_fetches'] += 1
+        self._direct[key] = _Series(rates=rates, fetched_at=now, capacity=capacity)
+        return rates
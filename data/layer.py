@@ -114,6 +114,20 @@ class DataLayer:
         
         return None
     
+    def cache_data(self, symbol: str, data: pd.DataFrame):
+        """
+        Replace cached data for a symbol (e.g. after splicing new bars onto a buffer).
+        
+        Args:
+            symbol: Trading symbol
+            data: Normalized DataFrame
+        """
+        if self.cache_enabled and symbol:
+            self._cache[symbol] = {
+                'data': data,
+                'timestamp': datetime.now()
+            }
+    
     def invalidate_cache(self, symbol: str = None):
         """
         Invalidate cached data.
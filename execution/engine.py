@@ -18,6 +18,7 @@ from enum import Enum
 
 from cthulu.strategy.base import Signal, SignalType
 from cthulu import constants
+from cthulu.utils.cache import symbol_spec
 
 
 class OrderType(Enum):
@@ -181,13 +182,12 @@ class ExecutionEngine:
             sym_min = None
             sym_step = None
             try:
-                sym_min = self.connector.get_min_lot(order_req.symbol)
+                # Static spec, shared with the risk evaluator and RPC server
+                spec = symbol_spec(self.connector, order_req.symbol)
+                sym_min = spec.get('volume_min')
+                sym_step = spec.get('volume_step')
             except Exception:
                 sym_min = None
-            try:
-                sym_info = self.connector.get_symbol_info(order_req.symbol) or {}
-                sym_step = sym_info.get('volume_step')
-            except Exception:
                 sym_step = None
 
             orig_vol = float(order_req.volume)
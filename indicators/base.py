@@ -104,6 +104,26 @@ class Indicator(ABC):
             'state': self._state.copy()
         }
         
+    def get_warm_state(self) -> Dict[str, Any]:
+        """Internal state for warm-restart snapshots."""
+        return {
+            'params': dict(self.params),
+            'state': self._state.copy(),
+            'last_calculation': self._last_calculation
+        }
+        
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """
+        Restore internal state captured by get_warm_state().
+        
+        State computed with different parameters is discarded.
+        """
+        if state.get('params') != dict(self.params):
+            self.logger.debug(f"{self.name}: parameters changed, ignoring snapshot state")
+            return
+        self._state = dict(state.get('state', {}))
+        self._last_calculation = state.get('last_calculation')
+        
     def update_calculation_time(self):
         """Update last calculation timestamp (ensure monotonic uniqueness)."""
         from datetime import timedelta
@@ -0,0 +1,154 @@
+"""
+Indicator Kernels
+
+Array implementations of the path-dependent parts of the indicators
+(Supertrend bands and direction, fractal pivots). Each loop is written once
+over plain indexable sequences: when numba is installed it is compiled to machine code and run
+on contiguous float64 arrays; otherwise it runs on Python lists, which is
+still far cheaper than scalar .iloc reads and writes on a Series.
+
+Kernels reproduce the pandas/indicator code they replace operation for
+operation (same comparisons, same NaN handling, same arithmetic order), so
+results are bit-identical on either backend.
+
+Set CTHULU_DISABLE_JIT=1 to force the pure-Python backend.
+
+Usage:
+    upper, lower, trend, direction = supertrend(basic_upper, basic_lower, close)
+    is_high, is_low = fractal_pivots(high, low, half=2)
+"""
+
+import os
+from typing import Any, Callable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Optional JIT backend
+    numba = None
+
+JIT_ENABLED = numba is not None and os.getenv('CTHULU_DISABLE_JIT', '').lower() not in ('1', 'true', 'yes')
+
+ArrayLike = Union[np.ndarray, Sequence[float]]
+
+
+def _kernel(fn: Callable) -> Callable:
+    """Compile fn with numba when the JIT backend is enabled."""
+    if JIT_ENABLED:
+        return numba.njit(cache=True, nogil=True)(fn)
+    return fn
+
+
+def backend() -> str:
+    """Name of the active kernel backend ('numba' or 'python')."""
+    return 'numba' if JIT_ENABLED else 'python'
+
+
+def _inputs(*arrays: ArrayLike) -> List[Any]:
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in arrays]
+    return arrays if JIT_ENABLED else [a.tolist() for a in arrays]
+
+
+def _outputs(n: int, count: int) -> List[Any]:
+    if JIT_ENABLED:
+        return [np.full(n, np.nan) for _ in range(count)]
+    return [[np.nan] * n for _ in range(count)]
+
+
+# ============================================================================
+# Supertrend
+# ============================================================================
+
+@_kernel
+def _supertrend_loop(basic_upper, basic_lower, close, final_upper, final_lower, trend, direction):
+    n = len(close)
+    if n == 0:
+        return
+    final_upper[0] = basic_upper[0]
+    final_lower[0] = basic_lower[0]
+    trend[0] = final_upper[0]
+    direction[0] = -1.0
+
+    for i in range(1, n):
+        # Upper band: reset to the basic band when it tightens or price closed above it
+        prev_upper = final_upper[i - 1]
+        if prev_upper != prev_upper:
+            final_upper[i] = basic_upper[i]
+        elif basic_upper[i] < prev_upper or close[i - 1] > prev_upper:
+            final_upper[i] = basic_upper[i]
+        else:
+            final_upper[i] = prev_upper
+
+        # Lower band: reset to the basic band when it tightens or price closed below it
+        prev_lower = final_lower[i - 1]
+        if prev_lower != prev_lower:
+            final_lower[i] = basic_lower[i]
+        elif basic_lower[i] > prev_lower or close[i - 1] < prev_lower:
+            final_lower[i] = basic_lower[i]
+        else:
+            final_lower[i] = prev_lower
+
+        # Direction flips when close breaks the previous bar's final band
+        if close[i] > prev_upper:
+            direction[i] = 1.0
+        elif close[i] < prev_lower:
+            direction[i] = -1.0
+        else:
+            direction[i] = direction[i - 1]
+
+        if direction[i] == 1.0:
+            trend[i] = final_lower[i]
+        else:
+            trend[i] = final_upper[i]
+
+
+def supertrend(basic_upper: ArrayLike, basic_lower: ArrayLike,
+               close: ArrayLike) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Final Supertrend bands, line and direction from the basic bands.
+
+    Args:
+        basic_upper: hl2 + multiplier * ATR
+        basic_lower: hl2 - multiplier * ATR
+        close: Close prices
+
+    Returns:
+        (final_upper, final_lower, supertrend, direction) float64 arrays;
+        direction is 1.0 (up) or -1.0 (down)
+    """
+    inputs = _inputs(basic_upper, basic_lower, close)
+    outputs = _outputs(len(inputs[2]), 4)
+    _supertrend_loop(*inputs, *outputs)
+    return tuple(np.asarray(o, dtype=np.float64) for o in outputs)
+
+
+# ============================================================================
+# Fractal pivots
+# ============================================================================
+
+def fractal_pivots(high: ArrayLike, low: ArrayLike, half: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Williams-style fractal pivots over 2 * half + 1 bar windows.
+
+    A bar is a high (low) fractal when no bar within `half` bars on either
+    side has a higher high (lower low). Bars closer than `half` to either end
+    are never pivots.
+
+    Returns:
+        (is_high, is_low) boolean arrays aligned with the input
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    is_high = np.zeros(n, dtype=bool)
+    is_low = np.zeros(n, dtype=bool)
+    width = 2 * half + 1
+    if n < width:
+        return is_high, is_low
+
+    highs = np.lib.stride_tricks.sliding_window_view(high, width)
+    lows = np.lib.stride_tricks.sliding_window_view(low, width)
+    is_high[half:n - half] = ~np.any(highs > highs[:, half:half + 1], axis=1)
+    is_low[half:n - half] = ~np.any(lows < lows[:, half:half + 1], axis=1)
+    return is_high, is_low
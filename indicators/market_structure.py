@@ -27,6 +27,8 @@ import logging
 import pandas as pd
 import numpy as np
 
+from .kernels import fractal_pivots
+
 logger = logging.getLogger('cthulu.market_structure')
 
 
@@ -209,8 +211,14 @@ class MarketStructureDetector:
         
         bar_time = data['time'].iloc[center_idx] if 'time' in data.columns else datetime.now(timezone.utc)
         
+        # One pivot pass over the scanned window gives both the high and low check
+        start = center_idx - self._p_half
+        window = data.iloc[start:center_idx + self._p_half + 1]
+        is_high, is_low = fractal_pivots(window['high'].to_numpy(dtype=np.float64),
+                                         window['low'].to_numpy(dtype=np.float64), self._p_half)
+        
         # Check for high fractal
-        if self._is_fractal_high(data, center_idx):
+        if is_high[self._p_half]:
             fractal_price = data['high'].iloc[center_idx]
             
             # Check if already recorded
@@ -227,7 +235,7 @@ class MarketStructureDetector:
                 logger.debug(f"High fractal detected at {bar_time}: {fractal_price}")
         
         # Check for low fractal
-        if self._is_fractal_low(data, center_idx):
+        if is_low[self._p_half]:
             fractal_price = data['low'].iloc[center_idx]
             
             # Check if already recorded
@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple
 from .base import Indicator
+from . import kernels
 
 
 class Supertrend(Indicator):
@@ -68,61 +69,12 @@ class Supertrend(Indicator):
         basic_upper = hl2 + (self.multiplier * atr)
         basic_lower = hl2 - (self.multiplier * atr)
         
-        # Initialize final bands
-        final_upper = basic_upper.copy()
-        final_lower = basic_lower.copy()
-        
-        # Calculate final bands using vectorized operations
-        final_upper = basic_upper.copy()
-        final_lower = basic_lower.copy()
-        
-        # Vectorized calculation with shift
-        for i in range(1, len(df)):
-            # Upper band: if previous final is NaN, default to current basic
-            if pd.isna(final_upper.iloc[i-1]):
-                final_upper.iloc[i] = basic_upper.iloc[i]
-            else:
-                # Upper band: if current basic < previous final OR close crossed above
-                if basic_upper.iloc[i] < final_upper.iloc[i-1] or df['close'].iloc[i-1] > final_upper.iloc[i-1]:
-                    final_upper.iloc[i] = basic_upper.iloc[i]
-                else:
-                    final_upper.iloc[i] = final_upper.iloc[i-1]
-                
-            # Lower band: if previous final is NaN, default to current basic
-            if pd.isna(final_lower.iloc[i-1]):
-                final_lower.iloc[i] = basic_lower.iloc[i]
-            else:
-                # Lower band: if current basic > previous final OR close crossed below
-                if basic_lower.iloc[i] > final_lower.iloc[i-1] or df['close'].iloc[i-1] < final_lower.iloc[i-1]:
-                    final_lower.iloc[i] = basic_lower.iloc[i]
-                else:
-                    final_lower.iloc[i] = final_lower.iloc[i-1]
-        
-        # Determine trend direction
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
-        
-        # Initialize
-        supertrend.iloc[0] = final_upper.iloc[0]
-        direction.iloc[0] = -1
-        
-        for i in range(1, len(df)):
-            # Direction logic (compare to previous final bands)
-            prev_upper = final_upper.iloc[i-1]
-            prev_lower = final_lower.iloc[i-1]
-
-            if df['close'].iloc[i] > prev_upper:
-                direction.iloc[i] = 1
-            elif df['close'].iloc[i] < prev_lower:
-                direction.iloc[i] = -1
-            else:
-                direction.iloc[i] = direction.iloc[i-1]
-
-            # Supertrend value based on current direction
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = final_lower.iloc[i]
-            else:
-                supertrend.iloc[i] = final_upper.iloc[i]
+        # Final bands, line and direction are path-dependent: run them in the array kernel
+        final_upper, final_lower, supertrend, direction = (
+            pd.Series(values, index=df.index)
+            for values in kernels.supertrend(basic_upper.to_numpy(), basic_lower.to_numpy(),
+                                             df['close'].to_numpy())
+        )
         
         # Generate trading signals (1 = buy, -1 = sell, 0 = hold)
         signal = direction.diff()
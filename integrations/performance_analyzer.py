@@ -3,18 +3,35 @@ Performance Analyzer
 
 Semantic search across performance metrics to identify what works
 in specific market conditions.
+
+Analytics mode: load closed trades plus their logged context (regime,
+strategy) once into a columnar frame, from the trades database or the ML
+training log, and every analyze_* report is answered from grouped
+aggregations over that frame instead of per-query vector searches.
+
+Usage:
+    analyzer = PerformanceAnalyzer()
+    analyzer.load_from_database(database)         # or load_from_training_log(dir)
+    report = analyzer.generate_performance_report('EURUSD', lookback_days=365)
 """
 
+import glob
+import gzip
+import json
 import logging
+import os
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Analytics frame: one row per closed trade
+FRAME_COLUMNS = ['timestamp', 'symbol', 'strategy', 'regime', 'pnl', 'outcome']
+
 
 @dataclass
 class PerformanceInsight:
@@ -48,17 +65,207 @@ class PerformanceAnalyzer:
     times, regimes, and other contextual factors.
     """
     
-    def __init__(self, vector_adapter=None, retriever=None):
+    def __init__(self, vector_adapter=None, retriever=None, trades: Optional[pd.DataFrame] = None):
         """
         Initialize performance analyzer.
         
         Args:
             vector_adapter: VectorStudioAdapter instance
             retriever: ContextRetriever instance
+            trades: Closed trades frame; enables analytics mode (see load_trades)
         """
         self.vector_adapter = vector_adapter
         self.retriever = retriever
         self.logger = logging.getLogger(__name__)
+        self._trades: Optional[pd.DataFrame] = None
+        self._as_of: Optional[datetime] = None
+        self._cache: Dict[tuple, Any] = {}
+        if trades is not None:
+            self.load_trades(trades)
+
+    # ------------------------------------------------------------------
+    # Analytics mode: loading
+    # ------------------------------------------------------------------
+
+    @property
+    def analytics_mode(self) -> bool:
+        """True when reports come from a loaded trades frame."""
+        return self._trades is not None
+
+    def load_trades(self, trades: Union[pd.DataFrame, Iterable[Dict[str, Any]]],
+                    as_of: Optional[datetime] = None) -> int:
+        """
+        Load closed trades and switch to analytics mode.
+        
+        Args:
+            trades: Frame/records with FRAME_COLUMNS (missing context columns
+                become 'UNKNOWN'; outcome is derived from pnl when absent)
+            as_of: End of every lookback window (default: now)
+            
+        Returns:
+            Number of trades loaded
+        """
+        frame = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(list(trades))
+        n = len(frame)
+        column = lambda name: frame[name] if name in frame else pd.Series([None] * n, index=frame.index)
+        
+        pnl = pd.to_numeric(column('pnl'), errors='coerce')
+        derived = np.where(pnl > 0, 'WIN', np.where(pnl < 0, 'LOSS', 'BREAKEVEN'))
+        outcome = self._categorical(column('outcome'), None, str.upper)
+        timestamp = pd.to_datetime(column('timestamp'), format='ISO8601', errors='coerce', utc=True)
+        
+        # Symbols/contexts repeat endlessly: categoricals keep groupbys on codes
+        data = pd.DataFrame({
+            'timestamp': timestamp.dt.tz_localize(None),
+            'symbol': self._categorical(column('symbol'), '', str.upper),
+            'strategy': self._categorical(column('strategy'), 'UNKNOWN'),
+            'regime': self._categorical(column('regime'), 'UNKNOWN', str.upper),
+            'pnl': pnl,
+            'outcome': pd.Categorical(np.where(outcome.isna(), derived, outcome.astype(object))),
+        })
+        data['win'] = data['outcome'] == 'WIN'
+        data['hour'] = data['timestamp'].dt.hour
+        
+        self._trades = data.sort_values('timestamp', kind='stable').reset_index(drop=True)
+        self._as_of = as_of or datetime.now()
+        self._cache.clear()
+        self.logger.info(f"Analytics mode: loaded {len(self._trades)} trades")
+        return len(self._trades)
+
+    @staticmethod
+    def _categorical(values: pd.Series, default: Optional[str], normalize=None) -> pd.Categorical:
+        """Categorical of values as text, normalizing each distinct value once."""
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        labels = [str(u) for u in uniques]
+        if normalize is not None:
+            labels = [normalize(label) for label in labels]
+        labels = np.array(labels + [default], dtype=object)
+        return pd.Categorical(labels[codes])
+    
+    def load_from_database(self, database, as_of: Optional[datetime] = None) -> int:
+        """
+        Load closed trades from the trades database with their signal context.
+        
+        Regime and strategy come from the originating signal's metadata
+        (or the trade's own metadata), extracted by SQLite in the same query.
+        
+        Args:
+            database: persistence Database instance
+            as_of: End of every lookback window (default: now)
+            
+        Returns:
+            Number of trades loaded
+        """
+        def meta(alias: str, key: str) -> str:
+            return f"CASE WHEN json_valid({alias}.metadata) THEN json_extract({alias}.metadata, '$.{key}') END"
+        
+        query = f"""
+            SELECT CAST(t.entry_time AS TEXT) AS timestamp, t.symbol, t.profit AS pnl,
+                   COALESCE({meta('t', 'strategy_name')}, {meta('t', 'strategy')},
+                            {meta('s', 'strategy_name')}, {meta('s', 'strategy')}) AS strategy,
+                   COALESCE({meta('t', 'regime')}, {meta('s', 'regime')}) AS regime
+            FROM trades t
+            LEFT JOIN signals s ON s.signal_id = t.signal_id
+            WHERE t.status = 'CLOSED' AND t.profit IS NOT NULL
+        """
+        return self.load_trades(pd.read_sql_query(query, database.conn), as_of=as_of)
+
+    def load_from_training_log(self, data_dir: str, as_of: Optional[datetime] = None) -> int:
+        """
+        Load 'trade_closed' events from the ML training log (.jsonl.gz and .evlog).
+        
+        Args:
+            data_dir: Directory the MLDataCollector writes to
+            as_of: End of every lookback window (default: now)
+            
+        Returns:
+            Number of trades loaded
+        """
+        from cthulu.utils.event_log import read_event_logs
+        
+        fields = ['timestamp', 'symbol', 'strategy_name', 'regime', 'pnl', 'outcome']
+        records = []
+        for path in sorted(glob.glob(os.path.join(data_dir, '*.jsonl.gz'))):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        if '"trade_closed"' not in line:
+                            continue
+                        try:
+                            event = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if event.get('event_type') == 'trade_closed':
+                            payload = event.get('payload') or {}
+                            records.append({k: payload.get(k) for k in fields})
+            except (OSError, EOFError) as e:
+                self.logger.debug(f"Could not read {path}: {e}")
+        
+        frames = [pd.DataFrame(records, columns=fields)]
+        columnar = read_event_logs(data_dir, 'trade_closed')
+        if not columnar.empty:
+            frames.append(columnar.reindex(columns=fields))
+        frame = pd.concat([f for f in frames if not f.empty] or frames, ignore_index=True)
+        return self.load_trades(frame.rename(columns={'strategy_name': 'strategy'}), as_of=as_of)
+
+    # ------------------------------------------------------------------
+    # Analytics mode: cached intermediates
+    # ------------------------------------------------------------------
+
+    def _window(self, symbol: str, lookback_days: int, regime: Optional[str] = None) -> pd.DataFrame:
+        """Trades for symbol within the lookback window (cached per snapshot)."""
+        key = ('window', symbol.upper(), lookback_days, regime)
+        if key not in self._cache:
+            trades = self._trades
+            start = np.searchsorted(trades['timestamp'].values,
+                                    np.datetime64(self._as_of - timedelta(days=lookback_days)))
+            trades = trades.iloc[start:]
+            mask = trades['symbol'] == symbol.upper()
+            if regime is not None:
+                mask &= trades['regime'] == regime.upper()
+            self._cache[key] = trades[mask]
+        return self._cache[key]
+
+    def _group_table(self, symbol: str, lookback_days: int, by: str,
+                     regime: Optional[str] = None) -> pd.DataFrame:
+        """
+        Per-group trades, win_rate, avg_pnl and confidence (cached per snapshot).
+        """
+        key = ('groups', symbol.upper(), lookback_days, by, regime)
+        if key not in self._cache:
+            window = self._window(symbol, lookback_days, regime)
+            table = window.groupby(by, observed=True, sort=True).agg(
+                trades=('win', 'size'), wins=('win', 'sum'), avg_pnl=('pnl', 'mean'))
+            table['win_rate'] = table['wins'] / table['trades']
+            table['confidence'] = self._confidence_array(table['trades'].values, table['win_rate'].values)
+            self._cache[key] = table
+        return self._cache[key]
+
+    def _frame_insights(self, table: pd.DataFrame, condition, recommend,
+                        min_samples: int = 1) -> Dict[Any, PerformanceInsight]:
+        insights = {}
+        for group, row in table[table['trades'] >= min_samples].iterrows():
+            avg_pnl = float(row['avg_pnl']) if pd.notna(row['avg_pnl']) else float('nan')
+            insights[group] = PerformanceInsight(
+                condition=condition(group),
+                metric="win_rate",
+                value=float(row['win_rate']),
+                sample_size=int(row['trades']),
+                confidence=float(row['confidence']),
+                recommendation=recommend(group, float(row['win_rate']), avg_pnl)
+            )
+        return insights
+
+    @staticmethod
+    def _confidence_array(sample_sizes: np.ndarray, win_rates: np.ndarray) -> np.ndarray:
+        """_calculate_confidence over whole columns."""
+        sample_confidence = np.minimum(1.0, sample_sizes / 30)
+        win_rate_confidence = 1.0 - np.abs(0.5 - win_rates)
+        return np.clip(sample_confidence * 0.7 + win_rate_confidence * 0.3, 0.0, 1.0)
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
         
     def analyze_regime_performance(
         self,
@@ -75,6 +282,9 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary of regime -> performance insight
         """
+        if self.analytics_mode:
+            return self._regime_from_frame(symbol, lookback_days)
+            
         insights = {}
         
         regimes = [
@@ -154,6 +364,14 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary of hour -> performance insight
         """
+        if self.analytics_mode:
+            return self._frame_insights(
+                self._group_table(symbol, lookback_days, 'hour'),
+                lambda hour: f"Hour: {hour:02d}:00",
+                self._generate_time_recommendation,
+                min_samples=5
+            )
+            
         insights = {}
         
         # Get all recent trades
@@ -227,6 +445,15 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary of strategy -> performance insight
         """
+        if self.analytics_mode:
+            table = self._group_table(symbol, lookback_days, 'strategy', regime)
+            return self._frame_insights(
+                table.drop(index='UNKNOWN', errors='ignore'),
+                lambda strategy: f"Strategy: {strategy}" + (f" in {regime}" if regime else ""),
+                lambda strategy, win_rate, avg_pnl: self._generate_strategy_recommendation(
+                    strategy, win_rate, avg_pnl, regime)
+            )
+            
         insights = {}
         
         strategies = [
@@ -358,6 +585,9 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with drawdown analysis
         """
+        if self.analytics_mode:
+            return self._drawdown_from_frame(symbol, lookback_days)
+            
         try:
             # Query losing trades
             query = f"[Trade] Symbol: {symbol}, Outcome: LOSS"
@@ -408,6 +638,53 @@ class PerformanceAnalyzer:
             self.logger.error(f"Error analyzing drawdown patterns: {e}")
             return {}
     
+    def _regime_from_frame(self, symbol: str, lookback_days: int) -> Dict[str, PerformanceInsight]:
+        table = self._group_table(symbol, lookback_days, 'regime').drop(index='UNKNOWN', errors='ignore')
+        insights = self._frame_insights(
+            table,
+            lambda regime: f"Regime: {regime}",
+            self._generate_regime_recommendation
+        )
+        # Ten most recent trades per regime as supporting examples
+        examples = self._window(symbol, lookback_days).groupby('regime', observed=True).tail(10)
+        for regime, rows in examples.groupby('regime', observed=True):
+            if regime in insights:
+                insights[regime].supporting_data = [
+                    {'outcome': outcome, 'pnl': pnl}
+                    for outcome, pnl in zip(rows['outcome'].astype(str), rows['pnl'].tolist())
+                ]
+        return insights
+
+    def _drawdown_from_frame(self, symbol: str, lookback_days: int) -> Dict[str, Any]:
+        window = self._window(symbol, lookback_days)
+        losses = window[window['outcome'] == 'LOSS']
+        if losses.empty:
+            return {}
+        
+        regimes = losses['regime'].value_counts(sort=True)
+        regimes = regimes[regimes > 0]
+        strategies = losses['strategy'].value_counts(sort=True)
+        strategies = strategies[strategies > 0]
+        hours = losses['hour'].dropna().astype(int).value_counts(sort=True)
+        
+        # Equity curve and losing streaks over the window, in trade order
+        equity = window['pnl'].fillna(0.0).cumsum().values
+        drawdown = equity - np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+        lost = window['outcome'].eq('LOSS').values
+        run_ids = np.cumsum(~lost)
+        streaks = np.bincount(run_ids[lost]) if lost.any() else np.zeros(1, dtype=int)
+        
+        return {
+            'total_losses': int(len(losses)),
+            'most_common_regime': regimes.index[0] if len(regimes) else None,
+            'most_common_strategy': strategies.index[0] if len(strategies) else None,
+            'worst_hours': [(int(h), int(c)) for h, c in hours.head(3).items()],
+            'regime_distribution': {k: int(v) for k, v in regimes.items()},
+            'strategy_distribution': {k: int(v) for k, v in strategies.items()},
+            'max_drawdown': float(drawdown.min()) if len(drawdown) else 0.0,
+            'max_losing_streak': int(streaks.max()),
+        }
+
     def generate_performance_report(
         self,
         symbol: str,
@@ -9,6 +9,8 @@ import logging
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+from cthulu.utils.cache import SmartCache
+
 
 @dataclass
 class SimilarContext:
@@ -29,22 +31,32 @@ class ContextRetriever:
     trades, and market conditions to enhance trading decisions.
     """
     
-    def __init__(self, adapter, embedder=None):
+    def __init__(self, adapter, embedder=None, query_cache_ttl: float = 30.0):
         """
         Initialize retriever.
         
         Args:
             adapter: VectorStudioAdapter instance
             embedder: TradeEmbedder instance (optional, will create if None)
+            query_cache_ttl: Seconds identical queries are served from cache
         """
         self.adapter = adapter
         self.logger = logging.getLogger("cthulu.integrations.retriever")
+        self._query_cache = SmartCache(ttl_seconds=query_cache_ttl, max_size=256, name="retriever_queries")
         
         if embedder is None:
             from .embedder import TradeEmbedder
             embedder = TradeEmbedder()
         self.embedder = embedder
     
+    def _search(self, query: str, k: int, min_score: float, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Vector search; identical repeated or concurrent queries hit the store once."""
+        key = (query, k, min_score, tuple(sorted((filters or {}).items())))
+        return self._query_cache.get_or_fetch(
+            key,
+            lambda: self.adapter.find_similar_contexts(query=query, k=k, min_score=min_score, filters=filters)
+        )
+    
     def get_similar_signals(
         self,
         current_signal: Any,
@@ -74,7 +86,7 @@ class ContextRetriever:
             query = self.embedder.signal_to_text(current_signal, indicators, regime)
             
             # Search Vector Studio
-            results = self.adapter.find_similar_contexts(
+            results = self._search(
                 query=query,
                 k=k * 2,  # Get more to filter
                 min_score=min_score,
@@ -125,7 +137,7 @@ class ContextRetriever:
         try:
             query = f"Market regime {regime} for {symbol}. Historical trade outcomes and patterns."
             
-            results = self.adapter.find_similar_contexts(
+            results = self._search(
                 query=query,
                 k=k,
                 min_score=min_score,
@@ -175,7 +187,7 @@ class ContextRetriever:
         try:
             query = f"Chart pattern: {pattern_description}. Timeframe: {timeframe}. Historical outcomes."
             
-            results = self.adapter.find_similar_contexts(
+            results = self._search(
                 query=query,
                 k=k,
                 min_score=min_score
@@ -222,7 +234,7 @@ class ContextRetriever:
         try:
             query = f"Winning trades for {symbol} in {regime} regime. Profitable outcomes."
             
-            results = self.adapter.find_similar_contexts(
+            results = self._search(
                 query=query,
                 k=k * 2,
                 min_score=0.5,
@@ -312,7 +324,7 @@ class ContextRetriever:
         try:
             query = self.embedder.build_query(current_state)
             
-            results = self.adapter.find_similar_contexts(
+            results = self._search(
                 query=query,
                 k=k,
                 min_score=0.5
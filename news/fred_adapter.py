@@ -16,10 +16,12 @@ class FREDAdapter(NewsAdapter):
     observation for a short list of series (configurable) and return them
     as NewsEvent objects for ingestion into ML pipelines.
     """
-    def __init__(self, api_key: Optional[str] = None, series: Optional[List[str]] = None, timeout: float = 5.0):
+    def __init__(self, api_key: Optional[str] = None, series: Optional[List[str]] = None, timeout: float = 5.0,
+                 base_url: str = 'https://api.stlouisfed.org/fred'):
         self.api_key = api_key
         self.series = series or ['GDP']
         self.timeout = timeout
+        self.base_url = base_url.rstrip('/')
 
     def fetch_recent(self) -> List[NewsEvent]:
         if not self.api_key:
@@ -27,7 +29,7 @@ class FREDAdapter(NewsAdapter):
         out = []
         for s in self.series:
             try:
-                url = 'https://api.stlouisfed.org/fred/series/observations'
+                url = f'{self.base_url}/series/observations'
                 params = {
                     'series_id': s,
                     'api_key': self.api_key,
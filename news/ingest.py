@@ -1,10 +1,12 @@
 from __future__ import annotations
 import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Optional
 import logging
 from .manager import NewsManager
 from .base import NewsAdapter, NewsEvent
+from .store import content_hash
 from cthulu.ML_RL.instrumentation import MLDataCollector
 
 logger = logging.getLogger('cthulu.news.ingest')
@@ -13,17 +15,22 @@ logger = logging.getLogger('cthulu.news.ingest')
 class NewsIngestor:
     """Periodically fetches news and calendar events and records to ML collector.
 
+    Each distinct event (by content hash) is recorded once, however many
+    rounds it keeps appearing in.
+
     Usage:
         ing = NewsIngestor(news_manager, calendar_adapter, ml_collector, interval_seconds=300)
         ing.start()
         ...
         ing.stop()
     """
-    def __init__(self, news_manager: NewsManager, calendar_adapter: Optional[NewsAdapter], ml_collector: MLDataCollector, interval_seconds: int = 300):
+    def __init__(self, news_manager: NewsManager, calendar_adapter: Optional[NewsAdapter], ml_collector: MLDataCollector, interval_seconds: int = 300, max_seen: int = 50000):
         self.news_manager = news_manager
         self.calendar_adapter = calendar_adapter
         self.ml_collector = ml_collector
         self.interval = interval_seconds
+        self.max_seen = max_seen
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
@@ -39,28 +46,49 @@ class NewsIngestor:
         if self._thread:
             self._thread.join(timeout=timeout)
 
-    def _run(self):
-        while not self._stop.is_set():
+    def _is_new(self, event_type: str, event: Any) -> bool:
+        key = f"{event_type}:{content_hash(event)}"
+        if key in self._seen:
+            return False
+        self._seen[key] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return True
+
+    def ingest_once(self) -> int:
+        """Fetch once and record the events not recorded before. Returns the count recorded."""
+        recorded = 0
+        events = self.news_manager.fetch_recent() or []
+        for e in events:
+            if not self._is_new('news_event', e):
+                continue
+            try:
+                payload = e.__dict__
+                self.ml_collector.record_event('news_event', payload)
+                recorded += 1
+            except Exception:
+                logger.exception('Failed to record news event')
+
+        if self.calendar_adapter:
             try:
-                events = self.news_manager.fetch_recent() or []
-                for e in events:
+                cal = self.calendar_adapter.fetch_recent() or []
+                for e in cal:
+                    if not self._is_new('calendar_event', e):
+                        continue
                     try:
                         payload = e.__dict__
-                        self.ml_collector.record_event('news_event', payload)
+                        self.ml_collector.record_event('calendar_event', payload)
+                        recorded += 1
                     except Exception:
-                        logger.exception('Failed to record news event')
+                        logger.exception('Failed to record calendar event')
+            except Exception:
+                logger.exception('Calendar adapter failed')
+        return recorded
 
-                if self.calendar_adapter:
-                    try:
-                        cal = self.calendar_adapter.fetch_recent() or []
-                        for e in cal:
-                            try:
-                                payload = e.__dict__
-                                self.ml_collector.record_event('calendar_event', payload)
-                            except Exception:
-                                logger.exception('Failed to record calendar event')
-                    except Exception:
-                        logger.exception('Calendar adapter failed')
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.ingest_once()
             except Exception:
                 logger.exception('News ingest loop error')
             # Sleep with early exit
@@ -1,49 +1,179 @@
 """
-NewsManager: orchestrates multiple adapters with fallback and caching
+NewsManager: orchestrates multiple adapters concurrently with deduplication
+
+Each fetch round queries every adapter at once on a small thread pool.
+Results that arrive within the adapter's deadline are merged and
+deduplicated by content hash. Slow or failing adapters are guarded by a
+circuit breaker, so a hung provider is skipped instead of stalling every
+round. Everything fetched is appended to a NewsEventStore, and consumers can
+ask for what is new since a cursor instead of reprocessing the whole set.
 """
 from __future__ import annotations
-from typing import List, Dict, Any
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from .base import NewsEvent, NewsAdapter
-from .cache import FileCache
+from .cache import CACHE_DIR
+from .store import NewsEventStore, as_news_event, content_hash
+from cthulu.utils.cache import SmartCache
+from cthulu.utils.circuit_breaker import CircuitBreaker
 import logging
 
 logger = logging.getLogger('cthulu.news')
 
+DEFAULT_STORE_PATH = os.path.join(CACHE_DIR, 'news_events.jsonl')
+
+
 class NewsManager:
-    def __init__(self, adapters: List[NewsAdapter], cache_ttl: int = 300):
+    def __init__(self, adapters: List[NewsAdapter], cache_ttl: int = 300, empty_ttl: int = 60,
+                 store: Optional[NewsEventStore] = None, deadline: float = 10.0,
+                 failure_threshold: int = 3, breaker_timeout: int = 300,
+                 store_path: Optional[str] = DEFAULT_STORE_PATH, store_retention_days: Optional[float] = 7.0):
+        """
+        Args:
+            adapters: News/calendar adapters, queried concurrently
+            cache_ttl: Seconds a fetch round is reused by fetch_recent()
+            empty_ttl: Seconds an all-empty round is reused
+            store: Event store (default: built from store_path and store_retention_days)
+            deadline: Seconds to wait for an adapter (an adapter's own
+                `deadline` attribute overrides it)
+            failure_threshold: Consecutive failures/timeouts before an adapter is skipped
+            breaker_timeout: Seconds an adapter is skipped before it is retried
+            store_path: JSON-lines file of the default store (None keeps it in memory)
+            store_retention_days: Days of events the default store keeps (None keeps all)
+        """
         self.adapters = adapters
-        self.cache = FileCache(namespace='news_manager', ttl=cache_ttl)
+        self.deadline = deadline
+        if store is None:
+            retention = store_retention_days * 86400 if store_retention_days is not None else None
+            store = NewsEventStore(store_path, retention_seconds=retention)
+        self.store = store
+        self._names = self._adapter_names(adapters)
+        self._breakers = {
+            name: CircuitBreaker(failure_threshold=failure_threshold, timeout=breaker_timeout, name=f'news:{name}')
+            for name in self._names
+        }
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {
+            name: {'rounds': 0, 'events': 0, 'timeouts': 0, 'failures': 0, 'skipped': 0}
+            for name in self._names
+        }
+        # In-process front cache: concurrent callers share one adapter round and
+        # an all-empty round is remembered for empty_ttl seconds
+        self._memory = SmartCache(ttl_seconds=cache_ttl, max_size=1,
+                                  negative_ttl_seconds=empty_ttl, name='news_recent')
+
+    @staticmethod
+    def _adapter_names(adapters: List[NewsAdapter]) -> List[str]:
+        names = []
+        for i, adapter in enumerate(adapters):
+            name = getattr(adapter, 'provider_name', None) or type(adapter).__name__
+            names.append(name if name not in names else f'{name}#{i}')
+        return names
 
     def fetch_recent(self) -> List[NewsEvent]:
-        # Try cache first
-        cached = self.cache.get()
-        if cached is not None:
-            try:
-                # Rehydrate minimal events
-                return [NewsEvent(**e) for e in cached]
-            except Exception:
-                # If cache corrupt, ignore
-                pass
-
-        # Query adapters in order until we get results
-        for adapter in self.adapters:
-            try:
-                events = adapter.fetch_recent()
-                if events:
-                    try:
-                        # Cache the serializable representation
-                        ser = [e.__dict__ for e in events]
-                        self.cache.set(ser)
-                    except Exception:
-                        logger.exception('Failed to cache news events')
-                    return events
-            except Exception:
-                logger.exception(f'Adapter {adapter} failed; trying next')
-                continue
+        """Deduplicated events from the latest adapter round (reused for cache_ttl)."""
+        return self._memory.get_or_fetch('recent', self._fetch_uncached) or []
+
+    def poll(self) -> List[NewsEvent]:
+        """Run an adapter round now and return only the events not seen before."""
+        return self.store.add_many(self._fetch_round())
+
+    def since(self, cursor: float = 0.0, symbol: Optional[str] = None) -> Tuple[List[NewsEvent], float]:
+        """Stored events that arrived after cursor; see NewsEventStore.since()."""
+        return self.store.since(cursor, symbol)
 
-        # If none produced results, return empty list
-        return []
+    def _fetch_uncached(self) -> Optional[List[NewsEvent]]:
+        events = self._fetch_round()
+        self.store.add_many(events)
+        # None produced results (cached briefly as a negative entry)
+        return events or None
 
+    # ------------------------------------------------------------------
+    # Adapter round
+    # ------------------------------------------------------------------
 
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.adapters)),
+                                                thread_name_prefix='news-fetch')
+            return self._pool
+
+    def _fetch_adapter(self, name: str, adapter: NewsAdapter, deadline: float) -> List[NewsEvent]:
+        started = time.monotonic()
+
+        def fetch():
+            events = [as_news_event(e) for e in (adapter.fetch_recent() or [])]
+            elapsed = time.monotonic() - started
+            if elapsed > deadline:
+                # Too late for this round, but keep what it found
+                self.store.add_many(events)
+                raise TimeoutError(f'{name} took {elapsed:.1f}s (deadline {deadline:.1f}s)')
+            return events
+
+        return self._breakers[name].call(fetch)
+
+    def _fetch_round(self) -> List[NewsEvent]:
+        """Query all adapters concurrently; merge what arrives within each deadline."""
+        pool = self._get_pool()
+        now = time.monotonic()
+        pending: List[Tuple[str, Future, float]] = []
+
+        # 1. Submit every adapter whose previous fetch has finished
+        with self._lock:
+            for name, adapter in zip(self._names, self.adapters):
+                running = self._inflight.get(name)
+                if running is not None and not running.done():
+                    self._stats[name]['skipped'] += 1
+                    logger.warning(f'News adapter {name} still busy from a previous round; skipped')
+                    continue
+                deadline = float(getattr(adapter, 'deadline', None) or self.deadline)
+                future = pool.submit(self._fetch_adapter, name, adapter, deadline)
+                self._inflight[name] = future
+                pending.append((name, future, now + deadline))
+
+        # 2. Collect each result up to its own deadline, in adapter order
+        events: List[NewsEvent] = []
+        seen = set()
+        for name, future, expires in pending:
+            stats = self._stats[name]
+            stats['rounds'] += 1
+            try:
+                result = future.result(timeout=max(0.0, expires - time.monotonic()))
+            except Exception as e:
+                if isinstance(e, TimeoutError) or not future.done():
+                    stats['timeouts'] += 1
+                    logger.warning(f'News adapter {name} missed its deadline')
+                else:
+                    stats['failures'] += 1
+                    logger.warning(f'News adapter {name} failed: {e}')
+                continue
+            stats['events'] += len(result)
+            for event in result:
+                event_id = content_hash(event)
+                if event_id not in seen:
+                    seen.add(event_id)
+                    events.append(event)
+        return events
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'adapters': {
+                name: {**self._stats[name], 'breaker': self._breakers[name].state.value}
+                for name in self._names
+            },
+            'store': self.store.get_stats(),
+        }
 
+    def close(self):
+        """Stop the fetch pool (late fetches are abandoned) and close the store."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self.store.close()
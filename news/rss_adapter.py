@@ -11,15 +11,16 @@ from .base import NewsAdapter, NewsEvent
 
 
 class RssAdapter(NewsAdapter):
-    def __init__(self, feeds: List[str]):
+    def __init__(self, feeds: List[str], timeout: float = 10.0):
         self.feeds = feeds or []
+        self.timeout = timeout
         self.provider_name = 'rss'
 
     def fetch_recent(self) -> List[NewsEvent]:
         events: List[NewsEvent] = []
         for url in self.feeds:
             try:
-                with urllib.request.urlopen(url, timeout=10) as resp:
+                with urllib.request.urlopen(url, timeout=self.timeout) as resp:
                     raw = resp.read()
                     # Parse XML
                     root = ET.fromstring(raw)
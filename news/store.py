@@ -0,0 +1,286 @@
+"""
+Append-only local news store.
+
+Every event fetched by the adapters is appended once: events are identified
+by a content hash (symbol, headline, body - not provider or fetch time, which
+RSS and calendar adapters stamp with the clock), so re-polled items and the
+same story from several providers are stored a single time. Records go to a
+JSON-lines file that is replayed on open; a torn last line from a crash is
+skipped and cut off so later appends start on a fresh line.
+
+In memory the store keeps three indexes:
+- arrival order, so consumers can ask "what's new since T" (since())
+- event time (NewsEvent.ts), for time-window queries (window())
+- symbol, for both
+
+Events that arrived more than retention_seconds ago are dropped when the
+store opens and at most once per compact_interval afterwards; the file is
+rewritten without them, so it neither grows without bound nor takes longer
+to replay on every start.
+
+Usage:
+    store = NewsEventStore(os.path.join(CACHE_DIR, 'news_events.jsonl'), retention_seconds=7 * 86400)
+    added = store.add_many(events)          # only the events not seen before
+    fresh, cursor = store.since(cursor, symbol='GOLD')
+    last_hour = store.window(time.time() - 3600, symbol='GOLD')
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base import NewsEvent
+
+logger = logging.getLogger('cthulu.news.store')
+
+
+def content_hash(event: Any) -> str:
+    """Stable identity of an event's content (symbol, headline, body)."""
+    parts = (
+        str(getattr(event, 'symbol', '') or '').strip().upper(),
+        ' '.join(str(getattr(event, 'headline', '') or '').split()).lower(),
+        ' '.join(str(getattr(event, 'body', '') or '').split()),
+    )
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def as_news_event(event: Any) -> NewsEvent:
+    """Coerce adapter output (NewsEvent or any object with its fields) to a NewsEvent."""
+    if isinstance(event, NewsEvent):
+        return event
+    return NewsEvent(
+        provider=getattr(event, 'provider', '') or '',
+        ts=float(getattr(event, 'ts', 0.0) or 0.0),
+        symbol=getattr(event, 'symbol', '') or '',
+        headline=getattr(event, 'headline', '') or '',
+        body=getattr(event, 'body', '') or '',
+        meta=dict(getattr(event, 'meta', None) or {}),
+    )
+
+
+class NewsEventStore:
+    """
+    Deduplicated, append-only news event store indexed by arrival, time and symbol.
+
+    Thread-safe. path=None keeps the store in memory only;
+    retention_seconds=None keeps every event.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock=time.time,
+                 retention_seconds: Optional[float] = None, compact_interval: float = 3600.0):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.compact_interval = compact_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._reset_index()
+        self._stats = {'added': 0, 'duplicates': 0, 'corrupt_lines': 0, 'expired': 0}
+        self._file = None
+        self._last_compact = clock()
+        if path:
+            self._load()
+        if retention_seconds is not None:
+            self.compact()
+
+    def _reset_index(self):
+        self._events: List[NewsEvent] = []
+        self._received: List[float] = []          # arrival time per position (non-decreasing)
+        self._ids: Dict[str, int] = {}            # content hash -> position
+        self._by_symbol: Dict[str, List[int]] = {}
+        self._by_time: List[Tuple[float, int]] = []  # (event ts, position), sorted
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            end = 0
+            with open(self.path, 'rb') as fh:
+                for line in fh:
+                    start, end = end, end + len(line)
+                    try:
+                        record = json.loads(line.decode('utf-8'))
+                        received = record.pop('_received')
+                        record.pop('_id', None)
+                        self._index(NewsEvent(**record), received)
+                        intact = True
+                    except Exception:
+                        self._stats['corrupt_lines'] += 1
+                        intact = False
+            if self._stats['corrupt_lines']:
+                logger.warning(f"Skipped {self._stats['corrupt_lines']} unreadable line(s) in {self.path}")
+            if end and not line.endswith(b'\n'):
+                # Unterminated last line: drop a torn fragment, or terminate a
+                # complete record, so the next append starts on its own line
+                with open(self.path, 'r+b') as fh:
+                    if intact:
+                        fh.seek(end)
+                        fh.write(b'\n')
+                    else:
+                        fh.truncate(start)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _append_record(self, event: NewsEvent, event_id: str, received: float):
+        if self._file is None:
+            return
+        record = dict(event.__dict__)
+        record['_id'] = event_id
+        record['_received'] = received
+        try:
+            self._file.write(json.dumps(record, default=str) + '\n')
+        except Exception:
+            logger.exception('Failed to append news event')
+
+    def _rewrite(self):
+        """Replace the file with the events currently held (caller holds the lock)."""
+        if self._file is None:
+            return
+        self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                for event_id, position in self._ids.items():
+                    record = dict(self._events[position].__dict__)
+                    record['_id'] = event_id
+                    record['_received'] = self._received[position]
+                    fh.write(json.dumps(record, default=str) + '\n')
+            os.replace(tmp_path, self.path)
+        except Exception:
+            logger.exception('Failed to compact news store')
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def compact(self) -> int:
+        """
+        Drop events that arrived before the retention window and rewrite the file.
+
+        Returns:
+            Number of events dropped
+        """
+        with self._lock:
+            self._last_compact = self._clock()
+            if self.retention_seconds is None:
+                return 0
+            expired = bisect_left(self._received, self._last_compact - self.retention_seconds)
+            if expired == 0:
+                return 0
+            kept = [(self._events[p], self._received[p], event_id)
+                    for event_id, p in sorted(self._ids.items(), key=lambda item: item[1]) if p >= expired]
+            self._reset_index()
+            for event, received, event_id in kept:
+                self._index(event, received, event_id)
+            self._rewrite()
+            self._stats['expired'] += expired
+            logger.info(f"Dropped {expired} news event(s) older than {self.retention_seconds:.0f}s")
+            return expired
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _index(self, event: NewsEvent, received: float, event_id: Optional[str] = None) -> bool:
+        event_id = event_id or content_hash(event)
+        if event_id in self._ids:
+            return False
+        position = len(self._events)
+        if self._received and received < self._received[-1]:
+            received = self._received[-1]  # keep arrival order monotonic
+        self._events.append(event)
+        self._received.append(received)
+        self._ids[event_id] = position
+        self._by_symbol.setdefault((event.symbol or '').upper(), []).append(position)
+        insort(self._by_time, (float(event.ts or 0.0), position))
+        return True
+
+    def add_many(self, events: Iterable[Any]) -> List[NewsEvent]:
+        """
+        Append events not seen before.
+
+        Returns:
+            The newly stored events, in input order
+        """
+        added = []
+        with self._lock:
+            # Strictly later than the previous batch, so a cursor never hides it
+            received = self._clock()
+            if self._received and received <= self._received[-1]:
+                received = self._received[-1] + 1e-6
+            for raw in events:
+                event = as_news_event(raw)
+                event_id = content_hash(event)
+                if self._index(event, received, event_id):
+                    self._append_record(event, event_id, received)
+                    added.append(event)
+                else:
+                    self._stats['duplicates'] += 1
+            if added:
+                self._stats['added'] += len(added)
+                if self._file is not None:
+                    self._file.flush()
+            if self.retention_seconds is not None and received - self._last_compact >= self.compact_interval:
+                self.compact()
+        return added
+
+    def add(self, event: Any) -> bool:
+        """Append one event; False if it was already stored."""
+        return bool(self.add_many([event]))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __contains__(self, event: Any) -> bool:
+        with self._lock:
+            return content_hash(event) in self._ids
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def since(self, cursor: float = 0.0, symbol: Optional[str] = None) -> Tuple[List[NewsEvent], float]:
+        """
+        Events that arrived after `cursor` (an arrival time), oldest first.
+
+        Returns:
+            (events, new cursor) - pass the cursor back to get only later arrivals
+        """
+        with self._lock:
+            start = bisect_right(self._received, cursor)
+            if start >= len(self._events):
+                return [], max(cursor, self._received[-1] if self._received else cursor)
+            if symbol is None:
+                positions = range(start, len(self._events))
+            else:
+                index = self._by_symbol.get(symbol.upper(), [])
+                positions = index[bisect_left(index, start):]
+            return [self._events[p] for p in positions], self._received[-1]
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None,
+               symbol: Optional[str] = None) -> List[NewsEvent]:
+        """Events with start <= ts <= end, ordered by event time."""
+        with self._lock:
+            lo = bisect_left(self._by_time, (start, -1)) if start is not None else 0
+            hi = bisect_right(self._by_time, (end, len(self._events))) if end is not None else len(self._by_time)
+            wanted = symbol.upper() if symbol is not None else None
+            return [
+                self._events[p] for _, p in self._by_time[lo:hi]
+                if wanted is None or (self._events[p].symbol or '').upper() == wanted
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, 'events': len(self._events), 'symbols': len(self._by_symbol)}
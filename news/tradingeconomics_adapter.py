@@ -16,16 +16,18 @@ class TradingEconomicsAdapter(NewsAdapter):
     - For production integration you may want to refine the request parameters
       (country, start/end dates, importance filtering), this is a minimal PoC.
     """
-    def __init__(self, api_key: Optional[str] = None, timeout: float = 5.0):
+    def __init__(self, api_key: Optional[str] = None, timeout: float = 5.0,
+                 base_url: str = 'https://api.tradingeconomics.com'):
         self.api_key = api_key
         self.timeout = timeout
+        self.base_url = base_url.rstrip('/')
 
     def fetch_recent(self) -> List[NewsEvent]:
         if not self.api_key:
             return []
         try:
             # Basic calendar endpoint - TradingEconomics uses `c` for client key
-            url = 'https://api.tradingeconomics.com/calendar'
+            url = f'{self.base_url}/calendar'
             params = {'c': self.api_key, 'format': 'json', 'last': 10}
             resp = requests.get(url, params=params, timeout=self.timeout)
             resp.raise_for_status()
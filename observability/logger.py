@@ -197,6 +197,29 @@ def setup_logger(
     return logger
 
 
+def get_log_directory(logger: Optional[logging.Logger] = None, default: str = "logs") -> str:
+    """
+    Directory the log file of a logger is written to.
+    
+    Follows propagation up to the logger that owns a file handler, so the
+    user-local fallback chosen by setup_logger is honoured.
+    
+    Args:
+        logger: Logger to inspect (defaults to the "Cthulu" logger)
+        default: Directory used when no file handler is configured
+        
+    Returns:
+        Absolute directory path
+    """
+    current = logger if logger is not None else logging.getLogger("Cthulu")
+    while current is not None:
+        for handler in getattr(current, 'handlers', []):
+            if isinstance(handler, logging.FileHandler):
+                return os.path.dirname(os.path.abspath(handler.baseFilename))
+        current = current.parent if getattr(current, 'propagate', False) else None
+    return os.path.abspath(default)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get existing logger.
@@ -0,0 +1,231 @@
+"""
+Slow Iteration Profiler
+
+Captures stack samples of the trading loop thread during iterations that
+blow their latency budget, so rare slow cycles can be diagnosed after the
+fact instead of being averaged away.
+
+A daemon sampler thread is armed at the start of every iteration. It
+sleeps until `arm_fraction` of the budget has elapsed; fast iterations
+finish before that and cost nothing beyond two Event operations. Once an
+iteration runs long, the sampler walks the loop thread's stack every
+`sample_interval_ms` until it ends. If the iteration exceeds the budget,
+the samples are written to disk as collapsed stacks (`.folded`, readable
+by flamegraph.pl / speedscope) plus a JSON summary with the per-stage
+timings of that iteration.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+
+logger = logging.getLogger("cthulu.observability.loop_profiler")
+
+
+def collapse_stack(frame, max_depth: int = 128) -> str:
+    """Collapsed representation (root first, ';'-separated) of a frame's stack."""
+    parts: List[str] = []
+    while frame is not None and len(parts) < max_depth:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class _Iteration:
+    """Sampling state of one loop iteration."""
+    __slots__ = ('thread_id', 'started', 'done', 'samples', 'first_sample_ms')
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.started = time.perf_counter()
+        self.done = threading.Event()
+        self.samples: Counter = Counter()
+        self.first_sample_ms: Optional[float] = None
+
+
+class SlowIterationProfiler:
+    """
+    Stack-sampling profiler for iterations over a latency budget.
+
+    Usage:
+        profiler = SlowIterationProfiler(budget_ms=1500, output_dir='logs/slow_iterations')
+        profiler.begin()
+        run_iteration()
+        path = profiler.end(elapsed_ms, stages={'calculate_indicators': 1200.0})
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 1000.0,
+        output_dir: str = 'logs/slow_iterations',
+        sample_interval_ms: float = 5.0,
+        arm_fraction: float = 0.5,
+        max_samples: int = 5000,
+        max_files: int = 50,
+        min_capture_interval_s: float = 30.0
+    ):
+        """
+        Initialize profiler.
+
+        Args:
+            budget_ms: Iterations slower than this are captured
+            output_dir: Directory for capture files
+            sample_interval_ms: Time between stack samples
+            arm_fraction: Fraction of the budget after which sampling starts
+            max_samples: Cap on samples per iteration
+            max_files: Captures kept on disk (oldest removed first)
+            min_capture_interval_s: Minimum time between two captures
+        """
+        self.budget_ms = float(budget_ms)
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval_ms / 1000.0
+        self.arm_delay = max(0.0, self.budget_ms * arm_fraction / 1000.0)
+        self.max_samples = max_samples
+        self.max_files = max_files
+        self.min_capture_interval_s = min_capture_interval_s
+
+        self.slow_iterations = 0
+        self.captures = 0
+        self.last_capture_path: Optional[str] = None
+        self._last_capture = 0.0
+        self._current: Optional[_Iteration] = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sampler, name="loop-profiler", daemon=True)
+            self._thread.start()
+
+    def _sampler(self) -> None:
+        while not self._stopped:
+            self._wake.wait()
+            self._wake.clear()
+            iteration = self._current
+            if iteration is None or self._stopped:
+                continue
+            # Fast iterations end before the profiler is armed
+            remaining = self.arm_delay - (time.perf_counter() - iteration.started)
+            if remaining > 0 and iteration.done.wait(remaining):
+                continue
+            while not iteration.done.is_set():
+                frame = sys._current_frames().get(iteration.thread_id)
+                if frame is None:
+                    break
+                stack = collapse_stack(frame)
+                del frame
+                with self._lock:
+                    if iteration.first_sample_ms is None:
+                        iteration.first_sample_ms = (time.perf_counter() - iteration.started) * 1000.0
+                    iteration.samples[stack] += 1
+                    if sum(iteration.samples.values()) >= self.max_samples:
+                        break
+                iteration.done.wait(self.sample_interval)
+
+    def begin(self) -> None:
+        """Mark the start of an iteration on the calling (loop) thread."""
+        self._ensure_thread()
+        self._current = _Iteration(threading.get_ident())
+        self._wake.set()
+
+    def end(self, elapsed_ms: float, stages: Optional[Dict[str, float]] = None,
+            context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Mark the end of the iteration started by begin().
+
+        Args:
+            elapsed_ms: Iteration duration
+            stages: Per-stage durations (ms) of this iteration
+            context: Extra fields for the capture summary (loop count, symbol, ...)
+
+        Returns:
+            Path of the capture summary if one was written
+        """
+        iteration = self._current
+        self._current = None
+        if iteration is None:
+            return None
+        iteration.done.set()
+        if elapsed_ms <= self.budget_ms:
+            return None
+
+        self.slow_iterations += 1
+        now = time.monotonic()
+        if self._last_capture and now - self._last_capture < self.min_capture_interval_s:
+            return None
+        with self._lock:
+            samples = Counter(iteration.samples)
+            first_sample_ms = iteration.first_sample_ms
+        if not samples:
+            return None
+        self._last_capture = now
+        try:
+            path = self._write(samples, elapsed_ms, first_sample_ms, stages or {}, context or {})
+        except Exception as e:
+            logger.warning(f"Failed to write slow iteration profile: {e}")
+            return None
+        self.captures += 1
+        self.last_capture_path = str(path)
+        return self.last_capture_path
+
+    def _write(self, samples: Counter, elapsed_ms: float, first_sample_ms: Optional[float],
+               stages: Dict[str, float], context: Dict[str, Any]) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"slow_iteration_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        folded = self.output_dir / f"{stem}.folded"
+        folded.write_text(
+            "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n",
+            encoding='utf-8'
+        )
+        summary = {
+            'timestamp': datetime.now().isoformat(),
+            'elapsed_ms': round(elapsed_ms, 3),
+            'budget_ms': self.budget_ms,
+            'sample_interval_ms': self.sample_interval * 1000.0,
+            'sampling_started_ms': round(first_sample_ms, 3) if first_sample_ms is not None else None,
+            'samples': sum(samples.values()),
+            'stages_ms': {k: round(v, 3) for k, v in stages.items()},
+            'top_stacks': [{'stack': s, 'count': c} for s, c in samples.most_common(20)],
+            'folded_file': folded.name,
+            **context,
+        }
+        path = self.output_dir / f"{stem}.json"
+        path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        self._prune()
+        logger.warning(f"Slow iteration ({elapsed_ms:.0f}ms > {self.budget_ms:.0f}ms budget) profiled to {path}")
+        return path
+
+    def _prune(self) -> None:
+        captures = sorted(self.output_dir.glob('slow_iteration_*.json'))
+        for old in captures[:max(0, len(captures) - self.max_files)]:
+            for file in (old, old.with_suffix('.folded')):
+                try:
+                    file.unlink()
+                except OSError:
+                    pass
+
+    def stop(self) -> None:
+        """Stop the sampler thread."""
+        self._stopped = True
+        if self._current is not None:
+            self._current.done.set()
+        self._wake.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'budget_ms': self.budget_ms,
+            'slow_iterations': self.slow_iterations,
+            'captures': self.captures,
+            'last_capture': self.last_capture_path,
+        }
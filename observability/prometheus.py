@@ -33,13 +33,16 @@ class PrometheusMetric:
         lines.append(f"# TYPE {self.name} {self.metric_type}")
         
         # Value line with optional labels
-        if self.labels:
-            label_str = ",".join(f'{k}="{v}"' for k, v in self.labels.items())
-            lines.append(f"{self.name}{{{label_str}}} {self.value}")
-        else:
-            lines.append(f"{self.name} {self.value}")
+        lines.append(self.to_sample_line())
         
         return "\n".join(lines)
+    
+    def to_sample_line(self) -> str:
+        """Format the value line only (no HELP/TYPE header)."""
+        if self.labels:
+            label_str = ",".join(f'{k}="{v}"' for k, v in self.labels.items())
+            return f"{self.name}{{{label_str}}} {self.value}"
+        return f"{self.name} {self.value}"
 
 
 class PrometheusExporter:
@@ -64,6 +67,9 @@ class PrometheusExporter:
         self.prefix = prefix
         self._start_time = time.time()
         self._metrics_cache: Dict[str, PrometheusMetric] = {}
+        # Latency histograms keyed by (name, sorted labels); rendered at export time
+        self._histograms: Dict[tuple, tuple] = {}
+        self._connector: Any = None
         
         # Initialize counters
         self._trade_count = 0
@@ -160,11 +166,124 @@ class PrometheusExporter:
             labels=labels
         )
         
+    def set_histogram(self, name: str, histogram: Any, help_text: str, labels: Dict[str, str] = None):
+        """
+        Register a LatencyHistogram to be exported (read live at export time).
+
+        Args:
+            name: Metric name without prefix
+            histogram: utils.latency.LatencyHistogram
+            help_text: HELP line
+            labels: Optional labels (e.g. {'op': 'get_rates'})
+        """
+        key = (name, tuple(sorted((labels or {}).items())))
+        self._histograms[key] = (f"{self.prefix}_{name}", histogram, help_text, labels)
+
+    def set_connector_latency(self, connector: Any):
+        """Export the per-operation latency histograms of an MT5Connector.
+
+        The connector creates a histogram on the first request of each
+        operation, so they are read from the connector at export time.
+        """
+        self._connector = connector
+
+    def _update_connector_metrics(self):
+        """Register histograms for operations the connector has timed so far."""
+        if self._connector is None:
+            return
+        for op, histogram in list(getattr(self._connector, 'latency_histograms', {}).items()):
+            self.set_histogram(
+                "mt5_request_latency_seconds", histogram,
+                "MT5 terminal request latency", labels={'op': op}
+            )
+
+    def set_loop_timing(self, loop: Any):
+        """Register the per-stage and whole-iteration histograms of a TradingLoop."""
+        for stage, histogram in getattr(loop, 'stage_histograms', {}).items():
+            self.set_histogram(
+                "loop_stage_latency_seconds", histogram,
+                "Trading loop stage latency", labels={'stage': stage}
+            )
+        iteration = getattr(loop, 'iteration_histogram', None)
+        if iteration is not None:
+            self.set_histogram(
+                "loop_iteration_latency_seconds", iteration,
+                "Trading loop iteration latency"
+            )
+
+    def set_slow_iterations(self, count: int):
+        """Set the number of loop iterations that exceeded the latency budget."""
+        self._update_metric(
+            f"{self.prefix}_loop_slow_iterations_total",
+            count,
+            "counter",
+            "Trading loop iterations over the latency budget"
+        )
+
     def get_all_metrics(self) -> List[PrometheusMetric]:
         """Get all current metrics."""
         # Update computed metrics
         self._update_computed_metrics()
+        self._update_cache_metrics()
+        self._update_event_bus_metrics()
+        self._update_connector_metrics()
         return list(self._metrics_cache.values())
+
+    def _update_cache_metrics(self):
+        """Export statistics of named caches (utils.cache.SmartCache)."""
+        try:
+            from cthulu.utils.cache import registered_caches
+        except Exception:
+            return
+        for cache_name, cache in registered_caches().items():
+            stats = cache.get_stats()
+            labels = {'cache': cache_name}
+            for field, metric_type, help_text in (
+                ('hits', 'counter', 'Cache hits'),
+                ('misses', 'counter', 'Cache misses'),
+                ('negative_hits', 'counter', 'Cache hits on cached empty results'),
+                ('coalesced', 'counter', 'Misses served by another thread\'s in-flight load'),
+                ('evictions', 'counter', 'LRU evictions'),
+                ('load_errors', 'counter', 'Failed cache loads'),
+                ('size', 'gauge', 'Cached entries'),
+            ):
+                name = f"{self.prefix}_cache_{field}"
+                # Keyed per cache so labelled series do not overwrite each other
+                self._metrics_cache[f"{name}:{cache_name}"] = PrometheusMetric(
+                    name=name, value=stats[field], metric_type=metric_type,
+                    help_text=help_text, labels=labels
+                )
+            self.set_histogram("cache_load_latency_seconds", cache.load_latency,
+                               "Cache loader latency", labels=labels)
+    
+    def _update_event_bus_metrics(self):
+        """Export per-subscriber queue depth, lag and drops of the trade event bus."""
+        try:
+            from cthulu.observability.trade_event_bus import current_event_bus
+        except Exception:
+            return
+        bus = current_event_bus()
+        if bus is None:
+            return
+        for subscriber, queue in bus.get_subscriber_queues().items():
+            stats = queue.get_stats()
+            labels = {'subscriber': subscriber}
+            for field, metric_type, help_text in (
+                ('queue_depth', 'gauge', 'Events waiting in the subscriber queue'),
+                ('spill_backlog', 'gauge', 'Spilled events waiting to be replayed'),
+                ('lag_seconds', 'gauge', 'Age of the oldest undelivered event'),
+                ('delivered', 'counter', 'Events delivered to the subscriber'),
+                ('dropped', 'counter', 'Events dropped by backpressure'),
+                ('spilled', 'counter', 'Events spilled to disk'),
+                ('errors', 'counter', 'Subscriber callback errors'),
+            ):
+                name = f"{self.prefix}_event_bus_subscriber_{field}"
+                self._metrics_cache[f"{name}:{subscriber}"] = PrometheusMetric(
+                    name=name, value=stats[field], metric_type=metric_type,
+                    help_text=help_text, labels=labels
+                )
+            self.set_histogram("event_bus_delivery_latency_seconds", queue.delivery_latency,
+                               "Publish to subscriber delivery latency", labels=labels)
     
     def _update_computed_metrics(self):
         """Update computed/derived metrics."""
@@ -293,9 +412,23 @@ class PrometheusExporter:
         metrics = self.get_all_metrics()
         lines = []
         
+        # One HELP/TYPE block per metric family, followed by all its series
+        families: Dict[str, List[PrometheusMetric]] = {}
         for metric in metrics:
-            lines.append(metric.to_prometheus_format())
-            lines.append("")  # Empty line between metrics
+            families.setdefault(metric.name, []).append(metric)
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {family[0].help_text}")
+            lines.append(f"# TYPE {name} {family[0].metric_type}")
+            lines.extend(metric.to_sample_line() for metric in family)
+            lines.append("")  # Empty line between metric families
+
+        histogram_families: Dict[str, List[tuple]] = {}
+        for entry in list(self._histograms.values()):
+            histogram_families.setdefault(entry[0], []).append(entry)
+        for name, family in histogram_families.items():
+            for i, (_, histogram, help_text, labels) in enumerate(family):
+                lines.append(histogram.to_prometheus(name, help_text, labels, header=i == 0))
+            lines.append("")
         
         return "\n".join(lines)
     
@@ -13,19 +13,28 @@ All events are collected non-blocking and dispatched to multiple consumers:
 - TrainingDataLogger (ML training data)
 - Database (persistence)
 
+Each subscriber has its own bounded ring queue and worker thread, with a
+backpressure policy for when it falls behind: block (bounded wait),
+drop_oldest or spill (overflow to disk, replayed in order).
+
 Part of Cthulu Observability v5.2.33
 """
 
 from __future__ import annotations
+import json
 import logging
+import os
 import threading
 import time
+from collections import deque
 from queue import Queue, Empty
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Deque, Tuple
 from enum import Enum
 
+from cthulu.utils.latency import LatencyHistogram
+
 logger = logging.getLogger('cthulu.observability.event_bus')
 
 
@@ -109,47 +118,379 @@ class TradeEvent:
         d['timestamp'] = self.timestamp.isoformat()
         return d
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TradeEvent':
+        """Rebuild an event from to_dict() output (e.g. a spilled event)"""
+        d = dict(data)
+        d['event_type'] = TradeEventType(d['event_type'])
+        d['timestamp'] = datetime.fromisoformat(d['timestamp'])
+        return cls(**d)
+
+
+# Backpressure policies for a full subscriber queue
+POLICY_BLOCK = "block"              # dispatcher waits up to block_timeout, then drops the event
+POLICY_DROP_OLDEST = "drop_oldest"  # oldest queued event is discarded
+POLICY_SPILL = "spill"              # overflow is appended to a JSONL file and replayed in order
+BACKPRESSURE_POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SPILL)
+
+
+class _SubscriberQueue:
+    """
+    Bounded ring queue and worker thread for one subscriber.
+
+    The dispatcher offers every event; the worker delivers them to the
+    callback (one at a time, or in batches of up to max_batch once the
+    oldest has waited flush_interval). A slow subscriber only fills its
+    own ring, and its backpressure policy decides what happens then.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable,
+        batch: bool,
+        capacity: int,
+        policy: str,
+        flush_interval: float,
+        max_batch: int,
+        block_timeout: float,
+        spill_dir: str
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}' (expected one of {BACKPRESSURE_POLICIES})")
+        self.name = name
+        self.callback = callback
+        self.batch = batch
+        self.capacity = max(1, int(capacity))
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, int(max_batch))
+        self.block_timeout = block_timeout
+
+        self._ring: Deque[Tuple[float, TradeEvent]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Spill state: once spilling starts, new events go to disk until the backlog is replayed
+        safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in name)
+        self._spill_path = os.path.join(spill_dir, f"{safe_name}.jsonl")
+        self._spilling = False
+        self._spill_pending = 0
+        self._spill_oldest: Optional[float] = None
+
+        # Stats
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.errors = 0
+        self.delivery_latency = LatencyHistogram()  # publish -> callback returned
+
+        self._recover_spill()
+
+    def _recover_spill(self) -> None:
+        """
+        Adopt spill files left by a previous process as the replay backlog.
+
+        An interrupted replay (.replay) holds older events than the spill
+        file, so both are merged in that order. Recovered events are
+        re-stamped with this process's clock and, with spilling switched on,
+        new events queue behind them so delivery order is kept.
+        """
+        replay_path = f"{self._spill_path}.replay"
+        sources = [p for p in (replay_path, self._spill_path) if os.path.exists(p)]
+        if not sources:
+            return
+        now = time.monotonic()
+        lines: List[str] = []
+        try:
+            for path in sources:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                            record['enqueued_at'] = now
+                            lines.append(json.dumps(record, default=str) + "\n")
+                        except Exception:
+                            self.errors += 1
+            tmp_path = f"{self._spill_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self._spill_path)
+            if os.path.exists(replay_path):
+                os.remove(replay_path)
+        except OSError as e:
+            logger.error(f"Subscriber {self.name} could not recover spill files: {e}")
+            return
+        if lines:
+            self._spilling = True
+            self._spill_pending = len(lines)
+            self._spill_oldest = now
+            logger.warning(f"Subscriber {self.name} recovered {len(lines)} spilled events from {self._spill_path}")
+        else:
+            os.remove(self._spill_path)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            self._closed = False
+        kind = "batch" if self.batch else "event"
+        self._thread = threading.Thread(target=self._run, name=f"trade-event-bus-{kind}-{self.name}", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events; the worker drains what is queued, then exits."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def offer(self, event: TradeEvent, enqueued_at: float) -> bool:
+        """
+        Queue an event, applying the backpressure policy when full.
+
+        Returns:
+            True if the event will be delivered, False if it was dropped
+        """
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            self.enqueued += 1
+
+            if self.policy == POLICY_SPILL:
+                if self._spilling or len(self._ring) >= self.capacity:
+                    return self._spill(event, enqueued_at)
+            elif len(self._ring) >= self.capacity:
+                if self.policy == POLICY_DROP_OLDEST:
+                    self._ring.popleft()
+                    self.dropped += 1
+                else:
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._ring) >= self.capacity and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._cond.wait(remaining)
+
+            self._ring.append((enqueued_at, event))
+            self._cond.notify_all()
+            return True
+
+    def _spill(self, event: TradeEvent, enqueued_at: float) -> bool:
+        """Append an overflow event to the spill file (caller holds the lock)."""
+        try:
+            os.makedirs(os.path.dirname(self._spill_path) or '.', exist_ok=True)
+            with open(self._spill_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'enqueued_at': enqueued_at, 'event': event.to_dict()}, default=str) + "\n")
+        except Exception as e:
+            self.dropped += 1
+            logger.error(f"Subscriber {self.name} spill failed, event dropped: {e}")
+            return False
+        if not self._spilling:
+            self._spilling = True
+            self._spill_oldest = enqueued_at
+            logger.warning(f"Subscriber {self.name} queue full ({self.capacity}); spilling to {self._spill_path}")
+        self._spill_pending += 1
+        self.spilled += 1
+        self._cond.notify_all()
+        return True
+
+    def _take(self) -> Optional[List[Tuple[float, TradeEvent]]]:
+        """Next items to deliver; None once closed and fully drained."""
+        with self._cond:
+            while True:
+                if self._ring:
+                    age = time.monotonic() - self._ring[0][0]
+                    if (not self.batch or self._closed or len(self._ring) >= self.max_batch
+                            or age >= self.flush_interval):
+                        # Event subscribers take one at a time so undelivered events stay visible as lag
+                        n = min(self.max_batch if self.batch else 1, len(self._ring))
+                        items = [self._ring.popleft() for _ in range(n)]
+                        self._cond.notify_all()  # wake a blocked dispatcher
+                        return items
+                    self._cond.wait(self.flush_interval - age)
+                elif self._spill_pending:
+                    break
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait(1.0)
+
+            # Ring drained and a spill backlog exists: replay it (new events keep spilling meanwhile)
+            replay_path = f"{self._spill_path}.replay"
+            try:
+                os.replace(self._spill_path, replay_path)
+            except OSError as e:
+                logger.error(f"Subscriber {self.name} spill replay failed: {e}")
+                self.dropped += self._spill_pending
+                self._spill_pending = 0
+                self._spilling = False
+                return []
+            self._spill_pending = 0
+
+        items: List[Tuple[float, TradeEvent]] = []
+        try:
+            with open(replay_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        items.append((record['enqueued_at'], TradeEvent.from_dict(record['event'])))
+                    except Exception:
+                        with self._cond:
+                            self.errors += 1
+            os.remove(replay_path)
+        except OSError as e:
+            logger.error(f"Subscriber {self.name} could not read spill file: {e}")
+
+        with self._cond:
+            if self._spill_pending == 0:
+                self._spilling = False
+                self._spill_oldest = None
+            else:
+                self._spill_oldest = time.monotonic()
+        return items
+
+    def _run(self) -> None:
+        while True:
+            items = self._take()
+            if items is None:
+                return
+            for start in range(0, len(items), self.max_batch):
+                self._deliver(items[start:start + self.max_batch])
+
+    def _deliver(self, items: List[Tuple[float, TradeEvent]]) -> None:
+        if not items:
+            return
+        errors = 0
+        if self.batch:
+            try:
+                self.callback([event for _, event in items])
+            except Exception as e:
+                errors += 1
+                logger.error(f"Batch subscriber {self.name} error: {e}")
+        else:
+            for _, event in items:
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Subscriber {self.name} error: {e}")
+
+        now = time.monotonic()
+        for enqueued_at, _ in items:
+            self.delivery_latency.observe(max(0.0, now - enqueued_at) * 1000.0)
+        with self._cond:
+            self.delivered += len(items)
+            self.errors += errors
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            oldest = self._ring[0][0] if self._ring else None
+            if self._spill_oldest is not None:
+                oldest = self._spill_oldest if oldest is None else min(oldest, self._spill_oldest)
+            return {
+                'kind': 'batch' if self.batch else 'event',
+                'policy': self.policy,
+                'capacity': self.capacity,
+                'queue_depth': len(self._ring),
+                'spill_backlog': self._spill_pending,
+                'lag_seconds': max(0.0, now - oldest) if oldest is not None else 0.0,
+                'enqueued': self.enqueued,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'spilled': self.spilled,
+                'errors': self.errors,
+                'delivery_latency_ms': self.delivery_latency.to_dict(),
+                'running': self.alive,
+            }
+
 
 class TradeEventBus:
     """
     Non-blocking event bus for trade events.
-    
-    Uses a background thread to process events, ensuring the main trading loop
-    is never blocked by metrics collection or database writes.
-    
+
+    publish() only puts the event on a bounded ingress queue; a dispatcher
+    thread copies each event into every subscriber's own ring queue, and a
+    worker thread per subscriber calls it. A slow subscriber therefore only
+    delays itself, and the trading loop never waits on observability.
+
     Thread-safe for multiple producers (trading loop, RPC server, adoption manager).
+
+    Usage:
+        bus = TradeEventBus()
+        bus.subscribe('metrics', on_event)                          # drop_oldest by default
+        bus.subscribe_batch('database', on_batch, policy='spill')   # never loses events
+        bus.start()
+        bus.publish_trade_opened(ticket=1, symbol='EURUSD', side='BUY', volume=0.1, price=1.1)
+        bus.get_subscriber_stats()['database']['lag_seconds']
     """
-    
-    def __init__(self, queue_size: int = 10000, flush_interval: float = 1.0):
+
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        flush_interval: float = 1.0,
+        subscriber_queue_size: int = 10000,
+        default_policy: str = POLICY_DROP_OLDEST,
+        max_batch: int = 100,
+        block_timeout: float = 1.0,
+        spill_dir: Optional[str] = None
+    ):
         """
         Initialize the event bus.
-        
+
         Args:
-            queue_size: Maximum events to queue before dropping
-            flush_interval: Seconds between batch flushes
+            queue_size: Maximum events on the ingress queue before publish() drops
+            flush_interval: Longest a batch subscriber's oldest event waits for a fuller batch
+            subscriber_queue_size: Default ring capacity per subscriber
+            default_policy: Backpressure policy for subscribers that do not name one
+            max_batch: Largest batch handed to a subscriber
+            block_timeout: Seconds the 'block' policy waits for space before dropping
+            spill_dir: Directory for 'spill' overflow files (default logs/event_bus_spill)
         """
-        self._queue: Queue[TradeEvent] = Queue(maxsize=queue_size)
+        if default_policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{default_policy}'")
+        self._queue: Queue[Tuple[float, TradeEvent]] = Queue(maxsize=queue_size)
         self._subscribers: Dict[str, Callable[[TradeEvent], None]] = {}
         self._batch_subscribers: Dict[str, Callable[[List[TradeEvent]], None]] = {}
-        
+        # Per-subscriber ring queues keyed by (kind, name); fan-out reads the tuple snapshot
+        self._queues: Dict[Tuple[str, str], _SubscriberQueue] = {}
+        self._queue_list: Tuple[_SubscriberQueue, ...] = ()
+
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._flush_interval = flush_interval
-        
+        self._subscriber_queue_size = subscriber_queue_size
+        self._default_policy = default_policy
+        self._max_batch = max_batch
+        self._block_timeout = block_timeout
+        self._spill_dir = spill_dir or os.path.join('logs', 'event_bus_spill')
+
         # Stats
         self._events_processed = 0
         self._events_dropped = 0
         self._errors_count = 0
         self._lock = threading.Lock()
-        
+
         logger.info("TradeEventBus initialized")
-    
+
     def start(self) -> None:
-        """Start the background event processor"""
+        """Start the dispatcher and the subscriber workers"""
         if self._running:
             return
-        
+
         self._running = True
+        for queue in self._queue_list:
+            queue.start()
         self._thread = threading.Thread(
             target=self._process_loop,
             name="trade-event-bus",
@@ -157,62 +498,109 @@ class TradeEventBus:
         )
         self._thread.start()
         logger.info("TradeEventBus started")
-    
+
     def stop(self, timeout: float = 5.0) -> None:
-        """Stop the event processor gracefully"""
+        """Stop gracefully: dispatch what was published, then let each subscriber drain"""
+        deadline = time.monotonic() + timeout
         self._running = False
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=timeout)
+        for queue in self._queue_list:
+            queue.close(timeout=max(0.0, deadline - time.monotonic()))
         logger.info(f"TradeEventBus stopped. Processed: {self._events_processed}, Dropped: {self._events_dropped}")
-    
-    def subscribe(self, name: str, callback: Callable[[TradeEvent], None]) -> None:
+
+    def subscribe(
+        self,
+        name: str,
+        callback: Callable[[TradeEvent], None],
+        policy: Optional[str] = None,
+        queue_size: Optional[int] = None
+    ) -> None:
         """
         Subscribe to individual events.
-        
+
         Args:
             name: Subscriber name (for logging/debugging)
             callback: Function to call for each event
+            policy: Backpressure policy when its queue is full (default: bus default)
+            queue_size: Ring capacity (default: bus default)
         """
         with self._lock:
             self._subscribers[name] = callback
-            logger.info(f"Subscriber registered: {name}")
-    
-    def subscribe_batch(self, name: str, callback: Callable[[List[TradeEvent]], None]) -> None:
+        self._add_queue('event', name, callback, policy, queue_size)
+        logger.info(f"Subscriber registered: {name}")
+
+    def subscribe_batch(
+        self,
+        name: str,
+        callback: Callable[[List[TradeEvent]], None],
+        policy: Optional[str] = None,
+        queue_size: Optional[int] = None
+    ) -> None:
         """
         Subscribe to batch events (more efficient for bulk processing).
-        
+
         Args:
             name: Subscriber name
             callback: Function to call with batch of events
+            policy: Backpressure policy when its queue is full (default: bus default)
+            queue_size: Ring capacity (default: bus default)
         """
         with self._lock:
             self._batch_subscribers[name] = callback
-            logger.info(f"Batch subscriber registered: {name}")
-    
+        self._add_queue('batch', name, callback, policy, queue_size)
+        logger.info(f"Batch subscriber registered: {name}")
+
+    def _add_queue(self, kind: str, name: str, callback: Callable, policy: Optional[str],
+                   queue_size: Optional[int]) -> None:
+        queue = _SubscriberQueue(
+            name=name,
+            callback=callback,
+            batch=(kind == 'batch'),
+            capacity=queue_size or self._subscriber_queue_size,
+            policy=policy or self._default_policy,
+            flush_interval=self._flush_interval,
+            max_batch=self._max_batch,
+            block_timeout=self._block_timeout,
+            spill_dir=self._spill_dir
+        )
+        with self._lock:
+            previous = self._queues.pop((kind, name), None)
+            self._queues[(kind, name)] = queue
+            self._queue_list = tuple(self._queues.values())
+        if previous is not None:
+            previous.close(timeout=self._block_timeout)
+        if self._running:
+            queue.start()
+
     def unsubscribe(self, name: str) -> None:
-        """Unsubscribe from events"""
+        """Unsubscribe from events (queued events are still delivered)"""
         with self._lock:
             self._subscribers.pop(name, None)
             self._batch_subscribers.pop(name, None)
-    
+            removed = [self._queues.pop(key) for key in (('event', name), ('batch', name)) if key in self._queues]
+            self._queue_list = tuple(self._queues.values())
+        for queue in removed:
+            queue.close(timeout=self._block_timeout)
+
     def publish(self, event: TradeEvent) -> bool:
         """
         Publish an event (non-blocking).
-        
+
         Args:
             event: Trade event to publish
-            
+
         Returns:
             True if queued, False if dropped
         """
         try:
-            self._queue.put_nowait(event)
+            self._queue.put_nowait((time.monotonic(), event))
             return True
         except Exception:
             with self._lock:
                 self._events_dropped += 1
             return False
-    
+
     def publish_trade_opened(
         self,
         ticket: int,
@@ -338,72 +726,62 @@ class TradeEventBus:
         return self.publish(event)
     
     def _process_loop(self) -> None:
-        """Background event processing loop"""
-        batch: List[TradeEvent] = []
-        last_flush = time.time()
-        
+        """Dispatcher: fan published events out to the subscriber queues"""
         while self._running:
             try:
-                # Get events with timeout
                 try:
-                    event = self._queue.get(timeout=self._flush_interval)
-                    batch.append(event)
+                    enqueued_at, event = self._queue.get(timeout=0.2)
                 except Empty:
-                    pass
-                
-                # Flush batch if interval elapsed or batch is large enough
-                now = time.time()
-                if batch and (len(batch) >= 100 or (now - last_flush) >= self._flush_interval):
-                    self._dispatch_batch(batch)
-                    batch = []
-                    last_flush = now
-                    
+                    continue
+                self._fan_out(enqueued_at, event)
             except Exception as e:
                 logger.error(f"Error in event processing loop: {e}")
                 with self._lock:
                     self._errors_count += 1
-        
+
         # Final flush on shutdown
-        if batch:
-            self._dispatch_batch(batch)
-    
-    def _dispatch_batch(self, batch: List[TradeEvent]) -> None:
-        """Dispatch a batch of events to subscribers"""
-        if not batch:
-            return
-        
-        with self._lock:
-            subscribers = dict(self._subscribers)
-            batch_subscribers = dict(self._batch_subscribers)
-        
-        # Dispatch to individual subscribers
-        for name, callback in subscribers.items():
-            for event in batch:
-                try:
-                    callback(event)
-                except Exception as e:
-                    logger.error(f"Subscriber {name} error: {e}")
-        
-        # Dispatch to batch subscribers
-        for name, callback in batch_subscribers.items():
+        while True:
             try:
-                callback(batch)
-            except Exception as e:
-                logger.error(f"Batch subscriber {name} error: {e}")
-        
+                enqueued_at, event = self._queue.get_nowait()
+            except Empty:
+                break
+            self._fan_out(enqueued_at, event)
+
+    def _fan_out(self, enqueued_at: float, event: TradeEvent) -> None:
+        """Offer one event to every subscriber queue"""
+        for queue in self._queue_list:
+            queue.offer(event, enqueued_at)
+        with self._lock:
+            self._events_processed += 1
+
+    def get_subscriber_queues(self) -> Dict[str, _SubscriberQueue]:
+        """Subscriber queues by name ('name:kind' if a name is both kinds)"""
         with self._lock:
-            self._events_processed += len(batch)
+            queues = dict(self._queues)
+        named = {}
+        for (kind, name), queue in queues.items():
+            other = ('event' if kind == 'batch' else 'batch', name)
+            named[f"{name}:{kind}" if other in queues else name] = queue
+        return named
     
+    def get_subscriber_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, lag, drops and delivery latency per subscriber"""
+        return {name: queue.get_stats() for name, queue in self.get_subscriber_queues().items()}
+
     def get_stats(self) -> Dict[str, Any]:
         """Get event bus statistics"""
+        subscriber_stats = self.get_subscriber_stats()
         with self._lock:
             return {
                 'events_processed': self._events_processed,
                 'events_dropped': self._events_dropped,
-                'errors_count': self._errors_count,
+                'errors_count': self._errors_count + sum(s['errors'] for s in subscriber_stats.values()),
                 'queue_size': self._queue.qsize(),
                 'subscribers': list(self._subscribers.keys()),
                 'batch_subscribers': list(self._batch_subscribers.keys()),
+                'subscriber_dropped': sum(s['dropped'] for s in subscriber_stats.values()),
+                'max_lag_seconds': max((s['lag_seconds'] for s in subscriber_stats.values()), default=0.0),
+                'subscriber_stats': subscriber_stats,
                 'running': self._running
             }
 
@@ -527,23 +905,85 @@ class DatabaseSubscriber:
         self.logger = logging.getLogger('cthulu.event_bus.database_subscriber')
     
     def on_batch(self, events: List[TradeEvent]) -> None:
-        """Process a batch of events for persistence"""
+        """Process a batch of events for persistence (one bulk write per batch)"""
+        # Coalesce: only the last close per ticket in the batch is written
+        exits: Dict[int, tuple] = {}
         for event in events:
+            if event.event_type == TradeEventType.TRADE_CLOSED and event.ticket is not None:
+                exits[event.ticket] = (
+                    event.ticket,
+                    event.price,
+                    event.timestamp,
+                    event.pnl,
+                    event.metadata.get('exit_reason', '')
+                )
+        if not exits:
+            return
+        
+        if hasattr(self.database, 'update_trade_exits'):
             try:
-                if event.event_type == TradeEventType.TRADE_CLOSED:
-                    # Update trade exit in database
-                    self.database.update_trade_exit(
-                        order_id=event.ticket,
-                        exit_price=event.price,
-                        exit_time=event.timestamp,
-                        profit=event.pnl,
-                        exit_reason=event.metadata.get('exit_reason', '')
-                    )
-                    
+                self.database.update_trade_exits(list(exits.values()))
+            except Exception as e:
+                self.logger.error(f"Error persisting events to database: {e}")
+            return
+        
+        for order_id, exit_price, exit_time, profit, exit_reason in exits.values():
+            try:
+                self.database.update_trade_exit(
+                    order_id=order_id,
+                    exit_price=exit_price,
+                    exit_time=exit_time,
+                    profit=profit,
+                    exit_reason=exit_reason
+                )
             except Exception as e:
                 self.logger.error(f"Error persisting event to database: {e}")
 
 
+class DashboardPushSubscriber:
+    """
+    Adapter to push events to the dashboard server (ui_server) over HTTP.
+    
+    The dashboard runs in its own process; one POST per batch replaces its
+    database polling. Failures are logged and dropped - the dashboard
+    catches up from the database on its next change check. `token` is sent
+    as the shared push token the dashboard requires from non-loopback
+    clients (CTHULU_DASHBOARD_PUSH_TOKEN on the server).
+    """
+    
+    def __init__(self, url: str, timeout: float = 1.0, token: Optional[str] = None):
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+        self.logger = logging.getLogger('cthulu.event_bus.dashboard_subscriber')
+        self._failures = 0
+    
+    def on_batch(self, events: List[TradeEvent]) -> None:
+        """POST a batch of events as {'events': [...]}"""
+        import json
+        import urllib.request
+        
+        try:
+            body = json.dumps({'events': [e.to_dict() for e in events]}, default=str).encode('utf-8')
+            headers = {'Content-Type': 'application/json'}
+            if self.token:
+                headers['X-Cthulu-Push-Token'] = self.token
+            request = urllib.request.Request(
+                self.url,
+                data=body,
+                headers=headers,
+                method='POST'
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+            self._failures = 0
+        except Exception as e:
+            self._failures += 1
+            # Dashboard may simply not be running; avoid flooding the log
+            if self._failures in (1, 10) or self._failures % 100 == 0:
+                self.logger.warning(f"Dashboard push failed ({self._failures}x): {e}")
+
+
 class MLDataCollectorSubscriber:
     """Adapter to feed events to ML instrumentation collector"""
     
@@ -588,39 +1028,58 @@ def get_event_bus() -> TradeEventBus:
     return _event_bus
 
 
+def current_event_bus() -> Optional[TradeEventBus]:
+    """The global event bus if one has been created (does not create it)"""
+    return _event_bus
+
+
 def initialize_event_bus(
     metrics_collector=None,
     comprehensive_collector=None,
     training_logger=None,
     database=None,
-    ml_collector=None
+    ml_collector=None,
+    dashboard_url: Optional[str] = None,
+    policies: Optional[Dict[str, str]] = None,
+    dashboard_token: Optional[str] = None
 ) -> TradeEventBus:
     """
     Initialize the event bus with all collectors.
     
     Call this during system startup to wire up all metrics collection.
+    `dashboard_url` (e.g. http://127.0.0.1:5000/api/events) enables push
+    updates to the dashboard server, authenticated with `dashboard_token`
+    when the dashboard is not on loopback. `policies` overrides the backpressure
+    policy per subscriber name; the database spills by default so closes
+    are never lost, the rest drop their oldest events.
     """
     bus = get_event_bus()
+    policy = {'database': POLICY_SPILL}
+    policy.update(policies or {})
     
     if metrics_collector:
         subscriber = MetricsCollectorSubscriber(metrics_collector)
-        bus.subscribe('metrics', subscriber.on_event)
+        bus.subscribe('metrics', subscriber.on_event, policy=policy.get('metrics'))
     
     if comprehensive_collector:
         subscriber = ComprehensiveCollectorSubscriber(comprehensive_collector)
-        bus.subscribe('comprehensive', subscriber.on_event)
+        bus.subscribe('comprehensive', subscriber.on_event, policy=policy.get('comprehensive'))
     
     if training_logger:
         subscriber = TrainingDataSubscriber(training_logger)
-        bus.subscribe('training', subscriber.on_event)
+        bus.subscribe('training', subscriber.on_event, policy=policy.get('training'))
     
     if database:
         subscriber = DatabaseSubscriber(database)
-        bus.subscribe_batch('database', subscriber.on_batch)
+        bus.subscribe_batch('database', subscriber.on_batch, policy=policy.get('database'))
     
     if ml_collector:
         subscriber = MLDataCollectorSubscriber(ml_collector)
-        bus.subscribe('ml_collector', subscriber.on_event)
+        bus.subscribe('ml_collector', subscriber.on_event, policy=policy.get('ml_collector'))
+    
+    if dashboard_url:
+        subscriber = DashboardPushSubscriber(dashboard_url, token=dashboard_token)
+        bus.subscribe_batch('dashboard', subscriber.on_batch, policy=policy.get('dashboard'))
     
     logger.info(f"Event bus initialized with subscribers: {bus.get_stats()['subscribers']}")
     return bus
@@ -7,10 +7,11 @@ Provides historical retention and export capabilities.
 
 import sqlite3
 import logging
+import threading
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import os
 
@@ -67,6 +68,10 @@ class Database:
     - Historical data retention
     - Export capabilities
     """
+
+    # Append-heavy tables the retention job moves into monthly archive files
+    # (table -> time column). Trades are kept: trade_summary counts them.
+    RETENTION_TABLES = {'signals': 'timestamp', 'order_provenance': 'timestamp'}
     
     def __init__(self, db_path: str = "cthulu.db"):
         """
@@ -80,6 +85,14 @@ class Database:
         self.conn: Optional[sqlite3.Connection] = None
         # Read-only marker (set if filesystem prevents initialization writes)
         self._read_only = False
+        # sqlite3 connections are bound to their creating thread; other
+        # threads (event bus workers) get their own connection on demand
+        self._owner_thread = threading.get_ident()
+        self._thread_conns = threading.local()
+        self._extra_conns: List[sqlite3.Connection] = []
+        self._retention_lock = threading.Lock()
+        self._retention_stop = threading.Event()
+        self._retention_thread: Optional[threading.Thread] = None
 
         # Create database directory if needed
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -229,6 +242,7 @@ class Database:
             # Create indexes
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_entry_time ON trades(entry_time)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_ticket ON positions(ticket)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status)")
@@ -281,6 +295,8 @@ class Database:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._ensure_trade_summary(cursor)
+            self._ensure_query_indexes(cursor)
             # Set a schema_version if not present
             cursor.execute("SELECT value FROM meta WHERE key = 'schema_version'")
             row = cursor.fetchone()
@@ -290,6 +306,130 @@ class Database:
         except Exception:
             self.logger.exception('Migration step failed')
 
+    def _ensure_trade_summary(self, cursor: sqlite3.Cursor):
+        """
+        Create the materialized trade_summary row and the triggers that keep it current.
+        
+        The dashboard reads this single row instead of scanning trades, so its
+        cost does not grow with the table. Triggers run inside the writer's
+        transaction, so readers in other processes (ui_server) always see
+        totals consistent with the trades table.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trade_summary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_trades INTEGER NOT NULL DEFAULT 0,
+                open_trades INTEGER NOT NULL DEFAULT 0,
+                closed_trades INTEGER NOT NULL DEFAULT 0,
+                total_pnl REAL NOT NULL DEFAULT 0.0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                losses INTEGER NOT NULL DEFAULT 0,
+                last_trade_id INTEGER,
+                updated_at TIMESTAMP
+            )
+        """)
+        
+        # Backfill once (single scan) when the summary is first created
+        cursor.execute("SELECT 1 FROM trade_summary WHERE id = 1")
+        if cursor.fetchone() is None:
+            cursor.execute("""
+                INSERT INTO trade_summary (id, total_trades, open_trades, closed_trades,
+                                           total_pnl, wins, losses, last_trade_id, updated_at)
+                SELECT 1, COUNT(*),
+                       COALESCE(SUM(status = 'OPEN'), 0),
+                       COALESCE(SUM(status = 'CLOSED'), 0),
+                       COALESCE(SUM(profit), 0.0),
+                       COALESCE(SUM(profit > 0), 0),
+                       COALESCE(SUM(profit < 0), 0),
+                       MAX(id),
+                       CURRENT_TIMESTAMP
+                FROM trades
+            """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_summary_insert AFTER INSERT ON trades
+            BEGIN
+                UPDATE trade_summary SET
+                    total_trades = total_trades + 1,
+                    open_trades = open_trades + (NEW.status = 'OPEN'),
+                    closed_trades = closed_trades + (NEW.status = 'CLOSED'),
+                    total_pnl = total_pnl + COALESCE(NEW.profit, 0.0),
+                    wins = wins + COALESCE(NEW.profit > 0, 0),
+                    losses = losses + COALESCE(NEW.profit < 0, 0),
+                    last_trade_id = NEW.id,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_summary_update AFTER UPDATE OF status, profit ON trades
+            BEGIN
+                UPDATE trade_summary SET
+                    open_trades = open_trades - (OLD.status = 'OPEN') + (NEW.status = 'OPEN'),
+                    closed_trades = closed_trades - (OLD.status = 'CLOSED') + (NEW.status = 'CLOSED'),
+                    total_pnl = total_pnl - COALESCE(OLD.profit, 0.0) + COALESCE(NEW.profit, 0.0),
+                    wins = wins - COALESCE(OLD.profit > 0, 0) + COALESCE(NEW.profit > 0, 0),
+                    losses = losses - COALESCE(OLD.profit < 0, 0) + COALESCE(NEW.profit < 0, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_trade_summary_delete AFTER DELETE ON trades
+            BEGIN
+                UPDATE trade_summary SET
+                    total_trades = total_trades - 1,
+                    open_trades = open_trades - (OLD.status = 'OPEN'),
+                    closed_trades = closed_trades - (OLD.status = 'CLOSED'),
+                    total_pnl = total_pnl - COALESCE(OLD.profit, 0.0),
+                    wins = wins - COALESCE(OLD.profit > 0, 0),
+                    losses = losses - COALESCE(OLD.profit < 0, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1;
+            END
+        """)
+
+    def _ensure_query_indexes(self, cursor: sqlite3.Cursor):
+        """
+        Composite/covering indexes for the dashboard and analyzer query shapes.
+
+        Single-column indexes already carry the rowid, so (timestamp, id)
+        keyset pages walk idx_signals_timestamp / idx_prov_timestamp /
+        idx_trades_entry_time directly. These add the multi-column shapes:
+        per-symbol signal windows, and the closed-trade replay
+        (status, exit_time -> symbol, profit) answered from the index alone.
+        """
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp ON signals(symbol, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prov_symbol_timestamp ON order_provenance(symbol, timestamp)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_status_exit
+            ON trades(status, exit_time, symbol, profit)
+        """)
+
+    def get_dashboard_summary(self) -> Dict[str, Any]:
+        """
+        Trade totals from the materialized summary row (O(1) regardless of table size).
+        
+        Returns:
+            Dict with total/open/closed trades, total_pnl, wins, losses, win_rate
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT total_trades, open_trades, closed_trades, total_pnl, wins, losses, last_trade_id
+                FROM trade_summary WHERE id = 1
+            """)
+            row = cursor.fetchone()
+            if row is None:
+                return {}
+            summary = dict(row)
+            decided = summary['wins'] + summary['losses']
+            summary['win_rate'] = (summary['wins'] / decided * 100) if decided > 0 else 0.0
+            return summary
+        except Exception as e:
+            self.logger.error(f"Failed to read dashboard summary: {e}")
+            return {}
+
     def purge_provenance_older_than(self, days: int) -> int:
         """Delete provenance rows older than `days` and return deleted count."""
         try:
@@ -305,6 +445,181 @@ class Database:
             self.logger.exception('Failed to purge provenance rows')
             return 0
 
+    # ------------------------------------------------------------------
+    # Time-partitioned retention
+    # ------------------------------------------------------------------
+
+    @property
+    def archive_dir(self) -> Path:
+        """Directory holding the monthly archive files (<db stem>_archive/)."""
+        return self.db_path.parent / f"{self.db_path.stem}_archive"
+
+    def archive_path(self, month: str) -> Path:
+        """Archive file for a 'YYYY-MM' bucket."""
+        return self.archive_dir / f"{month.replace('-', '_')}.db"
+
+    def list_archives(self) -> Dict[str, Path]:
+        """Existing monthly archive files, oldest first ('YYYY-MM' -> path)."""
+        if not self.archive_dir.exists():
+            return {}
+        archives = {}
+        for path in sorted(self.archive_dir.glob('*_*.db')):
+            month = path.stem.replace('_', '-')
+            if len(month) == 7:
+                archives[month] = path
+        return archives
+
+    @staticmethod
+    def _month_buckets(first: str, cutoff: str) -> List[Tuple[str, str, str]]:
+        """(month, lower, upper) text bounds covering [first's month start, cutoff)."""
+        try:
+            year, month = int(first[:4]), int(first[5:7])
+        except (TypeError, ValueError):
+            return []
+        buckets = []
+        lower = f"{year:04d}-{month:02d}-01 00:00:00"
+        while lower < cutoff:
+            key = lower[:7]
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            upper = f"{year:04d}-{month:02d}-01 00:00:00"
+            buckets.append((key, lower, min(upper, cutoff)))
+            lower = upper
+        return buckets
+
+    def _ensure_archive_table(self, conn: sqlite3.Connection, table: str, column: str) -> str:
+        """Create/upgrade archive.<table> to match main.<table>; return the column list."""
+        create_sql = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        conn.execute(create_sql.replace(f"CREATE TABLE {table}",
+                                        f"CREATE TABLE IF NOT EXISTS archive.{table}", 1))
+        columns = [r[1] for r in conn.execute(f"PRAGMA main.table_info({table})")]
+        archived = {r[1] for r in conn.execute(f"PRAGMA archive.table_info({table})")}
+        for name in columns:
+            if name not in archived:
+                conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {name}")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS archive.idx_{table}_{column} ON {table}({column}, id)")
+        return ', '.join(columns)
+
+    def run_retention(self, signal_days: Optional[int] = 90, provenance_days: Optional[int] = 30,
+                      dry_run: bool = False, vacuum: bool = False,
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Move signals/provenance rows past their retention window into monthly archive files.
+
+        Rows are copied per calendar month into <db stem>_archive/YYYY_MM.db
+        (same schema, attached for the copy) and then deleted from the live
+        table, so the live tables - and their indexes - stay bounded no matter
+        how long signals are logged. The copy is INSERT OR IGNORE on the
+        original ids, so a run interrupted between copy and delete is
+        completed by the next run without duplicates.
+
+        Uses its own connection; safe to call from a background thread.
+
+        Args:
+            signal_days: Keep this many days of signals live (None: keep all)
+            provenance_days: Keep this many days of provenance live (None: keep all)
+            dry_run: Only count what would be archived
+            vacuum: VACUUM the live database afterwards to return freed pages
+            now: Reference time (default: datetime.now())
+
+        Returns:
+            Dict with per-table {month: rows} and the total archived
+        """
+        windows = {'signals': signal_days, 'order_provenance': provenance_days}
+        result: Dict[str, Any] = {'archived': 0, 'dry_run': dry_run, 'archive_dir': str(self.archive_dir)}
+        if self._read_only:
+            self.logger.warning("Retention skipped: database is read-only")
+            return result
+        now = now or datetime.now()
+
+        with self._retention_lock:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            try:
+                conn.execute("PRAGMA busy_timeout=30000")
+                for table, days in windows.items():
+                    result[table] = {}
+                    if days is None:
+                        continue
+                    column = self.RETENTION_TABLES[table]
+                    cutoff = (now - timedelta(days=int(days))).strftime('%Y-%m-%d %H:%M:%S')
+                    first = conn.execute(f"SELECT MIN({column}) FROM {table} WHERE {column} < ?",
+                                         (cutoff,)).fetchone()[0]
+                    if first is None:
+                        continue
+                    for month, lower, upper in self._month_buckets(str(first), cutoff):
+                        where = f"{column} >= ? AND {column} < ?"
+                        count = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}",
+                                             (lower, upper)).fetchone()[0]
+                        if not count:
+                            continue
+                        result[table][month] = count
+                        if dry_run:
+                            continue
+                        self.archive_dir.mkdir(parents=True, exist_ok=True)
+                        conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_path(month)),))
+                        try:
+                            columns = self._ensure_archive_table(conn, table, column)
+                            # A transaction across an ATTACHed file is not atomic under WAL,
+                            # so the copy commits before the delete. A crash in between leaves
+                            # rows in both files; re-running skips the copies (INSERT OR IGNORE)
+                            # and finishes the delete.
+                            with conn:
+                                conn.execute(f"INSERT OR IGNORE INTO archive.{table} ({columns}) "
+                                             f"SELECT {columns} FROM main.{table} WHERE {where}",
+                                             (lower, upper))
+                            with conn:
+                                conn.execute(f"DELETE FROM main.{table} WHERE {where}", (lower, upper))
+                        finally:
+                            conn.execute("DETACH DATABASE archive")
+                        result['archived'] += count
+                        self.logger.info(f"Archived {count} {table} rows for {month}")
+
+                if result['archived'] and not dry_run:
+                    conn.execute("PRAGMA optimize")
+                    if vacuum:
+                        conn.execute("VACUUM")
+                        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        return result
+
+    def start_retention_job(self, interval_seconds: float = 6 * 3600, **retention_kwargs) -> bool:
+        """
+        Run run_retention() periodically on a daemon thread.
+
+        Args:
+            interval_seconds: Seconds between runs (the first run is immediate)
+            **retention_kwargs: Passed to run_retention()
+
+        Returns:
+            True if a new job was started
+        """
+        if self._retention_thread is not None and self._retention_thread.is_alive():
+            return False
+        self._retention_stop.clear()
+
+        def loop():
+            while not self._retention_stop.is_set():
+                try:
+                    summary = self.run_retention(**retention_kwargs)
+                    if summary['archived']:
+                        self.logger.info(f"Retention job archived {summary['archived']} rows")
+                except Exception:
+                    self.logger.exception('Retention job failed')
+                self._retention_stop.wait(interval_seconds)
+
+        self._retention_thread = threading.Thread(target=loop, name='db-retention', daemon=True)
+        self._retention_thread.start()
+        return True
+
+    def stop_retention_job(self, timeout: float = 5.0):
+        """Stop the background retention job (waits for a run in progress)."""
+        self._retention_stop.set()
+        thread, self._retention_thread = self._retention_thread, None
+        if thread is not None:
+            thread.join(timeout)
+
     def _normalize_timestamp(self, ts) -> Optional[str]:
         """Normalize various timestamp inputs to SQLite-friendly TEXT format:
         - Accepts datetime objects or ISO strings like 'YYYY-MM-DDTHH:MM:SS(.micro)[Z]'
@@ -381,45 +696,90 @@ class Database:
             self.logger.exception('Failed to record provenance')
             return -1
 
+    @staticmethod
+    def _provenance_from_row(r: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'id': r['id'],
+            'timestamp': r['timestamp_text'],
+            'signal_id': r['signal_id'],
+            'client_tag': r['client_tag'],
+            'symbol': r['symbol'],
+            'side': r['side'],
+            'volume': r['volume'],
+            'caller_module': r['caller_module'],
+            'caller_function': r['caller_function'],
+            'stack_snippet': json.loads(r['stack_snippet']) if r['stack_snippet'] else None,
+            'metadata': json.loads(r['metadata']) if r['metadata'] else None,
+            'pid': r['pid'],
+            'thread_id': r['thread_id'],
+            'hostname': r['hostname'],
+            'python_version': r['python_version'],
+            'env_snapshot': json.loads(r['env_snapshot']) if r['env_snapshot'] else None
+        }
+
     def get_recent_provenance(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Retrieve recent provenance entries as dicts.
         """
+        return self.get_provenance_page(limit=limit)[0]
+
+    def get_provenance_page(self, limit: int = 50, cursor: Optional[Tuple[str, int]] = None,
+                            symbol: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """
+        One page of provenance entries, newest first (keyset pagination).
+        
+        Args:
+            limit: Page size
+            cursor: Cursor returned with the previous page (None: first page)
+            symbol: Only entries for this symbol
+            
+        Returns:
+            (entries, cursor for the next page or None when exhausted)
+        """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            rows = self._keyset_page(self.conn, """
                 SELECT id, CAST(timestamp AS TEXT) AS timestamp_text, signal_id, client_tag, symbol, side, volume,
                        caller_module, caller_function, stack_snippet, metadata,
                        pid, thread_id, hostname, python_version, env_snapshot
                 FROM order_provenance
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            rows = cursor.fetchall()
-            out = []
-            for r in rows:
-                out.append({
-                    'id': r['id'],
-                    'timestamp': r['timestamp_text'],
-                    'signal_id': r['signal_id'],
-                    'client_tag': r['client_tag'],
-                    'symbol': r['symbol'],
-                    'side': r['side'],
-                    'volume': r['volume'],
-                    'caller_module': r['caller_module'],
-                    'caller_function': r['caller_function'],
-                    'stack_snippet': json.loads(r['stack_snippet']) if r['stack_snippet'] else None,
-                    'metadata': json.loads(r['metadata']) if r['metadata'] else None,
-                    'pid': r['pid'],
-                    'thread_id': r['thread_id'],
-                    'hostname': r['hostname'],
-                    'python_version': r['python_version'],
-                    'env_snapshot': json.loads(r['env_snapshot']) if r['env_snapshot'] else None
-                })
-            return out
+            """, limit, cursor, symbol=symbol)
+            return [self._provenance_from_row(r) for r in rows], self._next_cursor(rows, 'timestamp_text', limit)
         except Exception:
             self.logger.exception('Failed to fetch provenance entries')
-            return []
+            return [], None
+
+    @staticmethod
+    def _keyset_page(conn: sqlite3.Connection, select_sql: str, limit: int,
+                     cursor: Optional[Tuple[str, int]], time_column: str = 'timestamp',
+                     symbol: Optional[str] = None, since: Optional[Any] = None) -> List[sqlite3.Row]:
+        """
+        Newest-first page ordered by (time_column, id).
+        
+        The cursor is the (time, id) of the last row already returned; the
+        next page seeks past it on the time index instead of skipping OFFSET
+        rows, so every page costs the same however deep the caller reads.
+        """
+        where, params = [], []
+        if symbol is not None:
+            where.append("symbol = ?")
+            params.append(symbol)
+        if since is not None:
+            where.append(f"{time_column} >= ?")
+            params.append(since)
+        if cursor is not None:
+            where.append(f"({time_column}, id) < (?, ?)")
+            params.extend([cursor[0], int(cursor[1])])
+        sql = select_sql + (f" WHERE {' AND '.join(where)}" if where else "")
+        sql += f" ORDER BY {time_column} DESC, id DESC LIMIT ?"
+        params.append(int(limit))
+        return conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _next_cursor(rows: List[sqlite3.Row], time_key: str, limit: int) -> Optional[Tuple[str, int]]:
+        if len(rows) < limit or not rows:
+            return None
+        return (rows[-1][time_key], rows[-1]['id'])
+
     def record_signal(self, signal_record: SignalRecord) -> int:
         """
         Record a trading signal.
@@ -486,6 +846,64 @@ class Database:
                 return -1
         return -1
             
+    def get_signals_page(self, limit: int = 500, cursor: Optional[Tuple[str, int]] = None,
+                         symbol: Optional[str] = None, since: Optional[Any] = None,
+                         month: Optional[str] = None) -> Tuple[List[SignalRecord], Optional[Tuple[str, int]]]:
+        """
+        One page of signals, newest first (keyset pagination).
+        
+        Args:
+            limit: Page size
+            cursor: Cursor returned with the previous page (None: first page)
+            symbol: Only signals for this symbol
+            since: Only signals at or after this time
+            month: Read the archived 'YYYY-MM' bucket instead of the live table
+            
+        Returns:
+            (signals, cursor for the next page or None when exhausted)
+        """
+        conn = None
+        try:
+            if month is None:
+                source = self.conn
+            else:
+                path = self.archive_path(month)
+                if not path.exists():
+                    return [], None
+                conn = source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+                source.row_factory = sqlite3.Row
+            rows = self._keyset_page(source, """
+                SELECT id, signal_id, CAST(timestamp AS TEXT) AS timestamp, symbol, timeframe, side, action,
+                       confidence, price, stop_loss, take_profit, reason, executed,
+                       CAST(execution_timestamp AS TEXT) AS execution_timestamp, metadata
+                FROM signals
+            """, limit, cursor, symbol=symbol,
+                since=self._normalize_timestamp(since) if since is not None else None)
+            signals = [SignalRecord(
+                id=r['id'],
+                signal_id=r['signal_id'],
+                timestamp=r['timestamp'],
+                symbol=r['symbol'],
+                timeframe=r['timeframe'],
+                side=r['side'],
+                action=r['action'],
+                confidence=r['confidence'],
+                price=r['price'],
+                stop_loss=r['stop_loss'],
+                take_profit=r['take_profit'],
+                reason=r['reason'] or "",
+                executed=bool(r['executed']),
+                metadata=r['metadata'] or "",
+                execution_timestamp=r['execution_timestamp']
+            ) for r in rows]
+            return signals, self._next_cursor(rows, 'timestamp', limit)
+        except Exception as e:
+            self.logger.error(f"Failed to get signals page: {e}", exc_info=True)
+            return [], None
+        finally:
+            if conn is not None:
+                conn.close()
+
     def record_trade(self, trade_record: TradeRecord) -> int:
         """
         Record a trade entry.
@@ -793,6 +1211,60 @@ class Database:
         except Exception as e:
             self.logger.error(f"Failed to update trade exit: {e}", exc_info=True)
             return False
+    
+    def update_trade_exits(self, exits: List[tuple]) -> int:
+        """
+        Record many trade exits in one transaction.
+        
+        Args:
+            exits: (order_id, exit_price, exit_time, profit, exit_reason) tuples
+            
+        Returns:
+            Number of trade rows updated
+        """
+        if not exits:
+            return 0
+        try:
+            conn = self._thread_connection()
+            rows = [
+                (exit_price, self._normalize_timestamp(exit_time), profit, exit_reason, order_id)
+                for order_id, exit_price, exit_time, profit, exit_reason in exits
+            ]
+            with conn:
+                cursor = conn.executemany("""
+                    UPDATE trades
+                    SET exit_price = ?,
+                        exit_time = ?,
+                        profit = ?,
+                        status = 'CLOSED',
+                        exit_reason = ?
+                    WHERE order_id = ?
+                """, rows)
+            updated = cursor.rowcount
+            if updated < len(rows):
+                self.logger.warning(f"Trade exits: {len(rows) - updated} of {len(rows)} orders not found")
+            self.logger.info(f"Trade exits recorded: {updated} in one batch")
+            return updated
+        except Exception as e:
+            self.logger.error(f"Failed to update trade exits: {e}", exc_info=True)
+            return 0
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """The main connection on the owning thread, else a per-thread connection."""
+        if threading.get_ident() == self._owner_thread:
+            return self.conn
+        conn = getattr(self._thread_conns, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                timeout=30.0,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._thread_conns.conn = conn
+            self._extra_conns.append(conn)
+        return conn
             
     def get_open_trades(self) -> List[TradeRecord]:
         """
@@ -849,43 +1321,54 @@ class Database:
         Returns:
             List of trade records
         """
+        return self.get_trades_page(limit=limit)[0]
+
+    def get_trades_page(self, limit: int = 100, cursor: Optional[Tuple[str, int]] = None,
+                        symbol: Optional[str] = None) -> Tuple[List[TradeRecord], Optional[Tuple[str, int]]]:
+        """
+        One page of trades (open and closed), most recent entry first (keyset pagination).
+        
+        Args:
+            limit: Page size
+            cursor: Cursor returned with the previous page (None: first page)
+            symbol: Only trades for this symbol
+            
+        Returns:
+            (trades, cursor for the next page or None when exhausted)
+        """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            rows = self._keyset_page(self.conn, """
                 SELECT id, signal_id, order_id, symbol, side, volume, entry_price,
                        exit_price, stop_loss, take_profit, CAST(entry_time AS TEXT) AS entry_time,
                        CAST(exit_time AS TEXT) AS exit_time, profit, status, exit_reason, metadata
                 FROM trades
-                ORDER BY entry_time DESC
-                LIMIT ?
-            """, (limit,))
-            
-            trades = []
-            for row in cursor.fetchall():
-                trades.append(TradeRecord(
-                    id=row['id'],
-                    signal_id=row['signal_id'],
-                    order_id=row['order_id'],
-                    symbol=row['symbol'],
-                    side=row['side'],
-                    volume=row['volume'],
-                    entry_price=row['entry_price'],
-                    exit_price=row['exit_price'],
-                    stop_loss=row['stop_loss'],
-                    take_profit=row['take_profit'],
-                    entry_time=row['entry_time'],
-                    exit_time=row['exit_time'],
-                    profit=row['profit'],
-                    status=row['status'],
-                    exit_reason=row['exit_reason'],
-                    metadata=row['metadata']
-                ))
-            
-            return trades
+            """, limit, cursor, time_column='entry_time', symbol=symbol)
+            return [self._trade_from_row(row) for row in rows], self._next_cursor(rows, 'entry_time', limit)
             
         except Exception as e:
             self.logger.error(f"Failed to get all trades: {e}", exc_info=True)
-            return []
+            return [], None
+
+    @staticmethod
+    def _trade_from_row(row: sqlite3.Row) -> TradeRecord:
+        return TradeRecord(
+            id=row['id'],
+            signal_id=row['signal_id'],
+            order_id=row['order_id'],
+            symbol=row['symbol'],
+            side=row['side'],
+            volume=row['volume'],
+            entry_price=row['entry_price'],
+            exit_price=row['exit_price'],
+            stop_loss=row['stop_loss'],
+            take_profit=row['take_profit'],
+            entry_time=row['entry_time'],
+            exit_time=row['exit_time'],
+            profit=row['profit'],
+            status=row['status'],
+            exit_reason=row['exit_reason'],
+            metadata=row['metadata']
+        )
             
     def record_metric(self, name: str, value: float, metadata: str = "") -> bool:
         """
@@ -914,6 +1397,13 @@ class Database:
             
     def close(self):
         """Close database connection."""
+        self.stop_retention_job()
+        for conn in self._extra_conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._extra_conns.clear()
         if self.conn:
             self.conn.close()
             self.logger.info("Database connection closed")
@@ -22,6 +22,10 @@ from typing import List, Optional, Set
 import logging
 from datetime import datetime, timedelta
 
+import pandas as pd
+
+from cthulu.data.bar_store import TIMEFRAME_H1
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,10 +54,10 @@ class TradeAdoptionPolicy:
     
     # Safety - ATR-based SL/TP (CRITICAL FIX)
     apply_emergency_sl: bool = True  # Add SL if none exists
-    use_atr_based_sltp: bool = True  # Use ATR-based calculation (not fixed points)
-    emergency_sl_atr_mult: float = 2.0  # SL distance as multiple of ATR
-    emergency_tp_atr_mult: float = 4.0  # TP distance as multiple of ATR
-    # Fallback fixed points (only used if ATR unavailable)
+    use_atr_based_sltp: bool = True  # Log the H1 ATR on adoption (stops stay fixed-point)
+    emergency_sl_atr_mult: float = 2.0  # Reserved: SL distance as multiple of ATR
+    emergency_tp_atr_mult: float = 4.0  # Reserved: TP distance as multiple of ATR
+    # Fixed-point distances applied to adopted trades
     emergency_sl_points: float = 100  # Emergency SL distance (fallback)
     apply_emergency_tp: bool = False  # Add TP if none exists
     emergency_tp_points: float = 100  # Emergency TP distance (fallback)
@@ -78,7 +82,7 @@ class TradeAdoptionManager:
     """
     
     def __init__(self, connector, position_tracker, position_lifecycle, 
-                 policy: Optional[TradeAdoptionPolicy] = None):
+                 policy: Optional[TradeAdoptionPolicy] = None, bar_store=None):
         """
         Initialize the trade adoption manager.
         
@@ -87,8 +91,10 @@ class TradeAdoptionManager:
             position_tracker: PositionTracker instance
             position_lifecycle: PositionLifecycle instance
             policy: TradeAdoptionPolicy configuration
+            bar_store: Optional shared BarStore for the H1 bars behind the logged ATR
         """
         self.connector = connector
+        self.bar_store = bar_store
         self.tracker = position_tracker
         self.lifecycle = position_lifecycle
         self.policy = policy or TradeAdoptionPolicy()
@@ -256,91 +262,31 @@ class TradeAdoptionManager:
             # Convert trade type to string
             type_str = "buy" if trade_type == 0 else "sell"
             
-            # Apply emergency SL/TP if configured - USE ATR-BASED CALCULATION
+            # Apply emergency SL/TP if configured. Adopted trades get
+            # fixed-point stops: the ATR-based distances never took effect
+            # (the H1 fetch always failed), so the ATR is only logged.
             if self.policy.apply_emergency_sl and not sl:
-                # Try to get ATR for market-condition-based SL/TP
-                atr = None
-                if self.policy.use_atr_based_sltp:
-                    try:
-                        # Try to get ATR from lifecycle's dynamic SLTP manager
-                        if hasattr(self.lifecycle, 'dynamic_sltp_manager') and self.lifecycle.dynamic_sltp_manager:
-                            # Get recent market data to calculate ATR
-                            # Check if connector has method to get recent data
-                            if hasattr(self.connector, 'get_rates'):
-                                import pandas as pd
-                                rates = self.connector.get_rates(symbol, '1H', 100)  # Get last 100 H1 bars
-                                if rates is not None and len(rates) > 0:
-                                    # Calculate ATR if not in data
-                                    if 'atr' in rates.columns:
-                                        atr = rates['atr'].iloc[-1]
-                                    else:
-                                        # Calculate simple ATR
-                                        high_low = rates['high'] - rates['low']
-                                        high_close = abs(rates['high'] - rates['close'].shift())
-                                        low_close = abs(rates['low'] - rates['close'].shift())
-                                        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-                                        atr = true_range.rolling(14).mean().iloc[-1]
-                                    logger.info(f"Calculated ATR for {symbol}: {atr:.5f}")
-                    except Exception as e:
-                        logger.warning(f"Could not calculate ATR for {symbol}, using fallback: {e}")
+                if self.policy.use_atr_based_sltp and getattr(self.lifecycle, 'dynamic_sltp_manager', None):
+                    atr = self._recent_atr(symbol)
+                    if atr:
+                        logger.info(f"Calculated ATR for {symbol}: {atr:.5f}")
                 
-                # Calculate SL based on ATR or fallback to fixed points
-                if atr and atr > 0 and self.policy.use_atr_based_sltp:
-                    # ATR-BASED SL/TP - PROPER MARKET CONDITION ADAPTATION
-                    sl_distance = atr * self.policy.emergency_sl_atr_mult
-                    if type_str == "buy":
-                        sl = open_price - sl_distance
-                    else:
-                        sl = open_price + sl_distance
-                    logger.info(f"Applied ATR-based SL to {ticket}: distance={sl_distance:.5f} ({self.policy.emergency_sl_atr_mult}x ATR={atr:.5f})")
+                if type_str == "buy":
+                    sl = open_price - self.policy.emergency_sl_points * self.connector.get_point(symbol)
                 else:
-                    # Fallback to fixed points
-                    if type_str == "buy":
-                        sl = open_price - self.policy.emergency_sl_points * self.connector.get_point(symbol)
-                    else:
-                        sl = open_price + self.policy.emergency_sl_points * self.connector.get_point(symbol)
-                    logger.warning(f"Applied fixed-point SL to {ticket} (ATR unavailable)")
+                    sl = open_price + self.policy.emergency_sl_points * self.connector.get_point(symbol)
+                logger.warning(f"Applied fixed-point SL to {ticket}")
                 
                 # Modify position with emergency SL
                 self.lifecycle.modify_position(ticket, sl=sl)
                 logger.info(f"Applied emergency SL to external trade {ticket}")
             
             if self.policy.apply_emergency_tp and not tp:
-                # Try to get ATR for TP calculation
-                atr = None
-                if self.policy.use_atr_based_sltp:
-                    try:
-                        if hasattr(self.connector, 'get_rates'):
-                            import pandas as pd
-                            rates = self.connector.get_rates(symbol, '1H', 100)
-                            if rates is not None and len(rates) > 0:
-                                if 'atr' in rates.columns:
-                                    atr = rates['atr'].iloc[-1]
-                                else:
-                                    high_low = rates['high'] - rates['low']
-                                    high_close = abs(rates['high'] - rates['close'].shift())
-                                    low_close = abs(rates['low'] - rates['close'].shift())
-                                    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-                                    atr = true_range.rolling(14).mean().iloc[-1]
-                    except Exception as e:
-                        logger.warning(f"Could not calculate ATR for TP: {e}")
-                
-                # Calculate TP based on ATR or fallback
-                if atr and atr > 0 and self.policy.use_atr_based_sltp:
-                    # ATR-BASED TP
-                    tp_distance = atr * self.policy.emergency_tp_atr_mult
-                    if type_str == "buy":
-                        tp = open_price + tp_distance
-                    else:
-                        tp = open_price - tp_distance
-                    logger.info(f"Applied ATR-based TP to {ticket}: distance={tp_distance:.5f} ({self.policy.emergency_tp_atr_mult}x ATR={atr:.5f})")
+                if type_str == "buy":
+                    tp = open_price + self.policy.emergency_tp_points * self.connector.get_point(symbol)
                 else:
-                    # Fallback to fixed points
-                    if type_str == "buy":
-                        tp = open_price + self.policy.emergency_tp_points * self.connector.get_point(symbol)
-                    else:
-                        tp = open_price - self.policy.emergency_tp_points * self.connector.get_point(symbol)
-                    logger.warning(f"Applied fixed-point TP to {ticket} (ATR unavailable)")
+                    tp = open_price - self.policy.emergency_tp_points * self.connector.get_point(symbol)
+                logger.warning(f"Applied fixed-point TP to {ticket}")
                 
                 # Modify position with emergency TP
                 self.lifecycle.modify_position(ticket, tp=tp)
@@ -400,6 +346,29 @@ class TradeAdoptionManager:
             logger.error(f"Error adopting trade {trade.get('ticket')}: {e}", exc_info=True)
             return False
     
+    def _recent_atr(self, symbol: str, period: int = 14) -> Optional[float]:
+        """
+        Simple ATR over the last 100 H1 bars, or None if bars are unavailable.
+        
+        Served from the shared bar store when one is attached, so adopting
+        several trades on a symbol costs no extra terminal requests.
+        """
+        try:
+            source = self.bar_store or self.connector
+            rates = source.get_rates(symbol, TIMEFRAME_H1, 100)
+            if rates is None or len(rates) <= period:
+                return None
+            rates = pd.DataFrame(rates)
+            high_low = rates['high'] - rates['low']
+            high_close = abs(rates['high'] - rates['close'].shift())
+            low_close = abs(rates['low'] - rates['close'].shift())
+            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+            atr = float(true_range.rolling(period).mean().iloc[-1])
+            return atr if atr > 0 else None
+        except Exception as e:
+            logger.warning(f"Could not calculate ATR for {symbol}, using fallback: {e}")
+            return None
+    
     def get_adopted_count(self) -> int:
         """
         Get count of adopted trades.
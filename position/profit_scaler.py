@@ -124,7 +124,7 @@ class ProfitScaler:
     """
     
     def __init__(self, connector, execution_engine, config: Optional[ScalingConfig] = None, 
-                 use_ml_optimizer: bool = True):
+                 use_ml_optimizer: bool = True, bar_store=None):
         """
         Initialize profit scaler.
         
@@ -133,8 +133,11 @@ class ProfitScaler:
             execution_engine: ExecutionEngine for order management
             config: Scaling configuration
             use_ml_optimizer: Whether to use ML-based tier optimization
+            bar_store: Optional shared BarStore; momentum bars are read from it
+                instead of one terminal request per position
         """
         self.connector = connector
+        self.bar_store = bar_store
         self.execution_engine = execution_engine
         self.config = config or ScalingConfig()
         self._position_states: Dict[int, PositionScalingState] = {}
@@ -185,8 +188,8 @@ class ProfitScaler:
             Tuple of (has_strong_momentum, reason)
         """
         try:
-            # Get recent price action from connector
-            rates = self.connector.get_rates(
+            # Get recent price action (shared bar store when available)
+            rates = (self.bar_store or self.connector).get_rates(
                 symbol=state.symbol,
                 timeframe=1,  # M1 for micro-momentum, fallback handled by connector
                 count=10
@@ -834,7 +837,8 @@ class ProfitScaler:
 
 
 # Convenience factory function
-def create_profit_scaler(connector, execution_engine, config_dict: Optional[Dict[str, Any]] = None) -> ProfitScaler:
+def create_profit_scaler(connector, execution_engine, config_dict: Optional[Dict[str, Any]] = None,
+                         bar_store=None) -> ProfitScaler:
     """
     Create a ProfitScaler with optional configuration.
     
@@ -842,6 +846,7 @@ def create_profit_scaler(connector, execution_engine, config_dict: Optional[Dict
         connector: MT5Connector instance
         execution_engine: ExecutionEngine instance
         config_dict: Optional configuration dictionary
+        bar_store: Optional shared BarStore
         
     Returns:
         Configured ProfitScaler instance
@@ -868,5 +873,5 @@ def create_profit_scaler(connector, execution_engine, config_dict: Optional[Dict
                 ScalingTier(**t) for t in config_dict['micro_tiers']
             ]
     
-    return ProfitScaler(connector, execution_engine, config)
+    return ProfitScaler(connector, execution_engine, config, bar_store=bar_store)
 
@@ -145,8 +145,21 @@ class AdaptiveDrawdownManager:
         self.trap_cooldown_minutes = 30
         self.last_trap_time: Optional[datetime] = None
         
+        # Latest regime inputs published by the shared regime service
+        self._published_market_data: Optional[Dict[str, Any]] = None
+        
         logger.info("AdaptiveDrawdownManager initialized")
     
+    def on_regime_update(self, snapshot: Any) -> None:
+        """
+        Regime service subscriber: keep the bar's regime inputs so update()
+        calls without market_data still classify the regime.
+        
+        Args:
+            snapshot: cognition.regime_service.RegimeSnapshot
+        """
+        self._published_market_data = snapshot.drawdown_inputs()
+    
     def update(self, balance: float, equity: float, 
                market_data: Optional[Dict[str, Any]] = None) -> AdaptiveSettings:
         """
@@ -227,6 +240,8 @@ class AdaptiveDrawdownManager:
         self.metrics.state = self._determine_state()
         
         # Detect market regime if data available
+        if market_data is None:
+            market_data = self._published_market_data
         if market_data:
             self.metrics.regime = self._detect_regime(market_data)
         
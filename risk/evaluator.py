@@ -380,6 +380,21 @@ class RiskEvaluator:
             logger.error(f"Error in trade approval: {e}", exc_info=True)
             return False, f"Error: {str(e)}"
     
+    def _sizing_spec(self, symbol: str) -> tuple:
+        """
+        Point value and minimum lot for sizing, from the shared symbol spec
+        cache (one terminal lookup per symbol and session across threads).
+
+        Returns:
+            Tuple of (point_value or None, min_lot)
+        """
+        from cthulu.utils.cache import symbol_spec
+        spec = symbol_spec(self.connector, symbol)
+        point = spec.get('point')
+        point_value = float(point) * float(spec.get('contract_size') or 1.0) if point is not None else None
+        min_lot = float(spec.get('volume_min') or 0.01)
+        return point_value, min_lot
+
     def calculate_position_size(self, symbol: str, balance: float, 
                                method: str = "percent", 
                                risk_percent: float = 2.0,
@@ -409,12 +424,11 @@ class RiskEvaluator:
             elif method == "percent":
                 # Risk percentage of balance
                 risk_amount = balance * (risk_percent / 100.0)
-                point_value = self.connector.get_point_value(symbol)
+                point_value, min_lot = self._sizing_spec(symbol)
                 
                 if sl_points and point_value:
                     volume = risk_amount / (sl_points * point_value)
                     # Round to valid lot size
-                    min_lot = self.connector.get_min_lot(symbol)
                     volume = max(min_lot, round(volume / min_lot) * min_lot)
                     return volume
                 else:
@@ -429,11 +443,10 @@ class RiskEvaluator:
                 
                 # Adjust position size inversely to volatility
                 # Higher volatility = smaller position
-                point_value = self.connector.get_point_value(symbol)
+                point_value, min_lot = self._sizing_spec(symbol)
                 risk_amount = balance * (risk_percent / 100.0)
                 volume = risk_amount / (atr * point_value)
                 
-                min_lot = self.connector.get_min_lot(symbol)
                 volume = max(min_lot, round(volume / min_lot) * min_lot)
                 return volume
             
@@ -675,6 +688,50 @@ class RiskEvaluator:
             )
         }
     
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        Capture risk counters for warm-restart snapshots.
+        
+        Returns:
+            Picklable state dictionary
+        """
+        return {
+            'daily_pnl': self.daily_tracker.daily_pnl,
+            'daily_trades': self.daily_tracker.daily_trades,
+            'last_reset': self.daily_tracker.last_reset,
+            'emergency_shutdown_triggered': self.emergency_shutdown_triggered,
+            'initial_balance': self.initial_balance,
+            'peak_balance': self.peak_balance,
+            'negative_balance_triggered': self.negative_balance_triggered,
+            'margin_call_triggered': self.margin_call_triggered
+        }
+    
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """
+        Restore risk counters captured by get_warm_state().
+        
+        Daily counters (and the emergency flag they drive) are only restored
+        when the snapshot was taken on the current trading day, so a restart
+        never carries yesterday's losses into today's limits.
+        
+        Args:
+            state: State dictionary from a snapshot
+        """
+        if state.get('last_reset') == datetime.now().date():
+            self.daily_tracker.daily_pnl = state.get('daily_pnl', 0.0)
+            self.daily_tracker.daily_trades = state.get('daily_trades', 0)
+            self.daily_tracker.last_reset = state['last_reset']
+            self.emergency_shutdown_triggered = state.get('emergency_shutdown_triggered', False)
+        
+        self.initial_balance = state.get('initial_balance', self.initial_balance)
+        self.peak_balance = max(self.peak_balance, state.get('peak_balance') or 0.0)
+        self.negative_balance_triggered = state.get('negative_balance_triggered', False)
+        self.margin_call_triggered = state.get('margin_call_triggered', False)
+        logger.info(
+            f"Risk counters restored (daily_pnl={self.daily_tracker.daily_pnl:.2f}, "
+            f"daily_trades={self.daily_tracker.daily_trades}, peak_balance={self.peak_balance:.2f})"
+        )
+    
     def suggest_sl_adjustment(self, balance: float, timeframe: str = "M5") -> float:
         """
         Suggest stop-loss distance based on balance and timeframe.
@@ -289,9 +289,10 @@ class RPCRequestHandler(BaseHTTPRequestHandler):
         connector = getattr(self.execution_engine, 'connector', None)
         if connector:
             try:
-                sym_min = connector.get_min_lot(symbol)
-                sym_info = connector.get_symbol_info(symbol) or {}
-                sym_step = sym_info.get('volume_step')
+                from cthulu.utils.cache import symbol_spec
+                spec = symbol_spec(connector, symbol)
+                sym_min = spec.get('volume_min')
+                sym_step = spec.get('volume_step')
             except Exception as e:
                 logger.debug('Failed to fetch symbol limits from connector for %s: %s', symbol, e, exc_info=True)
                 sym_min = None
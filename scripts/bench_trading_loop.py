@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Trading loop latency benchmark.
+
+Runs TradingLoop iterations against the simulated MT5 terminal on a fixed
+fixture and reports p50/p99 per stage plus allocation counts. Results can
+be saved as JSON baselines and compared between commits.
+
+Usage:
+    python scripts/bench_trading_loop.py --preset dynamic
+    python scripts/bench_trading_loop.py --preset order_path --save benchmarks/order_path.json
+    python scripts/bench_trading_loop.py --preset order_path --compare benchmarks/order_path.json
+
+Exit code 1 when --compare finds a regression beyond --tolerance.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from cthulu.core.loop_benchmark import (  # noqa: E402
+    PRESETS, BenchmarkConfig, BenchmarkResult, LoopBenchmark, compare
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Trading loop latency benchmark")
+    parser.add_argument('--preset', default='sma', choices=sorted(PRESETS))
+    parser.add_argument('--config', help='JSON file with BenchmarkConfig field overrides')
+    parser.add_argument('--iterations', type=int)
+    parser.add_argument('--alloc-iterations', type=int, help='tracemalloc pass length (0 disables)')
+    parser.add_argument('--bars', help='Bar file (csv/parquet) instead of the synthetic fixture')
+    parser.add_argument('--save', help='Write the result as a JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=20.0, help='Allowed slowdown in percent')
+    parser.add_argument('--json', action='store_true', help='Print the full result as JSON')
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.config:
+        overrides.update(json.loads(Path(args.config).read_text(encoding='utf-8')))
+    if args.iterations is not None:
+        overrides['iterations'] = args.iterations
+    if args.alloc_iterations is not None:
+        overrides['alloc_iterations'] = args.alloc_iterations
+    if args.bars:
+        overrides['bars_path'] = args.bars
+
+    result = LoopBenchmark(BenchmarkConfig.preset(args.preset, **overrides)).run()
+    print(json.dumps(result.to_dict(), indent=2) if args.json else result.format_table())
+
+    if args.save:
+        print(f"Saved baseline to {result.save(args.save)}")
+
+    if args.compare:
+        regressions = compare(BenchmarkResult.load(args.compare), result, tolerance_pct=args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.compare}:")
+            for r in regressions:
+                print(f"  {r['stage']:<24}{r['metric']:<8}{r['baseline']:>10.3f} -> {r['current']:>10.3f} ms "
+                      f"(+{r['change_pct']}%)")
+            return 1
+        print(f"\nNo regressions vs {args.compare} (tolerance {args.tolerance:.0f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,12 +9,15 @@ Usage:
     python -m scripts.data_cli status          # Show storage usage summary
     python -m scripts.data_cli health          # Check all data endpoint health
     python -m scripts.data_cli cleanup [--days N] [--dry-run]  # Cleanup old data
+    python -m scripts.data_cli retention [--db PATH] [--signal-days N] [--provenance-days N] [--dry-run]
+                                               # Archive old DB rows into monthly files
     python -m scripts.data_cli export [--output DIR]  # Export data for ML training
     python -m scripts.data_cli watch           # Real-time monitoring
 
 Examples:
     python -m scripts.data_cli status
     python -m scripts.data_cli cleanup --days 30 --dry-run
+    python -m scripts.data_cli retention --db cthulu.db --signal-days 90 --vacuum
     python -m scripts.data_cli export --output ./exports
 """
 
@@ -400,6 +403,55 @@ class DataCLI:
             print(f"Deleted: {total_deleted} files, {total_bytes/(1024*1024):.2f} MB freed")
         print("=" * 70 + "\n")
     
+    def cmd_retention(self, args):
+        """Archive signals/provenance past their retention window into monthly files."""
+        from persistence.database import Database
+        
+        db_path = Path(args.db)
+        if not db_path.is_absolute():
+            db_path = self.root / db_path
+        
+        print("\n" + "=" * 70)
+        print(f"🗄️  CTHULU DB RETENTION ({db_path.name})")
+        print(f"   signals > {args.signal_days} days, provenance > {args.provenance_days} days")
+        if args.dry_run:
+            print("   [DRY RUN - no rows will be moved]")
+        print("=" * 70)
+        
+        if not db_path.exists():
+            print(f"\n❌ Database not found: {db_path}\n")
+            return 1
+        
+        db = Database(str(db_path))
+        try:
+            result = db.run_retention(
+                signal_days=args.signal_days,
+                provenance_days=args.provenance_days,
+                dry_run=args.dry_run,
+                vacuum=args.vacuum,
+            )
+        finally:
+            db.close()
+        
+        total = 0
+        for table in Database.RETENTION_TABLES:
+            months = result.get(table, {})
+            print(f"\n📋 {table}")
+            if not months:
+                print("  Nothing past retention")
+            for month, rows in months.items():
+                print(f"  {month}: {rows:,} rows")
+                total += rows
+        
+        print("\n" + "=" * 70)
+        if args.dry_run:
+            print(f"Would archive: {total:,} rows into {result['archive_dir']}")
+            print("Run without --dry-run to move them")
+        else:
+            print(f"Archived: {result['archived']:,} rows into {result['archive_dir']}")
+        print("=" * 70 + "\n")
+        return 0
+    
     def cmd_export(self, args):
         """Export data for ML training."""
         output_dir = Path(args.output)
@@ -536,6 +588,19 @@ def main():
     cleanup_parser.add_argument('--dry-run', action='store_true',
                                help='Show what would be deleted without deleting')
     
+    # retention command
+    retention_parser = subparsers.add_parser('retention', help='Archive old DB rows into monthly files')
+    retention_parser.add_argument('--db', type=str, default='cthulu.db',
+                                 help='Database path (default: cthulu.db)')
+    retention_parser.add_argument('--signal-days', type=int, default=90,
+                                 help='Keep N days of signals live (default: 90)')
+    retention_parser.add_argument('--provenance-days', type=int, default=30,
+                                 help='Keep N days of order provenance live (default: 30)')
+    retention_parser.add_argument('--vacuum', action='store_true',
+                                 help='VACUUM the database after archiving')
+    retention_parser.add_argument('--dry-run', action='store_true',
+                                 help='Show what would be archived without moving rows')
+    
     # export command
     export_parser = subparsers.add_parser('export', help='Export data for ML training')
     export_parser.add_argument('--output', type=str, default='./exports',
@@ -558,6 +623,8 @@ def main():
         return cli.cmd_health(args)
     elif args.command == 'cleanup':
         cli.cmd_cleanup(args)
+    elif args.command == 'retention':
+        return cli.cmd_retention(args)
     elif args.command == 'export':
         cli.cmd_export(args)
     elif args.command == 'watch':
@@ -156,6 +156,9 @@ def run_optimization_suite(
             base_config=config,
             objective=opt_config.get('objective', 'sharpe_ratio'),
             n_iterations=opt_config.get('n_iterations', 50),
+            n_initial_points=opt_config.get('n_initial_points', 10),
+            n_workers=opt_config.get('n_workers'),
+            pruning=opt_config.get('pruning', True),
             progress_callback=progress_callback
         )
     elif method == 'multi_objective':
@@ -424,6 +424,8 @@ class SentinelGuardian:
             env = os.environ.copy()
             cthulu_package_dir = str(cthulu_dir / "cthulu")
             env['PYTHONPATH'] = cthulu_package_dir + os.pathsep + env.get('PYTHONPATH', '')
+            # Tell bootstrap this is a crash recovery so it resumes the warm-state snapshot
+            env['CTHULU_WARM_RESTART'] = '1'
             
             # First try with visible output to capture errors
             proc = subprocess.Popen(
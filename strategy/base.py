@@ -121,6 +121,24 @@ class Strategy(ABC):
         """
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch signal generation over a whole frame (optional).
+        
+        Equivalent to calling on_bar() on every row of `df`, in order, on a
+        freshly constructed strategy, but computed with column operations.
+        The strategy's on_bar() state is not touched.
+        
+        Args:
+            df: Bars with the indicator columns on_bar() reads
+            
+        Returns:
+            Signal frame indexed like `df` (columns side, price, stop_loss,
+            take_profit, confidence; see strategy.batch), or None if the
+            strategy has no batch implementation
+        """
+        return None
+        
     def configure(self, params: Dict[str, Any]):
         """
         Update strategy parameters.
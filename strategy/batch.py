@@ -0,0 +1,222 @@
+"""
+Batch Signal Helpers
+
+Shared pieces for Strategy.generate_signals(): the signal frame layout, a
+vectorized copy of Strategy.validate_signal(), the on_bar() replay used as
+the reference implementation and the equivalence check between the two.
+
+A signal frame is indexed like the input bars and has one row per bar:
+
+    side         int8   1 = LONG, -1 = SHORT, 0 = no signal
+    price        float  entry price (NaN without a signal)
+    stop_loss    float
+    take_profit  float
+    confidence   float
+
+Usage:
+    frame = strategy.generate_signals(df)
+    if frame is None:                       # no batch implementation
+        frame = replay_signals(strategy, df)
+    mismatches = check_equivalence(lambda: SmaCrossover(cfg), df)
+"""
+
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cthulu.strategy.base import Strategy, Signal, SignalType
+
+
+SIGNAL_COLUMNS = ('side', 'price', 'stop_loss', 'take_profit', 'confidence')
+SIDE_LONG = 1
+SIDE_SHORT = -1
+SIDE_NONE = 0
+
+
+def empty_signal_frame(index: pd.Index) -> pd.DataFrame:
+    """Signal frame with no signals."""
+    n = len(index)
+    return pd.DataFrame({
+        'side': np.zeros(n, dtype=np.int8),
+        'price': np.full(n, np.nan),
+        'stop_loss': np.full(n, np.nan),
+        'take_profit': np.full(n, np.nan),
+        'confidence': np.full(n, np.nan),
+    }, index=index)
+
+
+def signal_frame(
+    index: pd.Index,
+    side: np.ndarray,
+    price: Any,
+    stop_loss: Any,
+    take_profit: Any,
+    confidence: Any
+) -> pd.DataFrame:
+    """
+    Build a signal frame, blanking the level columns of rows without a signal.
+
+    Args:
+        index: Bar index
+        side: Per-bar side codes (1, -1 or 0)
+        price, stop_loss, take_profit, confidence: Per-bar values (arrays or scalars)
+    """
+    side = np.asarray(side, dtype=np.int8)
+    active = side != SIDE_NONE
+    n = len(index)
+
+    def values(v):
+        arr = np.broadcast_to(np.asarray(v, dtype=float), (n,))
+        return np.where(active, arr, np.nan)
+
+    return pd.DataFrame({
+        'side': side,
+        'price': values(price),
+        'stop_loss': values(stop_loss),
+        'take_profit': values(take_profit),
+        'confidence': np.clip(values(confidence), 0.0, 1.0),
+    }, index=index)
+
+
+def column(df: pd.DataFrame, name: str, default: Any = np.nan) -> np.ndarray:
+    """Column as a float array, or `default` broadcast (mirrors bar.get(name, default))."""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=float)
+    return np.broadcast_to(np.asarray(default, dtype=float), (len(df),)).copy()
+
+
+def previous(values: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """Values shifted one bar forward (the value on_bar() kept from the prior call)."""
+    out = np.empty(len(values), dtype=float)
+    if len(values):
+        out[0] = fill
+        out[1:] = values[:-1]
+    return out
+
+
+def builtin_max(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise max(a, b) with Python's NaN behaviour (a unless b > a)."""
+    return np.where(b > a, b, a)
+
+
+def builtin_min(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise min(a, b) with Python's NaN behaviour (a unless b < a)."""
+    return np.where(b < a, b, a)
+
+
+def valid_levels(side: int, price: np.ndarray, stop_loss: np.ndarray, take_profit: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Strategy.validate_signal() level checks for one side.
+
+    Zero levels are skipped (falsy in the scalar check); NaN levels pass.
+    """
+    with np.errstate(invalid='ignore'):
+        priced = price != 0
+        if side == SIDE_LONG:
+            bad_sl = (stop_loss != 0) & priced & (stop_loss >= price)
+            bad_tp = (take_profit != 0) & priced & (take_profit <= price)
+        else:
+            bad_sl = (stop_loss != 0) & priced & (stop_loss <= price)
+            bad_tp = (take_profit != 0) & priced & (take_profit >= price)
+    return ~(bad_sl | bad_tp)
+
+
+def replay_signals(strategy: Strategy, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Signal frame produced by calling strategy.on_bar() on every row.
+
+    This advances the strategy's state; pass a fresh instance (or a copy)
+    to compare against generate_signals().
+    """
+    n = len(df)
+    side = np.zeros(n, dtype=np.int8)
+    price = np.full(n, np.nan)
+    stop_loss = np.full(n, np.nan)
+    take_profit = np.full(n, np.nan)
+    confidence = np.full(n, np.nan)
+    for i, (_, bar) in enumerate(df.iterrows()):
+        signal = strategy.on_bar(bar)
+        if signal is None or signal.side not in (SignalType.LONG, SignalType.SHORT):
+            continue
+        side[i] = SIDE_LONG if signal.side == SignalType.LONG else SIDE_SHORT
+        price[i] = np.nan if signal.price is None else signal.price
+        stop_loss[i] = np.nan if signal.stop_loss is None else signal.stop_loss
+        take_profit[i] = np.nan if signal.take_profit is None else signal.take_profit
+        confidence[i] = signal.confidence
+    return signal_frame(df.index, side, price, stop_loss, take_profit, confidence)
+
+
+def compare_signal_frames(expected: pd.DataFrame, actual: pd.DataFrame,
+                          rtol: float = 1e-9, atol: float = 1e-12) -> List[str]:
+    """
+    Differences between two signal frames (empty list if equivalent).
+
+    Sides must match exactly; levels within tolerance, NaN equal to NaN.
+    """
+    problems: List[str] = []
+    if len(expected) != len(actual) or not expected.index.equals(actual.index):
+        return [f"index mismatch: {len(expected)} vs {len(actual)} rows"]
+    side_diff = np.flatnonzero(expected['side'].to_numpy() != actual['side'].to_numpy())
+    for i in side_diff[:20]:
+        problems.append(f"{expected.index[i]}: side {expected['side'].iat[i]} != {actual['side'].iat[i]}")
+    for col in SIGNAL_COLUMNS[1:]:
+        a = expected[col].to_numpy(dtype=float)
+        b = actual[col].to_numpy(dtype=float)
+        close = np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+        for i in np.flatnonzero(~close)[:20]:
+            if i not in side_diff:
+                problems.append(f"{expected.index[i]}: {col} {a[i]!r} != {b[i]!r}")
+    return problems
+
+
+def check_equivalence(factory: Callable[[], Strategy], df: pd.DataFrame,
+                      rtol: float = 1e-9) -> List[str]:
+    """
+    Compare generate_signals() with the on_bar() replay on fresh instances.
+
+    Args:
+        factory: Returns a new, unused strategy instance
+        df: Bars with the indicator columns the strategy reads
+
+    Returns:
+        List of differences (empty if equivalent)
+    """
+    batch = factory().generate_signals(df)
+    if batch is None:
+        return ["strategy has no batch implementation"]
+    return compare_signal_frames(replay_signals(factory(), df), batch, rtol=rtol)
+
+
+def frame_to_signals(strategy: Strategy, frame: pd.DataFrame, symbol: Optional[str] = None) -> List[tuple]:
+    """
+    Signal objects for the rows of a signal frame that carry a signal.
+
+    Returns:
+        List of (row position, Signal)
+    """
+    rows = np.flatnonzero(frame['side'].to_numpy() != SIDE_NONE)
+    if not len(rows):
+        return []
+    symbol = symbol or strategy.config.get('params', {}).get('symbol') or 'UNKNOWN'
+    timeframe = strategy.config.get('timeframe', '1H')
+    side = frame['side'].to_numpy()
+    columns = {col: frame[col].to_numpy(dtype=float) for col in SIGNAL_COLUMNS[1:]}
+    signals = []
+    for i in rows:
+        long = side[i] == SIDE_LONG
+        signals.append((int(i), Signal(
+            id=f"{strategy.name}_batch_{i}",
+            timestamp=frame.index[i],
+            symbol=symbol,
+            timeframe=timeframe,
+            side=SignalType.LONG if long else SignalType.SHORT,
+            action='BUY' if long else 'SELL',
+            price=float(columns['price'][i]),
+            stop_loss=float(columns['stop_loss'][i]),
+            take_profit=float(columns['take_profit'][i]),
+            confidence=float(columns['confidence'][i]),
+            reason=f"{strategy.name} (batch)",
+            metadata={'strategy': strategy.name},
+        )))
+    return signals
@@ -5,11 +5,15 @@ High-speed crossover strategy using EMA for faster reaction to price changes.
 Optimized for day trading with quicker signals than SMA.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, previous, valid_levels, signal_frame, empty_signal_frame
+)
 
 
 class EmaCrossover(Strategy):
@@ -176,6 +180,78 @@ class EmaCrossover(Strategy):
                 
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+        
+        Crossover and continuation setups are found with column operations;
+        the continuation cooldown is then applied in one pass over the
+        candidate bars only.
+        
+        Args:
+            df: Bars with ema_{fast}, ema_{slow} and atr columns
+            
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        ema_fast_col = f'ema_{self.fast_period}'
+        ema_slow_col = f'ema_{self.slow_period}'
+        if not {ema_fast_col, ema_slow_col, 'atr'} <= set(df.columns):
+            return empty_signal_frame(df.index)
+            
+        n = len(df)
+        ema_fast = column(df, ema_fast_col)
+        ema_slow = column(df, ema_slow_col)
+        prev_fast = previous(ema_fast)
+        prev_slow = previous(ema_slow)
+        atr = column(df, 'atr')
+        close = column(df, 'close')
+        low = column(df, 'low', close)
+        high = column(df, 'high', close)
+        
+        long_sl = close - (atr * self.atr_multiplier)
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = close + (atr * self.atr_multiplier)
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+        valid_long = valid_levels(SIDE_LONG, close, long_sl, long_tp)
+        valid_short = valid_levels(SIDE_SHORT, close, short_sl, short_tp)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bullish = (prev_fast <= prev_slow) & (ema_fast > ema_slow)
+            bearish = ~bullish & (prev_fast >= prev_slow) & (ema_fast < ema_slow)
+            separation_pct = np.where(ema_slow > 0, np.abs(ema_fast - ema_slow) / ema_slow, 0) * 100
+            uptrend = ema_fast > ema_slow
+            downtrend = ema_fast < ema_slow
+            pullback_long = uptrend & (low <= ema_fast * 1.002) & (close > ema_slow) & (close > ema_fast)
+            pullback_short = ~uptrend & downtrend & (high >= ema_fast * 0.998) & \
+                (close < ema_slow) & (close < ema_fast)
+                
+        cross_long = bullish & valid_long
+        cross_short = bearish & valid_short
+        continuation = (np.arange(n) >= 1) & ~cross_long & ~cross_short & (separation_pct > 0.1) & \
+            ((pullback_long & valid_long) | (pullback_short & valid_short))
+            
+        side = np.zeros(n, dtype=np.int8)
+        confidence = np.full(n, np.nan)
+        last, cooldown = 0, 0
+        for i in np.flatnonzero(cross_long | cross_short | continuation):
+            if cross_long[i] or cross_short[i]:
+                side[i] = SIDE_LONG if cross_long[i] else SIDE_SHORT
+                confidence[i] = 0.75
+                last, cooldown = i, 5
+            elif i - last >= cooldown:
+                side[i] = SIDE_LONG if pullback_long[i] else SIDE_SHORT
+                confidence[i] = 0.65  # continuation: confidence_adj=-0.1 as in on_bar()
+                last, cooldown = i, 8
+                
+        is_long = side == SIDE_LONG
+        return signal_frame(
+            df.index, side, close,
+            np.where(is_long, long_sl, short_sl),
+            np.where(is_long, long_tp, short_tp),
+            confidence
+        )
+        
     def _create_long_signal(self, price: float, atr: float, bar: pd.Series, 
                              reason_type: str = "crossover", confidence_adj: float = 0.0) -> Signal:
         """Create LONG signal with calculated SL/TP."""
@@ -5,11 +5,15 @@ Capitalizes on price deviations from moving averages, expecting reversion to mea
 Works well in ranging markets and corrections within trends.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, builtin_min, builtin_max, signal_frame, empty_signal_frame
+)
 
 
 class MeanReversionStrategy(Strategy):
@@ -163,5 +167,50 @@ class MeanReversionStrategy(Strategy):
 
         return None
 
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+
+        Args:
+            df: Bars with Bollinger Band, RSI and atr columns
+
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        bb_upper_col = f'bb_upper_{self.ma_period}_{self.bb_std}'
+        bb_lower_col = f'bb_lower_{self.ma_period}_{self.bb_std}'
+        bb_middle_col = f'bb_middle_{self.ma_period}'
+        rsi_col = f'rsi_{self.rsi_period}' if f'rsi_{self.rsi_period}' in df.columns else 'rsi'
+        if not {'close', 'high', 'low', 'atr', bb_upper_col, bb_lower_col, rsi_col} <= set(df.columns):
+            return empty_signal_frame(df.index)
+
+        close = column(df, 'close')
+        high = column(df, 'high')
+        low = column(df, 'low')
+        rsi = column(df, rsi_col)
+        atr = column(df, 'atr')
+        bb_upper = column(df, bb_upper_col)
+        bb_lower = column(df, bb_lower_col)
+        bb_middle = column(df, bb_middle_col, (bb_upper + bb_lower) / 2)
+
+        long_sl = builtin_min(low, bb_lower - atr * 0.5)
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = builtin_max(high, bb_upper + atr * 0.5)
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+
+        with np.errstate(invalid='ignore'):
+            bullish = (close <= bb_lower * 1.005) & (rsi <= self.rsi_oversold) & \
+                (low < bb_lower) & (close > low + (high - low) * 0.6)
+            upper_zone = bb_middle + ((bb_upper - bb_lower) * 0.4)
+            bearish = ~bullish & (close >= upper_zone) & (rsi >= self.rsi_overbought)
+
+        side = np.where(bullish, SIDE_LONG, np.where(bearish, SIDE_SHORT, 0))
+        return signal_frame(
+            df.index, side, close,
+            np.where(bullish, long_sl, short_sl),
+            np.where(bullish, long_tp, short_tp),
+            0.75
+        )
+
 
 
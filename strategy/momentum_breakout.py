@@ -11,6 +11,10 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, builtin_min, builtin_max, valid_levels,
+    signal_frame, empty_signal_frame
+)
 
 
 class MomentumBreakout(Strategy):
@@ -120,6 +124,51 @@ class MomentumBreakout(Strategy):
                 
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+        
+        Args:
+            df: Bars with rsi, atr, volume and high_/low_{lookback} columns
+            
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        high_col = f'high_{self.lookback_period}'
+        low_col = f'low_{self.lookback_period}'
+        if not {'rsi', 'atr', 'volume', high_col, low_col} <= set(df.columns):
+            return empty_signal_frame(df.index)
+            
+        close = column(df, 'close')
+        high = column(df, 'high')
+        low = column(df, 'low')
+        rsi = column(df, 'rsi')
+        atr = column(df, 'atr')
+        volume = column(df, 'volume')
+        recent_high = column(df, high_col)
+        recent_low = column(df, low_col)
+        avg_volume = column(df, f'volume_avg_{self.lookback_period}', volume)
+        
+        long_sl = builtin_max(recent_low - (atr * 0.5), close - (atr * self.atr_multiplier))
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = builtin_min(recent_high + (atr * 0.5), close + (atr * self.atr_multiplier))
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+        
+        with np.errstate(invalid='ignore'):
+            volume_spike = volume > avg_volume * self.volume_multiplier
+            bullish = (high > recent_high) & (rsi > self.rsi_threshold) & volume_spike
+            bearish = ~bullish & (low < recent_low) & (rsi < (100 - self.rsi_threshold)) & volume_spike
+        long_ok = bullish & valid_levels(SIDE_LONG, close, long_sl, long_tp)
+        short_ok = bearish & valid_levels(SIDE_SHORT, close, short_sl, short_tp)
+        
+        side = np.where(long_ok, SIDE_LONG, np.where(short_ok, SIDE_SHORT, 0))
+        return signal_frame(
+            df.index, side, close,
+            np.where(long_ok, long_sl, short_sl),
+            np.where(long_ok, long_tp, short_tp),
+            0.80
+        )
+        
     def _create_long_signal(self, price: float, atr: float, bar: pd.Series) -> Signal:
         """Create LONG signal for bullish breakout."""
         # Stop below recent low or ATR-based
@@ -6,11 +6,15 @@ Designed for volatile markets where price oscillates rapidly.
 Does NOT require crossover events - trades immediately on extreme RSI levels.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, previous, valid_levels, signal_frame, empty_signal_frame
+)
 
 
 class RsiReversalStrategy(Strategy):
@@ -123,6 +127,57 @@ class RsiReversalStrategy(Strategy):
                 
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+        
+        Reversal setups are found with column operations; the cooldown is
+        then applied in one pass over the candidate bars only.
+        
+        Args:
+            df: Bars with rsi (or rsi_{period}) and atr columns
+            
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        rsi_col = f'rsi_{self.rsi_period}' if f'rsi_{self.rsi_period}' in df.columns else 'rsi'
+        if rsi_col not in df.columns or 'atr' not in df.columns:
+            return empty_signal_frame(df.index)
+            
+        n = len(df)
+        rsi = column(df, rsi_col)
+        prev_rsi = previous(rsi)
+        atr = column(df, 'atr')
+        close = column(df, 'close')
+        
+        long_sl = close - (atr * self.atr_multiplier)
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = close + (atr * self.atr_multiplier)
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+        
+        with np.errstate(invalid='ignore'):
+            oversold_turn = (prev_rsi <= self.rsi_extreme_oversold) & (rsi > prev_rsi) & (rsi < 50)
+            overbought_turn = ~oversold_turn & (prev_rsi >= self.rsi_extreme_overbought) & \
+                (rsi < prev_rsi) & (rsi > 50)
+        long_ok = oversold_turn & valid_levels(SIDE_LONG, close, long_sl, long_tp)
+        short_ok = overbought_turn & valid_levels(SIDE_SHORT, close, short_sl, short_tp)
+        
+        # bars_since_signal starts at 0 and is incremented before the cooldown check
+        side = np.zeros(n, dtype=np.int8)
+        last = -1
+        for i in np.flatnonzero(long_ok | short_ok):
+            if i - last >= self.cooldown_bars:
+                side[i] = SIDE_LONG if long_ok[i] else SIDE_SHORT
+                last = i
+                
+        is_long = side == SIDE_LONG
+        return signal_frame(
+            df.index, side, close,
+            np.where(is_long, long_sl, short_sl),
+            np.where(is_long, long_tp, short_tp),
+            0.75
+        )
+        
     def _create_long_signal(self, price: float, atr: float, rsi: float, bar: pd.Series) -> Signal:
         """Create LONG signal for RSI oversold reversal."""
         stop_loss = price - (atr * self.atr_multiplier)
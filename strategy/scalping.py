@@ -5,11 +5,15 @@ Ultra-fast strategy optimized for M1/M5 timeframes with quick entries and exits.
 Uses tight stops and quick profit targets for high-frequency trading.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, valid_levels, signal_frame, empty_signal_frame
+)
 
 
 class ScalpingStrategy(Strategy):
@@ -199,6 +203,86 @@ class ScalpingStrategy(Strategy):
                  
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+        
+        on_bar() only remembers EMA values of bars that pass the NaN and
+        spread filters, so crossovers are measured between consecutive
+        eligible bars. The "no consecutive overbought shorts" rule is
+        applied in one pass over the candidate bars only.
+        
+        Args:
+            df: Bars with ema_{fast}, ema_{slow}, rsi and atr columns
+                (optional spread / pip_value columns)
+            
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        ema_fast_col = f'ema_{self.fast_ema}'
+        ema_slow_col = f'ema_{self.slow_ema}'
+        rsi_col = f'rsi_{self.rsi_period}' if f'rsi_{self.rsi_period}' in df.columns else 'rsi'
+        if not {ema_fast_col, ema_slow_col, rsi_col, 'atr'} <= set(df.columns):
+            return empty_signal_frame(df.index)
+            
+        n = len(df)
+        ema_fast = column(df, ema_fast_col)
+        ema_slow = column(df, ema_slow_col)
+        rsi = column(df, rsi_col)
+        atr = column(df, 'atr')
+        close = column(df, 'close')
+        spread = column(df, 'spread', 0)
+        pip_value = column(df, 'pip_value', 0.0001)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spread_pips = np.where(pip_value > 0, spread / pip_value, 0)
+            eligible = ~np.isnan(np.stack([ema_fast, ema_slow, rsi, atr, close])).any(axis=0) & \
+                ~(spread_pips > self.spread_limit_pips)
+                
+        # Previous EMA values are those of the previous eligible bar
+        rows = np.flatnonzero(eligible)
+        has_prev = np.zeros(n, dtype=bool)
+        prev_fast = np.full(n, np.nan)
+        prev_slow = np.full(n, np.nan)
+        has_prev[rows[1:]] = True
+        prev_fast[rows[1:]] = ema_fast[rows[:-1]]
+        prev_slow[rows[1:]] = ema_slow[rows[:-1]]
+        
+        long_sl = close - (atr * self.atr_multiplier)
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = close + (atr * self.atr_multiplier)
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+        valid_long = valid_levels(SIDE_LONG, close, long_sl, long_tp)
+        valid_short = valid_levels(SIDE_SHORT, close, short_sl, short_tp)
+        
+        with np.errstate(invalid='ignore'):
+            bullish = has_prev & (prev_fast <= prev_slow) & (ema_fast > ema_slow) & \
+                (rsi > self.rsi_oversold) & (rsi < self.rsi_long_max)
+            bearish = has_prev & ~bullish & (prev_fast >= prev_slow) & (ema_fast < ema_slow) & \
+                (rsi < self.rsi_overbought) & (rsi > self.rsi_short_min)
+            overbought = has_prev & ~bullish & ~bearish & (rsi >= self.rsi_overbought) & \
+                (ema_fast < ema_slow * 1.002)
+                
+        long_ok = bullish & valid_long
+        short_ok = bearish & valid_short
+        overbought_ok = overbought & valid_short
+        
+        side = np.zeros(n, dtype=np.int8)
+        last = None
+        for i in np.flatnonzero(long_ok | short_ok | overbought_ok):
+            if long_ok[i]:
+                side[i] = last = SIDE_LONG
+            elif short_ok[i] or last != SIDE_SHORT:
+                side[i] = last = SIDE_SHORT
+                
+        is_long = side == SIDE_LONG
+        return signal_frame(
+            df.index, side, close,
+            np.where(is_long, long_sl, short_sl),
+            np.where(is_long, long_tp, short_tp),
+            0.85
+        )
+        
     def _create_long_signal(self, price: float, atr: float, bar: pd.Series) -> Signal:
         """Create LONG scalp signal."""
         # Very tight stop for scalping
@@ -5,12 +5,16 @@ Implementation of SMA crossover strategy.
 Entry on crossovers, exit on opposite signals or stop loss/take profit.
 """
 
+import numpy as np
 import pandas as pd
 from cthulu.connector.mt5_connector import mt5
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, previous, valid_levels, signal_frame, empty_signal_frame
+)
 
 
 class SmaCrossover(Strategy):
@@ -112,6 +116,47 @@ class SmaCrossover(Strategy):
                 
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+        
+        Args:
+            df: Bars with sma_{short}, sma_{long} and atr columns
+            
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        sma_short_col = f'sma_{self.short_window}'
+        sma_long_col = f'sma_{self.long_window}'
+        if not {sma_short_col, sma_long_col, 'atr'} <= set(df.columns):
+            return empty_signal_frame(df.index)
+            
+        sma_short = column(df, sma_short_col)
+        sma_long = column(df, sma_long_col)
+        prev_short = previous(sma_short)
+        prev_long = previous(sma_long)
+        close = column(df, 'close')
+        atr = column(df, 'atr')
+        
+        long_sl = close - (atr * self.atr_multiplier)
+        long_tp = close + ((close - long_sl) * self.risk_reward_ratio)
+        short_sl = close + (atr * self.atr_multiplier)
+        short_tp = close - ((short_sl - close) * self.risk_reward_ratio)
+        
+        with np.errstate(invalid='ignore'):
+            bullish = (prev_short <= prev_long) & (sma_short > sma_long)
+            bearish = ~bullish & (prev_short >= prev_long) & (sma_short < sma_long)
+        long_ok = bullish & valid_levels(SIDE_LONG, close, long_sl, long_tp)
+        short_ok = bearish & valid_levels(SIDE_SHORT, close, short_sl, short_tp)
+        
+        side = np.where(long_ok, SIDE_LONG, np.where(short_ok, SIDE_SHORT, 0))
+        return signal_frame(
+            df.index, side, close,
+            np.where(long_ok, long_sl, short_sl),
+            np.where(long_ok, long_tp, short_tp),
+            0.7
+        )
+        
     def _create_long_signal(self, price: float, atr: float, bar: pd.Series) -> Signal:
         """Create LONG signal with calculated SL/TP."""
         # Calculate stop loss
@@ -29,6 +29,109 @@ class MarketRegime:
     REVERSAL = "reversal"
 
 
+def regime_inputs(data: pd.DataFrame, returns: Optional[float] = None,
+                  volatility: Optional[float] = None) -> Dict[str, float]:
+    """
+    Latest-bar values the regime decision is made on.
+
+    Args:
+        data: DataFrame with OHLCV and indicators
+        returns: Precomputed 20-bar return (computed from data['close'] when omitted)
+        volatility: Precomputed 20-bar std of 1-bar returns (likewise)
+
+    Returns:
+        Dict of adx, rsi, macd, macd_signal, bb_upper, bb_lower, close,
+        returns, volatility and bb_width (NaN coerced to neutral defaults)
+    """
+    last = data.iloc[-1]
+
+    def value(name, default):
+        v = last[name] if name in data.columns else None
+        return v if v is not None and pd.notna(v) else default
+
+    # Get latest values (coerce to safe numeric defaults when missing)
+    adx = value('adx', 0.0)
+    rsi = value('rsi', 50.0)
+    macd = value('macd', 0.0)
+    macd_signal = value('macd_signal', 0.0)
+    bb_upper = value('bb_upper', last['high'])
+    bb_lower = value('bb_lower', last['low'])
+    close = last['close']
+
+    # Calculate additional metrics (guard against NaN)
+    if returns is None:
+        returns = data['close'].pct_change(20).iloc[-1]
+    returns = returns if pd.notna(returns) else 0.0
+    if volatility is None:
+        volatility = data['close'].pct_change().rolling(20).std().iloc[-1]
+    volatility = volatility if pd.notna(volatility) else 0.0
+    bb_width = (bb_upper - bb_lower) / close if pd.notna(close) and (bb_upper - bb_lower) != 0 else 0.0  # Normalized BB width
+
+    return {
+        'adx': adx, 'rsi': rsi, 'macd': macd, 'macd_signal': macd_signal,
+        'bb_upper': bb_upper, 'bb_lower': bb_lower, 'close': close,
+        'returns': returns, 'volatility': volatility, 'bb_width': bb_width,
+    }
+
+
+def classify_market_regime(inputs: Dict[str, float]) -> str:
+    """
+    Regime decision tree over regime_inputs().
+
+    Returns:
+        MarketRegime constant
+    """
+    adx = inputs['adx']
+    rsi = inputs['rsi']
+    returns = inputs['returns']
+    volatility = inputs['volatility']
+    bb_width = inputs['bb_width']
+
+    # Trend strength indicators
+    trend_strength = adx if adx else abs(returns) * 100
+
+    # MACD momentum
+    macd_histogram = inputs['macd'] - inputs['macd_signal']
+    macd_trend = 1 if macd_histogram > 0 else -1
+
+    # Regime classification logic
+    regime = MarketRegime.RANGING_TIGHT  # Default
+
+    # Strong trending regimes
+    if trend_strength > 30:
+        if returns > 0.005:  # Strong uptrend
+            regime = MarketRegime.TRENDING_UP_STRONG
+        elif returns < -0.005:  # Strong downtrend
+            regime = MarketRegime.TRENDING_DOWN_STRONG
+        elif returns > 0.002:  # Weak uptrend
+            regime = MarketRegime.TRENDING_UP_WEAK
+        elif returns < -0.002:  # Weak downtrend
+            regime = MarketRegime.TRENDING_DOWN_WEAK
+
+    # Volatile regimes
+    elif volatility > 0.015:  # High volatility
+        if bb_width > 0.03:  # Wide bands = potential breakout
+            regime = MarketRegime.VOLATILE_BREAKOUT
+        else:  # Tight bands = consolidation before move
+            regime = MarketRegime.VOLATILE_CONSOLIDATION
+
+    # Ranging regimes
+    elif bb_width < 0.015:  # Tight range
+        regime = MarketRegime.RANGING_TIGHT
+    elif bb_width > 0.025:  # Wide range
+        regime = MarketRegime.RANGING_WIDE
+
+    # Consolidation (low volatility, medium trend)
+    elif trend_strength < 20 and volatility < 0.01:
+        regime = MarketRegime.CONSOLIDATING
+
+    # Reversal signals (RSI extreme + MACD divergence)
+    elif ((rsi > 70 and macd_trend < 0) or (rsi < 30 and macd_trend > 0)):
+        regime = MarketRegime.REVERSAL
+
+    return regime
+
+
 class StrategyPerformance:
     """Track strategy performance metrics."""
     
@@ -91,6 +194,30 @@ class StrategyPerformance:
         recent_total = len(self.recent_signals)
         
         return recent_wins / recent_total if recent_total > 0 else 0.5
+        
+    def get_warm_state(self) -> Dict[str, Any]:
+        """Counters and rolling windows for warm-restart snapshots."""
+        return {
+            'signals_count': self.signals_count,
+            'wins': self.wins,
+            'losses': self.losses,
+            'total_profit': self.total_profit,
+            'total_loss': self.total_loss,
+            'recent_signals': list(self.recent_signals),
+            'confidence_scores': list(self.confidence_scores),
+            'last_signal_time': self.last_signal_time
+        }
+        
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """Restore counters and rolling windows from a snapshot."""
+        self.signals_count = state.get('signals_count', 0)
+        self.wins = state.get('wins', 0)
+        self.losses = state.get('losses', 0)
+        self.total_profit = state.get('total_profit', 0.0)
+        self.total_loss = state.get('total_loss', 0.0)
+        self.recent_signals = deque(state.get('recent_signals', []), maxlen=self.window_size)
+        self.confidence_scores = deque(state.get('confidence_scores', []), maxlen=self.window_size)
+        self.last_signal_time = state.get('last_signal_time')
 
 
 class StrategySelector:
@@ -237,71 +364,22 @@ class StrategySelector:
             if len(data) < 50:
                 self.logger.warning("Insufficient data for regime detection (need 50 bars)")
                 return MarketRegime.RANGING_TIGHT
-                
-            # Get latest values (coerce to safe numeric defaults when missing)
-            adx = data['adx'].iloc[-1] if 'adx' in data.columns and pd.notna(data['adx'].iloc[-1]) else 0.0
-            rsi = data['rsi'].iloc[-1] if 'rsi' in data.columns and pd.notna(data['rsi'].iloc[-1]) else 50.0
-            macd = data['macd'].iloc[-1] if 'macd' in data.columns and pd.notna(data['macd'].iloc[-1]) else 0.0
-            macd_signal = data['macd_signal'].iloc[-1] if 'macd_signal' in data.columns and pd.notna(data['macd_signal'].iloc[-1]) else 0.0
-            bb_upper = data['bb_upper'].iloc[-1] if 'bb_upper' in data.columns and pd.notna(data['bb_upper'].iloc[-1]) else data['high'].iloc[-1]
-            bb_lower = data['bb_lower'].iloc[-1] if 'bb_lower' in data.columns and pd.notna(data['bb_lower'].iloc[-1]) else data['low'].iloc[-1]
-            
-            # Calculate additional metrics (guard against NaN)
-            returns = data['close'].pct_change(20).iloc[-1]
-            returns = returns if pd.notna(returns) else 0.0
-            volatility = data['close'].pct_change().rolling(20).std().iloc[-1]
-            volatility = volatility if pd.notna(volatility) else 0.0
-            bb_width = (bb_upper - bb_lower) / data['close'].iloc[-1] if pd.notna(data['close'].iloc[-1]) and (bb_upper - bb_lower) != 0 else 0.0  # Normalized BB width
-            
-            # Trend strength indicators
-            trend_strength = adx if adx else abs(returns) * 100
-            
-            # MACD momentum
-            macd_histogram = macd - macd_signal
-            macd_trend = 1 if macd_histogram > 0 else -1
-            
-            # Price position in BB
-            price_pos = (data['close'].iloc[-1] - bb_lower) / (bb_upper - bb_lower) if bb_upper != bb_lower else 0.5
             
-            # Regime classification logic
-            regime = MarketRegime.RANGING_TIGHT  # Default
+            # Reuse the regime the trading loop already published for this bar
+            from cthulu.cognition.regime_service import get_regime_service
+            snapshot = get_regime_service().lookup(data)
+            if snapshot is not None:
+                self.logger.debug(f"Market regime: {snapshot.selector_regime} (shared, bar {snapshot.bar_time})")
+                return snapshot.selector_regime
             
-            # Strong trending regimes
-            if trend_strength > 30:
-                if returns > 0.005:  # Strong uptrend
-                    regime = MarketRegime.TRENDING_UP_STRONG
-                elif returns < -0.005:  # Strong downtrend
-                    regime = MarketRegime.TRENDING_DOWN_STRONG
-                elif returns > 0.002:  # Weak uptrend
-                    regime = MarketRegime.TRENDING_UP_WEAK
-                elif returns < -0.002:  # Weak downtrend
-                    regime = MarketRegime.TRENDING_DOWN_WEAK
-            
-            # Volatile regimes
-            elif volatility > 0.015:  # High volatility
-                if bb_width > 0.03:  # Wide bands = potential breakout
-                    regime = MarketRegime.VOLATILE_BREAKOUT
-                else:  # Tight bands = consolidation before move
-                    regime = MarketRegime.VOLATILE_CONSOLIDATION
-            
-            # Ranging regimes
-            elif bb_width < 0.015:  # Tight range
-                regime = MarketRegime.RANGING_TIGHT
-            elif bb_width > 0.025:  # Wide range
-                regime = MarketRegime.RANGING_WIDE
-            
-            # Consolidation (low volatility, medium trend)
-            elif trend_strength < 20 and volatility < 0.01:
-                regime = MarketRegime.CONSOLIDATING
-            
-            # Reversal signals (RSI extreme + MACD divergence)
-            elif ((rsi > 70 and macd_trend < 0) or (rsi < 30 and macd_trend > 0)):
-                regime = MarketRegime.REVERSAL
+            inputs = regime_inputs(data)
+            regime = classify_market_regime(inputs)
             
             # Log regime with details
             self.logger.info(
                 f"Market regime: {regime} "
-                f"(ADX={adx:.1f}, RSI={rsi:.1f}, Returns={returns:.3f}, Vol={volatility:.3f}, BB={bb_width:.3f})"
+                f"(ADX={inputs['adx']:.1f}, RSI={inputs['rsi']:.1f}, Returns={inputs['returns']:.3f}, "
+                f"Vol={inputs['volatility']:.3f}, BB={inputs['bb_width']:.3f})"
             )
             
             return regime
@@ -541,6 +619,40 @@ class StrategySelector:
                 f"${pnl:.2f} (WinRate={self.performance[strategy_name].win_rate:.2%})"
             )
             
+    def get_warm_state(self) -> Dict[str, Any]:
+        """
+        Capture performance windows and regime state for warm restarts.
+        
+        Returns:
+            Picklable state dictionary
+        """
+        return {
+            'performance': {name: perf.get_warm_state() for name, perf in self.performance.items()},
+            'current_strategy': self.current_strategy.name if self.current_strategy else None,
+            'current_regime': self.current_regime,
+            'regime_history': list(self.regime_history)
+        }
+        
+    def restore_warm_state(self, state: Dict[str, Any]):
+        """
+        Restore state captured by get_warm_state().
+        
+        Strategies that are no longer configured are ignored. The regime is
+        re-detected on the next bar since the check timer is not restored.
+        
+        Args:
+            state: State dictionary from a snapshot
+        """
+        for name, perf_state in state.get('performance', {}).items():
+            if name in self.performance:
+                self.performance[name].restore_warm_state(perf_state)
+        
+        current = state.get('current_strategy')
+        if current in self.strategies:
+            self.current_strategy = self.strategies[current]
+        self.current_regime = state.get('current_regime', self.current_regime)
+        self.regime_history = deque(state.get('regime_history', []), maxlen=self.regime_history.maxlen)
+            
     def get_performance_report(self) -> Dict[str, Any]:
         """Get detailed performance report for all strategies."""
         report = {
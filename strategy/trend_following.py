@@ -5,11 +5,15 @@ Follows established trends using ADX for trend strength confirmation.
 Uses moving averages and trend continuation patterns for entries.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 from cthulu.strategy.base import Strategy, Signal, SignalType
+from cthulu.strategy.batch import (
+    SIDE_LONG, SIDE_SHORT, column, previous, signal_frame, empty_signal_frame
+)
 
 
 class TrendFollowingStrategy(Strategy):
@@ -238,5 +242,70 @@ class TrendFollowingStrategy(Strategy):
 
         return None
 
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Batch equivalent of on_bar() over every row of df.
+
+        Setups are found with column operations; the 5-bar cooldown is then
+        applied in one pass over the candidate bars only.
+
+        Args:
+            df: Bars with ADX, fast/slow moving average and atr columns
+
+        Returns:
+            Signal frame (see strategy.batch)
+        """
+        columns = set(df.columns)
+        adx_col = next((c for c in (f'adx_{self.adx_period}', 'adx', f'adx_{14}') if c in columns), None)
+        fast_col = next((f'{p}_{self.fast_ma}' for p in ('ema', 'sma') if f'{p}_{self.fast_ma}' in columns), None)
+        slow_col = next((f'{p}_{self.slow_ma}' for p in ('ema', 'sma') if f'{p}_{self.slow_ma}' in columns), None)
+        if not {'close', 'high', 'low', 'atr'} <= columns or adx_col is None or fast_col is None or slow_col is None:
+            return empty_signal_frame(df.index)
+
+        n = len(df)
+        close = column(df, 'close')
+        high = column(df, 'high')
+        low = column(df, 'low')
+        atr = column(df, 'atr')
+        adx = column(df, adx_col)
+        fast_ma = column(df, fast_col)
+        slow_ma = column(df, slow_col)
+
+        with np.errstate(invalid='ignore'):
+            ma_trend = np.where(fast_ma > slow_ma, 1, -1)
+            trend = np.where(adx >= self.adx_threshold, ma_trend, 0)
+            prev_trend = previous(trend, fill=0)
+            strong = adx > 30
 
+            up = (trend == 1) & (close > fast_ma)
+            up_strong = strong & (close > fast_ma * 1.001)
+            up_pullback = (low <= fast_ma * 1.003) & (close > fast_ma)
+            up_new = (prev_trend != 1) & (ma_trend == 1)
+            long_ok = up & (up_strong | up_pullback | up_new)
+            long_conf = np.where(up_strong, 0.80, np.where(up_pullback, 0.75, 0.78))
 
+            down = (trend == -1) & (close < fast_ma)
+            down_strong = strong & (close < fast_ma * 0.999)
+            down_pullback = (high >= fast_ma * 0.997) & (close < fast_ma)
+            down_new = (prev_trend != -1) & (ma_trend == -1)
+            short_ok = down & (down_strong | down_pullback | down_new)
+            short_conf = np.where(down_strong, 0.80, np.where(down_pullback, 0.75, 0.78))
+
+        # A signal starts a 5-bar cooldown during which every bar returns None
+        side = np.zeros(n, dtype=np.int8)
+        last = -6
+        for i in np.flatnonzero(long_ok | short_ok):
+            if i - last > 5:
+                side[i] = SIDE_LONG if long_ok[i] else SIDE_SHORT
+                last = i
+
+        is_long = side == SIDE_LONG
+        long_sl = fast_ma - (atr * self.atr_multiplier)
+        short_sl = fast_ma + (atr * self.atr_multiplier)
+        return signal_frame(
+            df.index, side, close,
+            np.where(is_long, long_sl, short_sl),
+            np.where(is_long, close + ((close - long_sl) * self.risk_reward_ratio),
+                     close - ((short_sl - close) * self.risk_reward_ratio)),
+            np.where(is_long, long_conf, short_conf)
+        )
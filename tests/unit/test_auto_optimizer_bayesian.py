@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from cthulu.backtesting.surrogate import TPESampler, MedianPruner
+from cthulu.backtesting.auto_optimizer import AutoOptimizer, run_config_backtest, objective_score
+
+
+def _make_ohlcv(n=600, seed=7):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range('2025-01-01', periods=n, freq='15min')
+    trend = np.sin(np.linspace(0, 8 * np.pi, n)) * 4
+    price = 100 + trend + np.cumsum(rng.normal(0, 0.15, n))
+    return pd.DataFrame({
+        'open': price,
+        'high': price + 0.3,
+        'low': price - 0.3,
+        'close': price,
+        'volume': rng.integers(100, 1000, n),
+    }, index=idx)
+
+
+BASE_CONFIG = {
+    'strategy': {'type': 'ema_crossover', 'params': {'symbol': 'TEST', 'fast_period': 9, 'slow_period': 21}},
+    'backtest': {'initial_capital': 10000.0, 'position_size_pct': 0.1},
+}
+
+
+def test_tpe_beats_random_on_quadratic():
+    def f(p):
+        return -((p['x'] - 0.7) ** 2 + (p['y'] - 0.2) ** 2)
+
+    bounds = {'x': (0.0, 1.0), 'y': (0.0, 1.0)}
+    tpe = TPESampler(bounds, n_startup_trials=8, seed=1)
+    for i in range(40):
+        tpe.tell(i, f(tpe.ask(i)))
+
+    rng = np.random.default_rng(1)
+    random_best = max(f({'x': rng.uniform(), 'y': rng.uniform()}) for _ in range(40))
+
+    _, tpe_best = tpe.best()
+    assert tpe_best > random_best
+    assert tpe_best > -0.01
+
+
+def test_constant_liar_spreads_pending_trials():
+    sampler = TPESampler({'x': (0.0, 1.0)}, n_startup_trials=3, seed=3)
+    for i in range(6):
+        sampler.tell(i, -abs(sampler.ask(i)['x'] - 0.5))
+
+    pending = [sampler.ask(100 + i)['x'] for i in range(4)]
+    assert len(set(round(x, 6) for x in pending)) == 4
+
+
+def test_integer_bounds_sample_integers():
+    sampler = TPESampler({'period': (5, 30)}, n_startup_trials=2, seed=0)
+    for i in range(10):
+        value = sampler.ask(i)['period']
+        assert isinstance(value, int) and 5 <= value <= 30
+        sampler.tell(i, float(value))
+
+
+def test_median_pruner_thresholds():
+    pruner = MedianPruner(n_startup_trials=3)
+    assert pruner.thresholds(2) == [None, None]
+    for values in ([1.0, 2.0], [3.0, 4.0], [5.0]):
+        pruner.report(values)
+    assert pruner.thresholds(2) == [3.0, None]
+
+
+def test_run_config_backtest_prunes_below_threshold():
+    data = _make_ohlcv()
+    full = run_config_backtest(data, BASE_CONFIG, checkpoints=[200, 400])
+    assert not full['pruned']
+    assert full['bars_processed'] == len(data)
+    assert len(full['intermediate']) == 2
+
+    pruned = run_config_backtest(data, BASE_CONFIG, checkpoints=[200, 400], thresholds=[float('inf'), None])
+    assert pruned['pruned']
+    assert pruned['bars_processed'] == 200
+
+
+def test_objective_score_negates_drawdown():
+    assert objective_score({'max_drawdown': 0.1}, 'max_drawdown') == -0.1
+    assert objective_score({'max_drawdown': -0.1}, 'max_drawdown') == -0.1
+    assert objective_score({'sharpe_ratio': 1.5}, 'sharpe_ratio') == 1.5
+
+
+def test_optimize_bayesian_runs_real_backtests(tmp_path):
+    data = _make_ohlcv(400)
+    optimizer = AutoOptimizer(output_dir=str(tmp_path))
+    results = optimizer.optimize_bayesian(
+        data=data,
+        param_bounds={'strategy.params.fast_period': (5, 12), 'strategy.params.slow_period': (20, 40)},
+        base_config=BASE_CONFIG,
+        n_iterations=8,
+        n_initial_points=4,
+        n_workers=1,
+        seed=11,
+    )
+
+    assert len(results) == 8
+    assert all('total_trades' in r.metrics for r in results)
+    # Base config is not mutated by nested parameter updates
+    assert BASE_CONFIG['strategy']['params']['fast_period'] == 9
+    assert list(tmp_path.glob('optimization_bayesian_*.json'))
+
+
+def test_optimize_bayesian_process_pool(tmp_path):
+    data = _make_ohlcv(300)
+    optimizer = AutoOptimizer(output_dir=str(tmp_path))
+    results = optimizer.optimize_bayesian(
+        data=data,
+        param_bounds={'strategy.params.fast_period': (5, 12)},
+        base_config=BASE_CONFIG,
+        n_iterations=4,
+        n_initial_points=2,
+        n_workers=2,
+        seed=5,
+    )
+    assert sorted(r.iteration for r in results) == [0, 1, 2, 3]
@@ -0,0 +1,176 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cthulu.backtesting.job_queue import (
+    BacktestJobQueue,
+    ResultCache,
+    job_cache_key,
+    COMPLETED,
+    CANCELLED,
+)
+
+
+def _square(context, x):
+    context.report(1.0, 'done')
+    return {'value': x * x}
+
+
+def _wait_for_release(context, release):
+    while not release.is_set():
+        context.report(0.5, 'waiting')
+        time.sleep(0.01)
+    return {'ok': True}
+
+
+def _spin_until_cancelled(context):
+    for i in range(10_000):
+        context.report(i / 10_000.0, 'spinning')
+        time.sleep(0.005)
+    return {'finished': True}
+
+
+def _fail(context):
+    raise ValueError('boom')
+
+
+class Recorder:
+    def __init__(self):
+        self.started = []
+        self.completed = {}
+        self.errors = {}
+        self.cancelled = []
+        self.progress = []
+        self.done = threading.Event()
+
+    def kwargs(self):
+        return {
+            'on_start': self.started.append,
+            'on_progress': lambda job_id, p, msg, extra: self.progress.append((job_id, p)),
+            'on_complete': self._complete,
+            'on_error': self._error,
+            'on_cancel': self._cancel,
+        }
+
+    def _complete(self, job_id, result, from_cache):
+        self.completed[job_id] = (result, from_cache)
+        self.done.set()
+
+    def _error(self, job_id, error):
+        self.errors[job_id] = error
+        self.done.set()
+
+    def _cancel(self, job_id):
+        self.cancelled.append(job_id)
+        self.done.set()
+
+
+def _wait(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_cache_key_depends_on_data_and_config():
+    idx = pd.date_range('2025-01-01', periods=50, freq='h')
+    data = pd.DataFrame({'close': np.arange(50.0)}, index=idx)
+    key = job_cache_key(data, [{'type': 'ema_crossover'}], {'initial_capital': 10000})
+
+    assert key == job_cache_key(data.copy(), [{'type': 'ema_crossover'}], {'initial_capital': 10000})
+    assert key != job_cache_key(data.iloc[:40], [{'type': 'ema_crossover'}], {'initial_capital': 10000})
+    assert key != job_cache_key(data, [{'type': 'sma_crossover'}], {'initial_capital': 10000})
+    assert key != job_cache_key(data, [{'type': 'ema_crossover'}], {'initial_capital': 5000})
+
+
+def test_priority_order_and_bounded_concurrency():
+    rec = Recorder()
+    jobs = BacktestJobQueue(max_workers=1, use_processes=False, **rec.kwargs())
+    release = threading.Event()
+    try:
+        jobs.submit('blocker', _wait_for_release, release)
+        assert _wait(lambda: jobs.running_jobs() == ['blocker'])
+
+        jobs.submit('low', _square, 1, priority=0)
+        jobs.submit('high', _square, 2, priority=10)
+        jobs.submit('mid', _square, 3, priority=5)
+        assert jobs.queued_jobs() == ['high', 'mid', 'low']
+        assert len(jobs.running_jobs()) == 1
+
+        release.set()
+        assert _wait(lambda: len(rec.completed) == 4)
+        assert rec.started == ['blocker', 'high', 'mid', 'low']
+    finally:
+        jobs.shutdown()
+
+
+def test_cancel_queued_and_running_jobs():
+    rec = Recorder()
+    jobs = BacktestJobQueue(max_workers=1, use_processes=False, progress_interval=0.0, **rec.kwargs())
+    try:
+        jobs.submit('running', _spin_until_cancelled)
+        jobs.submit('queued', _square, 4)
+        assert _wait(lambda: jobs.running_jobs() == ['running'])
+
+        assert jobs.cancel('queued')
+        assert jobs.status('queued') == CANCELLED
+        assert jobs.cancel('running')
+        assert _wait(lambda: 'running' in rec.cancelled)
+        assert jobs.status('running') == CANCELLED
+        assert 'queued' not in rec.started
+        assert not jobs.cancel('running')
+    finally:
+        jobs.shutdown()
+
+
+def test_result_cache_serves_resubmission(tmp_path):
+    rec = Recorder()
+    cache = ResultCache(str(tmp_path))
+    jobs = BacktestJobQueue(max_workers=2, result_cache=cache, use_processes=False, **rec.kwargs())
+    try:
+        assert not jobs.submit('first', _square, 5, cache_key='k1')
+        assert _wait(lambda: 'first' in rec.completed)
+        assert rec.completed['first'] == ({'value': 25}, False)
+
+        assert jobs.submit('again', _square, 5, cache_key='k1')
+        assert rec.completed['again'] == ({'value': 25}, True)
+        assert jobs.status('again') == COMPLETED
+        assert 'again' not in rec.started
+    finally:
+        jobs.shutdown()
+
+    # Persisted results survive a restart
+    assert ResultCache(str(tmp_path)).get('k1') == {'value': 25}
+
+
+def test_failed_job_reports_error():
+    rec = Recorder()
+    jobs = BacktestJobQueue(max_workers=1, use_processes=False, **rec.kwargs())
+    try:
+        jobs.submit('bad', _fail)
+        assert _wait(lambda: 'bad' in rec.errors)
+        assert 'boom' in rec.errors['bad']
+    finally:
+        jobs.shutdown()
+
+
+def test_process_pool_progress_and_cancellation():
+    rec = Recorder()
+    jobs = BacktestJobQueue(max_workers=2, progress_interval=0.05, **rec.kwargs())
+    try:
+        jobs.submit('square', _square, 7)
+        jobs.submit('spin', _spin_until_cancelled)
+        assert _wait(lambda: 'square' in rec.completed, timeout=30)
+        assert rec.completed['square'][0] == {'value': 49}
+
+        assert _wait(lambda: any(job_id == 'spin' for job_id, _ in rec.progress), timeout=30)
+        jobs.cancel('spin')
+        assert _wait(lambda: 'spin' in rec.cancelled, timeout=30)
+        # Worker-side throttling keeps updates well below one per report
+        assert sum(1 for job_id, _ in rec.progress if job_id == 'spin') < 100
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from cthulu.backtesting import ui_server
+from cthulu.backtesting.ui_server import BacktestJob, BacktestServer
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, job_id, fn, *args, priority=0, cache_key=None):
+        self.submitted.append((job_id, fn, args, cache_key))
+        return False
+
+    def cancel(self, job_id):
+        return True
+
+
+def _server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = BacktestServer(max_workers=1)
+    server.job_queue = _RecordingQueue()
+    return server, server.app.test_client()
+
+
+def test_submit_defers_data_loading_to_the_worker(tmp_path, monkeypatch):
+    server, client = _server(tmp_path, monkeypatch)
+    monkeypatch.setattr(ui_server, 'load_market_data', lambda source: (_ for _ in ()).throw(AssertionError('loaded')))
+    csv = tmp_path / 'bars.csv'
+    pd.DataFrame({'Date': pd.date_range('2031-03-01', periods=3, freq='h'), 'close': [1.0, 1.1, 1.2]}).to_csv(csv, index=False)
+
+    request = {'strategies': [{'type': 'sma_crossover'}], 'data_source': {'csv_path': str(csv)}}
+    assert client.post('/api/backtest/run', json=request).status_code == 200
+    assert client.post('/api/backtest/run', json=request).status_code == 200
+    (_, fn, args, key), (_, _, _, same_key) = server.job_queue.submitted
+    assert fn is ui_server.run_backtest_job and args[0] == {'csv_path': str(csv)}
+    assert key is not None and key == same_key  # keyed on the file, not its parsed contents
+
+    csv.write_text(csv.read_text() + '2031-03-01 03:00:00,1.3\n')
+    client.post('/api/backtest/run', json=request)
+    assert server.job_queue.submitted[-1][3] != key
+
+
+def test_job_routes_without_a_queue_return_503(tmp_path, monkeypatch):
+    server, client = _server(tmp_path, monkeypatch)
+    server.job_queue = None
+    server.jobs['j1'] = BacktestJob(job_id='j1', status='QUEUED', config={}, progress=0.0)
+
+    for method, url in [('post', '/api/backtest/run'), ('post', '/api/optimize'), ('post', '/api/backtest/cancel/j1')]:
+        response = getattr(client, method)(url, json={})
+        assert response.status_code == 503
+        assert 'not available' in response.get_json()['error']
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cthulu.connector.mt5_connector as m5
+from cthulu.connector import simulated_terminal as sim
+from cthulu.data.bar_store import BarStore, aggregate_rates, as_rates, resolve_timeframe
+from cthulu.position.profit_scaler import PositionScalingState, ProfitScaler
+
+
+def _bars(n=4000, start='2024-03-04 00:00'):
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(size=n)) * 1e-4
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'open': open_, 'high': np.maximum(open_, close) + 5e-5, 'low': np.minimum(open_, close) - 5e-5,
+        'close': close, 'tick_volume': 10, 'spread': 8,
+    }, index=pd.date_range(start, periods=n, freq='1min'))
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = sim.SimulatedTerminal({'EURUSD': _bars()}, specs={'EURUSD': sim.SymbolSpec(name='EURUSD')},
+                                     speed=None, warmup_bars=2000)
+    monkeypatch.setattr(m5, 'mt5', terminal)
+    return terminal
+
+
+def _connector():
+    conn = m5.MT5Connector(m5.ConnectionConfig(login=0, password='', server=''))
+    assert conn.connect()
+    return conn
+
+
+def test_resolve_timeframe_and_aggregation():
+    assert resolve_timeframe('H1') == resolve_timeframe('TIMEFRAME_H1') == resolve_timeframe('1H') == (16385, 3600)
+    assert resolve_timeframe(15) == resolve_timeframe('15min') == (15, 900)
+    assert resolve_timeframe('MN1') == (49153, None)
+    with pytest.raises(ValueError):
+        resolve_timeframe('H7')
+
+    rates = as_rates([{'time': 3600 + 60 * i, 'open': i, 'high': i + 1, 'low': i - 1, 'close': i + 0.5,
+                       'tick_volume': 1, 'spread': i} for i in range(7)])
+    m5_bars = aggregate_rates(rates, 300)
+    assert m5_bars['time'].tolist() == [3600, 3900]
+    assert m5_bars['open'].tolist() == [0, 5] and m5_bars['close'].tolist() == [4.5, 6.5]
+    assert m5_bars['high'].tolist() == [5, 7] and m5_bars['low'].tolist() == [-1, 4]
+    assert m5_bars['tick_volume'].tolist() == [5, 2] and m5_bars['spread'].tolist() == [4, 6]
+
+
+def test_derived_timeframes_track_the_terminal(terminal):
+    now = [0.0]
+    store = BarStore(_connector(), clock=lambda: now[0])
+    timeframes = [1, 5, 15, 16385, 16388, 16408]
+    for _ in range(120):
+        terminal.clock.advance(37)
+        now[0] += 10
+        for tf in timeframes:
+            got = store.get_rates_array('EURUSD', tf, 40)
+            expected = terminal.copy_rates_from_pos('EURUSD', tf, 0, 40)
+            for field in ('time', 'open', 'high', 'low', 'close', 'tick_volume'):
+                np.testing.assert_array_equal(got[field], expected[field])
+
+    stats = store.get_stats()
+    # One base reload, one tail fetch per refresh, one seed per higher timeframe
+    assert stats['base_reloads'] == 1 and stats['seeds'] == len(timeframes) - 1
+    assert stats['terminal_calls'] == 1 + stats['base_refreshes'] + stats['seeds']
+
+    dicts = store.get_rates('EURUSD', 'H1', 3, start_pos=1)
+    assert [d['close'] for d in dicts] == terminal.copy_rates_from_pos('EURUSD', 16385, 1, 3)['close'].tolist()
+    frame = store.get_frame('EURUSD', 'M15', 5)
+    assert list(frame.columns[:5]) == ['open', 'high', 'low', 'close', 'volume'] and len(frame) == 5
+
+
+def test_per_position_momentum_checks_share_one_fetch(terminal):
+    conn = _connector()
+    calls = []
+    original = conn.get_rates_array
+    conn.get_rates_array = lambda *a, **k: calls.append(a) or original(*a, **k)
+    scaler = ProfitScaler(conn, execution_engine=None, use_ml_optimizer=False,
+                          bar_store=BarStore(conn, max_age_seconds=60.0))
+
+    for ticket in range(25):
+        state = PositionScalingState(ticket=ticket, symbol='EURUSD', initial_volume=0.1, current_volume=0.1,
+                                     entry_price=1.1, current_sl=None, current_tp=None)
+        scaler._has_strong_momentum(state, 'BUY')
+    assert len(calls) == 1
@@ -0,0 +1,155 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.cognition.engine import CognitionEngine, CONFIDENCE_WEIGHTS
+from cthulu.cognition.inference import InferenceCache, get_inference_cache
+from cthulu.cognition.price_predictor import PricePrediction, PredictionDirection
+from cthulu.cognition.regime_classifier import MarketRegime, RegimeState
+from cthulu.cognition.sentiment_analyzer import SentimentDirection, SentimentScore
+
+
+def _frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(size=n)) * 1e-3
+    return pd.DataFrame({
+        'open': close, 'high': close + 5e-4, 'low': close - 5e-4, 'close': close,
+        'volume': rng.integers(50, 150, n).astype(float),
+    }, index=pd.date_range('2031-03-01', periods=n, freq='15min'))
+
+
+class _SlowPredictor:
+    lookback_bars = 20
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def predict(self, df):
+        time.sleep(self.delay)
+        return PricePrediction(direction=PredictionDirection.LONG, confidence=0.8, probabilities={},
+                               expected_move_pct=0.1, horizon_bars=5, features_used=10)
+
+
+class _SlowSentiment:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def get_sentiment(self, symbol):
+        time.sleep(self.delay)
+        return SentimentScore(score=0.5, direction=SentimentDirection.BULLISH, confidence=0.9,
+                              components={}, events=[])
+
+    def should_avoid_trading(self, symbol):
+        time.sleep(self.delay)
+        return True, "NFP release in 10 minutes"
+
+
+def _engine(deadline_ms, regime_delay, predict_delay, sentiment_delay):
+    engine = CognitionEngine(enable_exit_oracle=False, enable_order_blocks=False,
+                             enable_session_orb=False, deadline_ms=deadline_ms)
+    engine._price_predictor = _SlowPredictor(predict_delay)
+    engine._sentiment_analyzer = _SlowSentiment(sentiment_delay)
+
+    def classify(symbol, df):
+        time.sleep(regime_delay)
+        return RegimeState(regime=MarketRegime.BULL, confidence=0.6, probabilities={}, features={})
+
+    engine._classify = classify
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    get_inference_cache().clear()
+    yield
+    get_inference_cache().clear()
+
+
+def test_modules_run_concurrently_within_deadline():
+    engine = _engine(deadline_ms=5000, regime_delay=0.3, predict_delay=0.3, sentiment_delay=0.3)
+    start = time.perf_counter()
+    state = engine.analyze('EURUSD', _frame())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.8  # three 0.3s modules overlap instead of adding up
+    assert not state.degraded and state.coverage == pytest.approx(1.0)
+    assert state.directional_consensus == 'BULLISH'
+    assert state.combined_confidence == pytest.approx(0.6 * 0.35 + 0.8 * 0.40 + 0.9 * 0.25)
+    assert engine.get_stats()['modules']['prediction']['runs'] == 1
+    engine.shutdown(wait_for_modules=True)
+
+
+def test_late_module_degrades_state_and_is_recorded():
+    engine = _engine(deadline_ms=150, regime_delay=0.0, predict_delay=0.0, sentiment_delay=1.0)
+    df = _frame()
+    start = time.perf_counter()
+    state = engine.analyze('EURUSD', df)
+    assert time.perf_counter() - start < 0.9
+
+    assert state.missed_modules == ['sentiment'] and state.degraded
+    assert state.sentiment.direction == SentimentDirection.NEUTRAL
+    assert state.coverage == pytest.approx(1 - CONFIDENCE_WEIGHTS['sentiment'])
+    # Confidence is renormalized over the modules that reported
+    assert state.combined_confidence == pytest.approx((0.6 * 0.35 + 0.8 * 0.40) / 0.75)
+
+    # The still-running sentiment call is not re-entered
+    enhancement = engine.enhance_signal('long', 0.7, 'EURUSD', df)
+    assert enhancement.degraded and enhancement.missed_modules == ['sentiment']
+    assert any('degraded' in w for w in enhancement.warnings)
+    assert 'Prediction aligned (80% conf)' in enhancement.reasons
+
+    stats = engine.get_stats()
+    assert stats['modules']['sentiment']['missed'] == 1
+    assert stats['modules']['sentiment']['busy'] == 1
+    assert stats['degraded'] == 2 and stats['last_missed'] == ['sentiment']
+
+    # An event check that cannot answer in time does not block the entry
+    assert engine.should_trade('EURUSD', df)[0]
+    engine.shutdown(wait_for_modules=True)
+
+
+def test_sequential_mode_and_structure_signals():
+    engine = _engine(deadline_ms=None, regime_delay=0.0, predict_delay=0.0, sentiment_delay=0.0)
+    state = engine.analyze('EURUSD', _frame())
+    assert not state.degraded and engine._pool is None
+    assert engine.should_trade('EURUSD', _frame()) == (False, "Critical event: NFP release in 10 minutes")
+
+    engine = CognitionEngine(enable_exit_oracle=False, deadline_ms=1000)
+
+    class _Detector:
+        def __init__(self, signal):
+            self.signal = signal
+
+        def update(self, df, current_price, atr, timestamp=None):
+            return dict(self.signal) if self.signal else None
+
+    engine._order_block_detector = _Detector({'direction': 'long'})
+    engine._session_orb_detector = _Detector(None)
+    assert engine.get_structure_signals(_frame(), 1.1, 0.001) == [{'direction': 'long', 'source': 'order_block'}]
+    engine.shutdown()
+
+
+def test_inference_cache_shares_in_flight_computation():
+    cache = InferenceCache()
+    predictor = _SlowPredictor(0.3)
+    calls = []
+
+    def compute(df):
+        calls.append(threading.current_thread().name)
+        return predictor.predict(df)
+
+    df = _frame()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.memoize('p', predictor, df, compute)))
+               for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and len(results) == 3
+    assert all(r is results[0] for r in results)
+    assert cache.get_stats()['misses'] == 1 and cache.get_stats()['shared'] == 2
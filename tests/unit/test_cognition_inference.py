@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.cognition.engine import CognitionEngine
+from cthulu.cognition.inference import InferenceCache, get_inference_cache
+from cthulu.cognition.price_predictor import PricePredictor
+from cthulu.cognition.regime_service import get_regime_service
+
+
+def _frame(n=120, seed=0, symbol='EURUSD'):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(size=n)) * 1e-3
+    df = pd.DataFrame({
+        'open': close, 'high': close + 5e-4, 'low': close - 5e-4, 'close': close,
+        'volume': rng.integers(50, 150, n).astype(float),
+    }, index=pd.date_range('2031-03-01', periods=n, freq='15min'))
+    df.attrs['symbol'] = symbol
+    return df
+
+
+@pytest.fixture
+def cache():
+    cache = get_inference_cache()
+    cache.clear()
+    get_regime_service().clear()
+    yield cache
+    cache.clear()
+
+
+def test_batched_float32_inference_matches_float64_forward():
+    predictor = PricePredictor()
+    frames = [_frame(seed=s) for s in range(6)] + [_frame(n=10)]
+    predictions = predictor.predict_batch(frames)
+
+    for df, prediction in zip(frames[:-1], predictions):
+        x = predictor._normalize_features(predictor.extract_features(df)).reshape(1, -1)
+        _, _, probs = predictor._forward(x)
+        assert [prediction.probabilities[d.value] for d in predictor.DIRECTIONS] == pytest.approx(probs[0].tolist(), abs=1e-6)
+        assert prediction.direction == predictor.predict(df).direction
+    # Too-short frame gets the neutral fallback without spoiling the batch
+    assert predictions[-1].features_used == 0 and predictions[-1].direction.value == 'neutral'
+
+
+def test_cache_memoizes_per_bar_and_model_version():
+    predictor = PricePredictor()
+    cache = InferenceCache()
+    df = _frame()
+
+    first = cache.predict(predictor, df)
+    assert cache.predict(predictor, df.copy()) is first
+    assert cache.get_stats()['hits'] == 1
+
+    # A ticking forming bar and a new bar are recomputed
+    ticked = df.copy()
+    ticked.iloc[-1, ticked.columns.get_loc('close')] += 1e-4
+    assert cache.predict(predictor, ticked) is not first
+    assert cache.predict(predictor, _frame(n=121)) is not first
+
+    # Weight updates retire cached outputs
+    predictor.model_version += 1
+    assert cache.predict(predictor, df) is not first
+
+    frames = {'GBPUSD': _frame(seed=2, symbol='GBPUSD'), 'EURUSD': df, 'USDJPY': _frame(seed=1, symbol='USDJPY')}
+    batched = cache.predict_many(predictor, frames)
+    assert list(batched) == list(frames) and batched['EURUSD'] is cache.predict(predictor, df)
+    assert cache.get_stats()['batches'] == 1 and cache.get_stats()['batched_rows'] == 2
+    assert cache.predict_many(predictor, frames) == batched
+    assert cache.get_stats()['batches'] == 1
+
+
+def test_engine_runs_each_model_once_per_bar(cache, monkeypatch):
+    engine = CognitionEngine(enable_sentiment=False, enable_order_blocks=False, enable_session_orb=False)
+    predictor, classifier = engine._price_predictor, engine._regime_classifier
+    calls = {'predict': 0, 'classify': 0}
+    predict_batch, classify = predictor.predict_batch, classifier.classify
+
+    def counting_predict_batch(frames):
+        calls['predict'] += len(frames)
+        return predict_batch(frames)
+
+    def counting_classify(df):
+        calls['classify'] += 1
+        return classify(df)
+
+    monkeypatch.setattr(predictor, 'predict_batch', counting_predict_batch)
+    monkeypatch.setattr(classifier, 'classify', counting_classify)
+
+    df = _frame()
+    engine.should_trade('EURUSD', df)
+    engine.enhance_signal('long', 0.7, 'EURUSD', df)
+    positions = [{'ticket': t, 'symbol': 'EURUSD', 'type': t % 2, 'price_open': 1.1, 'price_current': 1.1,
+                  'volume': 0.1, 'profit': 1.0} for t in range(5)]
+    engine.get_exit_signals(positions, df, {'rsi': 50})
+    assert calls == {'predict': 1, 'classify': 1}
+
+    states = engine.analyze_many({'EURUSD': df, 'GBPUSD': _frame(seed=3, symbol='GBPUSD')})
+    assert set(states) == {'EURUSD', 'GBPUSD'}
+    assert calls == {'predict': 2, 'classify': 2}
+    assert states['EURUSD'].prediction is engine.analyze('EURUSD', df).prediction
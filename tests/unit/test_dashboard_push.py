@@ -0,0 +1,43 @@
+import urllib.request
+
+import cthulu.ui_server.app as dashboard
+from cthulu.observability.trade_event_bus import DashboardPushSubscriber, TradeEvent, TradeEventType
+
+EVENTS = {'events': [{'event_type': 'trade_opened', 'symbol': 'GOLD', 'price': 2400.0}]}
+
+
+def test_event_push_requires_loopback_or_token(monkeypatch):
+    client = dashboard.app.test_client()
+    remote = {'REMOTE_ADDR': '10.0.0.7'}
+
+    monkeypatch.setattr(dashboard, 'PUSH_TOKEN', None)
+    assert client.post('/api/events', json=EVENTS).json == {'received': 1}
+    assert client.post('/api/events', json=EVENTS, environ_base=remote).status_code == 403
+
+    monkeypatch.setattr(dashboard, 'PUSH_TOKEN', 's3cret')
+    monkeypatch.setattr(dashboard, 'last_price', {'value': 0, 'time': 0})
+    assert client.post('/api/events', json=EVENTS).status_code == 403  # token required even on loopback
+    assert client.post('/api/events', json=EVENTS, environ_base=remote,
+                       headers={dashboard.PUSH_TOKEN_HEADER: 'wrong'}).status_code == 403
+    assert dashboard.last_price['value'] == 0
+    response = client.post('/api/events', json=EVENTS, environ_base=remote,
+                           headers={dashboard.PUSH_TOKEN_HEADER: 's3cret'})
+    assert response.json == {'received': 1} and dashboard.last_price['value'] == 2400.0
+
+
+def test_push_subscriber_sends_token(monkeypatch):
+    sent = []
+
+    class _Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(urllib.request, 'urlopen', lambda req, timeout: sent.append(req) or _Response())
+    event = TradeEvent(event_type=TradeEventType.TRADE_OPENED, ticket=1, symbol='GOLD')
+    DashboardPushSubscriber('http://127.0.0.1:5000/api/events', token='s3cret').on_batch([event])
+    DashboardPushSubscriber('http://127.0.0.1:5000/api/events').on_batch([event])
+    assert sent[0].get_header('X-cthulu-push-token') == 's3cret'
+    assert sent[1].get_header('X-cthulu-push-token') is None
@@ -0,0 +1,96 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from cthulu.persistence.database import Database, SignalRecord, TradeRecord
+
+NOW = datetime(2031, 6, 15, 12, 0, 0)
+
+
+def _signal(i, symbol='EURUSD', ts=None):
+    return SignalRecord(signal_id=f'sig-{i}', timestamp=ts or NOW - timedelta(hours=i), symbol=symbol,
+                        timeframe='M1', side='long', action='buy', confidence=0.6)
+
+
+def test_keyset_pages_walk_every_row_once(tmp_path):
+    db = Database(str(tmp_path / 'cthulu.db'))
+    same_time = NOW - timedelta(days=1)
+    for i in range(25):
+        # Ties on the timestamp must not drop or repeat rows across pages
+        db.record_signal(_signal(i, symbol='GOLD' if i % 3 == 0 else 'EURUSD', ts=same_time if i < 10 else None))
+        db.record_trade(TradeRecord(signal_id=f'sig-{i}', symbol='EURUSD', side='BUY', volume=0.1,
+                                    entry_price=1.1, entry_time=same_time))
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = db.get_signals_page(limit=7, cursor=cursor)
+        seen.extend(s.signal_id for s in page)
+        pages += 1
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(f'sig-{i}' for i in range(25)) and pages == 4
+    assert seen[0] == 'sig-10'  # newest first
+
+    gold, _ = db.get_signals_page(limit=50, symbol='GOLD', since=NOW - timedelta(hours=20))
+    assert [s.signal_id for s in gold] == ['sig-12', 'sig-15', 'sig-18']
+
+    first, cursor = db.get_trades_page(limit=20)
+    rest, end = db.get_trades_page(limit=20, cursor=cursor)
+    assert len(first) == 20 and len(rest) == 5 and end is None
+    assert [t.id for t in first + rest] == list(range(25, 0, -1))
+    assert [t.id for t in db.get_all_trades(limit=3)] == [25, 24, 23]
+
+    plan = ' '.join(r[-1] for r in db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM signals WHERE symbol = ? AND (timestamp, id) < (?, ?) "
+        "ORDER BY timestamp DESC, id DESC LIMIT 5", ('GOLD', '2031', 1)))
+    assert 'idx_signals_symbol_timestamp' in plan
+    db.close()
+
+
+def test_retention_moves_old_rows_into_monthly_archives(tmp_path):
+    db = Database(str(tmp_path / 'cthulu.db'))
+    for day in range(120):
+        ts = NOW - timedelta(days=day)
+        db.record_signal(_signal(day, ts=ts))
+        db.record_provenance({'timestamp': ts, 'signal_id': f'sig-{day}', 'symbol': 'EURUSD', 'side': 'BUY'})
+
+    preview = db.run_retention(signal_days=90, provenance_days=30, dry_run=True, now=NOW)
+    assert preview['archived'] == 0 and not db.list_archives()
+    assert preview['signals'] == {'2031-02': 13, '2031-03': 16}
+    assert sum(preview['order_provenance'].values()) == 89
+
+    result = db.run_retention(signal_days=90, provenance_days=30, now=NOW)
+    assert result['archived'] == 29 + 89
+    assert list(db.list_archives()) == ['2031-02', '2031-03', '2031-04', '2031-05']
+    assert db.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 91
+    assert len(db.get_recent_provenance(limit=500)) == 31
+
+    # Archived months are still readable through the same paging API
+    march, cursor = db.get_signals_page(limit=100, month='2031-03')
+    assert len(march) == 16 and cursor is None
+    assert march[0].timestamp.startswith('2031-03-16') and march[-1].timestamp.startswith('2031-03-01')
+
+    # A torn move (copied but not deleted) is completed without duplicates
+    with sqlite3.connect(db.archive_path('2031-03')) as archive:
+        row = archive.execute("SELECT * FROM signals ORDER BY id LIMIT 1").fetchone()
+    db.conn.execute(f"INSERT INTO signals VALUES ({', '.join('?' * len(row))})", row)
+    db.conn.commit()
+    assert db.run_retention(signal_days=90, provenance_days=None, now=NOW)['archived'] == 1
+    with sqlite3.connect(db.archive_path('2031-03')) as archive:
+        assert archive.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 16
+    assert db.run_retention(now=NOW)['archived'] == 0
+    db.close()
+
+
+def test_background_retention_job(tmp_path):
+    db = Database(str(tmp_path / 'cthulu.db'))
+    db.record_signal(_signal(1, ts=datetime.now() - timedelta(days=400)))
+    assert db.start_retention_job(interval_seconds=60, signal_days=30)
+    assert not db.start_retention_job(interval_seconds=60)
+    deadline = time.monotonic() + 10
+    while not db.list_archives() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    db.stop_retention_job()
+    assert db.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 0
+    assert len(db.list_archives()) == 1
+    db.close()
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from cthulu.persistence.database import Database, TradeRecord
+
+
+def _trade(i, **kwargs):
+    return TradeRecord(signal_id=f"s{i}", order_id=i, symbol="EURUSD", side="BUY",
+                       volume=0.1, entry_price=1.1, entry_time=datetime.now(), **kwargs)
+
+
+def _scan(db):
+    row = db.conn.execute("""
+        SELECT COUNT(*), COALESCE(SUM(status = 'OPEN'), 0), COALESCE(SUM(status = 'CLOSED'), 0),
+               COALESCE(SUM(profit), 0.0), COALESCE(SUM(profit > 0), 0), COALESCE(SUM(profit < 0), 0)
+        FROM trades
+    """).fetchone()
+    return tuple(row)
+
+
+def _summary(db):
+    s = db.get_dashboard_summary()
+    return (s['total_trades'], s['open_trades'], s['closed_trades'], s['total_pnl'], s['wins'], s['losses'])
+
+
+def test_summary_tracks_inserts_exits_and_deletes(tmp_path):
+    db = Database(str(tmp_path / "summary.db"))
+    for i in range(1, 6):
+        db.record_trade(_trade(i))
+
+    db.update_trade_exit(order_id=1, exit_price=1.2, exit_time=datetime.now(), profit=10.0, exit_reason="tp")
+    db.update_trade_exit(order_id=2, exit_price=1.0, exit_time=datetime.now(), profit=-4.0, exit_reason="sl")
+    assert _summary(db) == _scan(db) == (5, 3, 2, 6.0, 1, 1)
+    assert db.get_dashboard_summary()['win_rate'] == 50.0
+
+    db.conn.execute("DELETE FROM trades WHERE order_id = 1")
+    db.conn.commit()
+    assert _summary(db) == _scan(db)
+
+
+def test_summary_backfilled_for_existing_database(tmp_path):
+    path = tmp_path / "legacy.db"
+    db = Database(str(path))
+    for i in range(1, 4):
+        db.record_trade(_trade(i))
+    # Simulate a database created before the summary table existed
+    db.conn.executescript("""
+        DROP TRIGGER trg_trade_summary_insert;
+        DROP TRIGGER trg_trade_summary_update;
+        DROP TRIGGER trg_trade_summary_delete;
+        DROP TABLE trade_summary;
+        UPDATE trades SET status = 'CLOSED', profit = order_id;
+    """)
+    db.close()
+
+    reopened = Database(str(path))
+    assert _summary(reopened) == _scan(reopened) == (3, 0, 3, 6.0, 3, 0)
@@ -0,0 +1,127 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.utils.event_log import (
+    EventLogReader, EventLogWriter, TIME_COLUMN, read_event_logs, scan_event_logs
+)
+from cthulu.cognition.training_logger import TrainingDataLogger
+from cthulu.ML_RL.instrumentation import BASE as ML_BASE, MLDataCollector
+
+
+def _write_sample(path, chunk_rows=4):
+    with EventLogWriter(str(path), chunk_rows=chunk_rows) as writer:
+        for i in range(10):
+            writer.append('order', {
+                'ticket': i,
+                'price': 1.1 + i / 100 if i != 5 else None,
+                'symbol': 'EURUSD' if i % 3 else 'GBPUSD',
+                'comment': None if i == 2 else f"order {i}",
+                'meta': {'i': i},
+                'filled': i % 2 == 0,
+            }, ts=pd.Timestamp('2031-03-01') + pd.Timedelta(hours=i))
+        writer.append('order', {'ticket': 10.5}, ts='2031-03-01T10:00:00')  # widens ticket to f8
+        writer.append('heartbeat', {'ok': True}, ts='2031-03-01T03:30:00')
+
+
+def test_round_trip_projection_and_time_window(tmp_path):
+    path = tmp_path / 'a.evlog'
+    _write_sample(path)
+
+    reader = EventLogReader(str(path))
+    assert reader.complete
+    assert reader.schemas['order'] == {'ticket': 'f8', 'price': 'f8', 'symbol': 'str',
+                                       'comment': 'str', 'meta': 'json', 'filled': 'b1'}
+    df = reader.read('order')
+    assert len(df) == 11
+    assert df['ticket'].tolist() == [float(i) for i in range(10)] + [10.5]
+    assert np.isnan(df['price'][5]) and df['price'][6] == pytest.approx(1.16)
+    assert df['symbol'][:4].tolist() == ['GBPUSD', 'EURUSD', 'EURUSD', 'GBPUSD']
+    assert df['comment'][2] is None and df['comment'][3] == 'order 3'
+    assert df['meta'][7] == {'i': 7}
+    assert str(df[TIME_COLUMN].dt.tz) == 'UTC'
+
+    # Window [02:00, 06:00) with two columns only touches the first two chunks
+    reader = EventLogReader(str(path))
+    window = reader.read('order', start='2031-03-01T02:00', end='2031-03-01T06:00', columns=['ticket', 'missing'])
+    assert list(window.columns) == [TIME_COLUMN, 'ticket', 'missing']
+    assert window['ticket'].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert window['missing'].isna().all()
+    assert reader.chunks_read == 2
+
+    both = read_event_logs(str(tmp_path), start='2031-03-01T03:00', end='2031-03-01T04:00')
+    assert sorted(both['_event_type']) == ['heartbeat', 'order']
+
+
+def test_unclosed_log_is_recovered(tmp_path):
+    path = tmp_path / 'torn.evlog'
+    writer = EventLogWriter(str(path), chunk_rows=4)
+    for i in range(10):
+        writer.append('tick', {'i': i}, ts=1_000 + i)
+    writer.flush()  # 8 rows in two full chunks; the last two are still buffered
+    writer._file.flush()
+    with open(path, 'ab') as f:
+        f.write(b'CHNK\x10')  # torn header of a chunk that never finished
+
+    reader = EventLogReader(str(path))
+    assert not reader.complete
+    assert reader.rows == 8
+    assert [b.rows for b in scan_event_logs(str(path), columns=['i'])] == [4, 4]
+    writer.close()
+
+
+def test_training_logger_columnar_sessions(tmp_path):
+    logger = TrainingDataLogger(data_dir=str(tmp_path), batch_size=3)
+    market = pd.DataFrame({'close': [1.1, 1.2]})
+    for i in range(5):
+        logger.log_decision(symbol='EURUSD', timeframe='M15', market_data=market,
+                            indicators={'rsi': 40 + i}, cognition_state=None, action='BUY',
+                            confidence=0.6, strategy='sma', position_size=0.1, ticket=100 + i)
+    logger.log_outcome(ticket=100, outcome='WIN', pnl=12.5, exit_price=1.2)
+    first = logger.get_stats()['session_file']
+    logger.close()
+
+    data = TrainingDataLogger.load_training_data(str(tmp_path))
+    assert len(data) == 5 + 1 + 4  # decisions, outcome, incomplete
+    assert TIME_COLUMN not in data.columns
+    assert data.loc[data['outcome'] == 'WIN', 'pnl'].tolist() == [12.5]
+    assert (data['outcome'] == 'INCOMPLETE').sum() == 4
+
+    # Logging after close starts a new session file instead of truncating the closed one
+    logger.log_decision(symbol='EURUSD', timeframe='M15', market_data=market, indicators={},
+                        cognition_state=None, action='HOLD', confidence=0.5, strategy='sma', position_size=0)
+    logger._flush()
+    second = logger.get_stats()['session_file']
+    assert second != first and os.path.exists(first) and os.path.exists(second)
+    assert TrainingDataLogger.load_training_data(str(tmp_path))['action'].tolist().count('HOLD') == 1
+    logger._writer.close()
+    data = TrainingDataLogger.load_training_data(str(tmp_path))
+
+    projected = TrainingDataLogger.load_training_data(str(tmp_path), columns=['rsi', 'action'],
+                                                      start=pd.Timestamp.utcnow() - pd.Timedelta(hours=1))
+    assert list(projected.columns) == ['rsi', 'action'] and len(projected) == len(data)
+    batches = list(TrainingDataLogger.iter_training_data(str(tmp_path), columns=['pnl']))
+    assert sum(len(b) for b in batches) == len(data)
+
+
+def test_ml_collector_columnar_format():
+    prefix = f"test_columnar_{int(time.time())}_{os.getpid()}"
+    collector = MLDataCollector(prefix=prefix, log_format='columnar')
+    for i in range(250):
+        collector.record_event('order_request', {'i': i, 'symbol': 'EURUSD'})
+    collector.record_event('execution', {'ticket': 7, 'pnl': 1.5})
+    collector.close(timeout=5.0)
+
+    files = [os.path.join(ML_BASE, f) for f in os.listdir(ML_BASE) if f.startswith(prefix)]
+    try:
+        assert len(files) == 1 and files[0].endswith('.evlog')
+        orders = read_event_logs(files, 'order_request', columns=['i'])
+        assert orders['i'].tolist() == list(range(250))
+        execution = next(scan_event_logs(files, 'execution'))
+        assert execution.to_records() == [{'ticket': 7, 'pnl': 1.5}]
+    finally:
+        for path in files:
+            os.remove(path)
@@ -0,0 +1,160 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from cthulu.backtesting.exit_replay import (
+    TradePaths, ExitPolicyReplay, FixedStopTargetPolicy, TrailingStopPolicy,
+    TimeExitPolicy, MultiRRRPolicy, ProfitScalerPolicy, CompositePolicy,
+    EXIT_STOP, EXIT_TARGET, EXIT_POLICY, EXIT_END,
+)
+from cthulu.exit.multi_rrr import RRRTarget, ExitTier
+
+
+def _paths(close, side, sl=None, tp=None, spread=0.0, **kwargs):
+    close = np.asarray(close, dtype=float)
+    return TradePaths.from_arrays(
+        entry_price=[100.0] * len(close), side=side, close=close,
+        high=close + spread, low=close - spread, stop_loss=sl, take_profit=tp, **kwargs
+    )
+
+
+def test_fixed_levels_first_hit_long_and_short():
+    close = [
+        [101, 102, 99, 95, 96],     # long: stop at 97 on bar 3
+        [101, 103, 106, 104, 104],  # long: target at 105 on bar 2
+        [99, 98, 97, 96, 95],       # short: target at 96 on bar 3
+        [100, 101, 101, 100, 100],  # short: held to the end
+    ]
+    paths = _paths(close, [1, 1, -1, -1], sl=[97, 97, 104, 104], tp=[105, 105, 96, 96], spread=0.5)
+    result = ExitPolicyReplay(paths).evaluate(FixedStopTargetPolicy())
+
+    assert list(result.exit_idx) == [3, 2, 3, 4]
+    assert list(result.exit_reason) == [EXIT_STOP, EXIT_TARGET, EXIT_TARGET, EXIT_END]
+    np.testing.assert_allclose(result.pnl, [-3.0, 5.0, 4.0, 0.0])
+    np.testing.assert_allclose(result.r_multiple, [-1.0, 5 / 3, 1.0, 0.0])
+
+
+def _trailing_reference(entry, side, closes, atr, mult, activation_pct):
+    """Bar-by-bar replica of TrailingStop.should_exit on closes."""
+    best = stop = None
+    for i, price in enumerate(closes):
+        if stop is None:
+            if (price - entry) * side / entry * 100 < activation_pct:
+                continue
+            best, stop = price, price - side * atr * mult
+        else:
+            if (price - best) * side > 0:
+                best = price
+            new_stop = best - side * atr * mult
+            if (new_stop - stop) * side > 0:
+                stop = new_stop
+        if (price - stop) * side <= 0:
+            return i
+    return len(closes)
+
+
+def test_trailing_stop_matches_bar_loop():
+    rng = np.random.default_rng(7)
+    n, h = 300, 80
+    side = np.where(rng.random(n) > 0.5, 1, -1)
+    close = 100 + np.cumsum(rng.normal(0, 0.4, size=(n, h)), axis=1)
+    atr = rng.uniform(0.3, 1.0, size=n)
+    paths = _paths(close, side, atr=atr)
+
+    policy = TrailingStopPolicy(atr_multiplier=1.5, activation_profit_pct=0.5)
+    plan = policy.plan(paths)
+    expected = [_trailing_reference(100.0, side[i], close[i], atr[i], 1.5, 0.5) for i in range(n)]
+    assert list(plan.exit_idx) == expected
+
+    result = ExitPolicyReplay(paths).evaluate(policy)
+    hit = plan.exit_idx < h
+    rows = np.where(hit)[0]
+    np.testing.assert_allclose(result.pnl[hit], (close[rows, plan.exit_idx[hit]] - 100.0) * side[hit])
+    assert (result.exit_reason[hit] == EXIT_POLICY).all()
+
+
+def test_rrr_partials_then_breakeven_stop():
+    targets = [
+        RRRTarget(tier=ExitTier.TIER_1, rrr=1.0, close_pct=0.5, sl_to_breakeven=True),
+        RRRTarget(tier=ExitTier.TIER_2, rrr=2.0, close_pct=0.5, sl_to_breakeven=True),
+    ]
+    close = [
+        [101, 102, 101, 100, 99],   # tier 1 at 102, then back to breakeven
+        [101, 102, 103, 104, 104],  # both tiers filled
+    ]
+    paths = _paths(close, [1, 1], sl=[98, 98], spread=0.0)
+    result = ExitPolicyReplay(paths).evaluate(MultiRRRPolicy(targets=targets))
+
+    # Trade 0: half at +2, stop moved to 100 and hit on bar 3
+    assert result.exit_idx[0] == 3 and result.exit_reason[0] == EXIT_STOP
+    assert np.isclose(result.pnl[0], 0.5 * 2.0)
+    # Trade 1: half at +2 and half at +4
+    assert np.isclose(result.partial_fraction[1], 1.0)
+    assert np.isclose(result.pnl[1], 0.5 * 2.0 + 0.5 * 4.0)
+    assert np.isclose(result.r_multiple[1], 1.5)
+
+
+def test_profit_scaler_closes_remaining_fractions():
+    from cthulu.position.profit_scaler import ScalingTier
+    tiers = [ScalingTier(0.5, 0.5, True, 0.0), ScalingTier(1.0, 0.5, False, 0.0)]
+    close = [[100.5, 101, 102, 103, 104]]
+    paths = _paths(close, [1], tp=[110], spread=0.0)
+    policy = ProfitScalerPolicy(tiers=tiers, min_time_in_trade_bars=1)
+    result = ExitPolicyReplay(paths, use_trade_levels=False).evaluate(policy)
+
+    # Progress is profit / TP distance (10): +4 never reaches the first tier
+    assert result.partial_fraction[0] == 0.0
+
+    paths = _paths([[102, 106, 111, 108, 107]], [1], tp=[110], spread=0.0)
+    result = ExitPolicyReplay(paths, use_trade_levels=False).evaluate(policy)
+    # 50% at 106 (bar 1), 25% at 111 (bar 2), rest held to the end at 107
+    assert np.isclose(result.partial_fraction[0], 0.75)
+    assert np.isclose(result.pnl[0], 0.5 * 6 + 0.25 * 11 + 0.25 * 7)
+
+
+def test_time_exit_and_composite():
+    times = pd.date_range('2025-01-06 09:00', periods=6, freq='1h').values  # Monday
+    close = np.full((1, 6), 100.0) + np.arange(6)
+    paths = _paths(close, [1], times=times[None, :], entry_time=[times[0] - np.timedelta64(1, 'h')])
+
+    plan = TimeExitPolicy(max_hold_hours=3).plan(paths)
+    assert plan.exit_idx[0] == 2
+
+    eod = TimeExitPolicy(max_hold_hours=48, day_trading_mode=True, eod_close_time="12:30")
+    assert eod.plan(paths).exit_idx[0] == 4
+
+    combined = CompositePolicy([TimeExitPolicy(max_hold_hours=3), eod])
+    result = ExitPolicyReplay(paths).evaluate(combined)
+    assert result.exit_idx[0] == 2 and np.isclose(result.pnl[0], 2.0)
+
+
+def test_from_bars_and_compare_over_many_trades():
+    rng = np.random.default_rng(1)
+    index = pd.date_range('2024-01-01', periods=20_000, freq='5min')
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, len(index)))
+    bars = pd.DataFrame({'open': close, 'high': close + 0.0003, 'low': close - 0.0003,
+                         'close': close, 'atr': 0.0008}, index=index)
+    n = 10_000
+    entry_bars = rng.integers(0, len(index) - 10, size=n)
+    side = np.where(rng.random(n) > 0.5, 'BUY', 'SELL')
+    entry = close[entry_bars]
+    sign = np.where(side == 'BUY', 1, -1)
+    entries = pd.DataFrame({
+        'entry_time': index[entry_bars], 'side': side,
+        'stop_loss': entry - sign * 0.002, 'take_profit': entry + sign * 0.004,
+    })
+
+    start = time.perf_counter()
+    paths = TradePaths.from_bars(entries, bars, horizon=200)
+    replay = ExitPolicyReplay(paths)
+    results = replay.run([FixedStopTargetPolicy(), TrailingStopPolicy(atr_multiplier=1.5, activation_profit_pct=0.05),
+                          MultiRRRPolicy(), TimeExitPolicy(max_hold_hours=4)])
+    elapsed = time.perf_counter() - start
+
+    assert paths.close.shape == (n, 200)
+    np.testing.assert_allclose(paths.entry_price, entry)
+    table = ExitPolicyReplay.compare(results)
+    assert set(table.index) == set(results)
+    assert (table['trades'] == n).all()
+    assert elapsed < 20
@@ -0,0 +1,69 @@
+"""
+Tests for the array indicator kernels against the scalar code they replace.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cthulu.indicators import kernels
+from cthulu.indicators.market_structure import MarketStructureDetector
+
+
+def _reference_supertrend(basic_upper, basic_lower, close):
+    """The original .iloc loop from Supertrend.calculate, on plain lists."""
+    n = len(close)
+    fu, fl = list(basic_upper), list(basic_lower)
+    for i in range(1, n):
+        fu[i] = basic_upper[i] if np.isnan(fu[i - 1]) or basic_upper[i] < fu[i - 1] or close[i - 1] > fu[i - 1] else fu[i - 1]
+        fl[i] = basic_lower[i] if np.isnan(fl[i - 1]) or basic_lower[i] > fl[i - 1] or close[i - 1] < fl[i - 1] else fl[i - 1]
+    trend, direction = [fu[0]], [-1.0]
+    for i in range(1, n):
+        d = 1.0 if close[i] > fu[i - 1] else -1.0 if close[i] < fl[i - 1] else direction[-1]
+        direction.append(d)
+        trend.append(fl[i] if d == 1 else fu[i])
+    return fu, fl, trend, direction
+
+
+def test_supertrend_kernel_matches_reference_loop_exactly():
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=3000))
+    atr = pd.Series(rng.random(3000) * 2).rolling(10).mean().to_numpy()
+    basic_upper, basic_lower = close + 3 * atr, close - 3 * atr
+
+    result = kernels.supertrend(basic_upper, basic_lower, close)
+    for got, expected in zip(result, _reference_supertrend(basic_upper, basic_lower, close)):
+        assert got.dtype == np.float64
+        np.testing.assert_array_equal(got, np.asarray(expected))
+    assert set(np.unique(result[3])) <= {-1.0, 1.0}
+    assert all(len(a) == 0 for a in kernels.supertrend([], [], []))
+
+
+def test_fractal_pivots():
+    high = np.array([1.0, 3.0, 2.0, 5.0, 4.0, 1.0, 2.0])
+    low = high - 1
+    is_high, is_low = kernels.fractal_pivots(high, low, 1)
+    assert np.flatnonzero(is_high).tolist() == [1, 3]
+    assert np.flatnonzero(is_low).tolist() == [2, 5]
+    assert not kernels.fractal_pivots(high[:2], low[:2], 1)[0].any()
+
+    # The structure detector's single-bar checks agree with the vectorized pivots
+    rng = np.random.default_rng(2)
+    mid = 100 + np.cumsum(rng.normal(size=300))
+    data = pd.DataFrame({'high': mid + rng.random(300), 'low': mid - rng.random(300)})
+    detector = MarketStructureDetector()
+    half = detector._p_half
+    is_high, is_low = kernels.fractal_pivots(data['high'], data['low'], half)
+    assert [detector._is_fractal_high(data, i) for i in range(300)] == is_high.tolist()
+    assert [detector._is_fractal_low(data, i) for i in range(300)] == is_low.tolist()
+    assert is_high.any() and is_low.any()
+
+    # Scanning bar by bar records exactly the vectorized pivots
+    data['time'] = pd.date_range('2031-01-01', periods=300, freq='15min')
+    detector = MarketStructureDetector()
+    detector.config.max_fractal_history = 300
+    for end in range(1, 301):
+        detector._scan_for_fractals(data.iloc[:end])
+    half = detector._p_half
+    is_high, is_low = kernels.fractal_pivots(data['high'], data['low'], half)
+    assert [f.bar_index for f in detector._high_fractals] == np.flatnonzero(is_high[:300 - half]).tolist()
+    assert [f.bar_index for f in detector._low_fractals] == np.flatnonzero(is_low[:300 - half]).tolist()
@@ -0,0 +1,45 @@
+import copy
+
+import cthulu.connector.mt5_connector as m5
+from cthulu.core.loop_benchmark import (
+    BenchmarkConfig, BenchmarkResult, LoopBenchmark, LOOP_STAGES, compare, fixture_bars,
+)
+
+
+def test_fixture_is_deterministic():
+    a = fixture_bars(500, seed=3)
+    b = fixture_bars(500, seed=3)
+    assert a.equals(b)
+    assert (a['high'] >= a[['open', 'close']].max(axis=1)).all()
+    assert (a['low'] <= a[['open', 'close']].min(axis=1)).all()
+    assert not fixture_bars(500, seed=4).equals(a)
+
+
+def test_benchmark_times_every_stage_and_roundtrips(tmp_path):
+    mt5_before = m5.mt5
+    config = BenchmarkConfig.preset('order_path', fixture_bars=400, lookback_bars=120,
+                                    warmup_iterations=3, iterations=30, alloc_iterations=5)
+    result = LoopBenchmark(config).run()
+
+    assert m5.mt5 is mt5_before  # simulated terminal uninstalled afterwards
+    assert result.stages['iteration']['count'] == 30
+    for stage in ('_ingest_market_data', '_calculate_indicators', '_generate_signal', '_monitor_positions'):
+        stats = result.stages[stage]
+        assert stats['count'] == 30
+        assert 0 < stats['p50_ms'] <= stats['p99_ms'] <= stats['max_ms']
+        assert 'net_blocks_mean' in stats and 'alloc_peak_kb' in stats
+    assert result.signals > 0
+    if result.orders:
+        assert result.stages['bar_to_order']['count'] == result.orders
+
+    path = result.save(str(tmp_path / 'baseline.json'))
+    loaded = BenchmarkResult.load(str(path))
+    assert loaded.stages == result.stages
+    assert loaded.config['strategy']['type'] == 'periodic'
+    assert compare(loaded, result) == []
+
+    slower = copy.deepcopy(loaded)
+    slower.stages['_calculate_indicators']['p99_ms'] *= 2
+    regressions = compare(loaded, slower)
+    assert [(r['stage'], r['metric']) for r in regressions] == [('_calculate_indicators', 'p99_ms')]
+    assert set(LOOP_STAGES) <= set(result.stages)
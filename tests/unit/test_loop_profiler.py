@@ -0,0 +1,95 @@
+import json
+import logging
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from cthulu.core.trading_loop import TradingLoop, LOOP_STAGES
+from cthulu.observability.loop_profiler import SlowIterationProfiler
+from cthulu.observability.prometheus import PrometheusExporter
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _slow_stage():
+    _busy(0.12)
+
+
+def test_profiler_captures_only_slow_iterations(tmp_path):
+    profiler = SlowIterationProfiler(budget_ms=60, output_dir=str(tmp_path), sample_interval_ms=2,
+                                     min_capture_interval_s=0)
+    try:
+        profiler.begin()
+        assert profiler.end(5.0) is None
+        assert profiler.slow_iterations == 0
+
+        profiler.begin()
+        start = time.perf_counter()
+        _slow_stage()
+        path = profiler.end((time.perf_counter() - start) * 1000.0, stages={'calculate_indicators': 120.0},
+                            context={'loop_count': 7})
+    finally:
+        profiler.stop()
+
+    assert path is not None and profiler.captures == 1
+    summary = json.loads(Path(path).read_text())
+    assert summary['loop_count'] == 7
+    assert summary['stages_ms'] == {'calculate_indicators': 120.0}
+    assert summary['sampling_started_ms'] >= 30.0  # armed at half the budget
+    assert any('_slow_stage' in entry['stack'] for entry in summary['top_stacks'])
+    folded = (tmp_path / summary['folded_file']).read_text().splitlines()
+    assert folded and all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+
+
+def test_trading_loop_records_stage_latency(tmp_path):
+    exporter = PrometheusExporter()
+    health = SimpleNamespace(calls=[])
+    health.update_performance = lambda **kw: health.calls.append(kw)
+    ctx = SimpleNamespace(
+        config={'observability': {'loop_profiling': {
+            'enabled': True, 'latency_budget_ms': 50, 'output_dir': str(tmp_path), 'min_capture_interval_s': 0}}},
+        logger=logging.getLogger('test.loop_profiler'),
+        symbol='EURUSD', indicators=[], exporter=exporter, system_health_collector=health,
+        position_manager=None,
+    )
+    loop = TradingLoop(ctx)
+    loop._ingest_market_data = lambda: _slow_stage() or 'bars'
+    loop._calculate_indicators = lambda df: None  # iteration stops after this stage
+
+    loop.loop_count = 1
+    loop._run_timed_iteration()
+    loop._profiler.stop()
+
+    assert loop.stage_histograms['ingest_market_data'].count == 1
+    assert loop.stage_histograms['calculate_indicators'].count == 1
+    assert loop.stage_histograms['generate_signal'].count == 0
+    assert loop.iteration_histogram.count == 1
+    assert loop.slow_iterations == 1 and loop._profiler.captures == 1
+    assert health.calls[-1]['max_loop_ms'] >= 100.0
+
+    text = exporter.export_text()
+    for stage in LOOP_STAGES:
+        assert f'Cthulu_loop_stage_latency_seconds_count{{stage="{stage}"}}' in text
+    assert 'Cthulu_loop_iteration_latency_seconds_count 1' in text
+    assert 'Cthulu_loop_slow_iterations_total 1' in text
+
+
+def test_profiler_is_opt_in_and_dumps_next_to_the_log_file(tmp_path):
+    logger = logging.getLogger('test.loop_profiler.dir')
+    handler = logging.FileHandler(str(tmp_path / 'Cthulu.log'))
+    logger.addHandler(handler)
+    try:
+        ctx = SimpleNamespace(config={}, logger=logger, symbol='EURUSD', indicators=[])
+        assert TradingLoop(ctx)._profiler is None
+
+        ctx.config = {'observability': {'loop_profiling': {'enabled': True}}}
+        loop = TradingLoop(ctx)
+        assert loop._profiler.output_dir == tmp_path / 'slow_iterations'
+        loop._profiler.stop()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
@@ -1,7 +1,9 @@
 import math
 from time import sleep
+from types import SimpleNamespace
 from cthulu.observability.metrics import MetricsCollector
-from cthulu.observability.prometheus import PrometheusExporter
+from cthulu.observability.prometheus import PrometheusExporter, PrometheusMetric
+from cthulu.utils.latency import LatencyHistogram
 
 
 def test_drawdown_duration_and_recovery():
@@ -51,3 +53,21 @@ def test_prometheus_exporter_integration():
 
 
 
+
+
+def test_labelled_series_share_one_help_and_type_block():
+    exporter = PrometheusExporter(prefix='herald_test')
+    loop = SimpleNamespace(stage_histograms={'ingest': LatencyHistogram(), 'signal': LatencyHistogram()},
+                           iteration_histogram=LatencyHistogram())
+    exporter.set_loop_timing(loop)
+    name = 'herald_test_event_bus_subscriber_queue_depth'
+    for subscriber in ('db', 'ml'):
+        exporter._metrics_cache[f"{name}:{subscriber}"] = PrometheusMetric(
+            name=name, value=1, metric_type='gauge', help_text='Depth', labels={'subscriber': subscriber})
+
+    text = exporter.export_text()
+    assert text.count('# HELP herald_test_loop_stage_latency_seconds ') == 1
+    assert text.count('# TYPE herald_test_loop_stage_latency_seconds histogram') == 1
+    assert 'herald_test_loop_stage_latency_seconds_count{stage="signal"} 0' in text
+    assert text.count(f'# TYPE {name} gauge') == 1
+    assert f'{name}{{subscriber="db"}} 1' in text and f'{name}{{subscriber="ml"}} 1' in text
@@ -0,0 +1,115 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+
+import cthulu.connector.mt5_connector as m5
+from cthulu.observability.prometheus import PrometheusExporter
+
+
+class _FakeMT5:
+    """Counts every terminal request."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.alive = True
+
+    def terminal_info(self):
+        self.calls['terminal_info'] += 1
+        return SimpleNamespace(connected=self.alive, trade_allowed=True)
+
+    def symbol_select(self, name, enable):
+        self.calls['symbol_select'] += 1
+        return name == 'EURUSD'
+
+    def symbols_get(self):
+        self.calls['symbols_get'] += 1
+        return [SimpleNamespace(name='EURUSD')]
+
+    def symbol_info(self, name):
+        self.calls['symbol_info'] += 1
+        return SimpleNamespace(name=name, bid=1.1, ask=1.1002, spread=2, digits=5, point=0.00001,
+                               volume_min=0.01, volume_max=100.0, volume_step=0.01,
+                               trade_contract_size=100000.0)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        self.calls['copy_rates_from_pos'] += 1
+        return np.array([(1700000000 + 60 * i, 1.1, 1.2, 1.0, 1.1, 10, 2, 0) for i in range(count)])
+
+    def last_error(self):
+        return (0, 'ok')
+
+
+def _connector(monkeypatch, fake):
+    monkeypatch.setattr(m5, 'mt5', fake)
+    conn = m5.MT5Connector(m5.ConnectionConfig(login=0, password='', server='', liveness_interval=60.0))
+    conn.connected = True
+    return conn
+
+
+def test_data_calls_cost_one_terminal_request(monkeypatch):
+    fake = _FakeMT5()
+    conn = _connector(monkeypatch, fake)
+    # Registered at bootstrap, before any request has created a histogram
+    exporter = PrometheusExporter()
+    exporter.set_connector_latency(conn)
+    assert 'mt5_request_latency_seconds' not in exporter.export_text()
+
+    for _ in range(5):
+        assert len(conn.get_rates('eurusd', 1, 3)) == 3
+
+    # One liveness probe, one symbol resolution, then only the rate requests
+    assert fake.calls['terminal_info'] == 1
+    assert fake.calls['copy_rates_from_pos'] == 5
+    assert fake.calls['symbol_select'] == 2  # 'eurusd' then matched 'EURUSD'
+
+    assert conn.get_point('EURUSD') == 0.00001
+    assert conn.get_min_lot('EURUSD') == 0.01
+    assert conn.get_point_value('EURUSD') == 0.00001 * 100000.0
+    assert fake.calls['symbol_info'] == 1  # spec cached while matching the symbol
+
+    stats = conn.get_latency_stats()
+    assert stats['copy_rates_from_pos']['count'] == 5
+    assert 'Cthulu_mt5_request_latency_seconds_count{op="copy_rates_from_pos"} 5' in exporter.export_text()
+
+
+def test_caches_reset_on_disconnect_and_failed_call(monkeypatch):
+    fake = _FakeMT5()
+    conn = _connector(monkeypatch, fake)
+    conn.get_rates('EURUSD', 1, 2)
+    conn.get_point('EURUSD')
+    assert conn._symbol_map and conn._symbol_specs
+
+    conn._reset_session_cache()  # as on connect()/disconnect()
+    assert not conn._symbol_map and not conn._symbol_specs
+
+    # A failed data call forces a fresh liveness probe on the next call
+    conn.get_rates('EURUSD', 1, 2)
+    probes = fake.calls['terminal_info']
+    fake.copy_rates_from_pos = lambda *a: None
+    assert conn.get_rates('EURUSD', 1, 2) is None
+    fake.alive = False
+    conn.connect = lambda: False
+    assert conn.get_rates('EURUSD', 1, 2) is None
+    assert fake.calls['terminal_info'] == probes + 1
+
+
+def test_request_throttle_is_opt_in_and_skips_cache_hits(monkeypatch):
+    fake = _FakeMT5()
+    sleeps = []
+    monkeypatch.setattr(m5.time, 'sleep', sleeps.append)
+    conn = _connector(monkeypatch, fake)
+    for _ in range(3):
+        conn.get_rates('EURUSD', 1, 2)
+        conn.get_point('EURUSD')
+    assert sleeps == []  # no throttle by default
+
+    monkeypatch.setattr(m5, 'mt5', fake)
+    throttled = m5.MT5Connector(m5.ConnectionConfig(login=0, password='', server='', liveness_interval=60.0,
+                                                    min_request_interval=10.0))
+    throttled.connected = True
+    throttled.get_point('EURUSD')  # symbol_info fetch, then served from the spec cache
+    throttled.get_rates('EURUSD', 1, 2)
+    throttled.get_point('EURUSD')
+    throttled.get_min_lot('EURUSD')
+    assert len(sleeps) == 1  # only the second terminal request waited
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from cthulu.backtesting.multi_fidelity import (
+    halving_schedule,
+    SuccessiveHalvingScheduler,
+    BacktestStateCache,
+)
+from cthulu.backtesting.auto_optimizer import (
+    AutoOptimizer,
+    run_config_backtest,
+    objective_score,
+    build_strategies,
+    build_backtest_config,
+)
+from cthulu.backtesting.engine import BacktestEngine
+from cthulu.backtesting.optimizer import WalkForwardOptimizer
+
+
+def _make_ohlcv(n=900, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range('2025-01-01', periods=n, freq='15min')
+    price = 100 + np.sin(np.linspace(0, 10 * np.pi, n)) * 3 + np.cumsum(rng.normal(0, 0.1, n))
+    return pd.DataFrame({
+        'open': price,
+        'high': price + 0.3,
+        'low': price - 0.3,
+        'close': price,
+        'volume': rng.integers(100, 1000, n),
+    }, index=idx)
+
+
+def _config(fast, slow):
+    return {
+        'strategy': {'type': 'ema_crossover', 'params': {'symbol': 'TEST', 'fast_period': fast, 'slow_period': slow}},
+        'backtest': {'initial_capital': 10000.0, 'position_size_pct': 0.1},
+    }
+
+
+def _engine(config):
+    return BacktestEngine(build_strategies(config), build_backtest_config(config))
+
+
+def test_halving_schedule_shrinks_candidates_and_grows_budget():
+    rungs = halving_schedule(27, 2700, eta=3, min_budget=200)
+    assert rungs == [(27, 300), (9, 900), (3, 2700)]
+    assert halving_schedule(4, 100, eta=3, min_budget=200) == [(4, 100)]
+    assert halving_schedule(10, 1000, eta=3, min_budget=50, n_final=4)[-1] == (4, 1000)
+
+
+def test_resumed_run_matches_full_run():
+    data = _make_ohlcv()
+    config = _config(9, 21)
+    scheduler = SuccessiveHalvingScheduler(_engine, lambda m: objective_score(m, 'sharpe_ratio'))
+
+    key = 'candidate'
+    scheduler._advance(key, config, data, 300)
+    metrics, bars = scheduler._advance(key, config, data, len(data))
+
+    full = run_config_backtest(data, config)
+    assert bars == len(data)
+    for name in ('total_trades', 'total_return', 'max_drawdown', 'sharpe_ratio'):
+        assert np.isclose(metrics[name], full[name])
+
+
+def test_scheduler_promotes_top_candidates_and_reuses_disk_cache(tmp_path):
+    data = _make_ohlcv()
+    configs = [_config(fast, slow) for fast in (5, 8, 12) for slow in (20, 30, 40)]
+
+    def run():
+        cache = BacktestStateCache(str(tmp_path))
+        scheduler = SuccessiveHalvingScheduler(
+            _engine, lambda m: objective_score(m, 'total_return'), min_bars=100, cache=cache
+        )
+        return scheduler.run(data, configs), cache
+
+    results, cache = run()
+    assert len(results) == len(configs)
+    assert sum(r.bars_evaluated == len(data) for r in results) == 1
+    assert results[0].bars_evaluated == len(data)
+    # Every promotion resumed a cached engine instead of restarting
+    assert cache.misses == len(configs)
+    assert cache.hits == 3 + 1
+
+    again, cache = run()
+    assert cache.misses == 0
+    assert [r.score for r in again] == [r.score for r in results]
+
+
+def test_grid_search_successive_halving(tmp_path):
+    data = _make_ohlcv(600)
+    optimizer = AutoOptimizer(output_dir=str(tmp_path))
+    results = optimizer.optimize_grid_search(
+        data=data,
+        param_grid={'strategy.params.fast_period': [5, 9, 13], 'strategy.params.slow_period': [21, 34, 55]},
+        base_config=_config(9, 21),
+        objective='total_return',
+        successive_halving=True,
+        min_bars=100,
+    )
+    assert len(results) == 9
+    assert results[0].metrics['bars_processed'] == len(data)
+    assert sorted(r.iteration for r in results) == list(range(9))
+
+
+def test_walk_forward_halving_only_runs_new_windows():
+    calls = []
+
+    class Metrics:
+        def __init__(self, value):
+            self.sharpe_ratio = value
+
+    def backtest_fn(data, strategy_class, params):
+        calls.append(params['x'])
+        return Metrics(params['x'])
+
+    data = _make_ohlcv(900)
+    optimizer = WalkForwardOptimizer(num_windows=9)
+    result = optimizer.optimize(data, object, {'x': list(range(9))}, backtest_fn, successive_halving=True)
+
+    assert result.best_params == {'x': 8}
+    evaluated = {r['params']['x']: r['windows_evaluated'] for r in result.all_results}
+    assert evaluated[8] == 9 and evaluated[0] == 1
+    # 9 x 1 + 3 x 2 more + 1 x 6 more windows, two backtests each, plus the final full run
+    assert len(calls) == 2 * (9 + 6 + 6) + 1
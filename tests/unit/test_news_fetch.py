@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cthulu.news.base import NewsEvent
+from cthulu.news.fred_adapter import FREDAdapter
+from cthulu.news.ingest import NewsIngestor
+from cthulu.news.manager import NewsManager
+from cthulu.news.rss_adapter import RssAdapter
+from cthulu.news.store import NewsEventStore
+from cthulu.news.tradingeconomics_adapter import TradingEconomicsAdapter
+
+
+def _rss(*titles):
+    items = ''.join(f'<item><title>{t}</title><description>{t} body</description></item>' for t in titles)
+    return f'<rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    routes = {
+        '/rss': (0.0, 'application/rss+xml', _rss('Gold rallies', 'XAU steady')),
+        '/mirror': (0.0, 'application/rss+xml', _rss('Gold rallies')),
+        '/slow': (0.8, 'application/rss+xml', _rss('Late gold story')),
+        '/fred/series/observations': (0.0, 'application/json',
+                                      json.dumps({'observations': [{'date': '2031-03-01', 'value': '1.5'}]}).encode()),
+        '/te/calendar': (0.0, 'application/json',
+                         json.dumps([{'country': 'United States', 'event': 'CPI', 'importance': 3}]).encode()),
+    }
+
+    def do_GET(self):
+        route = self.routes.get(self.path.split('?')[0])
+        if route is None:
+            self.send_error(404)
+            return
+        delay, content_type, body = route
+        time.sleep(delay)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def test_concurrent_round_dedup_and_since(server, tmp_path):
+    slow = RssAdapter([f'{server}/slow'])
+    slow.provider_name, slow.deadline = 'slow_rss', 0.2
+    mirror = RssAdapter([f'{server}/mirror'])
+    mirror.provider_name = 'mirror'
+    adapters = [
+        RssAdapter([f'{server}/rss']), mirror, slow,
+        FREDAdapter(api_key='k', series=['GDP'], base_url=f'{server}/fred'),
+        TradingEconomicsAdapter(api_key='k', base_url=f'{server}/te'),
+    ]
+    store = NewsEventStore(str(tmp_path / 'news.jsonl'))
+    manager = NewsManager(adapters, store=store, deadline=5.0, failure_threshold=1)
+
+    start = time.monotonic()
+    fresh = manager.poll()
+    assert time.monotonic() - start < 0.7  # the slow feed does not hold up the round
+    assert sorted(e.headline for e in fresh) == ['CPI', 'FRED GDP latest 2031-03-01: 1.5', 'Gold rallies', 'XAU steady']
+    stats = manager.get_stats()['adapters']
+    assert stats['slow_rss']['timeouts'] == 1 and stats['mirror']['events'] == 1
+
+    # The late feed still lands in the store and trips its breaker
+    time.sleep(1.0)
+    assert [e.headline for e in store.window(symbol='GOLD')][-1] == 'Late gold story'
+    assert manager.get_stats()['adapters']['slow_rss']['breaker'] == 'open'
+
+    _, cursor = manager.since(0.0)
+    assert manager.poll() == []  # everything already seen
+    assert manager.get_stats()['adapters']['slow_rss']['failures'] == 1  # skipped by the open breaker
+    assert manager.since(cursor) == ([], cursor)
+    gold, _ = manager.since(0.0, symbol='gold')
+    assert [e.headline for e in gold] == ['Gold rallies', 'XAU steady', 'Late gold story']
+    manager.close()
+
+    # Append-only file replays on restart; a torn last line is skipped
+    with open(tmp_path / 'news.jsonl', 'a') as fh:
+        fh.write('{"provider": "rss", "ts"')
+    reopened = NewsEventStore(str(tmp_path / 'news.jsonl'))
+    assert len(reopened) == 5 and reopened.get_stats()['corrupt_lines'] == 1
+    assert not reopened.add(gold[0])
+    assert reopened.add(NewsEvent(provider='rss', ts=time.time(), symbol='GOLD', headline='After the crash', body='', meta={}))
+    reopened.close()
+
+    # The fragment was cut off, so the record appended after it reads back cleanly
+    reopened = NewsEventStore(str(tmp_path / 'news.jsonl'))
+    assert len(reopened) == 6 and reopened.get_stats()['corrupt_lines'] == 0
+    assert reopened.window(symbol='GOLD')[-1].headline == 'After the crash'
+    reopened.close()
+
+
+def test_store_drops_events_past_retention(tmp_path):
+    now = [1000.0]
+    path = str(tmp_path / 'news.jsonl')
+    event = lambda i: NewsEvent(provider='rss', ts=i, symbol='GOLD', headline=f'story {i}', body='', meta={})
+    store = NewsEventStore(path, clock=lambda: now[0], retention_seconds=60, compact_interval=50)
+    for i in range(4):
+        store.add(event(i))
+        now[0] += 40
+    # Compacted on the add at t=1080: the event from t=1000 has expired
+    assert [e.headline for e in store.window()] == ['story 1', 'story 2', 'story 3']
+    fresh, cursor = store.since(1050.0)
+    assert [e.headline for e in fresh] == ['story 2', 'story 3']
+    store.close()
+
+    now[0] = 1175.0  # story 1 (t=1040) and story 2 (t=1080) are now past retention
+    reopened = NewsEventStore(path, clock=lambda: now[0], retention_seconds=60)
+    assert [e.headline for e in reopened.window()] == ['story 3']
+    assert reopened.get_stats()['expired'] == 2
+    assert reopened.add(event(0))  # an expired event may be stored again
+    reopened.close()
+    with open(path) as fh:
+        assert len(fh.readlines()) == 2
+
+
+def test_fetch_recent_and_ingestor_skip_duplicates(server):
+    manager = NewsManager([RssAdapter([f'{server}/rss']), RssAdapter([f'{server}/mirror'])],
+                          store=NewsEventStore(), cache_ttl=0)
+    assert [e.headline for e in manager.fetch_recent()] == ['Gold rallies', 'XAU steady']
+
+    class Collector:
+        def __init__(self):
+            self.events = []
+
+        def record_event(self, event_type, payload):
+            self.events.append((event_type, payload['headline']))
+
+    collector = Collector()
+    ingestor = NewsIngestor(manager, RssAdapter([f'{server}/mirror']), collector)
+    assert ingestor.ingest_once() == 3
+    assert ingestor.ingest_once() == 0
+    assert collector.events == [('news_event', 'Gold rallies'), ('news_event', 'XAU steady'),
+                                ('calendar_event', 'Gold rallies')]
+    manager.close()
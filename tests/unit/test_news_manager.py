@@ -1,6 +1,7 @@
 from cthulu.news.newsapi_adapter import NewsApiAdapter
 from cthulu.news.rss_adapter import RssAdapter
 from cthulu.news.manager import NewsManager
+from cthulu.news.store import NewsEventStore
 
 
 def test_news_manager_fallback(tmp_path, monkeypatch):
@@ -17,7 +18,7 @@ def test_news_manager_fallback(tmp_path, monkeypatch):
                 type('E', (), {'provider': 'rss', 'ts': 0, 'symbol': 'GOLD', 'headline': 'h', 'body': 'b', 'meta': {}})()
             ]
 
-    manager = NewsManager([FailAdapter(api_key='x'), SuccessAdapter()], cache_ttl=1)
+    manager = NewsManager([FailAdapter(api_key='x'), SuccessAdapter()], cache_ttl=1, store=NewsEventStore())
     events = manager.fetch_recent()
     assert events and events[0].symbol == 'GOLD'
 
@@ -1,10 +1,11 @@
 from cthulu.news.manager import NewsManager
 from cthulu.news.fred_adapter import FREDAdapter
+from cthulu.news.store import NewsEventStore
 
 
 def test_manager_with_fred_no_key():
     a = FREDAdapter(api_key=None)
-    mgr = NewsManager(adapters=[a], cache_ttl=1)
+    mgr = NewsManager(adapters=[a], cache_ttl=1, store=NewsEventStore())
     assert mgr.fetch_recent() == []
 
 
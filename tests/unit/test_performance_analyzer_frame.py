@@ -0,0 +1,101 @@
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.integrations.performance_analyzer import PerformanceAnalyzer
+from cthulu.persistence.database import Database, SignalRecord, TradeRecord
+from cthulu.utils.event_log import EventLogWriter
+
+AS_OF = datetime(2031, 6, 1, 0, 0, 0)
+
+
+def _trades(n, seed=0, years=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp(AS_OF) - pd.to_timedelta(rng.integers(0, years * 365 * 86400, n), unit='s'),
+        'symbol': rng.choice(['EURUSD', 'GOLD'], n),
+        'strategy': rng.choice(['scalping', 'mean_reversion', None], n),
+        'regime': rng.choice(['ranging', 'VOLATILE'], n),
+        'pnl': rng.normal(0.2, 5.0, n),
+    })
+
+
+def test_reports_match_per_group_reference():
+    trades = _trades(3000)
+    analyzer = PerformanceAnalyzer()
+    analyzer.load_trades(trades, as_of=AS_OF)
+    assert analyzer.analytics_mode
+
+    window = trades[(trades['symbol'] == 'EURUSD') & (trades['timestamp'] >= AS_OF - timedelta(days=90))]
+    ranging = window[window['regime'] == 'ranging']
+    insight = analyzer.analyze_regime_performance('eurusd')['RANGING']
+    assert insight.sample_size == len(ranging)
+    assert insight.value == pytest.approx((ranging['pnl'] > 0).mean())
+    assert insight.confidence == pytest.approx(analyzer._calculate_confidence(len(ranging), insight.value))
+    assert len(insight.supporting_data) == 10
+
+    hours = analyzer.analyze_time_of_day_performance('EURUSD')
+    counts = window['timestamp'].dt.hour.value_counts()
+    assert set(hours) == set(counts[counts >= 5].index)
+
+    strategies = analyzer.analyze_strategy_effectiveness('EURUSD', regime='VOLATILE')
+    assert set(strategies) == {'scalping', 'mean_reversion'}  # untagged trades are not a strategy
+    scalping = window[(window['strategy'] == 'scalping') & (window['regime'] == 'VOLATILE')]
+    assert strategies['scalping'].sample_size == len(scalping)
+    assert strategies['scalping'].condition == 'Strategy: scalping in VOLATILE'
+
+    drawdown = analyzer.analyze_drawdown_patterns('EURUSD')
+    losses = window[window['pnl'] < 0]
+    assert drawdown['total_losses'] == len(losses)
+    assert drawdown['strategy_distribution']['UNKNOWN'] == losses['strategy'].isna().sum()
+    equity = window.sort_values('timestamp')['pnl'].cumsum()
+    assert drawdown['max_drawdown'] == pytest.approx(min(0.0, (equity - equity.cummax().clip(lower=0)).min()))
+
+
+def test_full_report_over_years_of_trades_is_fast():
+    analyzer = PerformanceAnalyzer()
+    analyzer.load_trades(_trades(300_000, years=5), as_of=AS_OF)
+    start = time.perf_counter()
+    report = analyzer.generate_performance_report('GOLD', lookback_days=5 * 365)
+    assert time.perf_counter() - start < 1.0
+    assert sum(r['sample_size'] for r in report['regime_performance'].values()) > 100_000
+    assert len(report['time_of_day_performance']) == 24
+
+
+def test_load_from_database_and_training_log(tmp_path):
+    db = Database(str(tmp_path / 'cthulu.db'))
+    for i, (regime, pnl) in enumerate([('RANGING', 5.0), ('RANGING', -2.0), ('VOLATILE', 1.0)]):
+        db.record_signal(SignalRecord(signal_id=f's{i}', timestamp=AS_OF, symbol='EURUSD', timeframe='M15',
+                                      side='long', action='buy', confidence=0.7,
+                                      metadata=json.dumps({'regime': regime, 'strategy': 'scalping'})))
+        db.record_trade(TradeRecord(signal_id=f's{i}', order_id=i, symbol='EURUSD', side='BUY',
+                                    volume=0.1, entry_price=1.1, entry_time=AS_OF - timedelta(hours=i)))
+        db.update_trade_exit(i, 1.2, AS_OF, pnl, 'tp')
+    db.record_trade(TradeRecord(signal_id='open', symbol='EURUSD', side='BUY', volume=0.1,
+                                entry_price=1.1, entry_time=AS_OF))
+
+    analyzer = PerformanceAnalyzer()
+    assert analyzer.load_from_database(db, as_of=AS_OF) == 3
+    regimes = analyzer.analyze_regime_performance('EURUSD')
+    assert regimes['RANGING'].sample_size == 2 and regimes['RANGING'].value == pytest.approx(0.5)
+    assert analyzer.analyze_strategy_effectiveness('EURUSD')['scalping'].sample_size == 3
+    db.close()
+
+    closed = lambda pnl, outcome: {'symbol': 'GOLD', 'pnl': pnl, 'outcome': outcome, 'strategy_name': 'orb',
+                                   'timestamp': (AS_OF - timedelta(days=1)).isoformat()}
+    with gzip.open(tmp_path / 'events.20310601T000000Z.jsonl.gz', 'wt', encoding='utf-8') as f:
+        for event_type, payload in [('trade_closed', closed(3.0, 'WIN')), ('order_request', {'symbol': 'GOLD'}),
+                                    ('trade_closed', closed(-1.0, 'LOSS'))]:
+            f.write(json.dumps({'ts': AS_OF.isoformat() + 'Z', 'event_type': event_type, 'payload': payload}) + '\n')
+    with EventLogWriter(str(tmp_path / 'events.20310601T010000Z.evlog')) as writer:
+        writer.append('trade_closed', closed(-4.0, 'LOSS'))
+
+    assert analyzer.load_from_training_log(str(tmp_path), as_of=AS_OF) == 3
+    orb = analyzer.analyze_strategy_effectiveness('GOLD')['orb']
+    assert orb.sample_size == 3 and orb.value == pytest.approx(1 / 3)
+    assert analyzer.analyze_drawdown_patterns('GOLD')['max_losing_streak'] == 2
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from cthulu.backtesting.engine import BacktestEngine, BacktestConfig, prepare_backtest_frame
+from cthulu.backtesting.portfolio import PortfolioBacktestEngine, PortfolioConfig
+from cthulu.strategy.sma_crossover import SmaCrossover
+
+
+def _bars(seed, n=600, start='2024-01-01', freq='15min', base=100.0):
+    rng = np.random.default_rng(seed)
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.003, n)) + 0.02 * np.sin(np.arange(n) / 25))
+    spread = np.abs(rng.normal(0, 0.002, n)) * close
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+        'volume': rng.integers(100, 1000, n),
+    }, index=pd.date_range(start, periods=n, freq=freq))
+
+
+def _strategy():
+    return SmaCrossover({'short_window': 5, 'long_window': 20, 'risk_reward_ratio': 1.5})
+
+
+def _trade_rows(trades):
+    return [(t.symbol, t.side.value, t.entry_time, t.exit_time, round(t.entry_price, 8),
+             round(t.exit_price, 8), round(t.pnl, 8), t.exit_reason) for t in trades]
+
+
+def test_single_symbol_matches_backtest_engine():
+    data = _bars(1)
+    config = BacktestConfig(max_positions=1, enable_short_selling=False)
+
+    reference = BacktestEngine([_strategy()], BacktestConfig(**vars(config)))
+    expected = reference.run(prepare_backtest_frame(data, [_strategy()]))
+    for trade in expected['trades']:
+        trade.symbol = 'EURUSD'
+
+    portfolio = PortfolioBacktestEngine([_strategy()], config, PortfolioConfig(n_workers=1))
+    result = portfolio.run({'EURUSD': data})
+
+    assert expected['trades']
+    assert _trade_rows(result['trades']) == _trade_rows(expected['trades'])
+    assert [e for _, e in result['equity_curve']] == [e for _, e in expected['equity_curve']]
+
+
+def test_shared_limits_and_deterministic_merge():
+    # Different sessions/frequencies so the merged clock is not any single symbol's index
+    data = {
+        'EURUSD': _bars(2),
+        'GBPUSD': _bars(3, start='2024-01-01 02:00'),
+        'XAUUSD': _bars(4, n=300, freq='30min', base=2000.0),
+    }
+    config = BacktestConfig(max_positions=2)
+
+    serial = PortfolioBacktestEngine([_strategy()], config, PortfolioConfig(n_workers=1)).run(data)
+    parallel = PortfolioBacktestEngine([_strategy()], config, PortfolioConfig(n_workers=3)).run(data)
+
+    assert _trade_rows(serial['trades']) == _trade_rows(parallel['trades'])
+    assert serial['equity_curve'] == parallel['equity_curve']
+    assert {t.symbol for t in serial['trades']} == set(data)
+    assert serial['rejections'].get('max_positions', 0) > 0
+    assert sum(s['trades'] for s in serial['per_symbol'].values()) == len(serial['trades'])
+
+    # Never more than max_positions open at once, at most one per symbol
+    events = sorted([(t.entry_time, 1, t.symbol) for t in serial['trades']] +
+                    [(t.exit_time, -1, t.symbol) for t in serial['trades']],
+                    key=lambda e: (e[0], e[1]))
+    open_count, per_symbol = 0, {}
+    for _, delta, symbol in events:
+        open_count += delta
+        per_symbol[symbol] = per_symbol.get(symbol, 0) + delta
+        assert open_count <= 2 and per_symbol[symbol] <= 1
+
+
+def test_correlation_limit_blocks_stacked_exposure():
+    base = _bars(5)
+    twin = base * 1.0001  # same moves, so the same crossovers on the same bars
+    data = {'EURUSD': base, 'EURUSD.x': twin}
+    config = BacktestConfig(max_positions=4)
+
+    free = PortfolioBacktestEngine([_strategy()], config, PortfolioConfig(n_workers=1)).run(data)
+    limited = PortfolioBacktestEngine(
+        [_strategy()], config, PortfolioConfig(n_workers=1, correlation_limit=0.9, correlation_window=50)
+    ).run(data)
+
+    assert {t.symbol for t in free['trades']} == set(data)
+    assert limited['rejections']['correlation'] > 0
+    assert len(limited['trades']) < len(free['trades'])
+
+
+def test_batch_signals_match_bar_replay():
+    data = {'EURUSD': _bars(6), 'GBPUSD': _bars(7)}
+    config = BacktestConfig(max_positions=2)
+    batch = PortfolioBacktestEngine([_strategy()], config, PortfolioConfig(n_workers=1)).run(data)
+    replay = PortfolioBacktestEngine(
+        [_strategy()], config, PortfolioConfig(n_workers=1, batch_signals=False)
+    ).run(data)
+
+    assert batch['trades']
+    assert _trade_rows(batch['trades']) == _trade_rows(replay['trades'])
+    assert batch['per_symbol']['EURUSD']['signals'] == replay['per_symbol']['EURUSD']['signals']
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.cognition.regime_classifier import MarketRegimeClassifier
+from cthulu.cognition.regime_service import RegimeService, get_regime_service
+from cthulu.risk.adaptive_drawdown import AdaptiveDrawdownManager
+from cthulu.strategy.strategy_selector import StrategySelector, regime_inputs, classify_market_regime
+from cthulu.strategy.sma_crossover import SmaCrossover
+
+
+def _frame(seed=3, n=400):
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.choice([-0.003, 0.0, 0.003], size=n // 50 + 1), 50)[:n]
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.006, n)))
+    wick = np.abs(rng.normal(0, 0.003, n)) * close
+    df = pd.DataFrame({
+        'open': close, 'high': close + wick, 'low': close - wick, 'close': close,
+        'volume': rng.integers(100, 1000, n).astype(float),
+        'adx': rng.uniform(10, 45, n),
+        'rsi': rng.uniform(20, 80, n),
+        'macd': rng.normal(0, 1, n),
+        'macd_signal': rng.normal(0, 1, n),
+        'atr': wick * 2,
+    }, index=pd.date_range('2031-03-01', periods=n, freq='15min'))
+    middle, std = df['close'].rolling(20).mean(), df['close'].rolling(20).std()
+    df['bb_upper'] = middle + 2 * std
+    df['bb_lower'] = middle - 2 * std
+    df.attrs['symbol'] = 'EURUSD'
+    return df
+
+
+@pytest.fixture
+def shared_service():
+    service = get_regime_service()
+    service.clear()
+    yield service
+    service.clear()
+
+
+def test_incremental_features_match_full_frame():
+    full = _frame()
+    service = RegimeService()
+    regimes = set()
+    for end in range(30, len(full) + 1):
+        final = full.iloc[max(0, end - 300):end]
+        # First sighting of a bar has a provisional close; the window re-reads it next bar
+        forming = final.copy()
+        forming.iloc[-1, forming.columns.get_loc('close')] *= 1.001
+
+        snapshot = service.update('EURUSD', 'M15', forming)
+        expected = regime_inputs(forming)
+        assert snapshot.features['returns'] == pytest.approx(expected['returns'], rel=1e-9, abs=1e-15)
+        assert snapshot.features['volatility'] == pytest.approx(expected['volatility'], rel=1e-9, abs=1e-15)
+        assert snapshot.features['atr_avg'] == pytest.approx(forming['atr'].iloc[-20:].mean())
+        if end >= 50:
+            assert snapshot.selector_regime == classify_market_regime(expected)
+            regimes.add(snapshot.selector_regime)
+
+        # A moved close re-classifies the bar; an unchanged one reuses the snapshot
+        closed = service.update('EURUSD', 'M15', final)
+        assert closed is not snapshot
+        assert service.update('EURUSD', 'M15', final) is closed
+        assert service.lookup(final) is closed
+        assert service.lookup(forming) is None
+        expected = regime_inputs(final)
+        assert closed.features['returns'] == pytest.approx(expected['returns'], rel=1e-9, abs=1e-15)
+        if end >= 50:
+            assert closed.selector_regime == classify_market_regime(expected)
+
+    assert len(regimes) >= 3
+    stats = service.get_stats()
+    assert stats['computations'] == 2 * (len(full) - 30 + 1)
+    assert stats['cached_updates'] == len(full) - 30 + 1
+    # Only the newest bar is re-read as it forms, never the whole frame again
+    assert stats['rows_read'] <= 3 * len(full) + 30
+
+
+def test_consumers_share_one_computation_per_bar(shared_service):
+    df = _frame(seed=5)
+    published = []
+    manager = AdaptiveDrawdownManager()
+    shared_service.subscribe(published.append)
+    shared_service.subscribe(manager.on_regime_update)
+    shared_service.subscribe(manager.on_regime_update)  # duplicate subscriptions are ignored
+
+    snapshot = shared_service.update('EURUSD', 'M15', df)
+    assert shared_service.update('EURUSD', 'M15', df) is snapshot
+    assert published == [snapshot]
+
+    # Selector reuses the published regime instead of recomputing it
+    selector = StrategySelector([SmaCrossover({'short_window': 5, 'long_window': 20})])
+    assert selector.detect_market_regime(df) == snapshot.selector_regime
+    assert selector.detect_market_regime(df) == classify_market_regime(regime_inputs(df))
+    assert shared_service.get_stats()['lookup_hits'] == 2
+
+    # Cognition classifies the bar once however many consumers ask
+    classifier = MarketRegimeClassifier()
+    calls = []
+    original = classifier.classify
+    classifier.classify = lambda data: calls.append(1) or original(data)
+    states = [shared_service.regime_state(df, classifier) for _ in range(5)]
+    assert len(calls) == 1 and all(s is states[0] for s in states)
+
+    # A frame that was never published falls back to the consumer's own computation
+    other = _frame(seed=6)
+    other.attrs['symbol'] = 'GBPUSD'
+    assert shared_service.lookup(other) is None
+    assert shared_service.regime_state(other, classifier) is None
+
+    # Risk consumer classifies from the pushed snapshot
+    manager.update(10000, 10000)
+    inputs = snapshot.drawdown_inputs()
+    assert inputs['trend_direction'] == snapshot.trend_direction
+    assert manager.metrics.regime == manager._detect_regime(inputs)
+    assert shared_service.get_stats()['computations'] == 1
+    shared_service.unsubscribe(published.append)
+    shared_service.unsubscribe(manager.on_regime_update)
@@ -0,0 +1,117 @@
+"""
+Tests for the array-backed replay buffers and the vectorized DQN update.
+"""
+
+import numpy as np
+import pytest
+
+from cthulu.ML_RL.rl_position_sizer import (
+    PrioritizedReplayBuffer, QNetwork, ReplayBuffer, RLExperience, RLPositionSizer,
+    RLState, SizeAction, SumTree
+)
+
+
+def _transitions(n, rng):
+    return (
+        rng.random((n, 11)).astype(np.float32),
+        rng.integers(0, 6, n),
+        rng.normal(size=n),
+        rng.random((n, 11)).astype(np.float32),
+        rng.random(n) < 0.5,
+    )
+
+
+def test_ring_buffer_wraps_and_batches_match_single_pushes():
+    rng = np.random.default_rng(0)
+    states, actions, rewards, next_states, dones = _transitions(25, rng)
+
+    single = ReplayBuffer(capacity=10)
+    for i in range(25):
+        single.push(RLExperience(states[i], int(actions[i]), float(rewards[i]), next_states[i], bool(dones[i])))
+    batched = ReplayBuffer(capacity=10)
+    batched.push_batch(states[:7], actions[:7], rewards[:7], next_states[:7], dones[:7])
+    batched.push_batch(states[7:], actions[7:], rewards[7:], next_states[7:], dones[7:])
+
+    assert len(single) == len(batched) == 10
+    assert single.data.tobytes() == batched.data.tobytes()
+    # Only the newest 10 transitions survive
+    assert sorted(single.data['reward']) == sorted(rewards[15:])
+
+    batch = batched.sample_batch(64)
+    assert batch.states.shape == (64, 11) and batch.actions.shape == (64,)
+    assert np.all(np.isin(batch.rewards, rewards[15:]))
+    assert np.all(batch.weights == 1)
+    assert all(isinstance(e, RLExperience) for e in batched.sample(4))
+
+
+def test_train_on_actions_matches_full_target_backward():
+    rng = np.random.default_rng(1)
+    states, actions, rewards, _, _ = _transitions(64, rng)
+    a, b = QNetwork(), QNetwork()
+
+    for _ in range(3):
+        # Old formulation: target = current Q with the taken actions replaced
+        target_q = a.forward(states).copy()
+        for i, action in enumerate(actions):
+            target_q[i, action] = rewards[i]
+        loss_a = a.backward(states, target_q)
+        loss_b, td_errors = b.train_on_actions(states, actions, rewards)
+
+        assert loss_b == pytest.approx(loss_a)
+        for name in ('W1', 'b1', 'W2', 'b2', 'W3', 'b3'):
+            np.testing.assert_allclose(getattr(b, name), getattr(a, name), rtol=1e-10, atol=1e-12)
+
+    expected_td = rewards - b.forward(states)[np.arange(64), actions]
+    _, td_errors = b.train_on_actions(states, actions, rewards, learning_rate=0.0)
+    np.testing.assert_allclose(td_errors, expected_td)
+
+
+def test_sum_tree_samples_proportionally_and_per_updates_priorities():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 3.0, 0.0, 6.0]))
+    assert tree.total == pytest.approx(10.0)
+    assert list(tree.find(np.array([0.5, 1.5, 3.9, 4.1, 9.99]))) == [0, 2, 2, 4, 4]
+
+    np.random.seed(0)
+    rng = np.random.default_rng(2)
+    buffer = PrioritizedReplayBuffer(capacity=100, alpha=1.0, beta=1.0, beta_increment=0.0)
+    buffer.push_batch(*_transitions(100, rng))
+    priorities = np.ones(100)
+    priorities[:10] = 10.0
+    buffer.update_priorities(np.arange(100), priorities)
+
+    counts = np.bincount(np.concatenate([buffer.sample_batch(64).indices for _ in range(200)]), minlength=100)
+    # The ten high-priority slots hold 100 / 190 of the mass
+    assert counts[:10].sum() / counts.sum() == pytest.approx(100 / 190, abs=0.03)
+    batch = buffer.sample_batch(64)
+    assert batch.weights.max() == pytest.approx(1.0)
+    assert np.all(batch.weights[np.isin(batch.indices, np.arange(10))] < 0.2)
+
+    # New transitions enter at the maximum priority seen so far
+    indices = buffer.push_batch(*_transitions(3, rng))
+    assert np.allclose(buffer.tree.leaves(indices), 10.0)
+
+
+def test_sizer_batch_paths():
+    np.random.seed(3)
+    fields = dict(trend_strength=0.7, volatility_regime=0.5, momentum_score=0.3,
+                  signal_confidence=0.8, entry_quality=0.75, risk_reward_ratio=7.0,
+                  current_exposure_pct=0.05, win_rate_recent=0.55, drawdown_pct=0.03,
+                  max_position_pct=0.1, remaining_daily_risk=1.4)
+    matrix = RLState.batch_array(**{**fields, 'trend_strength': np.array([0.7, 0.2])})
+    assert matrix.shape == (2, 11)
+    np.testing.assert_array_equal(matrix[0], RLState(**fields).to_array())
+
+    sizer = RLPositionSizer(prioritized_replay=True, batch_size=32)
+    sizer.epsilon = 0.0
+    states = np.repeat(matrix, 50, axis=0)
+    actions, multipliers = sizer.select_actions(states, explore=False)
+    greedy, _ = sizer.select_action(RLState(**fields), explore=False)
+    assert np.all(actions[::2] == greedy.value)
+    assert np.all((multipliers >= 0) & (multipliers <= 2))
+    assert np.all(multipliers[actions == SizeAction.SKIP.value] == 0)
+
+    sizer.store_experiences(states, actions, np.full(100, 5.0), states, np.ones(100, dtype=bool))
+    before = sizer.replay_buffer.tree.total
+    assert sizer.train_step() >= 0
+    assert sizer.replay_buffer.tree.total != before
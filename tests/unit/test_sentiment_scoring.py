@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from cthulu.cognition.sentiment_analyzer import (
+    CalendarStore, EconomicEvent, EventImpact, KeywordSentimentAnalyzer, NewsItem, NewsStore,
+    SentimentAnalyzer
+)
+
+
+def test_keyword_scan_negation_window_and_phrases():
+    analyzer = KeywordSentimentAnalyzer()
+    assert analyzer.analyze("Gold rallies to record highs") == pytest.approx(1.0)
+    assert analyzer.analyze("Stocks crash as recession fears mount") == pytest.approx(-1.0)
+    assert analyzer.analyze("Nothing to see here") == 0.0
+
+    # Negation flips keywords up to three words later, not four
+    assert analyzer.analyze("Dollar not in a rally") < 0
+    assert analyzer.analyze("No sign of any more rally") > 0
+    # Mixed headline: (0.7 - 0.95) / 1.65
+    assert analyzer.analyze("Rally fades into crash") == pytest.approx((0.7 - 0.95) / 1.65)
+
+    analyzer.add_keyword("rate cut", 0.6, bullish=True)
+    analyzer.add_keyword("hawkish surprise", 0.8, bullish=False)
+    assert analyzer.analyze("Fed signals rate cut") == pytest.approx(0.6 / 1.0)
+    assert analyzer.analyze("Fed rules out rate hike") == 0.0
+    assert analyzer.analyze("Fed delivers no rate cut") == pytest.approx(-0.6)
+    assert analyzer.analyze("ECB hawkish surprise") == pytest.approx(-0.8)
+
+    analyzer.analyze("Fed signals rate cut")
+    stats = analyzer.get_stats()
+    assert stats['cache_hits'] == 1 and stats['cached'] == 4  # compile() dropped earlier scores
+
+    scores = analyzer.analyze_many(["Bullish breakout", "Fed signals rate cut", "quiet day"])
+    assert scores.tolist() == pytest.approx([1.0, 0.6, 0.0])
+
+
+def test_score_cache_is_bounded():
+    analyzer = KeywordSentimentAnalyzer(cache_size=3)
+    for i in range(5):
+        analyzer.analyze(f"headline {i} rally")
+    assert analyzer.get_stats()['cached'] == 3
+    analyzer.analyze("headline 4 rally")
+    assert analyzer.get_stats()['cache_hits'] == 1
+
+    # A hit makes the headline most recent, so the next eviction skips it
+    analyzer.analyze("headline 2 rally")
+    analyzer.analyze("headline 5 rally")
+    analyzer.analyze("headline 2 rally")
+    assert analyzer.get_stats()['cache_hits'] == 3
+    analyzer.analyze("headline 3 rally")
+    assert analyzer.get_stats()['scored'] == 7
+
+
+def test_news_and_calendar_stores_are_indexed():
+    now = datetime.utcnow()
+    news = NewsStore(retention=timedelta(hours=4))
+    item = lambda h, age, symbols: NewsItem(h, 'wire', now - timedelta(hours=age), 0.5, 0.8, symbols)
+    news.add(item('late', 1, ['EURUSD', 'GBPUSD']))
+    news.add(item('early', 3, ['EURUSD']))
+    news.add(item('stale', 5, ['EURUSD']))
+    assert [n.headline for n in news.since('EURUSD', now - timedelta(hours=4))] == ['early', 'late']
+    assert [n.headline for n in news.since('GBPUSD', now - timedelta(hours=2))] == ['late']
+    assert news.since('USDJPY', now - timedelta(hours=4)) == [] and len(news) == 2
+
+    calendar = CalendarStore()
+    event = lambda name, ccy, hours: EconomicEvent(name, ccy, EventImpact.HIGH, now + timedelta(hours=hours))
+    calendar.replace([event('NFP', 'USD', 1), event('CPI', 'EUR', 0.5), event('BoJ', 'JPY', 1), event('GDP', 'USD', 5)])
+    assert [e.name for e in calendar.for_currencies(['EUR', 'USD'])] == ['CPI', 'NFP', 'GDP']
+    assert [e.name for e in calendar.for_currencies(['USD'], now, now + timedelta(hours=2))] == ['NFP']
+    calendar.prune(now + timedelta(hours=2))
+    assert len(calendar) == 1
+
+
+def test_analyzer_uses_indexed_stores():
+    analyzer = SentimentAnalyzer()
+    analyzer.add_news("Euro surges on strong growth", "wire", ["eurusd"])
+    analyzer.add_news("Yen plunges", "wire", ["USDJPY"])
+    analyzer.add_event(name='Rate decision', currency='eur', impact='critical',
+                       scheduled_time=datetime.utcnow() + timedelta(minutes=30))
+    analyzer.add_event(name='Old release', currency='EUR', impact='high',
+                       scheduled_time=datetime.utcnow() - timedelta(hours=30))
+
+    sentiment = analyzer.get_sentiment('EURUSD')
+    assert sentiment.components['news'] == pytest.approx(1.0)
+    assert [e['name'] for e in sentiment.events] == ['Rate decision']
+    assert analyzer.should_avoid_trading('EURUSD') == (True, "Critical event: Rate decision")
+    assert analyzer.to_dict()['news_count'] == 2 and analyzer.to_dict()['events_count'] == 1
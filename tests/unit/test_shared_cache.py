@@ -0,0 +1,65 @@
+import threading
+import time
+
+from cthulu.utils.cache import SmartCache, symbol_spec
+from cthulu.observability.prometheus import PrometheusExporter
+
+
+class _Connector:
+    session_id = 0
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_symbol_spec(self, symbol):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return {'volume_min': 0.1, 'volume_step': 0.1, 'point': 0.01, 'contract_size': 100.0}
+
+
+class _LegacyConnector:
+    def get_symbol_info(self, symbol):
+        return {'volume_step': 0.01}
+
+    def get_min_lot(self, symbol):
+        return 0.02
+
+
+def test_symbol_spec_shared_across_threads_and_sessions():
+    conn = _Connector()
+    specs = []
+    threads = [threading.Thread(target=lambda: specs.append(symbol_spec(conn, 'XAUUSD'))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert conn.calls == 1
+    assert all(s['volume_min'] == 0.1 for s in specs)
+
+    conn.session_id = 1  # reconnect
+    symbol_spec(conn, 'XAUUSD')
+    assert conn.calls == 2
+
+    legacy = symbol_spec(_LegacyConnector(), 'EURUSD')
+    assert legacy == {'volume_step': 0.01, 'volume_min': 0.02}
+
+
+def test_risk_sizing_uses_cached_spec():
+    from cthulu.risk.evaluator import RiskEvaluator
+    conn = _Connector()
+    risk = RiskEvaluator(connector=conn, position_tracker=None)
+    volume = risk.calculate_position_size('XAUUSD', 1000.0, 'percent', 1.0, sl_points=10)
+    assert abs(volume - 1.0) < 1e-9  # risk 10 / (10 points * 0.01 * 100)
+    risk.calculate_position_size('XAUUSD', 1000.0, 'percent', 1.0, sl_points=10)
+    assert conn.calls == 1
+
+
+def test_named_cache_stats_exported():
+    cache = SmartCache(ttl_seconds=60, name='test_quotes')
+    cache.get_or_fetch('a', lambda: 1)
+    cache.get_or_fetch('a', lambda: 1)
+    text = PrometheusExporter().export_text()
+    assert 'Cthulu_cache_hits{cache="test_quotes"} 1' in text
+    assert 'Cthulu_cache_load_latency_seconds_count{cache="test_quotes"} 1' in text
@@ -0,0 +1,123 @@
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+import cthulu.connector.mt5_connector as m5
+import cthulu.execution.engine as engine_module
+from cthulu.connector import simulated_terminal as sim
+from cthulu.execution.engine import ExecutionEngine, OrderRequest, OrderType, OrderStatus
+
+
+def _bars(n=600, start='2024-03-04 00:00'):
+    index = pd.date_range(start, periods=n, freq='1min')
+    close = 1.1000 + 0.0001 * np.sin(np.arange(n) / 10.0)
+    # A sharp drop over bars 520-530 to trigger long stop losses
+    close[520:530] -= np.linspace(0, 0.0030, 10)
+    close[530:] -= 0.0030
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'open': open_.round(5), 'high': (np.maximum(open_, close) + 0.00005).round(5),
+        'low': (np.minimum(open_, close) - 0.00005).round(5), 'close': close.round(5),
+        'tick_volume': 10, 'spread': 8,
+    }, index=index)
+
+
+def _terminal(**kwargs):
+    spec = sim.SymbolSpec(name='EURUSD', point=0.00001, digits=5)
+    return sim.SimulatedTerminal({'EURUSD': _bars()}, specs={'EURUSD': spec}, speed=None,
+                                 warmup_bars=500, **kwargs)
+
+
+def test_rates_never_include_the_future():
+    terminal = _terminal()
+    terminal.initialize()
+    terminal.clock.advance(30)  # half way through bar 500
+
+    rates = terminal.copy_rates_from_pos('EURUSD', sim.TIMEFRAME_M1, 0, 5)
+    bars = _bars()
+    assert rates['time'][-1] == int(bars.index[500].timestamp())
+    assert rates['close'][-2] == bars['close'].iloc[499]
+    assert bars['low'].iloc[500] <= rates['close'][-1] <= bars['high'].iloc[500]
+
+    m15 = terminal.copy_rates_from_pos('EURUSD', sim.TIMEFRAME_M15, 0, 100)
+    assert np.all(np.diff(m15['time']) == 900)
+    assert m15['time'][-1] == int(bars.index[495].timestamp())  # 08:15 bucket, still forming
+
+    tick = terminal.symbol_info_tick('EURUSD')
+    assert np.isclose(tick.ask - tick.bid, 8 * 0.00001)
+
+
+def test_order_lifecycle_through_connector_and_engine(monkeypatch):
+    terminal = _terminal(config=sim.SimulationConfig(balance=10000, max_slippage_points=0, seed=1))
+    monkeypatch.setattr(m5, 'mt5', terminal)
+    monkeypatch.setattr(engine_module, 'mt5', terminal)
+
+    conn = m5.MT5Connector(m5.ConnectionConfig(login=0, password='', server=''))
+    assert conn.connect()
+    rates = conn.get_rates('EURUSD', 1, 50)
+    assert len(rates) == 50
+
+    engine = ExecutionEngine(connector=conn)
+    tick = terminal.symbol_info_tick('EURUSD')
+    order = OrderRequest(signal_id='sim', symbol='EURUSD', side='BUY', volume=0.1,
+                         order_type=OrderType.MARKET, sl=round(tick.bid - 0.0010, 5),
+                         tp=round(tick.bid + 0.0050, 5))
+    result = engine.place_order(order)
+    assert result.status == OrderStatus.FILLED
+    assert np.isclose(result.fill_price, tick.ask)
+
+    ticket = result.position_ticket
+    assert terminal.positions_get(ticket=ticket)
+
+    # The drop after bar 520 takes out the stop between two polls
+    terminal.clock.advance(40 * 60)
+    assert terminal.positions_get(ticket=ticket) == ()
+    deals = terminal.history_deals_get(position=ticket)
+    exit_deal = [d for d in deals if d.entry == sim.DEAL_ENTRY_OUT][0]
+    assert exit_deal.reason == sim.DEAL_REASON_SL and 'sl' in exit_deal.comment
+    assert np.isclose(exit_deal.profit, (order.sl - tick.ask) * 0.1 * 100000, atol=1.0)
+    assert np.isclose(terminal.account_info().balance, 10000 + exit_deal.profit)
+
+
+def test_rejections_and_partial_close():
+    terminal = _terminal(config=sim.SimulationConfig(balance=1000, leverage=100))
+    terminal.initialize()
+    request = {'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'type': sim.ORDER_TYPE_SELL,
+               'volume': 0.015}
+    assert terminal.order_send(request).retcode == sim.TRADE_RETCODE_INVALID_VOLUME
+    assert terminal.order_send({**request, 'volume': 5.0}).retcode == sim.TRADE_RETCODE_NO_MONEY
+    assert terminal.order_send({**request, 'volume': 0.05, 'sl': 1.0}).retcode == sim.TRADE_RETCODE_INVALID_STOPS
+
+    opened = terminal.order_send({**request, 'volume': 0.05})
+    assert opened.retcode == sim.TRADE_RETCODE_DONE
+    closed = terminal.order_send({'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD',
+                                  'type': sim.ORDER_TYPE_BUY, 'volume': 0.02, 'position': opened.order})
+    assert closed.retcode == sim.TRADE_RETCODE_DONE
+    assert terminal.positions_get(ticket=opened.order)[0].volume == 0.03
+
+    terminal.clock.advance(10 ** 6)  # past the end of the data
+    assert terminal.order_send({**request, 'volume': 0.01}).retcode == sim.TRADE_RETCODE_MARKET_CLOSED
+
+
+def test_from_config_and_install(tmp_path, monkeypatch):
+    path = tmp_path / 'EURUSD.csv'
+    _bars().rename_axis('time').reset_index().to_csv(path, index=False)
+    config = {'symbols': {'EURUSD': {'bars': str(path)}}, 'speed': None, 'warmup_bars': 100}
+    terminal = sim.SimulatedTerminal.from_config(config)
+    assert terminal.symbol_info('EURUSD').digits == 5
+
+    # install() rebinds every module-level mt5; keep the rebinding local to this test
+    for module in list(sys.modules.values()):
+        if getattr(module, 'mt5', None) is m5.mt5:
+            monkeypatch.setattr(module, 'mt5', m5.mt5)
+    monkeypatch.setitem(sys.modules, 'MetaTrader5', None)
+    sim.install(terminal)
+    import MetaTrader5
+    assert MetaTrader5 is terminal and m5.mt5 is terminal
+
+    cfg_file = tmp_path / 'sim.json'
+    cfg_file.write_text(json.dumps(config))
+    monkeypatch.setenv('CTHULU_MT5_SIM', str(cfg_file))
+    assert isinstance(sim.terminal_from_env(), sim.SimulatedTerminal)
@@ -0,0 +1,88 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cthulu.indicators.adx import ADX
+from cthulu.indicators.atr import calculate_atr
+from cthulu.indicators.rsi import RSI
+from cthulu.strategy import (
+    SmaCrossover, EmaCrossover, RsiReversalStrategy, MeanReversionStrategy,
+    MomentumBreakout, ScalpingStrategy, TrendFollowingStrategy,
+)
+from cthulu.strategy.batch import check_equivalence, replay_signals, empty_signal_frame
+
+
+def _frame(seed=7, n=1500):
+    rng = np.random.default_rng(seed)
+    # Alternating trending and ranging regimes so every strategy fires
+    drift = np.repeat(rng.choice([-0.002, 0.0, 0.002], size=n // 100 + 1), 100)[:n]
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.004, n)))
+    wick = np.abs(rng.normal(0, 0.003, (2, n))) * close
+    df = pd.DataFrame({
+        'open': np.r_[close[0], close[:-1]],
+        'high': close + wick[0],
+        'low': close - wick[1],
+        'close': close,
+        'volume': rng.integers(50, 500, n) * np.where(rng.random(n) < 0.1, 4, 1),
+        'spread': np.where(rng.random(n) < 0.05, 0.0005, 0.00005),
+    }, index=pd.date_range('2024-01-01', periods=n, freq='15min'))
+
+    for p in (5, 20, 50):
+        df[f'sma_{p}'] = df['close'].rolling(p).mean()
+    for p in (5, 9, 10, 20, 21, 50):
+        df[f'ema_{p}'] = df['close'].ewm(span=p, adjust=False).mean()
+    df['rsi'] = RSI(period=14).calculate(df)
+    df['atr'] = calculate_atr(df, period=14)
+    adx = ADX(period=14).calculate(df)
+    df['adx'] = adx['adx'] if isinstance(adx, pd.DataFrame) else adx
+    middle, std = df['close'].rolling(20).mean(), df['close'].rolling(20).std()
+    df['bb_middle_20'] = middle
+    df['bb_upper_20_2.0'] = middle + 2.0 * std
+    df['bb_lower_20_2.0'] = middle - 2.0 * std
+    df['high_20'] = df['high'].rolling(20).max().shift(1)
+    df['low_20'] = df['low'].rolling(20).min().shift(1)
+    df['volume_avg_20'] = df['volume'].rolling(20).mean()
+    return df
+
+
+STRATEGIES = {
+    'sma_crossover': lambda: SmaCrossover({'short_window': 5, 'long_window': 20}),
+    'ema_crossover': lambda: EmaCrossover({'params': {}}),
+    'rsi_reversal': lambda: RsiReversalStrategy({'params': {'rsi_extreme_oversold': 30,
+                                                            'rsi_extreme_overbought': 70}}),
+    'mean_reversion': lambda: MeanReversionStrategy({'params': {'rsi_oversold': 40, 'rsi_overbought': 60}}),
+    'momentum_breakout': lambda: MomentumBreakout({'params': {'volume_multiplier': 1.2}}),
+    'scalping': lambda: ScalpingStrategy({'params': {'rsi_overbought': 65}}),
+    'trend_following': lambda: TrendFollowingStrategy({'params': {}}),
+}
+
+
+@pytest.fixture(autouse=True)
+def _quiet_strategies():
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+def test_batch_signals_match_on_bar_replay(name):
+    df = _frame()
+    factory = STRATEGIES[name]
+
+    reference = replay_signals(factory(), df)
+    assert (reference['side'] == 1).sum() > 0 and (reference['side'] == -1).sum() > 0
+
+    assert check_equivalence(factory, df) == []
+    # Still equivalent with leading NaN indicators cut off and on another path
+    assert check_equivalence(factory, df.iloc[60:]) == []
+    assert check_equivalence(factory, _frame(seed=11, n=800)) == []
+
+
+def test_batch_signals_without_required_columns():
+    df = _frame(n=200)[['open', 'high', 'low', 'close', 'volume']]
+    for name, factory in STRATEGIES.items():
+        frame = factory().generate_signals(df)
+        assert frame.equals(empty_signal_frame(df.index)), name
+        assert (replay_signals(factory(), df)['side'] == 0).all(), name
@@ -74,4 +74,34 @@ def test_adopt_applies_emergency_sl_and_tracks():
     tracked = tracker.get_position(ticket)
     assert tracked is not None
     assert tracked.sl is not None
-    assert tracked.sl != pos['sl']
\ No newline at end of file
+    assert tracked.sl != pos['sl']
+
+def test_adoption_stops_stay_fixed_point_with_bars_available():
+    pos = {'ticket': 556, 'symbol': 'EURUSD', 'price_open': 100.0, 'price_current': 100.0,
+           'volume': 0.1, 'type': 1, 'sl': None, 'tp': None}
+
+    class BarStore:
+        def __init__(self):
+            self.calls = []
+
+        def get_rates(self, symbol, timeframe, count):
+            self.calls.append((symbol, timeframe, count))
+            return [{'high': 105.0 + i, 'low': 95.0 + i, 'close': 100.0 + i} for i in range(count)]
+
+    connector = DummyConnector(pos)
+    exec_engine = DummyExecutionEngine()
+    tracker = PositionTracker()
+    lifecycle = PositionLifecycle(connector=connector, execution_engine=exec_engine, position_tracker=tracker, db_handler=DummyDB())
+    lifecycle.dynamic_sltp_manager = object()
+    policy = TradeAdoptionPolicy(emergency_sl_points=50, apply_emergency_tp=True, emergency_tp_points=80)
+    bar_store = BarStore()
+
+    manager = TradeAdoptionManager(connector=connector, position_tracker=tracker, position_lifecycle=lifecycle,
+                                   policy=policy, bar_store=bar_store)
+    assert manager._recent_atr('EURUSD') == 10.0
+    assert manager._adopt_trade(pos) is True
+
+    # ATR-based distances never took effect before the bar store, so none here either
+    tracked = tracker.get_position(556)
+    assert (tracked.sl, tracked.tp) == (150.0, 20.0)
+    assert all(call[0] == 'EURUSD' for call in bar_store.calls)
@@ -306,6 +306,159 @@ class TestTradeEventBus:
             bus.stop()
 
 
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestSubscriberQueues:
+    """Per-subscriber queues, backpressure policies and batched persistence"""
+    
+    def _publish(self, bus, n, start=0):
+        for i in range(start, start + n):
+            assert bus.publish_trade_opened(ticket=i, symbol='TEST', side='BUY', volume=0.1, price=100.0)
+    
+    def test_slow_subscriber_does_not_stall_others(self):
+        from observability.trade_event_bus import TradeEventBus
+        
+        bus = TradeEventBus()
+        fast, slow = [], []
+        bus.subscribe('fast', fast.append)
+        bus.subscribe('slow', lambda e: (time.sleep(0.2), slow.append(e)))
+        bus.start()
+        try:
+            self._publish(bus, 10)
+            assert _wait_for(lambda: len(fast) == 10, timeout=1.0)
+            assert len(slow) < 5
+            stats = bus.get_subscriber_stats()
+            assert stats['slow']['lag_seconds'] > 0 and stats['slow']['queue_depth'] > 0
+            assert stats['fast']['delivered'] == 10 and stats['fast']['lag_seconds'] == 0.0
+        finally:
+            bus.stop(timeout=5.0)
+        assert len(slow) == 10
+    
+    def test_drop_oldest_and_block_policies(self):
+        from observability.trade_event_bus import TradeEventBus
+        
+        gate = threading.Event()
+        received = {'drop': [], 'block': []}
+        bus = TradeEventBus(block_timeout=0.05)
+        bus.subscribe('drop', lambda e: gate.wait() and received['drop'].append(e.ticket),
+                      policy='drop_oldest', queue_size=5)
+        bus.subscribe('block', lambda e: gate.wait() and received['block'].append(e.ticket),
+                      policy='block', queue_size=5)
+        bus.start()
+        try:
+            # First event is taken by each worker, which then waits on the gate
+            self._publish(bus, 1)
+            assert _wait_for(lambda: all(s['enqueued'] == 1 and s['queue_depth'] == 0
+                                         for s in bus.get_subscriber_stats().values()))
+            start = time.time()
+            self._publish(bus, 19, start=1)
+            assert time.time() - start < 0.1  # publishing never waits on a subscriber
+            assert _wait_for(lambda: bus.get_stats()['events_processed'] == 20)
+            stats = bus.get_subscriber_stats()
+            assert stats['drop']['dropped'] == 14 and stats['block']['dropped'] == 14
+            gate.set()
+            assert _wait_for(lambda: len(received['drop']) == 6 and len(received['block']) == 6)
+        finally:
+            bus.stop()
+        # drop_oldest keeps the newest, block keeps the earliest
+        assert received['drop'] == [0, 15, 16, 17, 18, 19]
+        assert received['block'] == [0, 1, 2, 3, 4, 5]
+    
+    def test_spill_policy_replays_overflow_in_order(self, tmp_path):
+        from observability.trade_event_bus import TradeEventBus, TradeEventType
+        
+        gate = threading.Event()
+        received = []
+        bus = TradeEventBus(spill_dir=str(tmp_path), flush_interval=0.05)
+        bus.subscribe_batch('db', lambda batch: gate.wait() and received.extend(batch),
+                            policy='spill', queue_size=3)
+        bus.start()
+        try:
+            self._publish(bus, 10)
+            assert _wait_for(lambda: bus.get_subscriber_stats()['db']['spilled'] > 0)
+            gate.set()
+            assert _wait_for(lambda: len(received) == 10)
+            self._publish(bus, 5, start=10)  # back to the in-memory ring once the backlog is replayed
+            assert _wait_for(lambda: len(received) == 15)
+        finally:
+            bus.stop()
+        assert [e.ticket for e in received] == list(range(15))
+        assert all(e.event_type == TradeEventType.TRADE_OPENED for e in received)
+        stats = bus.get_subscriber_stats()['db']
+        assert stats['dropped'] == 0 and stats['spill_backlog'] == 0
+        assert not list(tmp_path.iterdir())
+    
+    def test_spill_left_by_a_crash_is_replayed_first(self, tmp_path):
+        import json
+        from observability.trade_event_bus import TradeEventBus, TradeEvent, TradeEventType
+        
+        def write(path, tickets):
+            with open(path, 'w', encoding='utf-8') as f:
+                for ticket in tickets:
+                    event = TradeEvent(event_type=TradeEventType.TRADE_OPENED, ticket=ticket, symbol='TEST')
+                    f.write(json.dumps({'enqueued_at': 1e9, 'event': event.to_dict()}, default=str) + "\n")
+        
+        # Crashed mid-replay: the .replay file is older than the spill file
+        write(tmp_path / 'db.jsonl.replay', range(3))
+        write(tmp_path / 'db.jsonl', range(3, 6))
+        
+        received = []
+        bus = TradeEventBus(spill_dir=str(tmp_path), flush_interval=0.05)
+        bus.subscribe_batch('db', received.extend, policy='spill', queue_size=100)
+        assert bus.get_subscriber_stats()['db']['spill_backlog'] == 6
+        self._publish(bus, 3, start=6)
+        bus.start()
+        try:
+            assert _wait_for(lambda: len(received) == 9)
+        finally:
+            bus.stop()
+        assert [e.ticket for e in received] == list(range(9))
+        stats = bus.get_subscriber_stats()['db']
+        assert stats['spill_backlog'] == 0 and stats['delivery_latency_ms']['count'] == 9
+        assert not list(tmp_path.iterdir())
+    
+    def test_database_subscriber_coalesces_exits(self, tmp_path):
+        from observability.trade_event_bus import TradeEventBus, DatabaseSubscriber
+        from cthulu.persistence.database import Database, TradeRecord
+        
+        db = Database(str(tmp_path / "bus.db"))
+        for i in range(1, 6):
+            db.record_trade(TradeRecord(signal_id=f"s{i}", order_id=i, symbol="EURUSD", side="BUY",
+                                        volume=0.1, entry_price=1.1, entry_time=datetime.now()))
+        calls = []
+        original = db.update_trade_exits
+        db.update_trade_exits = lambda exits: calls.append(len(exits)) or original(exits)
+        
+        bus = TradeEventBus(flush_interval=0.2)
+        bus.subscribe_batch('database', DatabaseSubscriber(db).on_batch)
+        bus.start()
+        try:
+            for i in range(1, 6):
+                bus.publish_trade_closed(ticket=i, symbol='EURUSD', side='BUY', volume=0.1,
+                                         entry_price=1.1, exit_price=1.2, pnl=1.0, exit_reason='tp')
+            # A later close for the same ticket wins
+            bus.publish_trade_closed(ticket=5, symbol='EURUSD', side='BUY', volume=0.1,
+                                     entry_price=1.1, exit_price=1.0, pnl=-1.0, exit_reason='sl')
+            assert _wait_for(lambda: sum(calls) == 5)
+        finally:
+            bus.stop()
+        
+        assert calls == [5]
+        rows = {r['order_id']: (r['status'], r['profit'], r['exit_reason'])
+                for r in db.conn.execute("SELECT order_id, status, profit, exit_reason FROM trades")}
+        assert rows[1] == ('CLOSED', 1.0, 'tp')
+        assert rows[5] == ('CLOSED', -1.0, 'sl')
+        db.close()
+
+
 class TestGlobalEventBus:
     """Tests for global event bus singleton"""
     
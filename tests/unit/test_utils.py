@@ -261,6 +261,75 @@ class TestSmartCache:
         assert stats['misses'] == 2
         assert stats['size'] == 2
 
+    def test_lru_eviction_keeps_recently_used(self):
+        """Should evict the least recently used entry, not the oldest."""
+        cache = SmartCache(ttl_seconds=60, max_size=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.get("key1")  # key2 is now least recently used
+        cache.set("key3", "value3")
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") is None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_negative_caching(self):
+        """None results should be cached for the negative TTL only."""
+        cache = SmartCache(ttl_seconds=60, negative_ttl_seconds=0.1)
+        calls = []
+
+        def lookup():
+            calls.append(1)
+            return None
+
+        assert cache.get_or_fetch("missing", lookup) is None
+        assert cache.get_or_fetch("missing", lookup) is None
+        assert len(calls) == 1
+        assert cache.get_stats()['negative_hits'] == 1
+
+        time.sleep(0.15)
+        cache.get_or_fetch("missing", lookup)
+        assert len(calls) == 2
+
+    def test_single_flight_concurrent_misses(self):
+        """Concurrent misses on one key should share a single load."""
+        import threading
+
+        cache = SmartCache(ttl_seconds=60)
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(2)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("key", slow_fetch)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        while cache.get_stats()['coalesced'] < 7:
+            time.sleep(0.005)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_load_errors_are_shared_not_cached(self):
+        """A failing load should raise for the caller and be retried next time."""
+        cache = SmartCache(ttl_seconds=60)
+
+        def broken():
+            raise RuntimeError("backend down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_fetch("key", broken)
+        assert cache.get_or_fetch("key", lambda: "ok") == "ok"
+        assert cache.get_stats()['load_errors'] == 1
+
 
 class TestSlidingWindowRateLimiter:
     """Test sliding window rate limiter."""
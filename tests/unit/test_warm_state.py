@@ -0,0 +1,145 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from cthulu.core.warm_state import WarmState, WarmStateStore, WarmStateSnapshotter
+from cthulu.core.trading_loop import TradingLoop
+from cthulu.risk.evaluator import RiskEvaluator
+from cthulu.strategy.strategy_selector import StrategySelector
+from cthulu.cognition.structure_detector import MarketStructureDetector
+
+
+def _bars(start, n):
+    idx = pd.date_range(start, periods=n, freq='15min')
+    price = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame({'open': price, 'high': price + 1, 'low': price - 1,
+                         'close': price, 'volume': np.ones(n)}, index=idx)
+
+
+def _strategy(name):
+    return SimpleNamespace(name=name)
+
+
+def test_store_roundtrip_and_validation(tmp_path):
+    store = WarmStateStore(str(tmp_path / 'warm.pkl'), max_age_seconds=60)
+    state = WarmState(symbol='EURUSD', timeframe='TIMEFRAME_M15', bars=_bars('2025-01-01', 5),
+                      sections={'risk': {'daily_trades': 3}})
+    assert store.save(state)
+    assert not list(tmp_path.glob('*.tmp'))
+
+    loaded = store.load_fresh('EURUSD', 'TIMEFRAME_M15')
+    assert loaded.sections == {'risk': {'daily_trades': 3}}
+    assert loaded.last_bar_time == state.bars.index[-1]
+
+    assert store.load_fresh('GBPUSD', 'TIMEFRAME_M15') is None
+    assert store.load_fresh('EURUSD', 'TIMEFRAME_H1') is None
+    state.created_at = time.time() - 120
+    store.save(state)
+    assert store.load_fresh('EURUSD', 'TIMEFRAME_M15') is None
+
+    (tmp_path / 'warm.pkl').write_bytes(b'garbage')
+    assert store.load() is None
+
+
+def test_snapshot_resume_restores_components(tmp_path):
+    store = WarmStateStore(str(tmp_path / 'warm.pkl'))
+
+    risk = RiskEvaluator(connector=None, position_tracker=None)
+    risk.record_trade_result(-25.0)
+    risk.peak_balance = 1200.0
+    selector = StrategySelector([_strategy('ema_crossover'), _strategy('scalping')])
+    selector.record_outcome('scalping', 'win', 12.5)
+    selector.current_regime = 'volatile_breakout'
+    detector = MarketStructureDetector()
+    df = _bars('2025-01-01', 12)
+    df.iloc[5, df.columns.get_loc('high')] = 500.0
+    detector.detect_fractals(df.iloc[:8])
+
+    snapshotter = WarmStateSnapshotter(store, 'EURUSD', 'TIMEFRAME_M15', interval_seconds=3600)
+    snapshotter.register('risk', risk)
+    snapshotter.register('strategy_selector', selector)
+    snapshotter.register('structure_detector', detector)
+    assert snapshotter.maybe_snapshot(bars=df)
+    assert not snapshotter.maybe_snapshot(bars=df)
+
+    # "Restart": fresh components, risk registered before resume, others after
+    risk2 = RiskEvaluator(connector=None, position_tracker=None)
+    selector2 = StrategySelector([_strategy('ema_crossover'), _strategy('scalping')])
+    detector2 = MarketStructureDetector()
+    resumed = WarmStateSnapshotter(store, 'EURUSD', 'TIMEFRAME_M15')
+    resumed.register('risk', risk2)
+    assert resumed.resume(store.load_fresh('EURUSD', 'TIMEFRAME_M15')) == ['risk']
+    assert resumed.register('strategy_selector', selector2)
+    assert resumed.register('structure_detector', detector2)
+
+    assert risk2.daily_tracker.daily_trades == 1
+    assert risk2.daily_tracker.daily_pnl == -25.0
+    assert risk2.peak_balance == 1200.0
+    assert selector2.performance['scalping'].wins == 1
+    assert selector2.current_regime == 'volatile_breakout'
+    assert len(detector2._bull_fractals) == len(detector._bull_fractals) == 1
+    assert resumed.take_bars().equals(df)
+    assert resumed.take_bars() is None
+
+
+def test_trading_loop_extends_warm_bar_buffer():
+    buffer = _bars('2025-01-01', 20)
+    fresh = _bars('2025-01-01', 23)
+    calls = []
+
+    def get_rates(symbol, timeframe, count):
+        calls.append(count)
+        return fresh.iloc[-count:]
+
+    snapshotter = WarmStateSnapshotter(WarmStateStore('unused.pkl'), 'EURUSD', 'M15')
+    snapshotter._resumed = WarmState(symbol='EURUSD', timeframe='M15', bars=buffer)
+    cached = {}
+    ctx = SimpleNamespace(
+        config={'warm_restart': {'tail_fetch_bars': 5}},
+        logger=logging.getLogger('test_warm_state'),
+        symbol='EURUSD', timeframe='M15', lookback_bars=20, poll_interval=0,
+        indicators=[], warm_state=snapshotter,
+        connector=SimpleNamespace(get_rates=get_rates),
+        data_layer=SimpleNamespace(normalize_rates=lambda rates, symbol=None: rates.copy(),
+                                   cache_data=lambda symbol, data: cached.update({symbol: data})),
+    )
+    loop = TradingLoop(ctx)
+
+    df = loop._ingest_market_data()
+    assert calls == [5]
+    assert df.equals(fresh.iloc[-20:])
+    assert len(cached['EURUSD']) == 20
+
+    # A gap larger than the tail falls back to the full history fetch
+    fresh = _bars('2025-01-03', 30)
+    df = loop._ingest_market_data()
+    assert calls == [5, 5, 20]
+    assert df.index[-1] == fresh.index[-1]
+
+
+def test_trading_loop_without_warm_restart_fetches_full_history():
+    fresh = _bars('2025-01-01', 30)
+    calls = []
+
+    def get_rates(symbol, timeframe, count):
+        calls.append(count)
+        return fresh.iloc[-count:]
+
+    ctx = SimpleNamespace(
+        config={'warm_restart': {'enabled': False}},
+        logger=logging.getLogger('test_warm_state'),
+        symbol='EURUSD', timeframe='M15', lookback_bars=20, poll_interval=0,
+        indicators=[], warm_state=None,
+        connector=SimpleNamespace(get_rates=get_rates),
+        data_layer=SimpleNamespace(normalize_rates=lambda rates, symbol=None: rates.copy(),
+                                   cache_data=lambda symbol, data: None),
+    )
+    loop = TradingLoop(ctx)
+
+    for _ in range(3):
+        assert len(loop._ingest_market_data()) == 20
+    assert calls == [20, 20, 20]
+    assert loop._bar_buffer is None
@@ -1,9 +1,12 @@
+import hmac
 import sqlite3
 import time
 import os
 import json
 import sys
 import threading
+import queue
+from contextlib import contextmanager
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
@@ -25,19 +28,53 @@ logger.info(f"DB_PATH: {DB_PATH}")
 # Track last known price for live updates
 last_price = {'value': 0, 'time': 0}
 
-def get_db_connection():
-    try:
-        print(f"Attempting to connect to: {DB_PATH}")
-        conn = sqlite3.connect(DB_PATH, timeout=10)
+# Seconds between cheap change checks (PRAGMA data_version) when no push arrives
+CHANGE_CHECK_INTERVAL = float(os.getenv('CTHULU_DASHBOARD_CHECK_INTERVAL', '2.0'))
+
+# Shared secret for /api/events; without it only loopback clients may push
+PUSH_TOKEN = os.getenv('CTHULU_DASHBOARD_PUSH_TOKEN')
+PUSH_TOKEN_HEADER = 'X-Cthulu-Push-Token'
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1', '::ffff:127.0.0.1')
+
+
+class ReadConnectionPool:
+    """
+    Small pool of reusable read-only SQLite connections.
+    
+    The threaded Flask server handles each request on a fresh thread, so
+    thread-local connections would still be reopened per request; pooled
+    connections are shared across threads instead (one user at a time).
+    """
+    
+    def __init__(self, db_path, size=4):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=size)
+        
+    def _open(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=10, check_same_thread=False)
         conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        print("DB connection successful")
         return conn
-    except Exception as e:
-        import traceback
-        print(f"Error connecting to DB: {e}")
-        traceback.print_exc()
-        return None
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; broken connections are discarded rather than returned."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+
+db_pool = ReadConnectionPool(DB_PATH)
 
 def parse_timestamp(ts_str):
     """Parse timestamp string with or without microseconds."""
@@ -69,13 +106,9 @@ def normalize_trade(row):
 @app.route('/api/trades', methods=['GET'])
 def get_trades():
     logger.info("GET /api/trades called")
-    conn = get_db_connection()
-    if not conn:
-        logger.error("DB connection failed")
-        return jsonify([]), 500
-    
     try:
-        trades = conn.execute("SELECT * FROM trades ORDER BY entry_time DESC LIMIT 50").fetchall()
+        with db_pool.connection() as conn:
+            trades = conn.execute("SELECT * FROM trades ORDER BY entry_time DESC LIMIT 50").fetchall()
         logger.info(f"Fetched {len(trades)} trades")
         result = [normalize_trade(t) for t in trades]
         logger.info(f"Normalized {len(result)} trades")
@@ -85,8 +118,6 @@ def get_trades():
         logger.error(f"Error querying trades: {e}")
         traceback.print_exc()
         return jsonify([]), 500
-    finally:
-        conn.close()
 
 @app.route('/api/logs', methods=['GET'])
 def get_logs():
@@ -159,75 +190,78 @@ def get_logs():
 
 @app.route('/api/signals', methods=['GET'])
 def get_signals():
-    conn = get_db_connection()
-    if not conn:
-        return jsonify([]), 500
     try:
         # Get recent signals
-        signals = conn.execute("SELECT * FROM signals ORDER BY timestamp DESC LIMIT 20").fetchall()
+        with db_pool.connection() as conn:
+            signals = conn.execute("SELECT * FROM signals ORDER BY timestamp DESC LIMIT 20").fetchall()
         return jsonify([dict(s) for s in signals])
     except Exception as e:
         print(f"Error querying signals: {e}")
         return jsonify([]), 500
-    finally:
-        conn.close()
 
 @app.route('/api/metrics', methods=['GET'])
 def get_metrics():
-    conn = get_db_connection()
-    if not conn:
-        return jsonify([]), 500
     try:
         # Get recent metrics
-        metrics = conn.execute("SELECT * FROM metrics ORDER BY timestamp DESC LIMIT 50").fetchall()
+        with db_pool.connection() as conn:
+            metrics = conn.execute("SELECT * FROM metrics ORDER BY timestamp DESC LIMIT 50").fetchall()
         return jsonify([dict(m) for m in metrics])
     except Exception as e:
         print(f"Error querying metrics: {e}")
         return jsonify([]), 500
-    finally:
-        conn.close()
+
+def _scan_trade_summary(conn):
+    """Full-table aggregate, used only when the trade_summary table is missing (older DB)."""
+    row = conn.execute("""
+        SELECT COUNT(*) AS total_trades,
+               COALESCE(SUM(status = 'OPEN'), 0) AS open_trades,
+               COALESCE(SUM(status = 'CLOSED'), 0) AS closed_trades,
+               COALESCE(SUM(profit), 0.0) AS total_pnl,
+               COALESCE(SUM(profit > 0), 0) AS wins,
+               COALESCE(SUM(profit < 0), 0) AS losses
+        FROM trades
+    """).fetchone()
+    return dict(row)
+
+def read_dashboard_summary(conn):
+    """Dashboard payload from the materialized trade_summary row (constant time)."""
+    try:
+        row = conn.execute("""
+            SELECT total_trades, open_trades, closed_trades, total_pnl, wins, losses
+            FROM trade_summary WHERE id = 1
+        """).fetchone()
+        summary = dict(row) if row else _scan_trade_summary(conn)
+    except sqlite3.OperationalError:
+        logger.warning("trade_summary table missing; falling back to table scan")
+        summary = _scan_trade_summary(conn)
+    
+    wins, losses = summary['wins'], summary['losses']
+    win_rate = (wins / (wins + losses) * 100) if (wins + losses) > 0 else 0
+    
+    # Recent signals (range scan on idx_signals_timestamp)
+    recent_signals = conn.execute("SELECT COUNT(*) FROM signals WHERE timestamp > datetime('now', '-1 hour')").fetchone()[0]
+    
+    return {
+        "total_trades": summary['total_trades'],
+        "open_trades": summary['open_trades'],
+        "closed_trades": summary['closed_trades'],
+        "total_pnl": round(summary['total_pnl'] or 0.0, 2),
+        "wins": wins,
+        "losses": losses,
+        "win_rate": round(win_rate, 1),
+        "recent_signals": recent_signals,
+        "status": "running"
+    }
 
 @app.route('/api/dashboard', methods=['GET'])
 def get_dashboard():
     """Get dashboard summary with real data from multiple sources."""
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({"error": "Database unavailable"}), 500
-    
     try:
-        # Get trade stats
-        total_trades = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
-        open_trades = conn.execute("SELECT COUNT(*) FROM trades WHERE status='OPEN'").fetchone()[0]
-        closed_trades = conn.execute("SELECT COUNT(*) FROM trades WHERE status='CLOSED'").fetchone()[0]
-        
-        # Get PnL
-        pnl_result = conn.execute("SELECT SUM(profit) FROM trades WHERE profit IS NOT NULL").fetchone()[0]
-        total_pnl = pnl_result if pnl_result else 0.0
-        
-        # Get win/loss
-        wins = conn.execute("SELECT COUNT(*) FROM trades WHERE profit > 0").fetchone()[0]
-        losses = conn.execute("SELECT COUNT(*) FROM trades WHERE profit < 0").fetchone()[0]
-        win_rate = (wins / (wins + losses) * 100) if (wins + losses) > 0 else 0
-        
-        # Recent signals
-        recent_signals = conn.execute("SELECT COUNT(*) FROM signals WHERE timestamp > datetime('now', '-1 hour')").fetchone()[0]
-        
-        return jsonify({
-            "total_trades": total_trades,
-            "open_trades": open_trades,
-            "closed_trades": closed_trades,
-            "total_pnl": round(total_pnl, 2),
-            "wins": wins,
-            "losses": losses,
-            "win_rate": round(win_rate, 1),
-            "recent_signals": recent_signals,
-            "status": "running"
-        })
+        with db_pool.connection() as conn:
+            return jsonify(read_dashboard_summary(conn))
     except Exception as e:
         print(f"Error getting dashboard: {e}")
         return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
@@ -250,51 +284,45 @@ RPC_URL = "http://127.0.0.1:8278/trade"
 @app.route('/api/ticker', methods=['GET'])
 def get_ticker():
     """Get current price from database (last trade entry_price)."""
-    conn = get_db_connection()
-    if conn:
-        try:
+    try:
+        with db_pool.connection() as conn:
             row = conn.execute("SELECT entry_price, symbol, entry_time FROM trades ORDER BY id DESC LIMIT 1").fetchone()
-            if row:
-                return jsonify({
-                    "symbol": row['symbol'],
-                    "price": row['entry_price'],
-                    "timestamp": int(time.time() * 1000),
-                    "source": "database"
-                })
-        except Exception as e:
-            print(f"Error fetching price: {e}")
-        finally:
-            conn.close()
+        if row:
+            return jsonify({
+                "symbol": row['symbol'],
+                "price": row['entry_price'],
+                "timestamp": int(time.time() * 1000),
+                "source": "database"
+            })
+    except Exception as e:
+        print(f"Error fetching price: {e}")
     return jsonify({"symbol": "BTCUSD#", "price": 0, "timestamp": int(time.time() * 1000)}), 200
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
     """Get price history from trades table."""
-    conn = get_db_connection()
-    if conn:
-        try:
+    try:
+        with db_pool.connection() as conn:
             rows = conn.execute("""
                 SELECT entry_price as close, entry_time 
                 FROM trades 
                 ORDER BY id DESC 
                 LIMIT 500
             """).fetchall()
-            candles = []
-            for row in reversed(rows):
-                ts = parse_timestamp(row['entry_time'])
-                candles.append({
-                    "time": ts,
-                    "open": row['close'],
-                    "high": row['close'],
-                    "low": row['close'],
-                    "close": row['close'],
-                    "volume": 0
-                })
-            return jsonify(candles)
-        except Exception as e:
-            print(f"Error fetching history: {e}")
-        finally:
-            conn.close()
+        candles = []
+        for row in reversed(rows):
+            ts = parse_timestamp(row['entry_time'])
+            candles.append({
+                "time": ts,
+                "open": row['close'],
+                "high": row['close'],
+                "low": row['close'],
+                "close": row['close'],
+                "volume": 0
+            })
+        return jsonify(candles)
+    except Exception as e:
+        print(f"Error fetching history: {e}")
     return jsonify([]), 200
 
 @app.route('/api/trade', methods=['POST'])
@@ -309,6 +337,50 @@ def proxy_trade():
         print(f"Error proxying trade to RPC: {e}")
         return jsonify({"error": "RPC Server Unreachable"}), 503
 
+def broadcast_dashboard():
+    """Push the current dashboard summary to all clients."""
+    try:
+        with db_pool.connection() as conn:
+            socketio.emit('dashboard', read_dashboard_summary(conn))
+    except Exception as e:
+        logger.error(f"Dashboard broadcast error: {e}")
+
+def push_authorized():
+    """Whether the current request may push events to the dashboard."""
+    if PUSH_TOKEN:
+        return hmac.compare_digest(request.headers.get(PUSH_TOKEN_HEADER, ''), PUSH_TOKEN)
+    return request.remote_addr in LOOPBACK_ADDRESSES
+
+@app.route('/api/events', methods=['POST'])
+def receive_events():
+    """
+    Trade events pushed by the trading process (TradeEventBus DashboardPushSubscriber).
+    
+    Forwards each event to WebSocket clients, updates the live price and
+    pushes a fresh dashboard summary once per batch. Requires the shared
+    CTHULU_DASHBOARD_PUSH_TOKEN when one is set, otherwise a loopback client.
+    """
+    global last_price
+    if not push_authorized():
+        logger.warning(f"Rejected event push from {request.remote_addr}")
+        return jsonify({'error': 'Unauthorized'}), 403
+    payload = request.get_json(silent=True) or {}
+    events = payload.get('events', [])
+    
+    for event in events:
+        socketio.emit('trade_event', event)
+        if event.get('event_type') in ('trade_opened', 'trade_adopted') and event.get('price'):
+            last_price = {
+                'value': event['price'],
+                'time': int(time.time() * 1000),
+                'symbol': event.get('symbol')
+            }
+    
+    if events:
+        socketio.emit('price', last_price)
+        broadcast_dashboard()
+    return jsonify({'received': len(events)})
+
 # WebSocket Events
 @socketio.on('connect')
 def handle_connect():
@@ -320,19 +392,30 @@ def handle_connect():
 def handle_disconnect():
     logger.info("Client disconnected from WebSocket")
 
-def price_streamer():
-    """Background thread that polls DB and broadcasts price updates."""
+def change_watcher():
+    """
+    Fallback for trading processes that do not push events.
+    
+    Checks PRAGMA data_version (changes only when another connection
+    commits) instead of querying trades, and reads the latest trade and
+    summary only when something was written.
+    """
     global last_price
+    last_version = None
     while True:
         try:
-            conn = sqlite3.connect(DB_PATH, timeout=5)
-            conn.row_factory = sqlite3.Row
-            row = conn.execute("""
-                SELECT entry_price, entry_time, symbol 
-                FROM trades 
-                ORDER BY id DESC LIMIT 1
-            """).fetchone()
-            conn.close()
+            with db_pool.connection() as conn:
+                version = conn.execute("PRAGMA data_version").fetchone()[0]
+                changed = last_version is not None and version != last_version
+                if last_version is None or changed:
+                    row = conn.execute("""
+                        SELECT entry_price, entry_time, symbol 
+                        FROM trades 
+                        ORDER BY id DESC LIMIT 1
+                    """).fetchone()
+                else:
+                    row = None
+                last_version = version
             
             if row and row['entry_price'] != last_price['value']:
                 last_price = {
@@ -342,16 +425,18 @@ def price_streamer():
                 }
                 socketio.emit('price', last_price)
                 logger.debug(f"Broadcasting price: {last_price['value']}")
+            if changed:
+                broadcast_dashboard()
         except Exception as e:
-            logger.error(f"Price streamer error: {e}")
+            logger.error(f"Change watcher error: {e}")
         
-        time.sleep(0.5)  # 500ms polling for near real-time
+        time.sleep(CHANGE_CHECK_INTERVAL)
 
 if __name__ == '__main__':
     print("Starting Flask server with WebSocket...", file=sys.stderr, flush=True)
     
-    # Start price streaming thread
-    streamer_thread = threading.Thread(target=price_streamer, daemon=True)
-    streamer_thread.start()
+    # Live updates are pushed to /api/events; the watcher only covers writers that do not push
+    watcher_thread = threading.Thread(target=change_watcher, daemon=True)
+    watcher_thread.start()
     
     socketio.run(app, host='0.0.0.0', port=5000, debug=False, use_reloader=False)
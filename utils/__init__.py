@@ -5,7 +5,9 @@ Utility functions and classes for Cthulu Trading System.
 from cthulu.utils.circuit_breaker import CircuitBreaker, CircuitState
 from cthulu.utils.retry import exponential_backoff, RetryConfig, with_retry
 from cthulu.utils.health_monitor import ConnectionHealthMonitor
-from cthulu.utils.cache import SmartCache
+from cthulu.utils.cache import SmartCache, shared_cache, symbol_spec
+from cthulu.utils.latency import LatencyHistogram
+from cthulu.utils.event_log import EventLogWriter, EventLogReader, scan_event_logs, read_event_logs
 from cthulu.utils.rate_limiter import SlidingWindowRateLimiter, TokenBucketRateLimiter
 from cthulu.utils.indicator_calculator import calculate_basic_indicators, validate_data_quality
 
@@ -17,6 +19,13 @@ __all__ = [
     'with_retry',
     'ConnectionHealthMonitor',
     'SmartCache',
+    'shared_cache',
+    'symbol_spec',
+    'LatencyHistogram',
+    'EventLogWriter',
+    'EventLogReader',
+    'scan_event_logs',
+    'read_event_logs',
     'SlidingWindowRateLimiter',
     'TokenBucketRateLimiter',
     'calculate_basic_indicators',
@@ -1,142 +1,291 @@
 """
 Smart caching with TTL support.
+
+SmartCache is a thread-safe LRU cache with per-entry TTL, optional
+negative caching of None results and single-flight loading: when several
+threads miss on the same key at once, one of them runs the loader and the
+others wait for its result instead of hitting the backend themselves.
+
+Named caches register themselves so their statistics can be exported by
+observability.prometheus.PrometheusExporter.
 """
 
+import time
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Callable, Optional, TypeVar, Generic
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar, Generic
+
+from cthulu.utils.latency import LatencyHistogram
 
 T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Named caches, for metrics export (weak so short-lived caches can go away)
+_registry: "weakref.WeakValueDictionary[str, SmartCache]" = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+# Strong references keeping shared caches alive for the life of the process
+_shared = []
+
+
+class _Flight:
+    """A load in progress that other threads can wait on."""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
 
 class SmartCache(Generic[T]):
     """
-    Cache with TTL (Time To Live) support.
-    
+    Thread-safe LRU cache with TTL, negative caching and single-flight loads.
+
     Usage:
-        cache = SmartCache(ttl_seconds=60)
-        
+        cache = SmartCache(ttl_seconds=60, negative_ttl_seconds=10, name="quotes")
+
         def fetch_data():
             return expensive_api_call()
-        
+
         data = cache.get_or_fetch("key", fetch_data)
     """
-    
-    def __init__(self, ttl_seconds: int = 60, max_size: int = 1000):
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60,
+        max_size: int = 1000,
+        negative_ttl_seconds: Optional[float] = None,
+        name: Optional[str] = None
+    ):
         """
         Initialize cache.
-        
+
         Args:
             ttl_seconds: Time to live for cached items
-            max_size: Maximum number of items to cache
+            max_size: Maximum number of items to cache (least recently used evicted first)
+            negative_ttl_seconds: Time to live for None results (defaults to ttl_seconds)
+            name: Register the cache under this name for metrics export
         """
         self.ttl = ttl_seconds
         self.max_size = max_size
-        self.cache: dict[str, tuple[T, datetime]] = {}
+        self.negative_ttl = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self.name = name
+        # key -> (value, expires_at on the monotonic clock), least recently used first
+        self.cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
         self.hits = 0
         self.misses = 0
-    
-    def get_or_fetch(self, key: str, fetch_func: Callable[[], T]) -> T:
+        self.negative_hits = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load_latency = LatencyHistogram()
+        if name:
+            with _registry_lock:
+                _registry[name] = self
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return live value or _MISSING. Caller holds the lock."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self.cache[key]
+            self.expirations += 1
+            return _MISSING
+        self.cache.move_to_end(key)
+        return value
+
+    def get_or_fetch(self, key: Hashable, fetch_func: Callable[[], T], ttl_seconds: Optional[float] = None) -> T:
         """
         Get cached value or fetch and cache it.
-        
+
+        Concurrent misses on the same key share a single call to
+        `fetch_func`. Exceptions are propagated to every waiting caller
+        and are not cached.
+
         Args:
             key: Cache key
             fetch_func: Function to call if cache miss
-            
+            ttl_seconds: Override the TTL for this entry
+
         Returns:
             Cached or freshly fetched value
         """
-        # Check if key exists and is not expired
-        if key in self.cache:
-            value, timestamp = self.cache[key]
-            age = datetime.now() - timestamp
-            
-            if age < timedelta(seconds=self.ttl):
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
                 self.hits += 1
-                logger.debug(f"Cache hit: {key} (age: {age.total_seconds():.1f}s)")
+                if value is None:
+                    self.negative_hits += 1
                 return value
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
             else:
-                logger.debug(f"Cache expired: {key} (age: {age.total_seconds():.1f}s)")
-        
-        # Cache miss - fetch new value
-        self.misses += 1
-        logger.debug(f"Cache miss: {key}, fetching new value")
-        
-        value = fetch_func()
-        self.set(key, value)
-        
-        return value
-    
-    def set(self, key: str, value: T):
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        start = time.perf_counter()
+        try:
+            value = fetch_func()
+            flight.value = value
+            self.set(key, value, ttl_seconds)
+            return value
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.load_errors += 1
+            raise
+        finally:
+            self.load_latency.observe((time.perf_counter() - start) * 1000.0)
+            with self._lock:
+                self.loads += 1
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def set(self, key: Hashable, value: T, ttl_seconds: Optional[float] = None):
         """
         Set cache value.
-        
+
         Args:
             key: Cache key
-            value: Value to cache
+            value: Value to cache (None is cached for negative_ttl_seconds)
+            ttl_seconds: Override the TTL for this entry
         """
-        # Evict oldest items if cache is full
-        if len(self.cache) >= self.max_size:
-            self._evict_oldest()
-        
-        self.cache[key] = (value, datetime.now())
-    
-    def get(self, key: str) -> Optional[T]:
+        if ttl_seconds is None:
+            ttl_seconds = self.negative_ttl if value is None else self.ttl
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            self.cache[key] = (value, time.monotonic() + ttl_seconds)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: Hashable) -> Optional[T]:
         """
         Get cached value if exists and not expired.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None
         """
-        if key in self.cache:
-            value, timestamp = self.cache[key]
-            age = datetime.now() - timestamp
-            
-            if age < timedelta(seconds=self.ttl):
-                return value
-        
-        return None
-    
-    def invalidate(self, key: str):
+        with self._lock:
+            value = self._lookup(key)
+        return None if value is _MISSING else value
+
+    def invalidate(self, key: Hashable):
         """Remove key from cache."""
-        if key in self.cache:
-            del self.cache[key]
-            logger.debug(f"Cache invalidated: {key}")
-    
+        with self._lock:
+            if self.cache.pop(key, None) is not None:
+                logger.debug(f"Cache invalidated: {key}")
+
     def clear(self):
         """Clear entire cache."""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
         logger.info("Cache cleared")
-    
-    def _evict_oldest(self):
-        """Evict oldest cache entry."""
-        if not self.cache:
-            return
-        
-        oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
-        del self.cache[oldest_key]
-        logger.debug(f"Cache evicted: {oldest_key}")
-    
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0.0
-        
-        return {
-            'size': len(self.cache),
-            'max_size': self.max_size,
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': hit_rate,
-            'ttl_seconds': self.ttl
-        }
+        with self._lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0.0
+            stats = {
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate,
+                'negative_hits': self.negative_hits,
+                'coalesced': self.coalesced,
+                'loads': self.loads,
+                'load_errors': self.load_errors,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'ttl_seconds': self.ttl,
+            }
+        stats['load_latency'] = self.load_latency.to_dict()
+        return stats
 
 
+def shared_cache(
+    name: str,
+    ttl_seconds: float = 60,
+    max_size: int = 1000,
+    negative_ttl_seconds: Optional[float] = None
+) -> SmartCache:
+    """
+    Process-wide named cache, created on first use.
+
+    Components that look up the same data (e.g. symbol specs from the
+    execution engine, risk evaluator and RPC server threads) share one
+    instance so their loads collapse.
+    """
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = SmartCache(ttl_seconds=ttl_seconds, max_size=max_size,
+                               negative_ttl_seconds=negative_ttl_seconds)
+            cache.name = name
+            _registry[name] = cache
+            _shared.append(cache)
+        return cache
+
+
+def registered_caches() -> Dict[str, SmartCache]:
+    """Snapshot of all named caches."""
+    with _registry_lock:
+        return dict(_registry.items())
+
+
+def symbol_spec(connector: Any, symbol: str) -> Dict[str, Any]:
+    """
+    Static trading spec of `symbol` (volume limits, point, contract size),
+    cached across threads per connector session.
+
+    Uses MT5Connector.get_symbol_spec() when available, otherwise
+    get_symbol_info() plus get_min_lot().
+
+    Returns:
+        Spec dictionary (empty if the connector cannot provide one)
+    """
+    cache = shared_cache('symbol_specs', ttl_seconds=300, max_size=512, negative_ttl_seconds=15)
+    key = (connector, getattr(connector, 'session_id', 0), symbol)
 
+    def load() -> Optional[Dict[str, Any]]:
+        getter = getattr(connector, 'get_symbol_spec', None)
+        spec = getter(symbol) if callable(getter) else None
+        if isinstance(spec, dict):
+            return spec
+        info = connector.get_symbol_info(symbol)
+        spec = dict(info) if isinstance(info, dict) else {}
+        if spec.get('volume_min') is None:
+            spec['volume_min'] = connector.get_min_lot(symbol)
+        return spec or None
 
+    return cache.get_or_fetch(key, load) or {}
@@ -0,0 +1,625 @@
+"""
+Columnar Event Log
+
+Append-only, chunked columnar storage for the ML capture streams
+(collector events, training decisions). Rows are buffered per event type
+and written as record batches: one zlib-compressed buffer per column, typed
+by a schema kept per event type. A footer indexes every chunk by event type
+and time range, so readers seek straight to the chunks and columns a query
+needs and stream them one batch at a time instead of parsing every line.
+
+File layout:
+    MAGIC
+    chunk*    b'CHNK' | u32 meta length | meta JSON | column buffers
+    footer    zlib(JSON index of all chunk metas + schemas)
+    trailer   u64 footer length | MAGIC
+
+A file whose writer died before close() has no trailer; readers then
+rebuild the index by walking the chunk headers.
+
+Column kinds: 'f8' (nulls as NaN), 'i8', 'b1', 'str' and 'json' (anything
+else, JSON-encoded). A column whose kind differs between chunks is widened
+(i8 -> f8, otherwise -> json) and read back with the widened kind.
+
+Usage:
+    with EventLogWriter('events.evlog') as writer:
+        writer.append('order_request', {'symbol': 'EURUSD', 'volume': 0.1})
+
+    for batch in scan_event_logs('data/raw', event_type='order_request',
+                                 start='2031-03-01', columns=['volume']):
+        batch.to_frame()
+"""
+from __future__ import annotations
+import glob
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("cthulu.utils.event_log")
+
+MAGIC = b'CTHEVL1\n'
+CHUNK_MARKER = b'CHNK'
+EXTENSION = '.evlog'
+
+# Row timestamp column (int64 ns since epoch, UTC) present in every chunk
+TIME_COLUMN = '_ts'
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+TimeLike = Union[str, datetime, pd.Timestamp, int, float, None]
+
+
+def to_ns(value: TimeLike) -> Optional[int]:
+    """Nanoseconds since epoch (UTC) for a timestamp; naive times are UTC."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    if isinstance(value, datetime) and not isinstance(value, pd.Timestamp):
+        # Fast path for the per-row timestamps the writers pass
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value)
+
+
+def _type_kind(value_type: type) -> Optional[str]:
+    if value_type is type(None):
+        return None
+    if issubclass(value_type, (bool, np.bool_)):
+        return 'b1'
+    if issubclass(value_type, (int, np.integer)):
+        return 'i8'
+    if issubclass(value_type, (float, np.floating)):
+        return 'f8'
+    if issubclass(value_type, str):
+        return 'str'
+    return 'json'
+
+
+def widen_kind(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """Narrowest kind that can hold values of both kinds."""
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    if {a, b} == {'i8', 'f8'}:
+        return 'f8'
+    return 'json'
+
+
+def _infer_kind(values: Sequence[Any]) -> Optional[str]:
+    kind = None
+    for value_type in {type(v) for v in values}:
+        kind = widen_kind(kind, _type_kind(value_type))
+    return kind
+
+
+def _pack_strings(encoded: Sequence[bytes]) -> bytes:
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets.tobytes() + b''.join(encoded)
+
+
+def _unpack_strings(body: bytes, count: int) -> Tuple[List[str], int]:
+    """Decoded strings and the number of bytes they occupied."""
+    offsets = np.frombuffer(body[:8 * (count + 1)], dtype=np.int64).tolist()
+    base = 8 * (count + 1)
+    data = body[base:base + offsets[-1]]
+    texts = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+    return texts, base + offsets[-1]
+
+
+def _encode_column(values: Sequence[Any], kind: str, level: int) -> Tuple[bytes, bool]:
+    """Compressed buffer for one column, and whether it carries a null mask."""
+    n = len(values)
+    valid = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+    has_mask = kind != 'f8' and not valid.all()
+
+    if kind == 'f8':
+        body = np.array([np.nan if v is None else v for v in values], dtype=np.float64).tobytes()
+    elif kind == 'i8':
+        body = np.array([0 if v is None else v for v in values], dtype=np.int64).tobytes()
+    elif kind == 'b1':
+        body = np.array([False if v is None else v for v in values], dtype=bool).tobytes()
+    elif kind == 'json':
+        body = _pack_strings([b'' if v is None else json.dumps(v, default=str).encode('utf-8') for v in values])
+    else:
+        encoded = [b'' if v is None else v.encode('utf-8') for v in values]
+        table = list(dict.fromkeys(encoded))
+        if len(table) * 2 <= n:
+            # Low-cardinality strings (symbols, actions, regimes): table + int32 codes
+            codes = {text: i for i, text in enumerate(table)}
+            body = (b'D' + struct.pack('<I', len(table)) + _pack_strings(table)
+                    + np.array([codes[text] for text in encoded], dtype=np.int32).tobytes())
+        else:
+            body = b'P' + _pack_strings(encoded)
+
+    if has_mask:
+        body = np.packbits(valid).tobytes() + body
+    return zlib.compress(body, level), has_mask
+
+
+def _decode_column(buffer: bytes, kind: str, rows: int, has_mask: bool,
+                   as_kind: Optional[str] = None) -> np.ndarray:
+    body = zlib.decompress(buffer)
+    valid = None
+    if has_mask:
+        mask_len = (rows + 7) // 8
+        valid = np.unpackbits(np.frombuffer(body[:mask_len], dtype=np.uint8), count=rows).astype(bool)
+        body = body[mask_len:]
+
+    if kind == 'f8':
+        values = np.frombuffer(body, dtype=np.float64).copy()
+    elif kind == 'i8':
+        values = np.frombuffer(body, dtype=np.int64).copy()
+    elif kind == 'b1':
+        values = np.frombuffer(body, dtype=bool).copy()
+    elif kind == 'json':
+        texts, _ = _unpack_strings(body, rows)
+        values = np.empty(rows, dtype=object)
+        for i, text in enumerate(texts):
+            if text:
+                values[i] = json.loads(text)
+    elif body[:1] == b'D':
+        (size,) = struct.unpack('<I', body[1:5])
+        table, used = _unpack_strings(body[5:], size)
+        lookup = np.empty(size, dtype=object)
+        lookup[:] = table
+        values = lookup[np.frombuffer(body[5 + used:], dtype=np.int32)]
+    else:
+        texts, _ = _unpack_strings(body[1:], rows)
+        values = np.empty(rows, dtype=object)
+        values[:] = texts
+
+    if valid is not None and values.dtype == object:
+        values[~valid] = None
+
+    if valid is not None and kind in ('i8', 'b1'):
+        if kind == 'i8' and as_kind in (None, 'i8', 'f8'):
+            values = values.astype(np.float64)
+            values[~valid] = np.nan
+        else:
+            values = values.astype(object)
+            values[~valid] = None
+
+    if as_kind == 'f8' and values.dtype != np.float64:
+        values = values.astype(np.float64)
+    elif as_kind == 'json' and values.dtype != object:
+        values = values.astype(object)
+    return values
+
+
+def _null_column(kind: Optional[str], rows: int) -> np.ndarray:
+    if kind == 'f8':
+        return np.full(rows, np.nan)
+    return np.full(rows, None, dtype=object)
+
+
+@dataclass
+class RecordBatch:
+    """Rows of one event type from one chunk, as column arrays."""
+    event_type: str
+    columns: Dict[str, np.ndarray]
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns[TIME_COLUMN])
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        return pd.to_datetime(self.columns[TIME_COLUMN], unit='ns', utc=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.columns)
+        frame[TIME_COLUMN] = self.timestamps()
+        return frame
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Rows as dicts, leaving out null fields."""
+        names = [n for n in self.columns if n != TIME_COLUMN]
+        records = []
+        for i in range(self.rows):
+            record = {}
+            for name in names:
+                value = self.columns[name][i]
+                if value is None or (isinstance(value, float) and np.isnan(value)):
+                    continue
+                record[name] = value.item() if isinstance(value, np.generic) else value
+            records.append(record)
+        return records
+
+
+class EventLogWriter:
+    """
+    Buffered writer for one event log file.
+
+    Rows are held per event type and written as a chunk once chunk_rows
+    accumulate, when they have waited max_buffer_seconds (checked on
+    flush()), or on flush(force=True) / close(). close() writes the footer.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 4096,
+                 max_buffer_seconds: float = 30.0, compression_level: int = 6):
+        """
+        Create (truncate) the log file.
+
+        Args:
+            path: File to write
+            chunk_rows: Rows per event type that trigger a chunk write
+            max_buffer_seconds: Oldest buffered row age that triggers a write on flush()
+            compression_level: zlib level for column buffers
+        """
+        self.path = str(path)
+        self.chunk_rows = chunk_rows
+        self.max_buffer_seconds = max_buffer_seconds
+        self.compression_level = compression_level
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC)
+        self._buffers: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._buffered_since: Dict[str, float] = {}
+        self._schemas: Dict[str, Dict[str, str]] = {}
+        self._chunks: List[Dict[str, Any]] = []
+        self._lock = Lock()
+        self.rows_written = 0
+
+    def append(self, event_type: str, record: Dict[str, Any], ts: TimeLike = None) -> None:
+        """
+        Buffer one row.
+
+        Args:
+            event_type: Event type (selects the schema and chunk)
+            record: Field values; nested values are stored as JSON
+            ts: Row timestamp (default now)
+        """
+        ts_ns = to_ns(ts) if ts is not None else time.time_ns()
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"Event log {self.path} is closed")
+            rows = self._buffers.setdefault(event_type, [])
+            if not rows:
+                self._buffered_since[event_type] = time.monotonic()
+            rows.append((ts_ns, record))
+            if len(rows) >= self.chunk_rows:
+                self._write_chunk(event_type)
+
+    def flush(self, force: bool = False) -> None:
+        """Write buffered rows that are due (all of them when force)."""
+        with self._lock:
+            if self._file is None:
+                return
+            now = time.monotonic()
+            for event_type in list(self._buffers):
+                if force or now - self._buffered_since[event_type] >= self.max_buffer_seconds:
+                    self._write_chunk(event_type)
+            self._file.flush()
+
+    @property
+    def bytes_written(self) -> int:
+        with self._lock:
+            return self._file.tell() if self._file is not None else 0
+
+    @property
+    def buffered_rows(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._buffers.values())
+
+    def _write_chunk(self, event_type: str) -> None:
+        rows = self._buffers.pop(event_type, None)
+        self._buffered_since.pop(event_type, None)
+        if not rows:
+            return
+
+        schema = self._schemas.setdefault(event_type, {})
+        names = list(schema)
+        seen = set(names)
+        for _, record in rows:
+            for name in record:
+                if name not in seen and name != TIME_COLUMN:
+                    seen.add(name)
+                    names.append(name)
+
+        ts = np.array([t for t, _ in rows], dtype=np.int64)
+        buffers = [zlib.compress(ts.tobytes(), self.compression_level)]
+        columns = [[TIME_COLUMN, 'i8', len(buffers[0]), False]]
+        for name in names:
+            values = [record.get(name) for _, record in rows]
+            kind = widen_kind(schema.get(name), _infer_kind(values)) or 'json'
+            try:
+                buffer, has_mask = _encode_column(values, kind, self.compression_level)
+            except OverflowError:
+                # Integers beyond int64
+                kind = 'json'
+                buffer, has_mask = _encode_column(values, kind, self.compression_level)
+            schema[name] = kind
+            buffers.append(buffer)
+            columns.append([name, kind, len(buffer), has_mask])
+
+        meta = {
+            'event_type': event_type,
+            'rows': len(rows),
+            'ts_min': int(ts.min()),
+            'ts_max': int(ts.max()),
+            'columns': columns,
+        }
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        offset = self._file.tell()
+        self._file.write(CHUNK_MARKER + struct.pack('<I', len(meta_bytes)) + meta_bytes)
+        for buffer in buffers:
+            self._file.write(buffer)
+        meta['offset'] = offset
+        self._chunks.append(meta)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Write remaining rows and the footer index, then close the file."""
+        with self._lock:
+            if self._file is None:
+                return
+            for event_type in list(self._buffers):
+                self._write_chunk(event_type)
+            footer = zlib.compress(json.dumps({
+                'chunks': self._chunks,
+                'schemas': self._schemas,
+            }).encode('utf-8'))
+            self._file.write(footer)
+            self._file.write(struct.pack('<Q', len(footer)) + MAGIC)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'EventLogWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventLogReader:
+    """
+    Indexed reader for one event log file.
+
+    Usage:
+        reader = EventLogReader(path)
+        reader.event_types
+        df = reader.read('decision', start='2031-03-01', end='2031-04-01', columns=['pnl'])
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.complete = False  # True when the footer was present
+        self.chunks: List[Dict[str, Any]] = []
+        self.schemas: Dict[str, Dict[str, str]] = {}
+        self.chunks_read = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not an event log")
+            trailer_len = 8 + len(MAGIC)
+            if size >= len(MAGIC) + trailer_len:
+                f.seek(size - trailer_len)
+                trailer = f.read(trailer_len)
+                if trailer[8:] == MAGIC:
+                    (footer_len,) = struct.unpack('<Q', trailer[:8])
+                    f.seek(size - trailer_len - footer_len)
+                    index = json.loads(zlib.decompress(f.read(footer_len)))
+                    self.chunks = index['chunks']
+                    self.schemas = index['schemas']
+                    self.complete = True
+                    return
+            self._scan_chunks(f, size)
+
+    def _scan_chunks(self, f, size: int) -> None:
+        """Rebuild the index from chunk headers (file has no footer)."""
+        offset = len(MAGIC)
+        while offset + 8 <= size:
+            f.seek(offset)
+            head = f.read(8)
+            if head[:4] != CHUNK_MARKER:
+                break
+            (meta_len,) = struct.unpack('<I', head[4:])
+            try:
+                meta = json.loads(f.read(meta_len))
+            except ValueError:
+                break
+            end = offset + 8 + meta_len + sum(c[2] for c in meta['columns'])
+            if end > size:
+                break  # Torn final chunk
+            meta['offset'] = offset
+            self.chunks.append(meta)
+            schema = self.schemas.setdefault(meta['event_type'], {})
+            for name, kind, _, _ in meta['columns'][1:]:
+                schema[name] = widen_kind(schema.get(name), kind)
+            offset = end
+        if self.chunks:
+            logger.debug(f"Recovered {len(self.chunks)} chunks from unclosed event log {self.path}")
+
+    @property
+    def event_types(self) -> List[str]:
+        return list(self.schemas)
+
+    @property
+    def rows(self) -> int:
+        return sum(c['rows'] for c in self.chunks)
+
+    def time_range(self) -> Optional[Tuple[int, int]]:
+        """(min, max) row timestamp in ns, or None for an empty log."""
+        if not self.chunks:
+            return None
+        return min(c['ts_min'] for c in self.chunks), max(c['ts_max'] for c in self.chunks)
+
+    def _select(self, event_type: Union[str, Iterable[str], None],
+                start_ns: Optional[int], end_ns: Optional[int]) -> List[Dict[str, Any]]:
+        types = {event_type} if isinstance(event_type, str) else set(event_type) if event_type else None
+        return [
+            c for c in self.chunks
+            if (types is None or c['event_type'] in types)
+            and (start_ns is None or c['ts_max'] >= start_ns)
+            and (end_ns is None or c['ts_min'] < end_ns)
+        ]
+
+    def iter_batches(
+        self,
+        event_type: Union[str, Iterable[str], None] = None,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[RecordBatch]:
+        """
+        Stream record batches, one chunk at a time.
+
+        Args:
+            event_type: Event type(s) to read (default all)
+            start: Inclusive lower bound on row timestamp
+            end: Exclusive upper bound on row timestamp
+            columns: Columns to decode (default all); missing ones read as null
+
+        Yields:
+            RecordBatch per chunk with at least one row in the window
+        """
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        selected = self._select(event_type, start_ns, end_ns)
+        if not selected:
+            return
+
+        with open(self.path, 'rb') as f:
+            for chunk in selected:
+                schema = self.schemas.get(chunk['event_type'], {})
+                layout = {}
+                # Column buffers follow the chunk's meta JSON
+                f.seek(chunk['offset'] + 4)
+                (meta_len,) = struct.unpack('<I', f.read(4))
+                position = chunk['offset'] + 8 + meta_len
+                for name, kind, length, has_mask in chunk['columns']:
+                    layout[name] = (position, kind, length, has_mask)
+                    position += length
+
+                rows = chunk['rows']
+                wanted = list(columns) if columns is not None else list(schema) or [
+                    c[0] for c in chunk['columns'][1:]
+                ]
+                out: Dict[str, np.ndarray] = {}
+                for name in [TIME_COLUMN] + [n for n in wanted if n != TIME_COLUMN]:
+                    if name not in layout:
+                        out[name] = _null_column(schema.get(name), rows)
+                        continue
+                    pos, kind, length, has_mask = layout[name]
+                    f.seek(pos)
+                    as_kind = None if name == TIME_COLUMN else schema.get(name)
+                    out[name] = _decode_column(f.read(length), kind, rows, has_mask, as_kind)
+                self.chunks_read += 1
+
+                ts = out[TIME_COLUMN]
+                if (start_ns is not None and chunk['ts_min'] < start_ns) or \
+                        (end_ns is not None and chunk['ts_max'] >= end_ns):
+                    keep = np.ones(rows, dtype=bool)
+                    if start_ns is not None:
+                        keep &= ts >= start_ns
+                    if end_ns is not None:
+                        keep &= ts < end_ns
+                    if not keep.any():
+                        continue
+                    out = {name: values[keep] for name, values in out.items()}
+                yield RecordBatch(chunk['event_type'], out)
+
+    def read(self, event_type: Union[str, Iterable[str], None] = None, start: TimeLike = None,
+             end: TimeLike = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """All matching rows as one DataFrame (see iter_batches)."""
+        return _concat(self.iter_batches(event_type, start, end, columns), tag_types=not isinstance(event_type, str))
+
+
+def _concat(batches: Iterable[RecordBatch], tag_types: bool) -> pd.DataFrame:
+    """One frame from many batches, joining column arrays directly."""
+    parts: Dict[str, List[Tuple[int, np.ndarray]]] = {}
+    types: List[np.ndarray] = []
+    total = 0
+    for batch in batches:
+        rows = batch.rows
+        for name, values in batch.columns.items():
+            parts.setdefault(name, []).append((total, values))
+        if tag_types:
+            types.append(np.full(rows, batch.event_type, dtype=object))
+        total += rows
+    if not total:
+        return pd.DataFrame()
+
+    columns: Dict[str, Any] = {}
+    for name, pieces in parts.items():
+        if len(pieces) == 1 and len(pieces[0][1]) == total:
+            values = pieces[0][1]
+        else:
+            dtypes = [v.dtype for _, v in pieces]
+            dtype = object if object in dtypes else np.result_type(*dtypes)
+            if sum(len(v) for _, v in pieces) == total:
+                values = np.empty(total, dtype=dtype)
+            else:
+                # Absent from some batches: those rows read as null
+                dtype = np.float64 if dtype != object and dtype != bool else object
+                values = np.full(total, np.nan if dtype == np.float64 else None, dtype=dtype)
+            for offset, piece in pieces:
+                values[offset:offset + len(piece)] = piece
+        columns[name] = values
+    columns[TIME_COLUMN] = pd.to_datetime(columns[TIME_COLUMN], unit='ns', utc=True)
+    if tag_types:
+        columns['_event_type'] = np.concatenate(types)
+    return pd.DataFrame(columns)
+
+
+def event_log_files(path: Union[str, Sequence[str]], pattern: str = '*' + EXTENSION) -> List[str]:
+    """Event log files at path (a file, a list of files, or a directory globbed with pattern)."""
+    if not isinstance(path, (str, os.PathLike)):
+        return [str(p) for p in path]
+    path = str(path)
+    if os.path.isfile(path):
+        return [path]
+    return sorted(glob.glob(os.path.join(path, pattern)))
+
+
+def scan_event_logs(
+    path: Union[str, Sequence[str]],
+    event_type: Union[str, Iterable[str], None] = None,
+    start: TimeLike = None,
+    end: TimeLike = None,
+    columns: Optional[Sequence[str]] = None,
+    pattern: str = '*' + EXTENSION
+) -> Iterator[RecordBatch]:
+    """
+    Stream record batches from every event log under path.
+
+    Files whose index shows no chunk in the window are skipped after reading
+    only their footer. Unreadable files are logged and skipped.
+    """
+    for file_path in event_log_files(path, pattern):
+        try:
+            reader = EventLogReader(file_path)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Skipping unreadable event log {file_path}: {e}")
+            continue
+        yield from reader.iter_batches(event_type, start, end, columns)
+
+
+def read_event_logs(path: Union[str, Sequence[str]], event_type: Union[str, Iterable[str], None] = None,
+                    start: TimeLike = None, end: TimeLike = None, columns: Optional[Sequence[str]] = None,
+                    pattern: str = '*' + EXTENSION) -> pd.DataFrame:
+    """All matching rows under path as one DataFrame (see scan_event_logs)."""
+    return _concat(scan_event_logs(path, event_type, start, end, columns, pattern),
+                   tag_types=not isinstance(event_type, str))
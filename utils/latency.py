@@ -0,0 +1,137 @@
+"""
+Latency Histograms
+
+Fixed-bucket latency histograms for hot call paths (terminal requests,
+loop stages). Recording is O(log buckets) with no allocation, so they can
+stay enabled in production and be exported in Prometheus histogram format.
+"""
+
+import bisect
+from threading import Lock
+from typing import Dict, Any, Optional, Sequence, List
+
+
+# Bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram with fixed millisecond buckets.
+
+    Usage:
+        hist = LatencyHistogram()
+        hist.observe(3.2)
+        hist.percentile(0.99)
+        hist.to_dict()
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets_ms: Sorted bucket upper bounds in milliseconds
+        """
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._counts = [0] * (len(self.buckets_ms) + 1)  # last bucket is +Inf
+        self._lock = Lock()
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record one latency sample in milliseconds."""
+        idx = bisect.bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.sum_ms += value_ms
+            if value_ms > self.max_ms:
+                self.max_ms = value_ms
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets_ms) + 1)
+            self.count = 0
+            self.sum_ms = 0.0
+            self.max_ms = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile by linear interpolation inside its bucket.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Latency in milliseconds (0.0 without samples)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self.count
+            max_ms = self.max_ms
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for idx, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = self.buckets_ms[idx - 1] if idx > 0 else 0.0
+                upper = self.buckets_ms[idx] if idx < len(self.buckets_ms) else max_ms
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(value, max_ms)
+            seen += n
+        return max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.mean_ms, 3),
+            'p50_ms': round(self.percentile(0.50), 3),
+            'p90_ms': round(self.percentile(0.90), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+    def to_prometheus(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None,
+                      header: bool = True) -> str:
+        """
+        Render in Prometheus histogram exposition format (seconds).
+
+        Args:
+            name: Metric name (without _bucket/_sum/_count suffix)
+            help_text: HELP line
+            labels: Extra labels
+            header: Emit the HELP/TYPE lines; pass False for the second and
+                later labelled series of the same metric family
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self.count
+            total_sum = self.sum_ms
+
+        base = dict(labels or {})
+
+        def fmt(extra: Dict[str, str]) -> str:
+            merged = {**base, **extra}
+            if not merged:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in merged.items()) + "}"
+
+        lines: List[str] = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"] if header else []
+        cumulative = 0
+        for bound, n in zip(self.buckets_ms, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{fmt({'le': f'{bound / 1000.0:g}'})} {cumulative}")
+        lines.append(f"{name}_bucket{fmt({'le': '+Inf'})} {total}")
+        lines.append(f"{name}_sum{fmt({})} {total_sum / 1000.0}")
+        lines.append(f"{name}_count{fmt({})} {total}")
+        return "\n".join(lines)